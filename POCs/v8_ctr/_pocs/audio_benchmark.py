@@ -0,0 +1,295 @@
+import argparse
+import glob
+import io
+import os
+import sys
+import threading
+import time
+import wave
+import logging
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_common import RATE, use_synthetic_audio
+from modules.audio.capture_buffer import CaptureRingBuffer
+
+# Configuração do logger
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+# Mesmos parâmetros do AudioConfig (sem importar pyaudio/tkinter, para rodar sem placa de som)
+CHUNK = 1024
+MAX_RECORD_SECONDS = 600
+VAD_FRAME_SIZE = 480
+CALIBRATION_SECONDS = 0.5  # Início de cada fixture sem fala, usado como calibração
+VOLUME_MULTIPLIER = 3
+
+
+# === capture: lista de frames + wave contra o buffer circular ===
+
+def synthetic_chunks(duration, template):
+    """Gera os blocos de 1024 quadros como o PortAudio entregaria (um objeto bytes novo por bloco)."""
+    for _ in range(int(duration * RATE / CHUNK)):
+        yield template.tobytes()
+
+
+def legacy_capture(duration, template, on_stop):
+    """Fluxo antigo: lista de frames, b''.join e reescrita via wave em um BytesIO."""
+    frames = [data for data in synthetic_chunks(duration, template)]
+    on_stop()
+    stop_time = time.perf_counter()
+    audio_file = io.BytesIO()
+    with wave.open(audio_file, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(b''.join(frames))
+    audio_file.name = "output.wav"
+    return audio_file, time.perf_counter() - stop_time
+
+
+def ring_capture(duration, template, on_stop, buffer):
+    """Fluxo novo: o callback escreve no anel pré-alocado e o WAV é um memoryview."""
+    buffer.reset()
+    for data in synthetic_chunks(duration, template):
+        buffer.write(data)
+    on_stop()
+    stop_time = time.perf_counter()
+    audio_file = buffer.wav_view()
+    return audio_file, time.perf_counter() - stop_time
+
+
+def measure_capture(capture, *args):
+    """Mede alocações (pico e blocos vivos no momento do stop) e a latência entre o stop e o arquivo pronto."""
+    snapshots = {}
+
+    def on_stop():
+        snapshots['stop'] = tracemalloc.take_snapshot()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    audio_file, stop_latency = capture(*args[:2], on_stop, *args[2:])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = snapshots['stop'].compare_to(before, 'filename')
+    return {
+        'peak_mb': peak / (1024 * 1024),
+        'allocations': sum(stat.count_diff for stat in stats if stat.count_diff > 0),
+        'stop_ms': stop_latency * 1000,
+        'wav_mb': len(audio_file.getbuffer()) / (1024 * 1024),
+    }
+
+
+def run_capture(args):
+    """Compara a captura antiga com o buffer circular para gravações de várias durações."""
+    template = (np.random.default_rng(0).standard_normal(CHUNK) * 1000).astype(np.int16)
+    # O anel é alocado uma vez, como no AudioHandler
+    buffer = CaptureRingBuffer(MAX_RECORD_SECONDS, RATE)
+
+    print(f"\n{'duração':<10} {'método':<18} {'pico (MB)':>10} {'alocações':>10} {'stop->upload (ms)':>18} {'WAV (MB)':>9}")
+    for duration in args.durations:
+        for name, result in (("lista + wave", measure_capture(legacy_capture, duration, template)),
+                             ("buffer circular", measure_capture(ring_capture, duration, template, buffer))):
+            print(f"{str(duration) + ' s':<10} {name:<18} {result['peak_mb']:10.2f} {result['allocations']:10d} "
+                  f"{result['stop_ms']:18.3f} {result['wav_mb']:9.2f}")
+
+
+# === vad: engines de VAD sobre fixtures rotulados ===
+
+def synthetic_fixture(seed, duration=20.0):
+    """
+    Gera um fixture sintético: ruído de fundo, trechos de "voz" harmônica e
+    rajadas de ruído de banda larga (distratores que não são fala).
+
+    Returns:
+        tuple: (amostras int16, segmentos de fala em segundos)
+    """
+    rng = np.random.default_rng(seed)
+    audio = rng.standard_normal(int(duration * RATE)).astype(np.float32) * 30
+
+    speech = []
+    position = CALIBRATION_SECONDS + rng.uniform(0.5, 1.5)
+    while position < duration - 2.5:
+        length = rng.uniform(0.6, 2.0)
+        start, end = int(position * RATE), int((position + length) * RATE)
+        t = np.arange(end - start) / RATE
+        f0 = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+        phase = 2 * np.pi * np.cumsum(f0) / RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t) ** 2
+        audio[start:end] += (voiced * envelope * rng.uniform(1500, 4000)).astype(np.float32)
+        speech.append((position, position + length))
+        position += length + rng.uniform(0.6, 2.0)
+
+        # Distrator: rajada de ruído branco alto entre as falas
+        if rng.random() < 0.5 and position < duration - 1:
+            burst_start = int((position - 0.5) * RATE)
+            burst_end = burst_start + int(0.3 * RATE)
+            audio[burst_start:burst_end] += rng.standard_normal(burst_end - burst_start).astype(np.float32) * 2000
+
+    return np.clip(audio, -32768, 32767).astype(np.int16), speech
+
+
+def load_vad_fixtures(fixtures_dir):
+    """Carrega WAVs com rótulos .json do diretório, ou gera fixtures sintéticos."""
+    from modules.audio.vad.offline import load_wav_fixture, load_labels
+
+    fixtures = []
+    if fixtures_dir:
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.wav'))):
+            labels = load_labels(path)
+            if labels is None:
+                print(f"Ignorando {path}: sem arquivo de rótulos .json")
+                continue
+            samples, rate = load_wav_fixture(path)
+            fixtures.append((samples, rate, labels))
+    if not fixtures:
+        fixtures = [synthetic_fixture(seed) for seed in range(5)]
+        fixtures = [(samples, RATE, labels) for samples, labels in fixtures]
+    return fixtures
+
+
+def evaluate_vad(engine, fixtures):
+    """Executa um engine sobre todos os fixtures e agrega acurácia e custo de CPU."""
+    from modules.audio.vad import create_vad, detect_segments
+    from modules.audio.vad.offline import segments_to_frames
+
+    tp = fp = fn = tn = 0
+    cpu_time = audio_seconds = 0.0
+    for samples, rate, labels in fixtures:
+        vad = create_vad(engine, rate, frame_size=VAD_FRAME_SIZE)
+        calibration = samples[:int(CALIBRATION_SECONDS * rate)].astype(np.float32)
+        vad.threshold = np.sqrt(np.mean(calibration ** 2)) * VOLUME_MULTIPLIER
+
+        cpu_start = time.process_time()
+        decisions, _ = detect_segments(samples, vad)
+        cpu_time += time.process_time() - cpu_start
+        audio_seconds += len(samples) / float(rate)
+
+        truth = segments_to_frames(labels, len(decisions), vad.frame_duration)
+        tp += np.count_nonzero(decisions & truth)
+        fp += np.count_nonzero(decisions & ~truth)
+        fn += np.count_nonzero(~decisions & truth)
+        tn += np.count_nonzero(~decisions & ~truth)
+
+    total = tp + fp + fn + tn
+    return {
+        'accuracy': (tp + tn) / total if total else 0.0,
+        'precision': tp / (tp + fp) if tp + fp else 0.0,
+        'recall': tp / (tp + fn) if tp + fn else 0.0,
+        'cpu_ms_per_s': cpu_time * 1000 / audio_seconds if audio_seconds else 0.0,
+    }
+
+
+def run_vad(args):
+    """Compara os engines de VAD offline, sem dispositivo de áudio."""
+    from modules.audio.vad import VAD_ENGINES
+
+    fixtures = load_vad_fixtures(args.fixtures)
+    print(f"\n{len(fixtures)} fixtures | resultados por quadro de 20 ms")
+    print(f"{'engine':<10} {'acurácia':>9} {'precisão':>9} {'revocação':>10} {'CPU (ms/s de áudio)':>20}")
+    for engine in VAD_ENGINES:
+        result = evaluate_vad(engine, fixtures)
+        print(f"{engine:<10} {result['accuracy']:9.3f} {result['precision']:9.3f} {result['recall']:10.3f} "
+              f"{result['cpu_ms_per_s']:20.3f}")
+
+
+# === headless: captura e reprodução pelo backend sem placa de som ===
+
+def headless_capture(speed):
+    """
+    Roda o modo VAD do AudioHandler sobre a entrada do backend sem placa de som e mede,
+    para cada fala entregue, a posição da entrada no momento do callback.
+    """
+    from config.audio_config import AudioConfig
+    from handlers.audio_handler import AudioHandler
+
+    deliveries = []
+    handler = None
+
+    def on_recording_complete(audio_file):
+        # Posição da entrada no momento da entrega, em segundos de áudio
+        deliveries.append((handler.audio_context.backend.input_position, audio_file.duration))
+
+    handler = AudioHandler(on_recording_complete=on_recording_complete)
+    handler.is_recording_vad = True
+    handler.stop_event.clear()
+    started = time.perf_counter()
+    thread = threading.Thread(target=handler.vad_recording, daemon=True)
+    thread.start()
+
+    handler.audio_context.backend.input_exhausted.wait()
+    time.sleep(AudioConfig.RECORD_TIME_AFTER_DETECTION / max(speed, 1.0) + 0.5)
+    handler.stop_recording()
+    thread.join(timeout=5)
+    elapsed = time.perf_counter() - started
+    handler.cleanup()
+
+    print("\n=== Captura (VAD) ===")
+    print(f"Áudio processado: {handler.audio_context.backend.input_position:.2f} s em {elapsed:.2f} s de relógio")
+    for i, (position, duration) in enumerate(deliveries, 1):
+        print(f"Fala {i}: {duration:.2f} s entregue com a entrada em {position:.2f} s")
+    metrics = handler.get_endpoint_metrics()
+    if metrics and metrics['count']:
+        print(f"Latência de fim de turno: média {metrics['mean'] * 1000:.0f} ms, p90 {metrics['p90'] * 1000:.0f} ms")
+
+
+def headless_playback(seconds):
+    """Reproduz áudio pelo AudioStreamManager e mede o tempo até o primeiro som e a vazão."""
+    from modules.open_ai.tts.tts_base import get_audio_stream_manager
+
+    manager = get_audio_stream_manager()
+    samples = (np.sin(2 * np.pi * 220 * np.arange(int(seconds * RATE)) / RATE) * 0.5).astype(np.float32)
+
+    started = time.perf_counter()
+    manager.play_audio_chunks(samples)
+    elapsed = time.perf_counter() - started
+    recording = manager.audio_context.backend.recordings[-1]
+    first_sound = (recording.first_sound_at - started) * 1000 if recording.first_sound_at else float('nan')
+    manager.cleanup()
+
+    print("\n=== Reprodução ===")
+    print(f"Áudio: {seconds:.2f} s enviado em {elapsed:.2f} s ({seconds / elapsed if elapsed else 0:.1f}x tempo real)")
+    print(f"Tempo até o primeiro som: {first_sound:.1f} ms")
+
+
+def run_headless(args):
+    """Mede captura e reprodução usando o backend de arquivo/sintético, sem dispositivo de áudio."""
+    if args.fixtures:
+        os.environ['JUNIN_AUDIO_FIXTURES'] = os.pathsep.join(args.fixtures)
+    use_synthetic_audio(args.speed, backend='file' if args.fixtures else 'synthetic')
+    # Uma única passagem pela entrada, para saber quando a captura terminou
+    os.environ['JUNIN_AUDIO_LOOP'] = '0'
+
+    headless_capture(args.speed)
+    headless_playback(args.playback_seconds)
+
+
+def main():
+    """Benchmarks da captura, do VAD e da pilha de áudio sem placa de som."""
+    parser = argparse.ArgumentParser(description="Benchmarks da captura e do VAD")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture = commands.add_parser("capture", help="Lista de frames + wave contra o buffer circular de captura")
+    capture.add_argument("--durations", type=int, nargs="*", default=[5, 60, 600], help="Durações das gravações (s)")
+    capture.set_defaults(run=run_capture)
+
+    vad = commands.add_parser("vad", help="Acurácia e CPU dos engines de VAD")
+    vad.add_argument("--fixtures", help="Diretório com arquivos .wav e rótulos .json ({\"speech\": [[inicio, fim], ...]})")
+    vad.set_defaults(run=run_vad)
+
+    headless = commands.add_parser("headless", help="Captura (VAD) e reprodução pelo backend sem placa de som")
+    headless.add_argument("--fixtures", nargs="*", help="Arquivos WAV usados como entrada (padrão: áudio sintético)")
+    headless.add_argument("--speed", type=float, default=1.0, help="Ritmo da entrada/saída (1.0 = tempo real, 0 = sem espera)")
+    headless.add_argument("--playback-seconds", type=float, default=5.0, help="Duração do áudio de reprodução")
+    headless.set_defaults(run=run_headless)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
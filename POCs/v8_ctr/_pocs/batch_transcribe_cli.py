@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from modules.open_ai.stt.batch_transcriber import BatchTranscriber, find_recordings
+from modules.open_ai.stt.pipeline import STTPipeline, MODE_ONLINE, MODE_LOCAL, MODE_SPELLCHECK
+from modules.open_ai.stt.stt_worker import get_stt_worker_pool, shutdown_stt_worker_pool
+from modules.open_ai.stt.chunked_transcriber import shutdown_executors
+from modules.open_ai.stt.transcription_cache import TranscriptionCache
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+load_dotenv()
+
+
+def main():
+    """Transcreve uma pasta de gravações WAV/FLAC e grava os resultados em JSONL."""
+    parser = argparse.ArgumentParser(description="Transcrição em lote de uma pasta de gravações")
+    parser.add_argument("directory", help="Pasta com os arquivos .wav/.flac")
+    parser.add_argument("--output", default="transcricoes.jsonl", help="Arquivo JSONL de saída")
+    parser.add_argument("--mode", default=MODE_ONLINE, choices=[MODE_ONLINE, MODE_LOCAL, MODE_SPELLCHECK],
+                        help="Modo de transcrição")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Arquivos em paralelo (padrão: 8 online, 2x processos no modo local)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() // 2 or 1, help="Processos do Whisper local")
+    parser.add_argument("--model", default="base", help="Modelo do Whisper local")
+    parser.add_argument("--cache-dir", default=None, help="Pasta do cache de transcrições (reaproveita execuções anteriores)")
+    parser.add_argument("--no-recursive", action="store_true", help="Ignora as subpastas")
+    args = parser.parse_args()
+
+    paths = find_recordings(args.directory, recursive=not args.no_recursive)
+    if not paths:
+        log.error("Nenhum arquivo .wav/.flac encontrado em %s", args.directory)
+        return 1
+
+    client = async_client = task_manager = None
+    if args.mode == MODE_LOCAL:
+        # Cada processo carrega uma cópia do modelo; o dobro de arquivos em andamento mantém a fila cheia
+        pool = get_stt_worker_pool(args.model, args.workers)
+        pool.start()
+        concurrency = args.concurrency or pool.num_workers * 2
+    else:
+        from openai import OpenAI, AsyncOpenAI
+        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        async_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        concurrency = args.concurrency or 8
+        if args.mode == MODE_SPELLCHECK:
+            from tasks_folder.task_manager import TaskManager
+            task_manager = TaskManager()
+
+    cache = TranscriptionCache(max_entries=len(paths), disk_dir=args.cache_dir)
+    pipeline = STTPipeline(client, log, task_manager, mode=args.mode, cache=cache)
+    try:
+        summary = BatchTranscriber(pipeline, concurrency, async_client).run(paths, args.output, root=args.directory)
+    finally:
+        shutdown_stt_worker_pool()
+        shutdown_executors()
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0 if summary['failed'] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import base64
+import os
+import re
+import sys
+import threading
+import time
+import logging
+from types import SimpleNamespace
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.audio.backends import synthetic_utterances
+from modules.audio.capture_buffer import build_wav_header
+from modules.audio.pcm import read_wav_pcm
+
+# Configuração do logger
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+RATE = 24000
+PROMPT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts", "spelling_correction_word.txt")
+CHAT_TRANSCRIPT = ("Claro! Vou explicar com calma. O relatório mostra que as vendas cresceram no último trimestre, "
+                   "principalmente no canal online, enquanto as lojas físicas ficaram estáveis. Os custos subiram um "
+                   "pouco por causa do frete, mas a margem continuou dentro da meta. Para o próximo período, a "
+                   "recomendação é reforçar o estoque dos produtos mais vendidos e revisar os contratos de entrega.")
+
+
+def use_synthetic_audio(speed=1.0, backend='synthetic'):
+    """Configura o backend de áudio sem placa de som e uma chave falsa da API (antes de criar o contexto de áudio)."""
+    os.environ['JUNIN_AUDIO_BACKEND'] = backend
+    os.environ['JUNIN_AUDIO_SPEED'] = str(speed)
+    os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+    # Os módulos do app registram em INFO; os logs distorceriam as medidas
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def tone(seconds, rate=RATE):
+    """PCM 16 bits de um tom sem amostras nulas (qualquer silêncio exato na saída é pausa ou fim do áudio)."""
+    t = np.arange(int(seconds * rate)) / rate
+    return (np.sin(2 * np.pi * 180 * t) * 8000 + 9000).astype('<i2')
+
+
+def build_dictation(seconds, lead_silence=0.0, tail_silence=0.0, pauses=True):
+    """
+    Concatena falas sintéticas até a duração pedida.
+
+    Args:
+        seconds: Duração mínima das falas
+        lead_silence: Ruído de fundo antes da primeira fala (s)
+        tail_silence: Ruído de fundo depois da última fala (s)
+        pauses: Mantém o silêncio de 1 s no fim de cada bloco de falas
+
+    Returns:
+        np.ndarray: Amostras int16
+    """
+    rng = np.random.default_rng(1)
+    parts = [rng.standard_normal(int(lead_silence * RATE)) * 30]
+    total, seed = 0.0, 0
+    while total < seconds:
+        utterance = synthetic_utterances(RATE, count=3, seed=seed)
+        if not pauses:
+            utterance = utterance[:-RATE]
+        parts.append(utterance)
+        total += len(utterance) / RATE
+        seed += 1
+    parts.append(rng.standard_normal(int(tail_silence * RATE)) * 30)
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+
+
+def wait_playback(audio_stream, settle=0.2):
+    """Espera o buffer de saída esvaziar e o último bloco tocar."""
+    while not audio_stream.buffer.empty():
+        time.sleep(0.02)
+    time.sleep(settle)
+
+
+def time_per_call(function, runs):
+    """Tempo médio por chamada em microssegundos."""
+    started = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - started) / runs * 1e6
+
+
+class FakeSpeechResponse:
+    """
+    Resposta em streaming do audio.speech (PCM): primeiro byte após `ttfb` e o
+    restante no ritmo de geração do servidor (sem espera se realtime_factor for None).
+    """
+
+    def __init__(self, data, ttfb=0.0, realtime_factor=None, piece_bytes=None):
+        self.data = data
+        self.ttfb = ttfb
+        self.realtime_factor = realtime_factor
+        self.piece_bytes = piece_bytes
+        self.completed_at = None
+        self.closed_at = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if self.closed_at is None:
+            self.closed_at = time.perf_counter()
+
+    def iter_bytes(self, chunk_size):
+        time.sleep(self.ttfb)
+        # piece_bytes simula pedaços da rede que não respeitam a fronteira das amostras
+        size = self.piece_bytes or chunk_size
+        for offset in range(0, len(self.data), size):
+            if self.closed_at is not None:
+                raise ConnectionError("stream fechado")
+            piece = self.data[offset:offset + size]
+            if self.realtime_factor:
+                time.sleep(len(piece) / (RATE * 2 * self.realtime_factor))
+            yield piece
+        self.completed_at = time.perf_counter()
+
+
+class FakeSpeechClient:
+    """
+    Cliente falso com a API audio.speech.with_streaming_response.create.
+
+    O áudio tem duração proporcional ao texto (chars_per_second). A resposta de
+    índice `slow_index` demora `slow_ttfb` para começar.
+    """
+
+    def __init__(self, ttfb=0.0, realtime_factor=None, chars_per_second=15.0, piece_bytes=None,
+                 slow_index=None, slow_ttfb=0.0):
+        self.ttfb = ttfb
+        self.realtime_factor = realtime_factor
+        self.chars_per_second = chars_per_second
+        self.piece_bytes = piece_bytes
+        self.slow_index = slow_index
+        self.slow_ttfb = slow_ttfb
+        self.responses = []  # Pares (aberta em, resposta)
+        self._lock = threading.Lock()
+        self.audio = SimpleNamespace(speech=SimpleNamespace(
+            with_streaming_response=SimpleNamespace(create=self._create)))
+
+    @property
+    def requests(self):
+        return len(self.responses)
+
+    def _create(self, model, voice, input, response_format, speed=1.0):
+        assert response_format == "pcm"
+        data = tone(len(input) / (self.chars_per_second * speed)).tobytes()
+        with self._lock:
+            ttfb = self.slow_ttfb if len(self.responses) == self.slow_index else self.ttfb
+            response = FakeSpeechResponse(data, ttfb, self.realtime_factor, self.piece_bytes)
+            self.responses.append((time.perf_counter(), response))
+        return response
+
+
+class FakeChatStream:
+    """Stream de deltas do chat.completions: áudio pcm16 em base64 e trechos da transcrição."""
+
+    def __init__(self, pcm, transcript, realtime_factor, delta_seconds=0.1):
+        self.pcm = pcm
+        self.transcript = transcript
+        self.realtime_factor = realtime_factor
+        self.delta_bytes = int(delta_seconds * RATE) * 2
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def __iter__(self):
+        words = self.transcript.split(" ")
+        deltas = range(0, len(self.pcm), self.delta_bytes)
+        per_delta = max(1, len(words) // len(deltas) + 1)
+        for index, offset in enumerate(deltas):
+            if self.closed:
+                raise ConnectionError("stream fechado")
+            piece = self.pcm[offset:offset + self.delta_bytes]
+            time.sleep(len(piece) / (RATE * 2 * self.realtime_factor))
+            text = " ".join(words[index * per_delta:(index + 1) * per_delta])
+            audio = SimpleNamespace(id="audio_1", data=base64.b64encode(piece).decode('ascii'),
+                                    transcript=(text + " ") if text else None)
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(audio=audio))])
+        yield SimpleNamespace(choices=[])  # Último chunk (uso de tokens), sem escolhas
+
+
+class FakeChatClient:
+    """
+    Cliente falso do chat.completions com áudio.
+
+    Com streaming, a chamada retorna após `ttfb` e os deltas pcm16 chegam no
+    ritmo de geração; sem streaming, a resposta (wav) só chega depois de todo o
+    áudio ser gerado.
+    """
+
+    def __init__(self, seconds, ttfb, realtime_factor=2.0, transcript=CHAT_TRANSCRIPT):
+        self.pcm = tone(seconds).tobytes()
+        self.seconds = seconds
+        self.ttfb = ttfb
+        self.realtime_factor = realtime_factor
+        self.transcript = transcript
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @property
+    def response_seconds(self):
+        """Tempo até a resposta completa sem streaming."""
+        return self.ttfb + self.seconds / self.realtime_factor
+
+    def _create(self, model, modalities, audio, messages, stream=False):
+        if stream:
+            assert audio['format'] == "pcm16"
+            time.sleep(self.ttfb)
+            return FakeChatStream(self.pcm, self.transcript, self.realtime_factor)
+        time.sleep(self.response_seconds)
+        wav = build_wav_header(len(self.pcm) // 2, RATE) + self.pcm
+        message_audio = SimpleNamespace(data=base64.b64encode(wav).decode('ascii'), transcript=self.transcript)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(audio=message_audio))])
+
+
+class PromptTaskManager:
+    """Fornece o prompt de correção ortográfica real, como o TaskManager (em memória)."""
+
+    def __init__(self):
+        with open(PROMPT_FILE, "r", encoding="utf-8") as f:
+            self.prompt = f.read()
+
+    def get_spelling_correction_prompt(self):
+        return self.prompt
+
+
+class SimulatedTranscriber:
+    """
+    Transcritor falso: espera um tempo proporcional à duração do áudio (como a API)
+    e devolve uma palavra por intervalo de fala, identificada pela posição absoluta.
+
+    A posição do trecho vem do atributo `offset` (segundos) ou do nome
+    "incremental_<amostra>.wav"; sem nenhum dos dois, o trecho começa em 0.
+    """
+
+    def __init__(self, base_latency, seconds_per_audio_second, speech=None, word_interval=0.5):
+        """
+        Args:
+            base_latency: Latência fixa por requisição (s)
+            seconds_per_audio_second: Processamento por segundo de áudio (s)
+            speech: Falas (início, fim) em segundos; None = todo o áudio é fala
+            word_interval: Uma palavra a cada word_interval segundos de fala
+        """
+        self.base_latency = base_latency
+        self.seconds_per_audio_second = seconds_per_audio_second
+        self.speech = speech
+        self.word_interval = word_interval
+        self.requests = 0
+
+    def words(self, offset, duration):
+        """Palavras do trecho: a palavra i pertence ao trecho que contém o seu meio, se o meio estiver em uma fala."""
+        first = int(np.ceil(offset / self.word_interval - 0.5))
+        last = int(np.ceil((offset + duration) / self.word_interval - 0.5))
+        ids = [i for i in range(first, last)
+               if self.speech is None or any(start <= (i + 0.5) * self.word_interval < end for start, end in self.speech)]
+        return " ".join(f"p{i}" for i in ids)
+
+    def request_transcription(self, audio_file):
+        samples, rate = read_wav_pcm(audio_file)
+        offset = getattr(audio_file, 'offset', None)
+        if offset is None:
+            match = re.match(r"incremental_(\d+)\.wav", getattr(audio_file, 'name', ''))
+            offset = int(match.group(1)) / float(rate) if match else 0.0
+        duration = len(samples) / float(rate)
+        time.sleep(self.base_latency + duration * self.seconds_per_audio_second)
+        self.requests += 1
+        return self.words(offset, duration)
@@ -0,0 +1,495 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import logging
+from types import SimpleNamespace
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_common import (RATE, PromptTaskManager, SimulatedTranscriber, build_dictation, time_per_call,
+                              use_synthetic_audio)
+from modules.audio.backends import synthetic_utterances
+from modules.audio.capture_buffer import CaptureRingBuffer
+from modules.audio.pcm import read_wav_pcm
+
+# Configuração do logger
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+CHUNK = 1024
+TICK = 0.01  # Período do "loop de UI" simulado (10 ms, como um after() do Tk)
+
+
+def synthetic_recordings(count):
+    """Gravações sintéticas distintas, uma por semente."""
+    return [CaptureRingBuffer.samples_to_wav(synthetic_utterances(RATE, seed=i), RATE) for i in range(count)]
+
+
+def has_whisper():
+    try:
+        import whisper  # noqa: F401
+        return True
+    except ImportError:
+        print("O pacote whisper não está instalado; instale-o para rodar este benchmark")
+        return False
+
+
+# === chunked: transcrição em partes paralelas ===
+
+def run_chunked(args):
+    """Mede o tempo de parede da transcrição em partes variando o número de workers."""
+    from modules.open_ai.stt.chunked_transcriber import ChunkedTranscriber, plan_segments
+
+    class OffsetChunkedTranscriber(ChunkedTranscriber):
+        """Marca cada segmento com sua posição no áudio, para o transcritor falso."""
+
+        def _submit(self, executor, samples, rate, index):
+            segment_file = CaptureRingBuffer.samples_to_wav(samples, rate, name=f"segment_{index}.wav")
+            segment_file.offset = self._segments[index][0] / float(rate)
+            return executor.submit(self.transcriber.request_transcription, segment_file)
+
+        def transcribe(self, audio_file):
+            samples, rate = read_wav_pcm(audio_file)
+            self._segments = plan_segments(samples, rate, self._segment_seconds(len(samples) / float(rate)),
+                                           overlap=self.overlap)
+            return super().transcribe(audio_file)
+
+    samples = build_dictation(args.seconds)
+    audio_file = CaptureRingBuffer.samples_to_wav(samples, RATE)
+    transcriber = SimulatedTranscriber(args.base_latency, args.rtf, word_interval=1.0 / args.words_per_second)
+    expected = transcriber.words(0.0, len(samples) / RATE)
+
+    started = time.perf_counter()
+    transcriber.request_transcription(audio_file)
+    serial = time.perf_counter() - started
+    print(f"\n=== Ditado de {len(samples) / RATE:.0f} s | arquivo inteiro (serial): {serial:.2f} s ===")
+    print(f"{'workers':<8} {'segmentos':>10} {'tempo (s)':>10} {'speedup':>8} {'texto ok':>9}")
+    for workers in args.workers:
+        chunked = OffsetChunkedTranscriber(None, log, transcriber=transcriber, max_workers=workers, min_duration=0)
+        started = time.perf_counter()
+        text = chunked.transcribe(audio_file)
+        elapsed = time.perf_counter() - started
+        print(f"{workers:<8d} {chunked.last_metrics['segments']:>10d} {elapsed:10.2f} {serial / elapsed:7.1f}x "
+              f"{'sim' if text == expected else 'NÃO':>9}")
+
+
+# === incremental: hipóteses parciais durante a fala ===
+
+def speech_regions(samples):
+    """Falas de referência do ditado, usadas pelo transcritor falso."""
+    from modules.audio.vad import create_vad, detect_segments
+    from modules.audio.vad.offline import estimate_threshold
+
+    vad = create_vad('multi', RATE, frame_size=480)
+    vad.threshold = estimate_threshold(samples, vad)
+    return detect_segments(samples, vad)[1]
+
+
+def capture_realtime(buffer, samples):
+    """Escreve o ditado no anel em tempo real, como o callback de captura."""
+    started = time.perf_counter()
+    for position in range(0, len(samples), CHUNK):
+        buffer.write(samples[position:position + CHUNK])
+        delay = started + (position + CHUNK) / float(RATE) - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_incremental(args):
+    """Compara o tempo entre o fim da fala e o texto pronto: transcrição em lote vs incremental."""
+    from modules.open_ai.stt.incremental_transcriber import IncrementalTranscriber
+
+    samples = build_dictation(args.seconds, tail_silence=args.trailing_silence, pauses=False)
+    transcriber = SimulatedTranscriber(args.base_latency, args.rtf, speech=speech_regions(samples))
+
+    buffer = CaptureRingBuffer(len(samples) / RATE + 1, RATE)
+    partials = []
+    incremental = IncrementalTranscriber(transcriber, step=args.step,
+                                         on_partial=lambda text: partials.append(len(text.split())))
+    incremental.start(buffer, 0)
+    writer = threading.Thread(target=capture_realtime, args=(buffer, samples))
+    writer.start()
+    writer.join()
+
+    started = time.perf_counter()
+    incremental_text = incremental.finalize()
+    incremental_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    batch_text = transcriber.request_transcription(buffer.wav_view())
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    metrics = incremental.last_metrics
+    print(f"\n=== Ditado de {len(samples) / RATE:.1f} s capturado em tempo real ===")
+    print(f"{'modo':<14} {'fim da fala -> texto (ms)':>26}")
+    print(f"{'lote':<14} {batch_ms:26.0f}")
+    print(f"{'incremental':<14} {incremental_ms:26.0f}")
+    print(f"\nHipóteses parciais: {metrics['partials']} (palavras: {partials}) | trechos confirmados: "
+          f"{metrics['commits']} | cauda final: {metrics['tail_seconds']:.2f} s"
+          f"{' (parcial reaproveitada)' if metrics['reused_partial'] else ''}")
+    print(f"Requisições: {transcriber.requests} | texto igual ao do lote: {'sim' if incremental_text == batch_text else 'NÃO'}")
+    if incremental_text != batch_text:
+        print(f"  lote: {batch_text}\n  incr: {incremental_text}")
+
+
+# === upload: recorte e compressão do áudio enviado ===
+
+def run_upload(args):
+    """Compara tamanho, tempo de codificação e tempo estimado de envio do WAV original e das variantes."""
+    from modules.audio.pcm import resample
+    from modules.audio.vad.offline import load_wav_fixture
+    from modules.open_ai.stt.upload_encoder import UploadEncoder
+
+    if args.fixtures:
+        inputs = []
+        for path in args.fixtures:
+            samples, rate = load_wav_fixture(path)
+            inputs.append((os.path.basename(path), resample(samples, rate, RATE)))
+    else:
+        inputs = [("sintético", build_dictation(args.seconds, lead_silence=1.5, tail_silence=2.0))]
+
+    variants = [
+        ("wav 16k", UploadEncoder(codec='wav', trim_silence=False)),
+        ("wav 16k + recorte", UploadEncoder(codec='wav')),
+        ("flac 16k + recorte", UploadEncoder(codec='flac')),
+        ("opus 16k + recorte", UploadEncoder(codec='opus'))
+    ]
+    # Aquece imports (scipy/soundfile) para não contar a carga na primeira variante
+    for _, encoder in variants:
+        encoder.encode(CaptureRingBuffer.samples_to_wav(np.zeros(RATE, dtype=np.int16), RATE))
+
+    def upload_ms(size):
+        return size * 8 / (args.uplink_kbps * 1000) * 1000
+
+    for name, samples in inputs:
+        original = CaptureRingBuffer.samples_to_wav(samples, RATE)
+        size = len(original.getbuffer())
+        print(f"\n=== {name} ({len(samples) / RATE:.1f} s, WAV 24 kHz: {size} bytes, envio estimado {upload_ms(size):.0f} ms) ===")
+        print(f"{'variante':<20} {'bytes':>10} {'economia':>9} {'áudio (s)':>10} {'cod. (ms)':>10} {'envio (ms)':>12}")
+        for label, encoder in variants:
+            _, metrics = encoder.encode(original)
+            label += "" if metrics['codec'] in label else " -> wav"
+            print(f"{label:<20} {metrics['encoded_bytes']:10d} {metrics['saved_ratio'] * 100:8.0f}% "
+                  f"{metrics['trimmed_duration']:10.2f} {metrics['encode_ms']:10.1f} "
+                  f"{upload_ms(metrics['encoded_bytes']):12.0f}")
+
+
+# === pipeline: pipeline de STT montado a cada gravação vs persistente ===
+
+class InstantClient:
+    """Cliente falso que responde na hora, para medir apenas o custo do próprio pipeline."""
+
+    def __init__(self):
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._transcribe))
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+
+    @staticmethod
+    def _transcribe(model, file):
+        return SimpleNamespace(text="texto transcrito")
+
+    @staticmethod
+    def _complete(model, temperature, messages):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=messages[-1]["content"]))])
+
+
+def run_pipeline(args):
+    """Mede o custo por gravação do pipeline de STT montado a cada vez vs reaproveitado."""
+    from modules.open_ai.stt.chunked_transcriber import ChunkedTranscriber
+    from modules.open_ai.stt.openai_transcriber import OpenAITranscriber
+    from modules.open_ai.stt.spellcheck_transcriber import SpellcheckTranscriber
+    from modules.open_ai.stt.stt import SpeechToText
+
+    def legacy_transcribe(audio_file):
+        """Caminho antigo: monta transcritor, divisão em partes e correção a cada gravação."""
+        transcriber = OpenAITranscriber(client, log)
+        chunked = ChunkedTranscriber(client, log, transcriber=transcriber)
+        if chunked.should_split(audio_file):
+            transcriber = chunked
+        text = transcriber.transcribe(audio_file)
+        return SpellcheckTranscriber(client, log, task_manager).transcribe(text)
+
+    client = InstantClient()
+    task_manager = PromptTaskManager()
+    stt = SpeechToText(client, log, task_manager)
+    mode = "Com Correção Ortográfica"
+    stt.get_pipeline(mode)
+
+    print("\n=== Montagem por gravação (sem áudio) ===")
+    build = time_per_call(lambda: (SpeechToText(client, log, task_manager),
+                                   ChunkedTranscriber(client, log, transcriber=OpenAITranscriber(client, log)),
+                                   SpellcheckTranscriber(client, log, task_manager)), args.runs)
+    reuse = time_per_call(lambda: stt.get_pipeline(mode), args.runs)
+    print(f"{'caminho':<22} {'us/gravação':>12}")
+    print(f"{'montado a cada vez':<22} {build:12.1f}")
+    print(f"{'pipeline persistente':<22} {reuse:12.1f}")
+
+    audio_file = CaptureRingBuffer.samples_to_wav(synthetic_utterances(RATE, count=2), RATE)
+    print(f"\n=== Gravação de {audio_file.duration:.1f} s de ponta a ponta (cliente instantâneo) ===")
+    legacy_transcribe(audio_file)  # aquece scipy/soundfile antes de medir
+    legacy = time_per_call(lambda: legacy_transcribe(audio_file), args.utterances) / 1000
+    persistent = time_per_call(lambda: stt.get_pipeline(mode).transcribe(audio_file), args.utterances) / 1000
+    print(f"{'caminho':<22} {'ms/gravação':>12}")
+    print(f"{'montado a cada vez':<22} {legacy:12.2f}")
+    print(f"{'pipeline persistente':<22} {persistent:12.2f}")
+    print(f"\nPipelines montados no modo persistente: {stt.builds}")
+
+
+# === cache: cache de transcrições ===
+
+class SlowClient:
+    """Cliente falso com a latência de uma requisição de transcrição à API."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = 0
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._transcribe))
+
+    def _transcribe(self, model, file):
+        self.requests += 1
+        time.sleep(self.latency)
+        return SimpleNamespace(text=f"o projeto pulse usa o brick ({file.name})")
+
+
+def run_cache(args):
+    """Mede reenvios, correções e reinícios com o cache de transcrições."""
+    from modules.open_ai.stt.pipeline import STTPipeline, MODE_ONLINE, MODE_SPELLCHECK
+    from modules.open_ai.stt.transcription_cache import TranscriptionCache
+
+    client = SlowClient(args.latency)
+    task_manager = PromptTaskManager()
+    recordings = synthetic_recordings(args.recordings)
+
+    def ms_per_recording(pipeline):
+        return time_per_call(lambda: [pipeline.transcribe(audio_file) for audio_file in recordings], 1) / 1000 / len(recordings)
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = TranscriptionCache(max_entries=64, disk_dir=disk_dir)
+        online = STTPipeline(client, log, task_manager, mode=MODE_ONLINE, cache=cache)
+        spellcheck = STTPipeline(client, log, task_manager, mode=MODE_SPELLCHECK, cache=cache)
+
+        def restarted():
+            """Reinício do aplicativo: memória vazia, entradas lidas do disco."""
+            return STTPipeline(client, log, task_manager, mode=MODE_ONLINE,
+                               cache=TranscriptionCache(max_entries=64, disk_dir=disk_dir))
+
+        print(f"\n{'etapa':<34} {'ms/gravação':>12} {'requisições':>12}")
+        steps = [
+            ("primeira transcrição", lambda: online),
+            ("reenvio da mesma gravação", lambda: online),
+            ("correção ortográfica (mesmo áudio)", lambda: spellcheck),
+            ("após reinício (cache em disco)", restarted),
+        ]
+        for label, pipeline in steps:
+            before = client.requests
+            elapsed = ms_per_recording(pipeline())
+            print(f"{label:<34} {elapsed:12.1f} {client.requests - before:>12}")
+
+        metrics = cache.get_metrics()
+        print(f"\nCache: {metrics['lookups']} consultas, taxa de acerto {metrics['hit_rate']:.0%} "
+              f"({metrics['hits']} memória, {metrics['disk_hits']} disco, {metrics['misses']} faltas)")
+        print(f"Acerto em memória (hash do PCM + consulta): {ms_per_recording(online):.2f} ms por gravação de "
+              f"{recordings[0].duration:.1f} s")
+
+
+# === terms: corretor local de termos ===
+
+FILLER = ("hoje vamos revisar o relatório da equipe e combinar os próximos passos do projeto "
+          "antes da reunião com o cliente na semana que vem").split()
+SYLLABLES = ["ka", "lo", "mi", "ru", "te", "sa", "vo", "ni", "pe", "da", "zu", "fi", "go", "ber", "tran", "quel"]
+TERM_SAMPLES = [
+    "Vamos subir no clowd da azure e no google cloud amanhã.",
+    "O projeto pulse usa o brick e o quartz.",
+    "A migração para a amazon web services e a aws termina hoje.",
+    "Hoje vamos conversar sobre o tempo e a reunião de amanhã.",
+    "Meu pulso está alto depois da corrida.",
+]
+
+
+def synthetic_terms(count, seed=0):
+    """Gera termos pronunciáveis distintos (2 a 5 sílabas)."""
+    rng = random.Random(seed)
+    terms = set()
+    while len(terms) < count:
+        terms.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))).capitalize())
+    return sorted(terms)
+
+
+def misspell(term, rng):
+    """Troca uma letra do termo, simulando um erro de transcrição."""
+    word = term.lower()
+    position = rng.randrange(1, len(word))
+    return word[:position] + rng.choice("aeioukstr") + word[position + 1:]
+
+
+def run_terms(args):
+    """Mede a latência do corretor local com a lista real e com listas grandes de termos."""
+    from modules.open_ai.stt.term_corrector import TermCorrector, parse_terms
+
+    corrector = TermCorrector(parse_terms(PromptTaskManager().prompt))
+    print(f"\n=== Lista real ({len(corrector)} termos) ===")
+    for transcript in TERM_SAMPLES:
+        corrector._cache.clear()
+        text, report = corrector.correct(transcript)
+        warm = min(corrector.correct(transcript)[1]['elapsed_us'] for _ in range(20))
+        outcome = "revisão (LLM)" if report['needs_review'] else "local"
+        print(f"{outcome:<14} frio {report['elapsed_us']:7.0f} us | cache {warm:5.0f} us | {text}")
+
+    print(f"\n{'termos':>8} {'índice (ms)':>12} {'frio (us/texto)':>16} {'cache (us/texto)':>17} {'corrigidos':>11}")
+    for size in args.sizes:
+        terms = synthetic_terms(size)
+        corrector = TermCorrector(terms)
+        rng = random.Random(1)
+        texts = []
+        for _ in range(args.transcripts):
+            words = [rng.choice(FILLER) for _ in range(30)]
+            for _ in range(2):
+                words.insert(rng.randrange(len(words)), misspell(rng.choice(terms), rng))
+            texts.append(" ".join(words))
+
+        started = time.perf_counter()
+        fixed = sum(len(corrector.correct(text)[1]['corrections']) for text in texts)
+        cold = (time.perf_counter() - started) / len(texts) * 1e6
+        warm = time_per_call(lambda: [corrector.correct(text) for text in texts], 1) / len(texts)
+        print(f"{size:>8} {corrector.build_ms:12.0f} {cold:16.0f} {warm:17.0f} {fixed:>5}/{2 * len(texts):<5}")
+
+
+# === whisper: Whisper local carregado por gravação, pool residente e worker isolado ===
+
+def measure_stalls(work):
+    """
+    Roda `work` enquanto uma thread simula o loop do Tk/callback de áudio com ticks de 10 ms.
+
+    Returns:
+        tuple: (tempo do trabalho em s, atraso máximo de tick em ms, p99 em ms)
+    """
+    delays = []
+    done = threading.Event()
+
+    def ticker():
+        expected = time.perf_counter() + TICK
+        while not done.is_set():
+            time.sleep(TICK)
+            now = time.perf_counter()
+            delays.append(max(0.0, now - expected) * 1000)
+            expected = now + TICK
+
+    thread = threading.Thread(target=ticker, daemon=True)
+    thread.start()
+    started = time.perf_counter()
+    work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    thread.join()
+    return elapsed, max(delays, default=0.0), float(np.percentile(delays, 99)) if delays else 0.0
+
+
+def run_whisper(args):
+    """Compara o Whisper carregado por gravação, o pool residente e o worker isolado (atrasos do loop principal)."""
+    if not has_whisper():
+        return
+    import whisper
+    from modules.audio.vad.offline import load_wav_fixture
+    from modules.open_ai.stt.local_transcriber import LocalTranscriber
+    from modules.open_ai.stt.stt_worker import STTWorkerPool
+    from modules.open_ai.stt.whisper_pool import WhisperModelPool, resident_memory_mb
+
+    def legacy_transcribe(audio_file):
+        """Caminho antigo: carrega o modelo a cada gravação e lê o WAV inteiro (com cabeçalho) como amostras."""
+        local_model = whisper.load_model(args.model)
+        audio_file.seek(0)
+        audio_data = np.frombuffer(audio_file.read(), np.int16).astype(np.float32) / 32768.0
+        return local_model.transcribe(audio_data, fp16=False).get("text", "")
+
+    if args.fixtures:
+        recordings = [CaptureRingBuffer.samples_to_wav(*load_wav_fixture(path)) for path in args.fixtures]
+    else:
+        recordings = synthetic_recordings(args.runs)
+
+    started = time.perf_counter()
+    in_process = WhisperModelPool(args.model)
+    in_process.warm_up()
+    in_process.ready.wait()
+    warm_up = time.perf_counter() - started
+    isolated = STTWorkerPool(args.model)
+    isolated.start()
+    isolated.ready.wait()
+
+    print(f"\n=== {len(recordings)} gravações | warm-up do pool residente em segundo plano: {warm_up:.2f} s ===")
+    print(f"{'modo':<22} {'tempo (s)':>10} {'atraso máx (ms)':>16} {'atraso p99 (ms)':>16}")
+    modes = [("load_model por gravação", legacy_transcribe)]
+    for label, pool in (("pool no processo", in_process), ("worker isolado", isolated)):
+        modes.append((label, LocalTranscriber(None, log, pool=pool).transcribe))
+    for label, transcribe in modes:
+        elapsed, worst, p99 = measure_stalls(lambda: [transcribe(audio_file) for audio_file in recordings])
+        print(f"{label:<22} {elapsed:10.2f} {worst:16.1f} {p99:16.1f}")
+
+    metrics = in_process.get_metrics()
+    model_mb = "?" if metrics['model_rss_mb'] is None else f"{metrics['model_rss_mb']:.0f}"
+    rss = resident_memory_mb()
+    print(f"\nCarga: {metrics['load_seconds']:.2f} s | RTF médio: {metrics['mean_rtf']:.2f} | "
+          f"Memória do modelo: {model_mb} MB | RSS atual: {'?' if rss is None else f'{rss:.0f}'} MB")
+    metrics = isolated.get_metrics()
+    print(f"Fila do worker: {metrics['completed']} concluídos, espera média {metrics['mean_wait_ms'] or 0.0:.1f} ms, "
+          f"processamento médio {metrics['mean_processing_ms'] or 0.0:.0f} ms")
+    isolated.shutdown()
+
+
+def main():
+    """Benchmarks do reconhecimento de fala (STT)."""
+    parser = argparse.ArgumentParser(description="Benchmarks do STT")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    chunked = commands.add_parser("chunked", help="Transcrição em partes paralelas variando o número de workers")
+    chunked.add_argument("--seconds", type=float, default=300.0, help="Duração do ditado sintético")
+    chunked.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8])
+    chunked.add_argument("--base-latency", type=float, default=0.3, help="Latência fixa simulada por requisição (s)")
+    chunked.add_argument("--rtf", type=float, default=0.02, help="Segundos de processamento simulado por segundo de áudio")
+    chunked.add_argument("--words-per-second", type=float, default=3.0, help="Ritmo de fala simulado (palavras por segundo)")
+    chunked.set_defaults(run=run_chunked)
+
+    incremental = commands.add_parser("incremental", help="Fim da fala -> texto: lote contra transcrição incremental")
+    incremental.add_argument("--seconds", type=float, default=15.0, help="Duração do ditado sintético (tempo real)")
+    incremental.add_argument("--base-latency", type=float, default=0.4, help="Latência fixa simulada por requisição (s)")
+    incremental.add_argument("--rtf", type=float, default=0.05, help="Segundos de processamento simulado por segundo de áudio")
+    incremental.add_argument("--step", type=float, default=1.0, help="Intervalo entre hipóteses parciais (s)")
+    incremental.add_argument("--trailing-silence", type=float, default=0.6, help="Silêncio até o endpointing encerrar o turno (s)")
+    incremental.set_defaults(run=run_incremental)
+
+    upload = commands.add_parser("upload", help="Recorte e compressão do áudio enviado à API")
+    upload.add_argument("--fixtures", nargs="*", help="Arquivos WAV (padrão: ditado sintético)")
+    upload.add_argument("--seconds", type=float, default=60.0, help="Duração do ditado sintético")
+    upload.add_argument("--uplink-kbps", type=float, default=1000.0, help="Banda de subida usada na estimativa de envio")
+    upload.set_defaults(run=run_upload)
+
+    pipeline = commands.add_parser("pipeline", help="Pipeline de STT montado a cada gravação contra persistente")
+    pipeline.add_argument("--runs", type=int, default=2000, help="Repetições da medida de montagem")
+    pipeline.add_argument("--utterances", type=int, default=50, help="Gravações transcritas de ponta a ponta")
+    pipeline.set_defaults(run=run_pipeline)
+
+    cache = commands.add_parser("cache", help="Reenvios, correções e reinícios com o cache de transcrições")
+    cache.add_argument("--recordings", type=int, default=5, help="Gravações distintas")
+    cache.add_argument("--latency", type=float, default=0.5, help="Latência simulada da API (s)")
+    cache.set_defaults(run=run_cache)
+
+    terms = commands.add_parser("terms", help="Latência do corretor local de termos")
+    terms.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 50000], help="Tamanhos das listas sintéticas")
+    terms.add_argument("--transcripts", type=int, default=100, help="Textos corrigidos por tamanho")
+    terms.set_defaults(run=run_terms)
+
+    whisper = commands.add_parser("whisper", help="Whisper local: por gravação, pool residente e worker isolado")
+    whisper.add_argument("--fixtures", nargs="*", help="Arquivos WAV (padrão: áudio sintético)")
+    whisper.add_argument("--model", default="base", help="Tamanho do modelo Whisper")
+    whisper.add_argument("--runs", type=int, default=3, help="Gravações sintéticas transcritas em cada modo")
+    whisper.set_defaults(run=run_whisper)
+
+    args = parser.parse_args()
+    use_synthetic_audio(0)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
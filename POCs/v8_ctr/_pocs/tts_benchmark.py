@@ -0,0 +1,649 @@
+import argparse
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import logging
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_common import (RATE, CHAT_TRANSCRIPT, FakeChatClient, FakeSpeechClient, use_synthetic_audio,
+                              wait_playback)
+
+# Configuração do logger
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+SHORT_TEXT = ("Claro, vou verificar isso para você agora mesmo. O relatório da semana passada mostra um aumento "
+              "de vendas na região sul. Quer que eu envie um resumo por e-mail para a equipe")
+LONG_TEXT = ("Certo, já estou verificando. Encontrei três arquivos com esse nome na pasta de documentos. "
+             "O mais recente foi alterado hoje de manhã e tem cerca de dois megabytes. "
+             "O segundo é da semana passada e parece ser um rascunho. O terceiro está vazio. "
+             "Quer que eu abra o mais recente ou prefere que eu compare as versões antes? "
+             "Também posso enviar uma cópia por e-mail para você revisar com calma mais tarde.")
+
+
+def make_standard_tts(client, **kwargs):
+    """StandardTTS em streaming com o cliente falso e o stream de saída já aberto."""
+    from modules.open_ai.tts.tts_standard import StandardTTS
+
+    tts = StandardTTS(streaming=True, **kwargs)
+    tts.client_openai = client
+    tts.audio_stream.ensure_stream()
+    return tts
+
+
+def fresh_recording(tts):
+    """Gravação do dispositivo de saída sintético, esvaziada antes da medida."""
+    recording = tts.audio_stream.audio_context.backend.recordings[-1]
+    recording.data.clear()
+    recording.blocks.clear()
+    recording.first_sound_at = None
+    return recording
+
+
+# === streaming: primeiro som com PCM em streaming ===
+
+def run_streaming(args):
+    """Mede o tempo até o primeiro som do StandardTTS em streaming PCM contra a espera pelo corpo inteiro."""
+    use_synthetic_audio(1.0)
+    # Pedaços da rede com tamanho ímpar, sem respeitar a fronteira das amostras
+    client = FakeSpeechClient(args.ttfb, args.realtime_factor, piece_bytes=1501)
+    tts = make_standard_tts(client)
+    recording = fresh_recording(tts)
+
+    started = time.perf_counter()
+    tts.speak_response(SHORT_TEXT)
+    first_sound = (recording.first_sound_at - started) * 1000
+    # Caminho anterior (AAC): o primeiro som só depois do corpo inteiro da primeira sentença (sem contar a decodificação)
+    full_body = (client.responses[0][1].completed_at - started) * 1000
+    sent = sum(len(response.data) // 2 for _, response in client.responses)
+    wait_playback(tts.audio_stream)
+    played = int(np.count_nonzero(recording.samples()))
+    tts.cleanup()
+
+    print(f"\nSentenças: {client.requests} | TTFB simulado {args.ttfb * 1000:.0f} ms, "
+          f"servidor {args.realtime_factor:.1f}x tempo real")
+    print(f"Primeiro som (streaming PCM):           {first_sound:7.0f} ms")
+    print(f"Corpo completo da 1ª sentença (AAC):     {full_body:7.0f} ms  (+ decodificação ffmpeg)")
+    print(f"Amostras reproduzidas: {played}/{sent} ({played / sent:.1%})")
+
+
+# === decode: decodificação no processo contra pydub/ffmpeg ===
+
+def speech_like(seconds, seed=0):
+    """Áudio int16 com harmônicos e envelope de fala."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * RATE)) / RATE
+    phase = 2 * np.pi * np.cumsum(140 * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 10)) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2)
+    return np.clip(voiced * 6000 + rng.standard_normal(len(t)) * 50, -32768, 32767).astype(np.int16)
+
+
+def encode(samples, format):
+    """Codifica as amostras no formato pedido (como a API devolveria)."""
+    from modules.audio.capture_buffer import build_wav_header
+
+    if format == 'pcm':
+        return samples.tobytes()
+    if format == 'wav':
+        return bytes(build_wav_header(len(samples), RATE, 1)) + samples.tobytes()
+    import soundfile as sf
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, RATE, format={'mp3': 'MP3', 'flac': 'FLAC', 'opus': 'OGG'}[format],
+             subtype='OPUS' if format == 'opus' else None)
+    return buffer.getvalue()
+
+
+def legacy_decode(data, format):
+    """Caminho anterior: pydub (ffmpeg fora do WAV), array de amostras, cópia float32 e normalização."""
+    from pydub import AudioSegment
+    audio_segment = AudioSegment.from_file(io.BytesIO(data), format=format)
+    audio_segment = audio_segment.set_frame_rate(RATE).set_channels(1)
+    samples = np.array(audio_segment.get_array_of_samples(), dtype=np.int16)
+    float_samples = samples.astype(np.float32)
+    max_value = np.max(np.abs(float_samples))
+    if max_value > 0:
+        float_samples = float_samples / max_value
+    return float_samples
+
+
+def ms_per_audio_second(function, seconds, repeats):
+    """Melhor tempo de `repeats` execuções, em ms por segundo de áudio."""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000 / seconds
+
+
+def run_decode(args):
+    """Compara o custo de decodificação por segundo de áudio: pydub/ffmpeg contra a decodificação no processo."""
+    from modules.audio.decode import decode_audio
+
+    samples = speech_like(args.seconds)
+    has_ffmpeg = shutil.which('ffmpeg') is not None
+    print(f"\nÁudio: {args.seconds:.1f} s a {RATE} Hz | ffmpeg {'disponível' if has_ffmpeg else 'não encontrado'}")
+    print(f"{'formato':<8} {'tamanho (KB)':>13} {'anterior (ms/s)':>16} {'no processo (ms/s)':>19} {'erro máx.':>10}")
+    # AAC (formato anterior do tts-1) não tem codificador no libsndfile e continua no ffmpeg
+    for format in ('pcm', 'wav', 'flac', 'mp3', 'opus'):
+        data = encode(samples, format)
+        new = decode_audio(data, format, rate=RATE, normalize=True)
+        new_ms = ms_per_audio_second(lambda: decode_audio(data, format, rate=RATE, normalize=True), args.seconds, args.repeats)
+
+        old_ms = "-"
+        error = "-"
+        if format == 'wav' or (has_ffmpeg and format != 'pcm'):
+            legacy_format = 'ogg' if format == 'opus' else format
+            old = legacy_decode(data, legacy_format)
+            old_ms = f"{ms_per_audio_second(lambda: legacy_decode(data, legacy_format), args.seconds, args.repeats):.3f}"
+            count = min(len(old), len(new))
+            error = f"{np.max(np.abs(old[:count] - new[:count])):.1e}"
+        print(f"{format:<8} {len(data) / 1024:13.1f} {old_ms:>16} {new_ms:19.3f} {error:>10}")
+
+
+# === segmenter: divisão do texto em trechos ===
+
+# Respostas típicas do assistente (português e inglês)
+CORPUS = [
+    "Claro! A temperatura agora em São Paulo é de 23.5 graus, com umidade de 68%. Para amanhã a previsão é de chuva "
+    "fraca no fim da tarde, então leve um guarda-chuva se for sair depois das 17h.",
+    "O Sr. Almeida confirmou a reunião com a Dra. Beatriz para quinta-feira. A pauta inclui o orçamento de R$ 1.250.000,00, "
+    "a contratação de dois engenheiros e a revisão do cronograma do projeto B.R.I.C.K. Quer que eu envie o convite?",
+    "Você pode baixar o instalador em https://www.python.org/downloads/release/python-3120/. Depois de instalar, abra o "
+    "terminal e rode python --version para conferir a versão 3.12.0.",
+    "Captura de tela realizada.",
+    "Sim.",
+    "Passos para configurar:\n1. Abra as configurações.\n2. Vá em Áudio e escolha o microfone.\n3. Clique em Salvar.\n"
+    "Pronto, agora o reconhecimento de voz deve funcionar normalmente.",
+    "Entendi... vou verificar isso para você. O arquivo relatorio_v2.1.xlsx foi salvo na pasta Documentos às 14:32.",
+    "Sure! The meeting with Mr. Smith is at 3 p.m. today, e.g. right after lunch. He mentioned that the budget "
+    "increased by 4.5% compared to last quarter, so we should review the numbers in section No. 7 before the call.",
+    "Hmm, não encontrei nenhum evento com esse nome na sua agenda; talvez ele tenha sido criado em outra conta, ou "
+    "quem sabe o convite ainda não foi aceito — você quer que eu procure nos e-mails recebidos nas últimas duas semanas, "
+    "incluindo a pasta de spam, as mensagens arquivadas e também os convites pendentes do calendário compartilhado da equipe?",
+    "O valor de pi é aproximadamente 3.14159. Já o número de Euler vale cerca de 2.71828. Ambos aparecem o tempo todo "
+    "em física, engenharia e estatística, por exemplo na distribuição normal e no cálculo de juros compostos.",
+    "Olá! Tudo bem? Em que posso ajudar hoje?",
+    "Mandei o resumo para contato@empresa.com.br e para o time. Se precisar de mais detalhes, veja a pág. 12 do relatório "
+    "ou o art. 5 do contrato. Qualquer coisa, é só me chamar.",
+    "Here is what I found: the library supports Python 3.8 and later, the latest release is v2.4.1, and the docs are "
+    "at docs.example.org/guide. Installation is a single pip command. Let me know if you want me to run it for you.",
+    LONG_TEXT,
+]
+
+# Trechos que não podem ser quebrados em requisições diferentes
+PROTECTED = re.compile(r"https?://\S+[\w/]|\b[\w.-]+@[\w-]+(?:\.[\w-]+)+|\b\d+(?:[.,]\d+)+|\b(?:Sr|Dra|Mr|No|pág|art)\. \w+|"
+                       r"\bp\.m\.|\be\.g\.|\b(?:[A-Z]\.){2,}|\b[\w-]+\.\w+\.\w+")
+
+
+def legacy_split(text):
+    """Divisão anterior do StandardTTS: split('.') e um ponto acrescentado a cada fragmento."""
+    return [s.strip() + "." for s in text.split('.') if s.strip()]
+
+
+def broken_tokens(text, chunks):
+    """Conta os trechos protegidos (decimais, URLs, abreviações) que não aparecem inteiros em nenhum pedaço."""
+    return sum(1 for token in PROTECTED.findall(text) if not any(token in chunk for chunk in chunks))
+
+
+def run_segmenter(args):
+    """Compara a divisão anterior (split('.')) com o segmentador de frases sobre um corpus de respostas."""
+    from modules.open_ai.tts.sentence_segmenter import SentenceSegmenter, split_sentences
+
+    segmenter = SentenceSegmenter(first_max_chars=args.first_max, max_chars=args.max_chars)
+    print(f"\n=== Corpus ({len(CORPUS)} respostas, {sum(len(t) for t in CORPUS)} caracteres) ===")
+    print(f"{'divisão':<22} {'1º médio':>9} {'1º máx.':>9} {'requisições':>12} {'maior trecho':>13} {'quebras':>10}")
+    for name, split in (("split('.') anterior", legacy_split), ("frases (sem agrupar)", split_sentences),
+                        ("segmentador", segmenter.split)):
+        chunks = [split(text) for text in CORPUS]
+        first = [len(parts[0]) for parts in chunks]
+        longest = max(len(part) for parts in chunks for part in parts)
+        broken = sum(broken_tokens(text, parts) for text, parts in zip(CORPUS, chunks))
+        print(f"{name:<22} {np.mean(first):9.0f} {max(first):9d} {sum(map(len, chunks)):12d} {longest:13d} {broken:10d}")
+
+    if args.verbose:
+        for text in CORPUS:
+            print()
+            for chunk in segmenter.split(text):
+                print(f"  [{len(chunk):3d}] {chunk}")
+
+
+# === prefetch: síntese antecipada dos trechos seguintes ===
+
+def silent_gaps(samples, min_seconds=0.02):
+    """Pausas (silêncio exato) entre o primeiro e o último som reproduzidos."""
+    sound = np.flatnonzero(samples != 0)
+    return [step / RATE for step in np.diff(sound) if step / RATE >= min_seconds] if len(sound) else []
+
+
+def speak_with_lookahead(lookahead, args, stop_after=None):
+    """Fala o texto com o look-ahead pedido e mede pausas audíveis, requisições e parada."""
+    from modules.open_ai.tts.sentence_segmenter import SentenceSegmenter
+    from modules.open_ai.tts.tts_cache import TTSAudioCache
+
+    client = FakeSpeechClient(args.ttfb, args.realtime_factor, chars_per_second=30.0,
+                              slow_index=args.slow_index, slow_ttfb=args.slow_ttfb)
+    # Cache vazio a cada execução: o mesmo texto é falado em todas
+    tts = make_standard_tts(client, lookahead=lookahead, cache=TTSAudioCache())
+    # Trechos menores que o padrão, para a resposta curta do teste render vários trechos
+    tts.segmenter = SentenceSegmenter(first_max_chars=40, max_chars=80)
+    recording = fresh_recording(tts)
+
+    thread = threading.Thread(target=tts.speak_response, args=(LONG_TEXT,), daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    stop_ms = None
+    if stop_after is not None:
+        time.sleep(stop_after)
+        stopped_at = time.perf_counter()
+        tts.stop_speaking()
+        stop_ms = (time.perf_counter() - stopped_at) * 1000
+    thread.join()
+    wait_playback(tts.audio_stream)
+
+    metrics = tts.scheduler.get_metrics()
+    result = {
+        'chunks': metrics['chunks'],
+        'requests': client.requests,
+        'gaps': silent_gaps(recording.samples()),
+        'scheduler_gaps': metrics['gaps'],
+        'elapsed': time.perf_counter() - started,
+        'stop_ms': stop_ms,
+    }
+    if stop_after is not None:
+        # Requisições abertas depois da parada e tempo até a última resposta em andamento fechar
+        result['requests_after_stop'] = sum(1 for opened, _ in client.responses if opened > stopped_at)
+        closes = [response.closed_at for _, response in client.responses if response.closed_at]
+        result['close_ms'] = (max(closes) - stopped_at) * 1000 if closes else 0.0
+    tts.cleanup()
+    return result
+
+
+def run_prefetch(args):
+    """Compara look-ahead 0..3 (pausas audíveis e requisições) e mede o cancelamento ao parar."""
+    use_synthetic_audio(1.0)
+    print(f"\nTTFB {args.ttfb * 1000:.0f} ms, servidor {args.realtime_factor:.1f}x tempo real, "
+          f"trecho {args.slow_index + 1} com TTFB de {args.slow_ttfb:.1f} s")
+    print(f"{'look-ahead':>10} {'trechos':>8} {'pausas':>7} {'soma (ms)':>10} {'máx. (ms)':>10} {'medida (ms)':>12} {'duração (s)':>12}")
+    for lookahead in args.lookaheads:
+        result = speak_with_lookahead(lookahead, args)
+        gaps = result['gaps']
+        print(f"{lookahead:>10} {result['chunks']:>8} {len(gaps):>7} {sum(gaps) * 1000:10.0f} "
+              f"{max(gaps, default=0) * 1000:10.0f} {sum(result['scheduler_gaps']) * 1000:12.0f} {result['elapsed']:12.1f}")
+
+    print("\n=== Parada no meio da fala (look-ahead 2) ===")
+    result = speak_with_lookahead(2, args, stop_after=1.5)
+    print(f"stop_speaking: {result['stop_ms']:.0f} ms | requisições: {result['requests']} de {result['chunks']} trechos "
+          f"| abertas após a parada: {result['requests_after_stop']} | streams fechados em {result['close_ms']:.0f} ms")
+
+
+# === cache: cache de áudio sintetizado ===
+
+# Frases repetidas pelo assistente e respostas únicas, na proporção de uma sessão típica
+REPEATED = ["Captura de tela realizada.", "Processando áudio...", "Desculpe, não consegui obter uma resposta."]
+UNIQUE = "A reunião de amanhã foi remarcada para as {} horas, na sala {}."
+
+
+def first_audio_ms(tts, text):
+    """Fala o texto e retorna o tempo até o primeiro bloco entrar no buffer de saída (ms)."""
+    tts.speak_response(text)
+    wait_playback(tts.audio_stream, settle=0.0)
+    return tts.first_audio_latency * 1000
+
+
+def run_cache(args):
+    """Mede a latência até o primeiro áudio sem cache, com acerto em memória e em disco, e a taxa de acertos."""
+    use_synthetic_audio(10.0)  # Reprodução acelerada: a medida é até o áudio entrar no buffer
+    from modules.open_ai.tts.tts_cache import TTSAudioCache
+
+    disk_dir = tempfile.mkdtemp(prefix="tts_cache_")
+    phrase = REPEATED[0]
+    cache = TTSAudioCache(disk_dir=disk_dir)
+    tts = make_standard_tts(FakeSpeechClient(args.ttfb), cache=cache)
+
+    print(f"\n=== Tempo até o primeiro áudio: \"{phrase}\" (TTFB {args.ttfb * 1000:.0f} ms) ===")
+    rows = {'sem cache': [], 'memória': [], 'disco': []}
+    for _ in range(args.runs):
+        cache.clear()
+        shutil.rmtree(disk_dir)
+        rows['sem cache'].append(first_audio_ms(tts, phrase))
+        rows['memória'].append(first_audio_ms(tts, phrase))
+        cache.clear()
+        rows['disco'].append(first_audio_ms(tts, phrase))
+    for name, values in rows.items():
+        print(f"{name:<10} mediana {np.median(values):8.1f} ms | máx. {max(values):8.1f} ms")
+    print(f"requisições: {tts.client_openai.requests} em {args.runs * 3} falas")
+    tts.cleanup()
+    shutil.rmtree(disk_dir, ignore_errors=True)
+
+    print("\n=== Aquecimento na inicialização ===")
+    disk_dir = tempfile.mkdtemp(prefix="tts_cache_")
+    tts = make_standard_tts(FakeSpeechClient(args.ttfb), cache=TTSAudioCache(disk_dir=disk_dir))
+    started = time.perf_counter()
+    synthesized = tts.prewarm_cache(REPEATED)
+    print(f"{synthesized} trechos sintetizados em {time.perf_counter() - started:.2f} s; "
+          f"segunda chamada: {tts.prewarm_cache(REPEATED)} trechos")
+    latencies = [first_audio_ms(tts, text) for text in REPEATED]
+    print(f"primeira fala de cada frase aquecida: máx. {max(latencies):.1f} ms, "
+          f"requisições durante a fala: {tts.client_openai.requests - synthesized}")
+    tts.cleanup()
+    shutil.rmtree(disk_dir, ignore_errors=True)
+
+    print(f"\n=== Sessão simulada: {args.session} falas, LRU de {args.cache_mb} MB ===")
+    cache = TTSAudioCache(max_bytes=int(args.cache_mb * 1024 * 1024))
+    tts = make_standard_tts(FakeSpeechClient(), cache=cache)
+    rng = np.random.default_rng(0)
+    for _ in range(args.session):
+        if rng.random() < 0.5:
+            text = REPEATED[rng.integers(len(REPEATED))]
+        else:
+            text = UNIQUE.format(rng.integers(8, 18), rng.integers(1, 400))
+        tts.speak_response(text)
+    metrics = cache.get_metrics()
+    print(f"acertos: {metrics['hit_rate'] * 100:.0f}% ({metrics['hits']} memória, {metrics['disk_hits']} disco, "
+          f"{metrics['misses']} falhas) | requisições: {tts.client_openai.requests}")
+    print(f"entradas: {metrics['entries']} | ocupação: {metrics['bytes'] / 1024:.0f} KB "
+          f"({metrics['audio_seconds']:.1f} s de áudio) | descartes: {metrics['evictions']}")
+    tts.cleanup()
+
+
+# === stop: parada da fala (cancelamento) ===
+
+def legacy_stop(tts):
+    """Parada anterior: sinaliza, descarta o buffer e espera em busy-wait até a fala terminar."""
+    from modules.audio.audio_context import get_audio_context
+
+    tts.stop_event.set()
+    get_audio_context().interrupt()
+    while tts.is_speaking:
+        pass
+
+
+def measure_stop(tts, text, stop_after, stop):
+    """
+    Fala em outra thread, para após `stop_after` segundos e mede a parada.
+
+    Returns:
+        dict: Tempo até o silêncio, retorno de stop, CPU da thread que parou e se houve som 100 ms após a parada
+    """
+    recording = tts.audio_stream.audio_context.backend.recordings[-1]
+    thread = threading.Thread(target=tts.speak_response, args=(text,), daemon=True)
+    thread.start()
+    time.sleep(stop_after)
+
+    cpu_started = time.thread_time()
+    stop_called = time.perf_counter()
+    stop(tts)
+    returned = time.perf_counter()
+    cpu = time.thread_time() - cpu_started
+    thread.join(timeout=15)
+    time.sleep(0.3)
+
+    # Último bloco com som entregue ao dispositivo: toca por CHUNK amostras depois de entregue
+    sounds = [(at, frames) for at, frames, has_sound in recording.blocks if has_sound and at <= returned + 0.3]
+    last_at, frames = sounds[-1] if sounds else (stop_called, 0)
+    return {
+        'silence_ms': max(0.0, last_at + frames / RATE - stop_called) * 1000,
+        'return_ms': (returned - stop_called) * 1000,
+        'cpu_ms': cpu * 1000,
+        'sound_after_stop': any(at > stop_called + 0.1 for at, _, has_sound in recording.blocks if has_sound),
+    }
+
+
+def print_stop(name, results):
+    silence = [r['silence_ms'] for r in results]
+    returns = [r['return_ms'] for r in results]
+    cpu = [r['cpu_ms'] for r in results]
+    print(f"{name:<38} {np.median(silence):9.1f} {max(silence):9.1f} {np.median(returns):11.1f} "
+          f"{np.median(cpu):10.1f} {sum(r['sound_after_stop'] for r in results):>7}")
+
+
+def run_stop(args):
+    """Mede a latência até o silêncio e a CPU gasta esperando a fala parar, no TTS-1 e no TTS-GPT4."""
+    use_synthetic_audio(1.0)
+    # O aviso de prazo esgotado é esperado no caso da chamada bloqueante do TTS-GPT4
+    logging.getLogger('modules.open_ai.tts.cancellation').setLevel(logging.ERROR)
+    from modules.open_ai.tts.audio_processor import CHUNK
+    from modules.open_ai.tts.tts_chat_completions import ChatCompletionsTTS
+    from modules.open_ai.tts.tts_cache import TTSAudioCache
+
+    print(f"\nBloco de saída: {CHUNK} amostras ({CHUNK / RATE * 1000:.1f} ms)")
+    print(f"{'caso':<38} {'silêncio':>9} {'máx.':>9} {'stop (ms)':>11} {'CPU (ms)':>10} {'vazou':>7}")
+
+    tts = make_standard_tts(FakeSpeechClient(0.2, 2.0), cache=TTSAudioCache())
+    for name, stop in (("TTS-1, stop_speaking", lambda t: t.stop_speaking()), ("TTS-1, busy-wait anterior", legacy_stop)):
+        results = []
+        for _ in range(args.runs):
+            tts.cache.clear()
+            results.append(measure_stop(tts, LONG_TEXT, 1.2, stop))
+        print_stop(name, results)
+    tts.cleanup()
+
+    for streaming, label in ((False, "TTS-GPT4"), (True, "TTS-GPT4 stream")):
+        chat = ChatCompletionsTTS(streaming=streaming)
+        chat.client_openai = FakeChatClient(8.0, args.chat_delay)
+        chat.audio_stream.ensure_stream()
+        # Parada com a resposta já tocando: depois do primeiro delta (stream) ou da resposta inteira
+        playing_after = (args.chat_delay if streaming else chat.client_openai.response_seconds) + 1.0
+        print_stop(f"{label} tocando, stop_speaking",
+                   [measure_stop(chat, "Leia o relatório.", playing_after, lambda t: t.stop_speaking())
+                    for _ in range(args.runs)])
+        stops = (("stop_speaking", lambda t: t.stop_speaking()),)
+        if not streaming:
+            stops += (("busy-wait anterior", legacy_stop),)
+        for name, stop in stops:
+            print_stop(f"{label} na API, {name}",
+                       [measure_stop(chat, "Leia o relatório.", 0.3, stop) for _ in range(args.runs)])
+        chat.cleanup()
+
+    print("\n=== Parada chamada pela própria thread da fala (callback de início) ===")
+    tts = make_standard_tts(FakeSpeechClient(0.2, 2.0), cache=TTSAudioCache())
+    started = time.perf_counter()
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (tts.speak_response(LONG_TEXT, on_speech_start=tts.stop_speaking), done.set()),
+                              daemon=True)
+    thread.start()
+    finished = done.wait(timeout=5.0)
+    print(f"speak_response {'retornou' if finished else 'TRAVOU'} em {(time.perf_counter() - started) * 1000:.0f} ms")
+    tts.cleanup()
+
+
+# === chat: TTS-GPT4 com streaming de deltas pcm16 ===
+
+def speak_chat(streaming, args):
+    """Fala uma resposta do TTS-GPT4 e mede o primeiro som, a transcrição parcial e o áudio reproduzido."""
+    from modules.open_ai.tts.tts_chat_completions import ChatCompletionsTTS
+
+    tts = ChatCompletionsTTS(streaming=streaming)
+    tts.client_openai = FakeChatClient(args.seconds, args.ttfb, args.realtime_factor)
+    tts.audio_stream.ensure_stream()
+    recording = fresh_recording(tts)
+
+    partials = []
+    finals = []
+    tts.set_transcript_callback(lambda text: finals.append((time.perf_counter(), text)),
+                                on_partial=lambda text: partials.append((time.perf_counter(), text)))
+    tts.set_input_audio("UklGRg==", skip_transcription=True)
+
+    started = time.perf_counter()
+    tts.speak_response("Processando áudio...")
+    wait_playback(tts.audio_stream)
+
+    played = int(np.count_nonzero(recording.samples()))
+    result = {
+        'first_sound': (recording.first_sound_at - started) if recording.first_sound_at else None,
+        'first_partial': (partials[0][0] - started) if partials else None,
+        'partials': len(partials),
+        'transcript_ok': ("".join(text for _, text in partials).strip() == CHAT_TRANSCRIPT) if partials
+                         else bool(finals and finals[-1][1] == CHAT_TRANSCRIPT),
+        'final': (finals[-1][0] - started) if finals else None,
+        'played': played / (args.seconds * RATE),
+    }
+    tts.cleanup()
+    return result
+
+
+def run_chat(args):
+    """Compara o TTS-GPT4 sem streaming (resposta inteira) com o streaming de deltas pcm16."""
+    use_synthetic_audio(4.0)  # Reprodução acelerada; as medidas são até o início da fala
+
+    def fmt(value):
+        return f"{value * 1000:8.0f}" if value is not None else f"{'-':>8}"
+
+    print(f"\nResposta de {args.seconds:.0f} s de áudio | primeiro delta em {args.ttfb * 1000:.0f} ms | "
+          f"servidor {args.realtime_factor:.1f}x tempo real")
+    print(f"{'modo':<22} {'1º som (ms)':>12} {'1º texto (ms)':>14} {'parciais':>9} {'texto final (ms)':>17} "
+          f"{'transcrição':>12} {'áudio':>7}")
+    for name, streaming in (("resposta inteira (wav)", False), ("streaming (pcm16)", True)):
+        result = speak_chat(streaming, args)
+        print(f"{name:<22} {fmt(result['first_sound']):>12} {fmt(result['first_partial']):>14} {result['partials']:>9} "
+              f"{fmt(result['final']):>17} {'ok' if result['transcript_ok'] else 'ERRO':>12} {result['played'] * 100:6.1f}%")
+
+
+# === loudness: normalizador de volume em streaming ===
+
+def synthetic_sentence(rng, seconds, level_dbfs, crest):
+    """
+    Fala sintética: ruído com envelope de sílabas (~4 Hz), pausas curtas e um pico isolado.
+
+    Args:
+        rng: Gerador aleatório
+        seconds: Duração
+        level_dbfs: RMS aproximado dos trechos com voz
+        crest: Multiplicador do pico isolado (consoante forte), muda a relação pico/RMS
+    """
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    envelope = np.clip(np.sin(2 * np.pi * 4.0 * t + rng.uniform(0, np.pi)), 0, None) ** 0.5
+    envelope[int(n * 0.45):int(n * 0.5)] = 0  # pausa no meio da frase
+    voice = rng.standard_normal(n) * envelope
+    voice *= 10 ** (level_dbfs / 20) / np.sqrt(np.mean(voice[envelope > 0] ** 2))
+    spike = rng.integers(n // 10, n - n // 10)
+    voice[spike:spike + 48] *= crest
+    return np.clip(voice, -1.0, 1.0).astype(np.float32)
+
+
+def active_dbfs(samples, frame=240, gate_dbfs=-50.0):
+    """RMS em dBFS só dos quadros com voz (ignora as pausas)."""
+    frames = samples[:len(samples) // frame * frame].reshape(-1, frame)
+    power = np.mean(frames.astype(np.float64) ** 2, axis=1)
+    voiced = power > 10 ** (gate_dbfs / 10)
+    return 10 * np.log10(np.mean(power[voiced])) if voiced.any() else -120.0
+
+
+def print_loudness(name, sentences):
+    levels = np.array([active_dbfs(s) for s in sentences])
+    jumps = np.abs(np.diff(levels))
+    peak = max(float(np.max(np.abs(s))) for s in sentences)
+    print(f"{name:<28} {levels.max() - levels.min():9.1f} {levels.std():8.1f} {jumps.max():10.1f} "
+          f"{np.mean(levels):9.1f} {peak:7.2f}")
+
+
+def run_loudness(args):
+    """Compara o volume entre sentenças (bruto, pico por sentença, normalizador em streaming) e mede o custo por bloco."""
+    from modules.open_ai.tts.audio_processor import LoudnessNormalizer, CHUNK, LIMITER_CEILING
+
+    def stream(normalizer, samples, block):
+        """Passa o áudio pelo normalizador em blocos de `block` amostras, como na reprodução."""
+        return np.concatenate([normalizer.process(samples[i:i + block]) for i in range(0, len(samples), block)])
+
+    rng = np.random.default_rng(0)
+    # Duas origens com níveis diferentes (ex.: tts-1 em PCM e gpt-4o), variação entre sentenças e picos variados
+    sentences = []
+    for index in range(args.sentences):
+        base = -24.0 if index < args.sentences // 2 else -16.0
+        sentences.append(synthetic_sentence(rng, rng.uniform(1.5, 4.0), base + rng.normal(0, 2.5),
+                                            crest=rng.choice([1.0, 3.0, 6.0])))
+
+    print(f"\n=== Volume entre {args.sentences} sentenças (duas origens: -24 e -16 dBFS, ±2.5 dB) ===")
+    print(f"{'processamento':<28} {'faixa dB':>9} {'desvio':>8} {'salto máx.':>10} {'média dB':>9} {'pico':>7}")
+    print_loudness("bruto (PCM da API)", sentences)
+    print_loudness("pico por sentença (anterior)", [s / np.max(np.abs(s)) for s in sentences])
+    normalizer = LoudnessNormalizer()
+    normalized = [stream(normalizer, s, 750) for s in sentences]
+    print_loudness("normalizador em streaming", normalized)
+    metrics = normalizer.get_metrics()
+    print(f"amostras acima de {LIMITER_CEILING}: "
+          f"{sum(int(np.count_nonzero(np.abs(s) > LIMITER_CEILING + 1e-6)) for s in normalized)} "
+          f"| amostras limitadas: {metrics['limited_samples']} de {metrics['samples']}")
+
+    print(f"\n=== Custo por bloco ({args.repeat} blocos) ===")
+    print(f"{'bloco':>20} {'µs/bloco':>10} {'µs/s de áudio':>14} {'x tempo real':>13}")
+    audio = synthetic_sentence(rng, 3.0, -20.0, 3.0)
+    for label, size in (("rede (750)", 750), (f"saída ({CHUNK})", CHUNK), ("sentença (1 s)", RATE)):
+        normalizer = LoudnessNormalizer()
+        block = audio[:size]
+        normalizer.process(block)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            normalizer.process(block)
+        per_block = (time.perf_counter() - started) / args.repeat
+        per_second = per_block * RATE / size
+        print(f"{label:>20} {per_block * 1e6:10.1f} {per_second * 1e6:14.0f} {1 / per_second:13.0f}")
+
+
+def main():
+    """Benchmarks da síntese de voz (TTS) sem placa de som e sem a API."""
+    parser = argparse.ArgumentParser(description="Benchmarks do TTS")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    streaming = commands.add_parser("streaming", help="Primeiro som do tts-1 com PCM em streaming")
+    streaming.add_argument("--ttfb", type=float, default=0.35, help="Latência até o primeiro byte (s)")
+    streaming.add_argument("--realtime-factor", type=float, default=3.0, help="Velocidade de geração do servidor (x tempo real)")
+    streaming.set_defaults(run=run_streaming)
+
+    decode = commands.add_parser("decode", help="Decodificação no processo contra pydub/ffmpeg")
+    decode.add_argument("--seconds", type=float, default=8.0, help="Duração do áudio de teste")
+    decode.add_argument("--repeats", type=int, default=10, help="Repetições por formato")
+    decode.set_defaults(run=run_decode)
+
+    segmenter = commands.add_parser("segmenter", help="Divisão do texto em trechos para o TTS")
+    segmenter.add_argument("--first-max", type=int, default=80, help="Tamanho máximo do primeiro trecho")
+    segmenter.add_argument("--max-chars", type=int, default=400, help="Tamanho máximo dos trechos")
+    segmenter.add_argument("--verbose", action="store_true", help="Mostra os trechos de cada resposta")
+    segmenter.set_defaults(run=run_segmenter)
+
+    prefetch = commands.add_parser("prefetch", help="Síntese antecipada: pausas audíveis e cancelamento")
+    prefetch.add_argument("--ttfb", type=float, default=0.4, help="Latência até o primeiro byte (s)")
+    prefetch.add_argument("--realtime-factor", type=float, default=2.0, help="Velocidade de geração do servidor")
+    prefetch.add_argument("--slow-index", type=int, default=2, help="Sentença com resposta lenta")
+    prefetch.add_argument("--slow-ttfb", type=float, default=4.0, help="Latência da sentença lenta (s)")
+    prefetch.add_argument("--lookaheads", type=int, nargs="*", default=[0, 1, 2, 3], help="Valores de look-ahead")
+    prefetch.set_defaults(run=run_prefetch)
+
+    cache = commands.add_parser("cache", help="Cache de áudio: latência, aquecimento e sessão simulada")
+    cache.add_argument("--ttfb", type=float, default=0.4, help="Latência da API até o primeiro byte (s)")
+    cache.add_argument("--runs", type=int, default=5, help="Repetições de cada medida")
+    cache.add_argument("--session", type=int, default=60, help="Falas na sessão simulada")
+    cache.add_argument("--cache-mb", type=float, default=4.0, help="LRU em memória da sessão simulada (MB)")
+    cache.set_defaults(run=run_cache)
+
+    stop = commands.add_parser("stop", help="Parada da fala: latência até o silêncio e CPU")
+    stop.add_argument("--runs", type=int, default=5, help="Repetições de cada medida")
+    stop.add_argument("--chat-delay", type=float, default=1.5, help="Latência da chamada do TTS-GPT4 até o primeiro delta (s)")
+    stop.set_defaults(run=run_stop)
+
+    chat = commands.add_parser("chat", help="TTS-GPT4: resposta inteira contra streaming de deltas pcm16")
+    chat.add_argument("--seconds", type=float, default=12.0, help="Duração do áudio da resposta (s)")
+    chat.add_argument("--ttfb", type=float, default=0.6, help="Latência até o primeiro delta (s)")
+    chat.add_argument("--realtime-factor", type=float, default=2.0, help="Velocidade de geração do servidor")
+    chat.set_defaults(run=run_chat)
+
+    loudness = commands.add_parser("loudness", help="Normalizador de volume em streaming")
+    loudness.add_argument("--sentences", type=int, default=24, help="Sentenças na resposta simulada")
+    loudness.add_argument("--repeat", type=int, default=2000, help="Repetições na medida de custo")
+    loudness.set_defaults(run=run_loudness)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
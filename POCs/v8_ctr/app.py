@@ -9,7 +9,9 @@ from modules.anthropic.computer_control.computer_control import AnthropicToolHan
 from tasks_folder.task_manager import TaskManager
 from ui.app_layout import AppLayout
 from config.settings_manager import SettingsManager
-from config.audio_config import AudioDeviceConfig
+from config.audio_config import AudioConfig, AudioDeviceConfig
+from modules.open_ai.stt.stt_worker import get_stt_worker_pool
+from modules.audio.audio_context import get_audio_context
 from handlers.event_handlers import EventHandlers
 from config.log_config import LogConfig  # Importação do sistema de logs
 import logging
@@ -44,6 +46,7 @@ class JuninApp:
             'update_voice_dropdown': None,
             'vad_checkbox': None,
             'spelling_correction': None,
+            'refresh_devices': None,
         }
         
         # Inicializa os componentes da UI
@@ -64,6 +67,9 @@ class JuninApp:
             'always_on_top': tk.BooleanVar(value=self.settings_manager.get_setting("always_on_top", True)),
             'hear_response': tk.BooleanVar(value=self.settings_manager.get_setting("hear_response", False)),
             'vad_enabled': tk.BooleanVar(value=self.settings_manager.get_setting("vad_enabled", False)),
+            # Transcrição durante a fala no modo VAD (no modo online, uma requisição extra por segundo de fala)
+            'incremental_transcription': tk.BooleanVar(value=self.settings_manager.get_setting(
+                "incremental_transcription", AudioConfig.INCREMENTAL_TRANSCRIPTION)),
             'voice_engine': tk.StringVar(value=self.settings_manager.get_setting("selected_voice_engine", "tts-1")),
             'voice': tk.StringVar(value=self.settings_manager.get_setting("selected_voice", "alloy")),
             'voice_speed': tk.StringVar(value=str(self.settings_manager.get_setting("voice_speed", "1.5"))),
@@ -100,13 +106,24 @@ class JuninApp:
             log.info("Estado da transcrição ativa alterado para: %s", self.vars['transcription_active'].get())
         self.vars['transcription_active'].trace('w', on_transcription_change)
 
+        def on_incremental_change(*args):
+            self.settings_manager.set_setting("incremental_transcription", self.vars['incremental_transcription'].get())
+            log.info("Transcrição durante a fala %s", 'ativada' if self.vars['incremental_transcription'].get() else 'desativada')
+        self.vars['incremental_transcription'].trace('w', on_incremental_change)
+
         # Adiciona trace para o modo whisper
         def on_whisper_change(*args):
             mode = self.vars['whisper'].get()
             self.settings_manager.set_setting("selected_whisper", mode)
             log.info("Modo de transcrição alterado para: %s", mode)
+            if mode == "Local":
+                get_stt_worker_pool(AudioConfig.LOCAL_WHISPER_MODEL, AudioConfig.LOCAL_STT_WORKERS).start()
         self.vars['whisper'].trace('w', on_whisper_change)
 
+        # Inicia os processos de STT (que carregam o modelo em segundo plano) se o modo local já estiver selecionado
+        if self.vars['whisper'].get() == "Local":
+            get_stt_worker_pool(AudioConfig.LOCAL_WHISPER_MODEL, AudioConfig.LOCAL_STT_WORKERS).start()
+
         # Adiciona trace para o controle de logs
         def on_show_logs_change(*args):
             show_logs = self.vars['show_logs'].get()
@@ -153,6 +170,9 @@ class JuninApp:
         )
         self.handlers['events'] = self.event_handlers
 
+        # No modo VAD, a captura pode acompanhar cada fala com uma transcrição incremental criada pelo SpeechHandler
+        self.handlers['audio'].incremental_factory = self.handlers['speech'].create_incremental_transcriber
+
     def initialize_ui(self):
         """Inicializa todos os componentes da UI.""" 
         # Atualiza os callbacks com os métodos reais dos manipuladores de eventos
@@ -166,6 +186,7 @@ class JuninApp:
             'vad_checkbox': self.event_handlers.vad_checkbox_callback,
             'spelling_correction': self.event_handlers.handle_spelling_correction,
             'toggle_logs': self.event_handlers.toggle_logs,  # Novo callback para controle de logs
+            'refresh_devices': self.event_handlers.refresh_audio_devices,
         })
 
         # Inicializa o layout com os callbacks atualizados
@@ -189,6 +210,8 @@ class JuninApp:
         # Configura o painel de controle e armazena o menu suspenso de voz
         voice_dropdown = self.app_layout.setup_control_panel()
         self.components['voice_dropdown'] = voice_dropdown
+        self.components['input_device_menu'] = self.app_layout.input_device_menu
+        self.components['output_device_menu'] = self.app_layout.output_device_menu
 
         # Atualiza os manipuladores de eventos com os componentes completos
         self.event_handlers.components = self.components
@@ -236,6 +259,7 @@ class JuninApp:
             "selected_whisper": self.vars['whisper'].get(),
             "selected_api": self.vars['api_selection'].get(),
             "vad_enabled": self.vars['vad_enabled'].get(),
+            "incremental_transcription": self.vars['incremental_transcription'].get(),
             "input_device": self.vars['input_device'].get(),
             "output_device": self.vars['output_device'].get(),
             "selected_model": self.vars['chatgpt_model'].get(),
@@ -261,6 +285,8 @@ class JuninApp:
             if self.handlers['computer'].falar and self.handlers['computer'].tts:
                 self.handlers['computer'].tts.cleanup()
             self.save_settings()
+            # Encerra o PortAudio uma única vez, depois que todos os consumidores fecharam seus streams
+            get_audio_context().shutdown()
         except Exception as e:
             log.error("Erro durante a limpeza: %s", e)
         finally:
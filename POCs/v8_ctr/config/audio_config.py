@@ -1,19 +1,68 @@
 import tkinter as tk
-import pyaudio
 import logging
+import os
+import sys
 from ui.theme import DarkTheme
 from ui.components import ModernFrame, ModernOptionMenu
+from modules.audio.backends import FORMAT_INT16
+from modules.audio.device_registry import get_device_registry
+
+def _user_cache_dir(name):
+    """
+    Pasta de cache do usuário para o aplicativo, fora da pasta de trabalho.
+
+    Args:
+        name: Subpasta do cache
+
+    Returns:
+        str: %LOCALAPPDATA%\\Junin\\name no Windows, ~/Library/Caches/Junin/name no macOS
+             e $XDG_CACHE_HOME/junin/name (ou ~/.cache/junin/name) nos demais sistemas
+    """
+    if sys.platform == 'win32' and os.getenv('LOCALAPPDATA'):
+        return os.path.join(os.getenv('LOCALAPPDATA'), 'Junin', name)
+    if sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Caches', 'Junin', name)
+    base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'junin', name)
+
 
 class AudioConfig:
     CHUNK = 1024
-    FORMAT = 8  # pyaudio.paInt32
+    FORMAT = FORMAT_INT16  # paInt16
     CHANNELS = 1
     RATE = 24000  # Ajustado para 24000Hz para compatibilidade com GPT-4
     MOVING_AVERAGE_WINDOW = 50
     VOLUME_MULTIPLIER = 3
     NOISE_FLOOR = 100
-    RECORD_TIME_AFTER_DETECTION = 2.0
+    RECORD_TIME_AFTER_DETECTION = 2.0  # Limite máximo de silêncio para encerrar o turno
+    ENDPOINT_MIN_SILENCE = 0.3  # Limite mínimo de silêncio do endpointing adaptativo
+    ENDPOINT_DEFAULT_SILENCE = 0.8  # Limite usado até haver pausas suficientes do falante
     DETECTION_TIME = 0.2
+    # Capacidade do buffer circular de captura (10 minutos, ~29 MB a 24 kHz). Gravações mais longas
+    # (push-to-talk) perdem o início: um aviso vai para o log e o WAV entregue traz dropped_seconds
+    MAX_RECORD_SECONDS = 600
+    VAD_ENGINE = "multi"  # "energy" (apenas energia) ou "multi" (energia + ZCR + planicidade espectral)
+    VAD_FRAME_SIZE = 480  # 20 ms a 24 kHz
+    VAD_PRE_ROLL = 0.5  # Segundos de áudio anteriores à detecção incluídos no recorte
+    VAD_POST_ROLL = 0.3  # Segundos de áudio mantidos após o fim da fala
+    NOISE_TRACKER_WINDOW = 3.0  # Segundos de quadros de silêncio usados na estimativa do ruído
+    NOISE_TRACKER_PERCENTILE = 20
+    LOCAL_WHISPER_MODEL = "base"  # Tamanho do modelo Whisper local ("tiny", "base", "small", ...)
+    LOCAL_STT_WORKERS = 1  # Processos dedicados ao Whisper local (cada um carrega uma cópia do modelo)
+    INCREMENTAL_TRANSCRIPTION = False  # Padrão da opção "Transcrição durante a fala" (só no modo VAD)
+    INCREMENTAL_STEP = 1.0  # Segundos entre as hipóteses parciais (cada uma é uma requisição no modo online, ~1 por segundo de fala)
+    INCREMENTAL_COMMIT_SECONDS = 4.0  # Áudio não confirmado a partir do qual o trecho até a última pausa é fixado
+    TRANSCRIPTION_CACHE_SIZE = 128  # Transcrições mantidas em memória (indexadas pelo conteúdo do áudio)
+    TRANSCRIPTION_CACHE_DIR = None  # Pasta do cache de transcrições em disco (None: apenas memória)
+    TTS_CACHE_SIZE_MB = 64  # Áudio sintetizado mantido em memória (64 MB ≈ 11 minutos de fala)
+    TTS_CACHE_DIR = _user_cache_dir("tts_cache")  # Pasta do cache de áudio do TTS em disco (None: apenas memória)
+    TTS_CACHE_DISK_MB = 128  # Limite do cache em disco; os arquivos usados há mais tempo são apagados
+    TTS_PREWARM_PHRASES = [  # Frases sintetizadas ao escolher a voz, para tocarem sem requisição
+        "Processando áudio...",
+        "Captura de tela realizada.",
+        "Olá! Em que posso ajudar?",
+        "Desculpe, não consegui obter uma resposta.",  # Primeiro trecho da mensagem de erro do chat
+    ]
 
 
 class AudioDeviceManager:
@@ -73,64 +122,26 @@ class AudioDeviceManager:
 
 class AudioDeviceConfig:
     def __init__(self):
-        self.p = pyaudio.PyAudio()
+        self.registry = get_device_registry()
         self.logger = logging.getLogger(__name__)
 
     @classmethod
-    def list_audio_devices(cls):
-        """Lista todos os dispositivos de entrada e saída de áudio disponíveis com filtragem de duplicatas."""        
-        p = pyaudio.PyAudio()
-        devices = {
-            'input': [],
-            'output': []
-        }
-        
-        # Rastrear dispositivos por seus nomes limpos para evitar duplicatas
-        seen_devices = {}
-        
-        for i in range(p.get_device_count()):
-            try:
-                device_info = p.get_device_info_by_index(i)
-                clean_name = device_info['name']
-                
-                # Cria uma entrada de dispositivo com nome limpo e índice original
-                device_entry = {
-                    'index': device_info['index'],
-                    'name': clean_name,
-                    'channels': {
-                        'input': device_info['maxInputChannels'],
-                        'output': device_info['maxOutputChannels']
-                    }
-                }
-                
-                # Lidar com dispositivos de entrada
-                if device_info['maxInputChannels'] > 0:
-                    if clean_name not in seen_devices.get('input', set()):
-                        devices['input'].append(device_entry)
-                        if 'input' not in seen_devices:
-                            seen_devices['input'] = set()
-                        seen_devices['input'].add(clean_name)
-                
-                # Lidar com dispositivos de saída
-                if device_info['maxOutputChannels'] > 0:
-                    if clean_name not in seen_devices.get('output', set()):
-                        devices['output'].append(device_entry)
-                        if 'output' not in seen_devices:
-                            seen_devices['output'] = set()
-                        seen_devices['output'].add(clean_name)
-                
-            except Exception as e:
-                logging.error(f"Erro ao processar o dispositivo {i}: {e}")
-                continue
-        
-        p.terminate()
-        return devices
+    def list_audio_devices(cls, rescan=False):
+        """
+        Lista todos os dispositivos de entrada e saída de áudio disponíveis com filtragem de duplicatas.
+
+        A lista vem do registro de dispositivos (enumerado uma vez); rescan=True força uma nova enumeração.
+        """
+        registry = get_device_registry()
+        if rescan:
+            return registry.rescan()
+        return registry.devices()
 
     def set_input_device(self, device_index):
         """Define o dispositivo de áudio de entrada."""        
         try:
             # Verifica se o dispositivo existe e suporta entrada
-            device_info = self.p.get_device_info_by_index(int(device_index))
+            device_info = self.registry.device_info(int(device_index))
             if device_info['maxInputChannels'] > 0:
                 self.input_device_index = int(device_index)
                 self.logger.info(f"Dispositivo de entrada definido como: {device_info['name']} (índice: {device_index})")
@@ -146,7 +157,7 @@ class AudioDeviceConfig:
         """Define o dispositivo de áudio de saída."""        
         try:
             # Verifica se o dispositivo existe e suporta saída
-            device_info = self.p.get_device_info_by_index(int(device_index))
+            device_info = self.registry.device_info(int(device_index))
             if device_info['maxOutputChannels'] > 0:
                 self.output_device_index = int(device_index)
                 self.logger.info(f"Dispositivo de saída definido como: {device_info['name']} (índice: {device_index})")
@@ -161,7 +172,7 @@ class AudioDeviceConfig:
     def _get_default_input_device(self):
         """Obtém o índice do dispositivo de entrada padrão."""        
         try:
-            default_device = self.p.get_default_input_device_info()
+            default_device = self.registry.device_info(self.registry.default_index('input'))
             self.logger.info(f"Dispositivo de entrada padrão: {default_device['name']}")
             return default_device['index']
         except Exception as e:
@@ -171,7 +182,7 @@ class AudioDeviceConfig:
     def _get_default_output_device(self):
         """Obtém o índice do dispositivo de saída padrão."""        
         try:
-            default_device = self.p.get_default_output_device_info()
+            default_device = self.registry.device_info(self.registry.default_index('output'))
             self.logger.info(f"Dispositivo de saída padrão: {default_device['name']}")
             return default_device['index']
         except Exception as e:
@@ -1,12 +1,12 @@
-import pyaudio
-import wave
 import numpy as np
-import io
 import threading
 import time
-from collections import deque
 import logging
 from config.audio_config import AudioConfig, AudioDeviceConfig  # Atualizado para incluir AudioDeviceConfig
+from modules.audio.backends import CONTINUE, COMPLETE
+from modules.audio.audio_context import get_audio_context
+from modules.audio.capture_buffer import CaptureRingBuffer
+from modules.audio.vad import create_vad, EnergyVAD, AdaptiveEndpointer, NoiseFloorTracker
 
 # Configurações de logging
 logging.basicConfig(level=logging.INFO)
@@ -14,12 +14,20 @@ log = logging.getLogger(__name__)
 
 class AudioHandler:
     def __init__(self, on_recording_complete=None):
-        self.p = pyaudio.PyAudio()
+        # Contexto de áudio compartilhado: o backend é inicializado uma vez por processo
+        self.audio_context = get_audio_context()
         self.stream = None
-        self.frames = []
         self.is_recording = False
         self.is_recording_vad = False
         self.stop_event = threading.Event()
+        # Ruído de fundo estimado continuamente durante a captura (substitui a calibração bloqueante)
+        self.noise_tracker = NoiseFloorTracker(
+            AudioConfig.VAD_FRAME_SIZE / float(AudioConfig.RATE),
+            window_seconds=AudioConfig.NOISE_TRACKER_WINDOW,
+            percentile=AudioConfig.NOISE_TRACKER_PERCENTILE,
+            multiplier=AudioConfig.VOLUME_MULTIPLIER,
+            min_threshold=AudioConfig.NOISE_FLOOR / np.sqrt(AudioConfig.CHUNK)
+        )
         self.threshold = 200
         self.please_interrupt = False
         self.fechando = False
@@ -28,6 +36,16 @@ class AudioHandler:
         self.vad_thread = None
         self.stream_lock = threading.Lock()
         
+        # Buffer circular pré-alocado para a captura (preenchido pelo callback do PortAudio)
+        self.capture_buffer = CaptureRingBuffer(AudioConfig.MAX_RECORD_SECONDS, AudioConfig.RATE, AudioConfig.CHANNELS)
+        self._capture_done = threading.Event()
+        self.endpointer = None
+
+        # Transcrição incremental durante a fala no modo VAD (a fábrica é definida pelo aplicativo)
+        self.incremental_factory = None
+        self.on_partial_transcript = None
+        self._incremental = None
+        
         # Inicializa o gerenciador de dispositivos
         self.device_config = AudioDeviceConfig()
         
@@ -41,6 +59,7 @@ class AudioHandler:
         
         # Inicializa o stream de saída
         self._initialize_output_stream()
+        self.audio_context.subscribe('output_device', self.set_output_device)
 
     def _initialize_output_stream(self):
         """Inicializa o stream de saída com tratamento de erros."""
@@ -54,14 +73,15 @@ class AudioHandler:
                         log.error("Erro ao fechar stream existente: %s", e)
 
                 # Obtém informações do dispositivo
-                device_info = self.p.get_device_info_by_index(self.output_device_index) if self.output_device_index is not None else None
+                device_info = self.device_config.registry.device_info(self.output_device_index) if self.output_device_index is not None else None
                 device_name = device_info['name'] if device_info else "dispositivo padrão"
                 
                 log.info("Inicializando stream de saída com dispositivo: %s (índice: %s)", 
                         device_name, 
                         self.output_device_index if self.output_device_index is not None else "padrão")
 
-                self.stream = self.p.open(
+                self.stream = self.audio_context.open_stream(
+                    owner=self,
                     format=AudioConfig.FORMAT,
                     channels=AudioConfig.CHANNELS,
                     rate=AudioConfig.RATE,
@@ -73,10 +93,13 @@ class AudioHandler:
                 self.current_output_device = device_name
         except Exception as e:
             log.error("Erro ao inicializar stream de saída: %s. Tentando dispositivo padrão...", e)
+            # O dispositivo pode ter sido removido: a próxima consulta enumera de novo
+            self.device_config.registry.invalidate()
             try:
                 # Tenta usar o dispositivo padrão
                 self.output_device_index = None
-                self.stream = self.p.open(
+                self.stream = self.audio_context.open_stream(
+                    owner=self,
                     format=AudioConfig.FORMAT,
                     channels=AudioConfig.CHANNELS,
                     rate=AudioConfig.RATE,
@@ -93,7 +116,7 @@ class AudioHandler:
         """Define o dispositivo de entrada e atualiza o estado."""
         try:
             # Verifica se o dispositivo existe e suporta entrada
-            device_info = self.p.get_device_info_by_index(device_index)
+            device_info = self.device_config.registry.device_info(device_index)
             if device_info['maxInputChannels'] > 0:
                 # Verifica se o dispositivo realmente mudou
                 if device_index == self.input_device_index:
@@ -115,7 +138,7 @@ class AudioHandler:
         """Define o dispositivo de saída e reinicializa o stream."""
         try:
             # Verifica se o dispositivo existe e suporta saída
-            device_info = self.p.get_device_info_by_index(device_index)
+            device_info = self.device_config.registry.device_info(device_index)
             if device_info['maxOutputChannels'] > 0:
                 # Verifica se o dispositivo realmente mudou
                 if device_index == self.output_device_index:
@@ -133,49 +156,95 @@ class AudioHandler:
             log.error("Erro ao definir dispositivo de saída: %s", e)
             return False
 
+    @property
+    def threshold(self):
+        """Limite de detecção atual na unidade original (norma por chunk de AudioConfig.CHUNK)."""
+        return self.noise_tracker.threshold * np.sqrt(AudioConfig.CHUNK)
+
+    @threshold.setter
+    def threshold(self, value):
+        """Define manualmente o limite, reiniciando a estimativa de ruído a partir dele."""
+        self.noise_tracker.noise_floor = value / np.sqrt(AudioConfig.CHUNK) / AudioConfig.VOLUME_MULTIPLIER
+
     def calibrate_noise_threshold(self):
-        """Calibra o ruído ambiente e define o limite."""        
-        log.info("Calibrando o som ambiente. Por favor, permaneça em silêncio durante a calibração...")
+        """
+        Retorna o limite de ruído atual sem bloquear.
 
-        try:
-            # Abre um stream temporário para calibração
-            stream = self.p.open(
-                format=AudioConfig.FORMAT,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.RATE,
-                input=True,
-                input_device_index=self.input_device_index,
-                frames_per_buffer=AudioConfig.CHUNK
-            )
+        O ruído é estimado continuamente pelo NoiseFloorTracker dentro do loop de
+        captura do VAD, então não é mais necessário abrir um stream e ficar em
+        silêncio para calibrar.
+        """        
+        log.info("Limite de som ambiente atual (adaptativo): %.2f", self.threshold)
+        return self.threshold
 
-            volume_history = deque(maxlen=AudioConfig.MOVING_AVERAGE_WINDOW)
+    def _capture_callback(self, in_data, frame_count, time_info, status):
+        """Callback do PortAudio: copia o bloco capturado direto para o buffer circular."""
+        self.capture_buffer.write(in_data)
+        if not self.is_recording:
+            self._capture_done.set()
+            return (None, COMPLETE)
+        return (None, CONTINUE)
 
-            for _ in range(AudioConfig.MOVING_AVERAGE_WINDOW):
-                data = np.frombuffer(stream.read(AudioConfig.CHUNK), dtype=np.int16)
-                volume = np.linalg.norm(data)
-                if volume < AudioConfig.NOISE_FLOOR:
-                    volume = 0
-                volume_history.append(volume)
-            
+    def _vad_capture_callback(self, in_data, frame_count, time_info, status):
+        """Callback do stream contínuo do modo VAD: alimenta o anel até o VAD ser desligado."""
+        self.capture_buffer.write(in_data)
+        if not self.is_recording_vad or self.stop_event.is_set():
+            return (None, COMPLETE)
+        return (None, CONTINUE)
+
+    def _open_capture_stream(self, callback=None):
+        """Abre o stream de entrada alimentado por callback no dispositivo atual."""
+        return self.audio_context.open_stream(
+            owner=self,
+            format=AudioConfig.FORMAT,
+            channels=AudioConfig.CHANNELS,
+            rate=AudioConfig.RATE,
+            input=True,
+            input_device_index=self.input_device_index,
+            frames_per_buffer=AudioConfig.CHUNK,
+            stream_callback=callback or self._capture_callback
+        )
+
+    def _resolve_input_device(self):
+        """Atualiza o índice do dispositivo de entrada pelo nome (os índices mudam quando o backend é reinicializado)."""
+        if self.current_input_device is None:
+            return
+        device_index = self.device_config.registry.index_for_name(self.current_input_device, 'input')
+        if device_index is None:
+            log.warning("Dispositivo de entrada %s não encontrado; usando o padrão do sistema", self.current_input_device)
+            device_index = self.device_config._get_default_input_device()
+        self.input_device_index = device_index
+
+    def _reopen_vad_stream(self, stream):
+        """
+        Fecha e reabre o stream contínuo do VAD, liberando a reinicialização pendente do backend.
+
+        Args:
+            stream: Stream de captura atual
+
+        Returns:
+            ManagedStream: Novo stream de captura no dispositivo de entrada atual
+        """
+        log.info("Reabrindo a captura do VAD para atualizar os dispositivos de áudio")
+        try:
             stream.stop_stream()
+            # Fechar a última captura executa a reinicialização pendente no contexto
             stream.close()
-            
-            average_volume = np.mean(volume_history)
-            self.threshold = average_volume * AudioConfig.VOLUME_MULTIPLIER
-            log.info("Calibração concluída. Limite de som ambiente: %.2f", self.threshold)
-            return self.threshold
-
         except Exception as e:
-            log.error("Erro durante a calibração: %s", e)
-            return 200  # valor padrão
+            log.debug("Stream VAD já estava fechado: %s", e)
+        self._resolve_input_device()
+        return self._open_capture_stream(self._vad_capture_callback)
 
     def start_recording(self):
         """Inicia a gravação de áudio com seleção robusta de dispositivo."""        
-        self.frames = []
+        self.capture_buffer.reset()
+        self._capture_done.clear()
         
         try:
+            self._resolve_input_device()
+
             # Valida o índice do dispositivo
-            device_info = self.p.get_device_info_by_index(self.input_device_index)
+            device_info = self.device_config.registry.device_info(self.input_device_index)
             
             # Garante que o dispositivo suporta entrada
             if device_info['maxInputChannels'] == 0:
@@ -184,14 +253,7 @@ class AudioHandler:
             log.info("Usando o dispositivo de entrada: %s (Índice: %d)", device_info['name'], self.input_device_index)
             
             # Abre o fluxo de áudio
-            self.audio_stream = self.p.open(
-                format=AudioConfig.FORMAT,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.RATE,
-                input=True,
-                input_device_index=self.input_device_index,
-                frames_per_buffer=AudioConfig.CHUNK
-            )
+            self.audio_stream = self._open_capture_stream()
             
             # Inicia a thread de gravação
             self.recording_thread = threading.Thread(target=self.record)
@@ -209,14 +271,7 @@ class AudioHandler:
                     self.input_device_index = default_input_device
                     
                     # Tenta novamente com o dispositivo padrão
-                    self.audio_stream = self.p.open(
-                        format=AudioConfig.FORMAT,
-                        channels=AudioConfig.CHANNELS,
-                        rate=AudioConfig.RATE,
-                        input=True,
-                        input_device_index=self.input_device_index,
-                        frames_per_buffer=AudioConfig.CHUNK
-                    )
+                    self.audio_stream = self._open_capture_stream()
                     
                     # Inicia a thread de gravação
                     self.recording_thread = threading.Thread(target=self.record)
@@ -230,93 +285,180 @@ class AudioHandler:
                 raise
 
     def record(self):
-        """Grava dados de áudio."""        
+        """Aguarda o fim da captura feita pelo callback e entrega o WAV gravado."""        
         self.please_interrupt = True
         self.is_recording = True  # Certifique-se de que a gravação está ativada
         log.info("Iniciando gravação...")
-        while self.is_recording:
-            data = self.audio_stream.read(AudioConfig.CHUNK)
-            self.frames.append(data)
+        overflow_reported = False
+        while not self._capture_done.wait(0.05):
+            if not overflow_reported and self.capture_buffer.overflowed:
+                overflow_reported = True
+                log.warning("Gravação passou de %.0f s (AudioConfig.MAX_RECORD_SECONDS); o início está sendo descartado",
+                            self.capture_buffer.capacity_seconds)
+            # Encerra mesmo que o callback pare de ser chamado (stream fechado ou erro no dispositivo)
+            if not self.is_recording:
+                try:
+                    if not self.audio_stream.is_active():
+                        break
+                except Exception:
+                    break
 
-        self.audio_stream.stop_stream()
-        self.audio_stream.close()
+        stop_time = time.perf_counter()
+        try:
+            self.audio_stream.stop_stream()
+            self.audio_stream.close()
+        except Exception as e:
+            log.debug("Stream de gravação já estava fechado: %s", e)
         self.please_interrupt = False
         log.info("Gravação finalizada.")
 
-        if self.frames and self.on_recording_complete:
-            audio_data = b''.join(self.frames)
-            audio_file = io.BytesIO()
-            with wave.open(audio_file, 'wb') as wf:
-                wf.setnchannels(AudioConfig.CHANNELS)
-                wf.setsampwidth(self.p.get_sample_size(AudioConfig.FORMAT))
-                wf.setframerate(AudioConfig.RATE)
-                wf.writeframes(audio_data)
-            audio_file.name = "output.wav"
-            self.last_recorded_file = audio_file  # Atualiza o último arquivo gravado
+        if self.capture_buffer.total_written and self.on_recording_complete:
+            audio_file = self.capture_buffer.wav_view()
+            log.info("Áudio pronto para envio em %.2f ms (%.2f segundos gravados)",
+                     (time.perf_counter() - stop_time) * 1000, audio_file.duration)
+            if audio_file.dropped_seconds:
+                log.warning("O áudio enviado não contém os primeiros %.1f s da gravação", audio_file.dropped_seconds)
+            self._deliver_recording(audio_file)
+
+    def _create_vad(self):
+        """Cria o detector de voz configurado e o endpointing adaptativo de fim de turno."""
+        vad = create_vad(AudioConfig.VAD_ENGINE, AudioConfig.RATE, frame_size=AudioConfig.VAD_FRAME_SIZE)
+        # O endpointer é mantido entre sessões para preservar a estatística de pausas do falante
+        if self.endpointer is None:
+            self.endpointer = AdaptiveEndpointer(
+                vad.frame_duration,
+                onset_frames=vad.frames_for(AudioConfig.DETECTION_TIME),
+                min_silence=AudioConfig.ENDPOINT_MIN_SILENCE,
+                max_silence=AudioConfig.RECORD_TIME_AFTER_DETECTION,
+                default_silence=AudioConfig.ENDPOINT_DEFAULT_SILENCE
+            )
+        self.endpointer.reset()
+        return vad, self.endpointer
+
+    def set_partial_transcript(self, text):
+        """Repassa a transcrição parcial da fala atual para o endpointing."""
+        if self.endpointer is not None:
+            self.endpointer.set_partial_transcript(text)
+        if self.on_partial_transcript:
+            self.on_partial_transcript(text)
+
+    def _start_incremental(self, start):
+        """Inicia a transcrição incremental da fala que começa no índice absoluto start."""
+        if self._incremental is not None:
+            self._incremental.stop()
+        self._incremental = None
+        if self.incremental_factory is None:
+            return
+        try:
+            incremental = self.incremental_factory(on_partial=self.set_partial_transcript)
+            if incremental is not None:
+                incremental.start(self.capture_buffer, start)
+                self._incremental = incremental
+        except Exception as e:
+            log.error("Erro ao iniciar a transcrição incremental: %s", e)
+
+    def _attach_incremental(self, audio_file, end):
+        """Encerra a transcrição incremental no fim da fala e a anexa ao arquivo entregue."""
+        incremental, self._incremental = self._incremental, None
+        if incremental is not None:
+            incremental.stop(end)
+            audio_file.incremental = incremental
+
+    def get_endpoint_metrics(self):
+        """Retorna as métricas de latência de fim de turno do modo VAD."""
+        return self.endpointer.get_metrics() if self.endpointer is not None else None
+
+    def _deliver_recording(self, audio_file):
+        """Guarda o último arquivo gravado e notifica o callback de gravação concluída."""
+        self.last_recorded_file = audio_file  # Atualiza o último arquivo gravado
+        if self.on_recording_complete:
             self.on_recording_complete(audio_file)
 
+    def _cut_utterance(self, start, end):
+        """Recorta uma fala do anel contínuo e entrega em uma thread separada."""
+        audio_file = self.capture_buffer.wav_view(start, end, copy=True)
+        self._attach_incremental(audio_file, end)
+        log.info("Fala recortada do buffer contínuo: %.2f segundos (pré-roll de %.2f s)",
+                 audio_file.duration, AudioConfig.VAD_PRE_ROLL)
+        threading.Thread(target=self._deliver_recording, args=(audio_file,), daemon=True).start()
+
     def vad_recording(self):
-        """Gravação de detecção de atividade de voz."""        
+        """
+        Gravação de detecção de atividade de voz.
+
+        Mantém um único stream de entrada aberto alimentando o anel de captura. As falas
+        detectadas são recortadas do anel já com o pré-roll (incluindo o início da fala),
+        sem reabrir o dispositivo a cada detecção.
+        """        
+        stream = None
         try:
-            stream = self.p.open(
-                format=AudioConfig.FORMAT,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.RATE,
-                input=True,
-                input_device_index=self.input_device_index,
-                frames_per_buffer=AudioConfig.CHUNK
-            )
+            self.capture_buffer.reset()
+            self._resolve_input_device()
+            stream = self._open_capture_stream(self._vad_capture_callback)
 
-            last_detection_time = None
-            continuous_detection_start_time = None
-            is_vad_active = False
+            vad, machine = self._create_vad()
+            if isinstance(vad, EnergyVAD):
+                vad.noise_floor = AudioConfig.NOISE_FLOOR / np.sqrt(AudioConfig.CHUNK)
+
+            pre_roll = int(AudioConfig.VAD_PRE_ROLL * AudioConfig.RATE) * AudioConfig.CHANNELS
+            post_roll = int(AudioConfig.VAD_POST_ROLL * AudioConfig.RATE) * AudioConfig.CHANNELS
+            position = 0
+            utterance_start = None
 
             log.info("Iniciando gravação VAD...")
             while self.is_recording_vad and not self.stop_event.is_set():
                 if self.fechando:
                     break
 
-                data = np.frombuffer(stream.read(AudioConfig.CHUNK), dtype=np.int16)
-                volume = np.linalg.norm(data)
+                # Atualização de dispositivos pendente: reabre a captura entre falas (não no meio de uma)
+                if utterance_start is None and self.audio_context.reinitialize_pending:
+                    stream = self._reopen_vad_stream(stream)
 
-                if volume < AudioConfig.NOISE_FLOOR:
-                    volume = 0
-                
-                log.debug("Volume detectado: %.2f, Limite: %.2f", volume, self.threshold)
+                if not self.capture_buffer.wait_for(position + AudioConfig.CHUNK, timeout=0.1):
+                    continue
+
+                end = self.capture_buffer.total_written
+                data = self.capture_buffer.read_range(position, end)
+                position = end
+                vad.threshold = self.noise_tracker.threshold
 
-                if volume > self.threshold:
-                    if continuous_detection_start_time is None:
-                        continuous_detection_start_time = time.time()
+                decisions = vad.process(data)
+                self.noise_tracker.update(vad.last_energy, decisions)
+                for event, frame in machine.update(decisions, vad.last_energy):
+                    sample = frame * vad.frame_size
+                    if event == 'start':
+                        log.info("Som detectado! Gravando...")
+                        
+                        if self.please_interrupt:
+                            self.interromper = True
+                        self.is_recording = True
+                        self.please_interrupt = True
+                        utterance_start = max(self.capture_buffer.oldest_available, sample - pre_roll)
+                        self._start_incremental(utterance_start)
                     else:
-                        elapsed_detection_time = time.time() - continuous_detection_start_time
-                        if elapsed_detection_time >= AudioConfig.DETECTION_TIME:
-                            if not is_vad_active:
-                                log.info("Som detectado! Gravando...")
-                                
-                                if self.please_interrupt:
-                                    self.interromper = True
-                                self.is_recording = True
-                                
-                                self.start_recording()
-                                is_vad_active = True
-                            last_detection_time = time.time()
-                else:
-                    continuous_detection_start_time = None
-                
-                if last_detection_time:
-                    elapsed_time = time.time() - last_detection_time
-                    if elapsed_time > AudioConfig.RECORD_TIME_AFTER_DETECTION and is_vad_active:
-                        log.info("Som finalizado. Aguardando...")
+                        log.info("Som finalizado após %.0f ms de silêncio. Aguardando...",
+                                 machine.last_endpoint_latency * 1000)
                         self.is_recording = False
-                        is_vad_active = False
+                        self.please_interrupt = False
+                        self._cut_utterance(utterance_start, sample + post_roll)
+                        utterance_start = None
+
+            # Entrega a fala em andamento se o VAD for desligado no meio dela
+            if utterance_start is not None:
+                self._cut_utterance(utterance_start, self.capture_buffer.total_written)
 
         except Exception as e:
             log.error("Erro durante gravação VAD: %s", e)
         finally:
-            stream.stop_stream()
-            stream.close()
+            if stream is not None:
+                try:
+                    stream.stop_stream()
+                    stream.close()
+                except Exception as e:
+                    log.debug("Stream VAD já estava fechado: %s", e)
             self.is_recording_vad = False
             self.is_recording = False
+            self.please_interrupt = False
             log.info("Gravação VAD finalizada.")
 
     def stop_recording(self):
@@ -338,19 +480,15 @@ class AudioHandler:
         self.stop_event.set()
         self.is_recording_vad = False
         self.is_recording = False
+        if self._incremental is not None:
+            self._incremental.stop()
+            self._incremental = None
         
+        self.audio_context.unsubscribe('output_device', self.set_output_device)
         with self.stream_lock:
-            if self.stream:
-                try:
-                    self.stream.stop_stream()
-                    self.stream.close()
-                except Exception as e:
-                    log.error("Erro ao fechar stream de saída: %s", e)
-        
-        try:
-            self.p.terminate()
-        except Exception as e:
-            log.error("Erro ao terminar PyAudio: %s", e)
+            # Fecha apenas os streams deste handler; o backend é do contexto compartilhado
+            self.audio_context.close_streams(owner=self)
+            self.stream = None
 
     def get_last_recorded_file(self):
         """Retorna o último arquivo de áudio gravado."""        
@@ -2,11 +2,11 @@ import threading
 import time
 import logging
 import json
-import io
 from ui.theme import DarkTheme
 from config.audio_config import AudioConfig, AudioDeviceConfig
 from config.log_config import LogConfig  # Importação do sistema de logs
 from modules.open_ai.tts.tts_base import get_audio_stream_manager
+from modules.audio.audio_context import get_audio_context
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -38,6 +38,7 @@ class EventHandlers:
             'vad_checkbox': self.vad_checkbox_callback,
             'spelling_correction': self.handle_spelling_correction,
             'toggle_logs': self.toggle_logs,  # Novo callback para controle de logs
+            'refresh_devices': self.refresh_audio_devices,
         }
 
     def toggle_logs(self):
@@ -60,9 +61,9 @@ class EventHandlers:
             log.info("Usando TTS-GPT4, enviando áudio diretamente sem transcrição")
             
             # Lê o conteúdo do áudio
-            if isinstance(audio_file, io.BytesIO):
-                # Se já é um BytesIO, usa diretamente
-                audio_data = audio_file.getvalue()
+            if hasattr(audio_file, 'getbuffer'):
+                # Se já está em memória (BytesIO ou WavView), usa diretamente
+                audio_data = audio_file.getbuffer()
             else:
                 # Se é um caminho de arquivo, abre e lê
                 with open(audio_file, 'rb') as f:
@@ -80,10 +81,20 @@ class EventHandlers:
                     self.vars['voice_engine'].get()
                 )
                 
-                # 2. Define o callback para atualizar o texto do chat
+                # 2. Define os callbacks para atualizar o texto do chat (aos poucos, durante o streaming)
+                streamed = {'started': False}
+
+                def update_chat_text_partial(text):
+                    if not streamed['started']:
+                        streamed['started'] = True
+                        self.components['chat_display'].start_message("Junin")
+                    self.components['chat_display'].append_to_message(text, "Junin")
+
                 def update_chat_text(text):
-                    self.components['chat_display'].add_message(text, "Junin")
-                self.handlers['speech'].set_transcript_callback(update_chat_text)
+                    # Sem streaming (ou sem trechos parciais), a transcrição chega inteira no fim
+                    if not streamed['started']:
+                        self.components['chat_display'].add_message(text, "Junin")
+                self.handlers['speech'].set_transcript_callback(update_chat_text, on_partial=update_chat_text_partial)
                 
                 # 3. Define o áudio para o TTS com skip_transcription=True
                 self.handlers['speech'].set_input_audio(audio_base64, skip_transcription=True)
@@ -284,9 +295,8 @@ class EventHandlers:
     def vad_checkbox_callback(self):
         """Lida com a mudança de estado da caixa de seleção VAD.""" 
         if self.vars['vad_enabled'].get():
-            # Apenas calibra o threshold, mas não inicia a gravação automaticamente
-            self.handlers['audio'].threshold = self.handlers['audio'].calibrate_noise_threshold()
-            log.info("VAD ativado e calibrado.")
+            # O ruído de fundo é estimado continuamente durante a captura, então ativar é instantâneo
+            log.info("VAD ativado. Limite adaptativo atual: %.2f", self.handlers['audio'].calibrate_noise_threshold())
         else:
             # Garante que a gravação VAD seja interrompida ao desativar
             if self.handlers['audio'].is_recording_vad:
@@ -294,6 +304,20 @@ class EventHandlers:
                 log.info("VAD desativado.")
         self.settings_manager.set_setting("vad_enabled", self.vars['vad_enabled'].get())
 
+    def refresh_audio_devices(self):
+        """Enumera os dispositivos de áudio de novo e atualiza as opções de entrada e saída."""
+        devices = AudioDeviceConfig.list_audio_devices(rescan=True)
+        for kind in ('input', 'output'):
+            menu = self.components[f'{kind}_device_menu']['menu']
+            menu.delete(0, 'end')
+            for device in devices[kind]:
+                menu.add_command(
+                    label=device['name'],
+                    command=lambda name=device['name'], var=self.vars[f'{kind}_device']: var.set(name)
+                )
+        log.info("Dispositivos de áudio atualizados: %d entrada(s), %d saída(s)",
+                 len(devices['input']), len(devices['output']))
+
     def on_input_device_select(self, *args):
         """Lida com a seleção do dispositivo de entrada.""" 
         try:
@@ -307,11 +331,7 @@ class EventHandlers:
             log.info("Iniciando atualização do dispositivo de entrada para: %s", selected_device)
             
             # Obtém o índice do dispositivo
-            audio_devices = AudioDeviceConfig.list_audio_devices()
-            device_index = next(
-                (device['index'] for device in audio_devices['input'] if device['name'] == selected_device), 
-                None
-            )
+            device_index = self.device_config.registry.index_for_name(selected_device, 'input')
             
             if device_index is not None:
                 # Atualiza o dispositivo no AudioHandler
@@ -338,26 +358,17 @@ class EventHandlers:
             log.info("Iniciando atualização do dispositivo de saída para: %s", selected_device)
             
             # Obtém o índice do dispositivo
-            audio_devices = AudioDeviceConfig.list_audio_devices()
-            device_index = next(
-                (device['index'] for device in audio_devices['output'] if device['name'] == selected_device), 
-                None
-            )
+            device_index = self.device_config.registry.index_for_name(selected_device, 'output')
             
             if device_index is not None:
-                # Atualiza o AudioHandler
-                if self.handlers['audio'].set_output_device(device_index):
-                    log.info("Dispositivo de saída atualizado no AudioHandler: %s", selected_device)
-                else:
-                    log.error("Falha ao atualizar dispositivo de saída no AudioHandler")
-                    return
+                # Garante que o AudioStreamManager global já está inscrito no contexto
+                get_audio_stream_manager()
 
-                # Atualiza o AudioStreamManager global
-                audio_stream = get_audio_stream_manager()
-                if audio_stream.update_output_device(selected_device):
-                    log.info("Dispositivo de saída atualizado no AudioStreamManager: %s", selected_device)
+                # Atualiza todos os consumidores (AudioHandler e AudioStreamManager) de uma vez
+                if get_audio_context().set_output_device(device_index):
+                    log.info("Dispositivo de saída atualizado em todos os consumidores: %s", selected_device)
                 else:
-                    log.error("Falha ao atualizar dispositivo de saída no AudioStreamManager")
+                    log.error("Falha ao atualizar dispositivo de saída")
                     return
 
                 # Salva a configuração e atualiza o dispositivo atual
@@ -378,9 +389,11 @@ class EventHandlers:
         if selected_option == "OnlineSpelling":
             audio_file = self.handlers['audio'].get_last_recorded_file()
             if audio_file:
-                # Usa o prompt de correção ortográfica carregado do TaskManager
-                system_message = self.handlers['task'].get_spelling_correction_prompt()
-                threading.Thread(target=self.handlers['speech'].transcribe_with_spellcheck, args=(system_message, audio_file)).start()
+                # A correção usa os termos do prompt carregado pelo TaskManager; o áudio já transcrito vem do cache
+                def correct_last_recording():
+                    text = self.handlers['speech'].transcribe_with_spellcheck(audio_file)
+                    self.components['chat_display'].add_message(text, "Eu")
+                threading.Thread(target=correct_last_recording, daemon=True).start()
 
     def on_monitor_settings_change(self, *args):
         """Lida com mudanças nas configurações do monitor.""" 
@@ -4,7 +4,13 @@ from openai import OpenAI
 from dotenv import load_dotenv
 from modules.open_ai.tts.tts import OpenAITTS
 from modules.open_ai.tts.pc_voice import PCVoiceTTS
+from config.audio_config import AudioConfig
 from modules.open_ai.stt.stt import SpeechToText
+from modules.open_ai.stt.chunked_transcriber import shutdown_executors
+from modules.open_ai.stt.stt_worker import shutdown_stt_worker_pool
+from modules.open_ai.stt.pipeline import MODE_SPELLCHECK
+from modules.open_ai.stt.transcription_cache import get_transcription_cache
+from modules.open_ai.tts.tts_cache import get_tts_cache
 
 # Carrega as variáveis de ambiente
 load_dotenv()
@@ -30,6 +36,10 @@ class SpeechHandler:
         # Armazena o TaskManager
         self.task_manager = task_manager
 
+        # Cache de áudio do TTS, criado antes dos engines para que usem esta configuração
+        self.tts_cache = get_tts_cache(AudioConfig.TTS_CACHE_SIZE_MB * 1024 * 1024, AudioConfig.TTS_CACHE_DIR,
+                                       AudioConfig.TTS_CACHE_DISK_MB * 1024 * 1024)
+
         # Inicializa os engines TTS
         self.openai_tts = OpenAITTS(
             voice_speed_var=voice_speed_var,
@@ -41,6 +51,15 @@ class SpeechHandler:
         self.current_engine = vars['voice_engine'].get() if vars else "tts-1"
         self.vars = vars
 
+        # Cache de transcrições compartilhado pelos pipelines (reenvios da mesma gravação)
+        self.transcription_cache = get_transcription_cache(AudioConfig.TRANSCRIPTION_CACHE_SIZE,
+                                                           AudioConfig.TRANSCRIPTION_CACHE_DIR)
+
+        # Pipeline de transcrição mantido entre gravações; refeito só quando o modo muda
+        self.stt = SpeechToText(self.client, log, self.task_manager, self.vars)
+        if vars:
+            vars['whisper'].trace('w', lambda *args: self.stt.get_pipeline())
+
         # Se o engine inicial for tts-gpt4, configura skip_transcription como True
         if self.current_engine == "tts-gpt4":
             self.openai_tts.skip_transcription = True
@@ -57,15 +76,16 @@ class SpeechHandler:
         if self.current_engine == "tts-gpt4":
             self.openai_tts.set_input_audio(audio_base64, skip_transcription)
 
-    def set_transcript_callback(self, callback):
+    def set_transcript_callback(self, callback, on_partial=None):
         """
         Define o callback para atualizar o texto do chat com a transcrição.
         
         Args:
             callback: Função a ser chamada quando houver uma nova transcrição
+            on_partial: Função chamada com cada trecho da transcrição enquanto a resposta chega
         """
         if self.current_engine == "tts-gpt4":
-            self.openai_tts.set_transcript_callback(callback)
+            self.openai_tts.set_transcript_callback(callback, on_partial)
 
     def get_available_voices(self, engine_type="tts-1"):
         """
@@ -99,6 +119,7 @@ class SpeechHandler:
         if engine_type in ["tts-1", "tts-1-hd", "tts-gpt4"]:
             self.openai_tts.set_voice(voice)
             self.openai_tts.set_model(engine_type)  # Define o modelo específico
+            self.openai_tts.prewarm(AudioConfig.TTS_PREWARM_PHRASES)  # Só sintetiza na primeira vez de cada voz
             # Define skip_transcription como True se for tts-gpt4
             self.openai_tts.skip_transcription = (engine_type == "tts-gpt4")
             log.info("Engine alterado para %s, skip_transcription: %s", engine_type, self.openai_tts.skip_transcription)
@@ -144,22 +165,58 @@ class SpeechHandler:
         try:
             self.openai_tts.cleanup()
             self.pc_tts.cleanup()
+            shutdown_executors()
+            shutdown_stt_worker_pool()
         except Exception as e:
             log.error("Erro durante a limpeza: %s", e)
 
+    def create_incremental_transcriber(self, on_partial=None):
+        """
+        Cria a transcrição incremental de uma nova fala, conforme o modo de transcrição atual.
+
+        Só é usada se a opção "Transcrição durante a fala" estiver marcada: no modo
+        online cada hipótese parcial é uma requisição ao whisper-1.
+
+        Args:
+            on_partial: Callback chamado com cada hipótese parcial
+
+        Returns:
+            IncrementalTranscriber | None: None se desativada ou se o áudio vai direto ao TTS-GPT4
+        """
+        enabled = AudioConfig.INCREMENTAL_TRANSCRIPTION
+        if self.vars and 'incremental_transcription' in self.vars:
+            enabled = self.vars['incremental_transcription'].get()
+        if not enabled or self.current_engine == "tts-gpt4":
+            return None
+        return self.stt.create_incremental(
+            on_partial=on_partial,
+            step=AudioConfig.INCREMENTAL_STEP,
+            commit_seconds=AudioConfig.INCREMENTAL_COMMIT_SECONDS,
+            vad_engine=AudioConfig.VAD_ENGINE
+        )
+
     def handle_recording_complete(self, audio_file):
         """Manipula a conclusão da gravação e transcreve o áudio."""
-        stt = SpeechToText(self.client, log, self.task_manager, self.vars)
-        
-        # Verifica o modo de transcrição selecionado na UI
-        whisper_mode = self.vars['whisper'].get() if self.vars else "Online"
-        log.info("Modo de transcrição selecionado: %s", whisper_mode)
-        
-        use_local = whisper_mode == "Local"
-        use_spellcheck = whisper_mode == "Com Correção Ortográfica"
-        
-        log.info("Usando modo de transcrição: %s", 'com correção ortográfica' if use_spellcheck else 'local' if use_local else 'normal')
-        log.info("Parâmetros de transcrição: use_local=%s, use_spellcheck=%s", use_local, use_spellcheck)
+        pipeline = self.stt.get_pipeline()
+        log.info("Modo de transcrição selecionado: %s", pipeline.mode)
         
         # Retorna o texto transcrito e indica se foi corrigido
-        return stt.transcribe_audio(audio_file, use_local=use_local, use_spellcheck=use_spellcheck), use_spellcheck
+        return pipeline.transcribe(audio_file), pipeline.use_spellcheck
+
+    def transcribe_with_spellcheck(self, audio_file):
+        """
+        Transcreve de novo uma gravação aplicando a correção ortográfica.
+
+        A transcrição bruta costuma vir do cache (a gravação já foi transcrita),
+        então só a correção é refeita.
+
+        Args:
+            audio_file: Gravação a ser reprocessada
+
+        Returns:
+            str: Texto corrigido
+        """
+        text = self.stt.get_pipeline(MODE_SPELLCHECK).transcribe(audio_file)
+        metrics = self.transcription_cache.get_metrics()
+        log.info("Cache de transcrições: %d acertos em %d consultas", metrics['hits'] + metrics['disk_hits'], metrics['lookups'])
+        return text
@@ -0,0 +1,36 @@
+"""
+Módulo de áudio local que fornece os blocos de captura e processamento usados pelo AudioHandler.
+
+Classes principais:
+- CaptureRingBuffer: Buffer circular pré-alocado alimentado pelo callback do PortAudio
+- WavView: Arquivo WAV somente leitura sobre um memoryview, sem cópia dos dados
+- read_wav_pcm/resample: Leitura do PCM de um WAV em memória e reamostragem polifásica
+- load_audio_file: Leitura de gravações WAV/FLAC do disco como PCM mono
+- decode_audio: Decodificação no processo (PCM/WAV direto, MP3/FLAC/Opus pelo libsndfile) para float32
+- PCMStreamDecoder: Conversão de PCM 16 bits recebido em pedaços (streaming) para float32
+- AudioDeviceRegistry: Registro dos dispositivos de áudio enumerado uma vez (com detecção de hot-plug)
+- AudioContext: Contexto de áudio único do processo (backend, streams e eventos compartilhados)
+"""
+
+from .capture_buffer import CaptureRingBuffer, WavView, build_wav_header
+from .pcm import read_wav_pcm, resample, load_audio_file, PCMStreamDecoder
+from .decode import decode_audio, parse_wav
+from .device_registry import AudioDeviceRegistry, get_device_registry
+from .audio_context import AudioContext, ManagedStream, get_audio_context
+
+__all__ = [
+    'CaptureRingBuffer',
+    'WavView',
+    'build_wav_header',
+    'read_wav_pcm',
+    'resample',
+    'load_audio_file',
+    'PCMStreamDecoder',
+    'decode_audio',
+    'parse_wav',
+    'AudioDeviceRegistry',
+    'get_device_registry',
+    'AudioContext',
+    'ManagedStream',
+    'get_audio_context'
+]
@@ -0,0 +1,258 @@
+import threading
+import logging
+from .backends import create_audio_backend
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+EVENTS = ('output_device', 'interrupt')
+
+
+class ManagedStream:
+    """
+    Stream entregue pelo AudioContext.
+
+    Repassa todos os métodos para o stream do backend e avisa o contexto ao ser
+    fechado, para que o contexto saiba quais streams ainda estão vivos.
+    """
+
+    def __init__(self, context, stream, owner, kind):
+        self._context = context
+        self._stream = stream
+        self.owner = owner
+        self.kind = kind
+        self.closed = False
+
+    def close(self):
+        """Fecha o stream no backend e o remove do contexto."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._stream.close()
+        finally:
+            self._context._forget(self)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class AudioContext:
+    """
+    Contexto de áudio único do processo.
+
+    Inicializa o backend (PortAudio) uma só vez, entrega os streams de entrada e
+    saída a quem pedir e acompanha o tempo de vida de cada um. Consumidores
+    (AudioHandler, AudioStreamManager) se inscrevem nos eventos do contexto para
+    que a troca do dispositivo de saída e a interrupção da fala (barge-in)
+    cheguem a todos de uma vez.
+    """
+
+    def __init__(self, backend_factory=create_audio_backend):
+        """
+        Args:
+            backend_factory: Função que cria o backend de áudio
+        """
+        self.backend_factory = backend_factory
+        self.lock = threading.RLock()
+        self.output_device_index = None
+        self.init_count = 0
+        self.reset_count = 0
+        self._backend = None
+        self._streams = []
+        self._reinitialize_pending = False
+        self._reinitialized = threading.Event()
+        self._reinitialized.set()
+        self._listeners = {event: [] for event in EVENTS}
+
+    @property
+    def backend(self):
+        """Backend de áudio compartilhado (inicializado no primeiro uso)."""
+        with self.lock:
+            if self._backend is None:
+                self._backend = self.backend_factory()
+                self.init_count += 1
+                log.info("Contexto de áudio inicializado (backend: %s)", getattr(self._backend, 'name', '?'))
+            return self._backend
+
+    def open_stream(self, owner=None, **kwargs):
+        """
+        Abre um stream no backend compartilhado.
+
+        Args:
+            owner: Objeto dono do stream (usado em close_streams e nas métricas)
+            **kwargs: Mesmos argumentos de AudioBackend.open
+
+        Returns:
+            ManagedStream: Stream rastreado pelo contexto
+        """
+        with self.lock:
+            stream = self.backend.open(**kwargs)
+            kind = 'input' if kwargs.get('input') else 'output'
+            managed = ManagedStream(self, stream, owner, kind)
+            self._streams.append(managed)
+            return managed
+
+    def _forget(self, managed):
+        with self.lock:
+            if managed in self._streams:
+                self._streams.remove(managed)
+            # A última captura liberou o dispositivo: executa a reinicialização adiada
+            if self._reinitialize_pending and not any(s.kind == 'input' for s in self._streams):
+                self.reinitialize()
+
+    def streams(self, owner=None):
+        """Retorna os streams abertos (de um dono, ou todos)."""
+        with self.lock:
+            return [s for s in self._streams if owner is None or s.owner is owner]
+
+    def close_streams(self, owner=None):
+        """Para e fecha os streams abertos de um dono (ou todos)."""
+        for managed in self.streams(owner):
+            try:
+                managed.stop_stream()
+            except Exception as e:
+                log.debug("Stream já estava parado: %s", e)
+            try:
+                managed.close()
+            except Exception as e:
+                log.error("Erro ao fechar stream: %s", e)
+
+    def get_sample_size(self, format):
+        return self.backend.get_sample_size(format)
+
+    def subscribe(self, event, callback):
+        """
+        Inscreve um callback em um evento do contexto.
+
+        Args:
+            event: 'output_device' (callback(device_index) -> bool) ou 'interrupt' (callback())
+            callback: Função chamada quando o evento ocorre
+        """
+        if event not in self._listeners:
+            raise ValueError(f"Evento de áudio desconhecido: {event}")
+        with self.lock:
+            self._listeners[event].append(callback)
+
+    def unsubscribe(self, event, callback):
+        with self.lock:
+            if callback in self._listeners.get(event, []):
+                self._listeners[event].remove(callback)
+
+    def set_output_device(self, device_index):
+        """
+        Troca o dispositivo de saída de todos os consumidores inscritos.
+
+        Returns:
+            bool: True se todos os consumidores aplicaram a troca
+        """
+        self.output_device_index = device_index
+        ok = True
+        for callback in list(self._listeners['output_device']):
+            try:
+                ok = callback(device_index) is not False and ok
+            except Exception as e:
+                log.error("Erro ao aplicar a troca do dispositivo de saída: %s", e)
+                ok = False
+        return ok
+
+    def interrupt(self):
+        """Interrompe imediatamente a reprodução em todos os consumidores inscritos (barge-in)."""
+        for callback in list(self._listeners['interrupt']):
+            try:
+                callback()
+            except Exception as e:
+                log.error("Erro ao interromper a reprodução: %s", e)
+
+    @property
+    def reinitialize_pending(self):
+        """True quando uma reinicialização espera os streams de entrada serem fechados."""
+        return self._reinitialize_pending
+
+    def reinitialize(self):
+        """
+        Fecha os streams e reinicializa o backend, para o PortAudio enumerar os dispositivos de novo.
+
+        Os streams de saída são fechados e reabertos pelos donos no próximo uso
+        (ManagedStream.closed). Com um stream de entrada aberto a reinicialização
+        fica pendente (reinitialize_pending) e é executada assim que o último
+        stream de entrada for fechado; a captura contínua do VAD fecha e reabre o
+        seu stream entre falas para liberá-la.
+
+        Returns:
+            bool: True se o backend foi reinicializado (ou ainda não existia)
+        """
+        with self.lock:
+            if self._backend is None:
+                self._finish_reinitialize()
+                return True
+            if any(s.kind == 'input' for s in self._streams):
+                if not self._reinitialize_pending:
+                    log.info("Reinicialização do backend adiada até a captura liberar o dispositivo de entrada")
+                self._reinitialize_pending = True
+                self._reinitialized.clear()
+                return False
+            # Limpa a pendência antes de fechar os streams (close -> _forget não reinicializa de novo)
+            self._reinitialize_pending = False
+            self.close_streams()
+            try:
+                self._backend.terminate()
+            except Exception as e:
+                log.error("Erro ao terminar o backend de áudio: %s", e)
+            self._backend = None
+            self.reset_count += 1
+            self._finish_reinitialize()
+            log.info("Backend de áudio reinicializado para atualizar os dispositivos")
+            return True
+
+    def _finish_reinitialize(self):
+        self._reinitialize_pending = False
+        self._reinitialized.set()
+
+    def wait_reinitialized(self, timeout):
+        """
+        Espera a reinicialização pendente ser executada.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            bool: True se não há reinicialização pendente
+        """
+        return self._reinitialized.wait(timeout)
+
+    def get_metrics(self):
+        """Retorna as inicializações e reinicializações do backend, a pendência e os streams abertos por tipo."""
+        with self.lock:
+            return {
+                'init_count': self.init_count,
+                'reset_count': self.reset_count,
+                'reinitialize_pending': self._reinitialize_pending,
+                'input_streams': sum(1 for s in self._streams if s.kind == 'input'),
+                'output_streams': sum(1 for s in self._streams if s.kind == 'output')
+            }
+
+    def shutdown(self):
+        """Fecha todos os streams e libera o backend (apenas no encerramento do aplicativo)."""
+        self.close_streams()
+        with self.lock:
+            if self._backend is not None:
+                try:
+                    self._backend.terminate()
+                except Exception as e:
+                    log.error("Erro ao terminar o backend de áudio: %s", e)
+                self._backend = None
+            log.info("Contexto de áudio encerrado")
+
+
+_context_instance = None
+_context_lock = threading.Lock()
+
+def get_audio_context():
+    """Retorna o contexto de áudio compartilhado pelo processo."""
+    global _context_instance
+    with _context_lock:
+        if _context_instance is None:
+            _context_instance = AudioContext()
+        return _context_instance
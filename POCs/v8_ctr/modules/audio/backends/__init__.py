@@ -0,0 +1,59 @@
+"""
+Módulo de backends de áudio: isola o acesso ao PortAudio para que toda a pilha de áudio
+(captura -> STT -> TTS -> reprodução) também rode sem placa de som.
+
+Classes principais:
+- AudioBackend: Interface comum (mesma API do pyaudio.PyAudio)
+- PortAudioBackend: Implementação com a placa de som via PyAudio
+- FileAudioBackend: Implementação que lê fixtures WAV/áudio sintético e grava a reprodução em buffers
+
+O backend é escolhido pela variável de ambiente JUNIN_AUDIO_BACKEND
+("portaudio", "file" ou "synthetic"). O backend "file" lê os arquivos listados em
+JUNIN_AUDIO_FIXTURES (separados por os.pathsep) e ambos os backends sem placa de som
+usam JUNIN_AUDIO_SPEED como ritmo (1.0 = tempo real, 0 = sem espera) e
+JUNIN_AUDIO_LOOP ("1" ou "0") para repetir a entrada.
+"""
+
+import os
+from .base_backend import (
+    AudioBackend, CONTINUE, COMPLETE, ABORT, FORMAT_FLOAT32, FORMAT_INT16
+)
+from .portaudio_backend import PortAudioBackend
+from .file_backend import FileAudioBackend, PlaybackRecording, synthetic_utterances
+
+def create_audio_backend(name=None):
+    """
+    Cria o backend de áudio configurado.
+
+    Args:
+        name: "portaudio", "file" ou "synthetic" (padrão: JUNIN_AUDIO_BACKEND ou "portaudio")
+
+    Returns:
+        AudioBackend: Instância do backend
+    """
+    name = name or os.getenv('JUNIN_AUDIO_BACKEND', 'portaudio')
+    speed = float(os.getenv('JUNIN_AUDIO_SPEED', '1.0'))
+    loop = os.getenv('JUNIN_AUDIO_LOOP', '1' if name == 'synthetic' else '0') == '1'
+
+    if name == 'portaudio':
+        return PortAudioBackend()
+    if name == 'file':
+        fixtures = [path for path in os.getenv('JUNIN_AUDIO_FIXTURES', '').split(os.pathsep) if path]
+        return FileAudioBackend(sources=fixtures, speed=speed, loop=loop)
+    if name == 'synthetic':
+        return FileAudioBackend(sources=[synthetic_utterances(24000)], speed=speed, loop=loop)
+    raise ValueError(f"Backend de áudio desconhecido: {name}")
+
+__all__ = [
+    'AudioBackend',
+    'PortAudioBackend',
+    'FileAudioBackend',
+    'PlaybackRecording',
+    'create_audio_backend',
+    'synthetic_utterances',
+    'CONTINUE',
+    'COMPLETE',
+    'ABORT',
+    'FORMAT_FLOAT32',
+    'FORMAT_INT16'
+]
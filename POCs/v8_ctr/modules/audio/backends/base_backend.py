@@ -0,0 +1,77 @@
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Formatos de amostra (mesmos valores do PortAudio)
+FORMAT_FLOAT32 = 1
+FORMAT_INT16 = 8
+
+# Retornos do callback de stream (mesmos valores do PortAudio)
+CONTINUE = 0
+COMPLETE = 1
+ABORT = 2
+
+SAMPLE_SIZES = {
+    FORMAT_FLOAT32: 4,
+    FORMAT_INT16: 2
+}
+
+
+class AudioBackend:
+    """
+    Interface de backend de áudio.
+
+    Segue a mesma API do pyaudio.PyAudio (open, get_device_count,
+    get_device_info_by_index, ...) para que o AudioHandler, o AudioStreamManager
+    e o AudioDeviceConfig possam trocar o PortAudio por um backend sem placa de som.
+    """
+
+    name = "base"
+
+    def open(self, format, channels, rate, input=False, output=False, input_device_index=None,
+             output_device_index=None, frames_per_buffer=1024, start=True, stream_callback=None):
+        """
+        Abre um stream de entrada ou saída.
+
+        Args:
+            format: FORMAT_INT16 ou FORMAT_FLOAT32
+            channels: Número de canais
+            rate: Taxa de amostragem em Hz
+            input: True para stream de captura
+            output: True para stream de reprodução
+            input_device_index: Índice do dispositivo de entrada (None = padrão)
+            output_device_index: Índice do dispositivo de saída (None = padrão)
+            frames_per_buffer: Quadros por bloco
+            start: Inicia o stream imediatamente
+            stream_callback: Callback no formato do PortAudio (in_data, frame_count, time_info, status)
+
+        Returns:
+            Stream com read/write/start_stream/stop_stream/close/is_active
+        """
+        raise NotImplementedError("Método open deve ser implementado pela classe filha")
+
+    def get_device_count(self):
+        """Retorna o número de dispositivos."""
+        raise NotImplementedError("Método get_device_count deve ser implementado pela classe filha")
+
+    def get_device_info_by_index(self, index):
+        """Retorna o dicionário de informações do dispositivo (name, index, maxInputChannels, ...)."""
+        raise NotImplementedError("Método get_device_info_by_index deve ser implementado pela classe filha")
+
+    def get_default_input_device_info(self):
+        """Retorna as informações do dispositivo de entrada padrão."""
+        raise NotImplementedError("Método get_default_input_device_info deve ser implementado pela classe filha")
+
+    def get_default_output_device_info(self):
+        """Retorna as informações do dispositivo de saída padrão."""
+        raise NotImplementedError("Método get_default_output_device_info deve ser implementado pela classe filha")
+
+    def get_sample_size(self, format):
+        """Retorna o tamanho em bytes de uma amostra no formato informado."""
+        return SAMPLE_SIZES[format]
+
+    def terminate(self):
+        """Libera os recursos do backend."""
+        pass
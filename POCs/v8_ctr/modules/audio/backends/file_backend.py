@@ -0,0 +1,286 @@
+import threading
+import time
+import numpy as np
+from .base_backend import AudioBackend, CONTINUE, FORMAT_FLOAT32, FORMAT_INT16
+from ..vad.offline import load_wav_fixture
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+INPUT_DEVICE_INDEX = 0
+OUTPUT_DEVICE_INDEX = 1
+
+
+def synthetic_utterances(rate, count=3, seed=0):
+    """
+    Gera um áudio sintético com falas harmônicas separadas por silêncio com ruído leve.
+
+    Returns:
+        np.ndarray: Amostras int16
+    """
+    rng = np.random.default_rng(seed)
+    parts = []
+    for _ in range(count):
+        silence = rng.standard_normal(int(rng.uniform(0.8, 1.5) * rate)) * 30
+        duration = rng.uniform(0.8, 2.0)
+        t = np.arange(int(duration * rate)) / rate
+        phase = 2 * np.pi * np.cumsum(rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / rate
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 12)) * (0.55 + 0.45 * np.sin(2 * np.pi * 4 * t) ** 2)
+        parts.extend([silence, voiced * rng.uniform(1500, 4000) + rng.standard_normal(len(t)) * 30])
+    parts.append(rng.standard_normal(rate) * 30)
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+
+
+def _to_format(samples, format):
+    """Converte amostras int16 para os bytes do formato pedido."""
+    if format == FORMAT_FLOAT32:
+        return (samples.astype(np.float32) * (1.0 / 32768.0)).tobytes()
+    return samples.tobytes()
+
+
+class _Pacer:
+    """Controla o ritmo de um stream: tempo real (speed=1), acelerado (speed>1) ou sem espera (speed=0)."""
+
+    def __init__(self, rate, speed):
+        self.rate = rate
+        self.speed = speed
+        self.start = time.perf_counter()
+        self.frames = 0
+
+    def advance(self, frames):
+        self.frames += frames
+        if self.speed <= 0:
+            return
+        delay = self.start + self.frames / (self.rate * self.speed) - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PlaybackRecording:
+    """Áudio reproduzido em um stream de saída do backend de arquivo, com marcação de tempo."""
+
+    def __init__(self, format, channels, rate):
+        self.format = format
+        self.channels = channels
+        self.rate = rate
+        self.data = bytearray()
+        self.opened_at = time.perf_counter()
+        self.first_sound_at = None
+        self.blocks = []  # (perf_counter, quadros, tem_som)
+
+    def append(self, data):
+        """Registra um bloco reproduzido."""
+        if not data:
+            return
+        dtype = np.float32 if self.format == FORMAT_FLOAT32 else np.int16
+        block = np.frombuffer(data, dtype=dtype)
+        has_sound = bool(np.any(block))
+        now = time.perf_counter()
+        if has_sound and self.first_sound_at is None:
+            self.first_sound_at = now
+        self.blocks.append((now, len(block) // self.channels, has_sound))
+        self.data += data
+
+    def samples(self):
+        """Retorna o áudio reproduzido como array NumPy (float32 ou int16)."""
+        dtype = np.float32 if self.format == FORMAT_FLOAT32 else np.int16
+        return np.frombuffer(bytes(self.data), dtype=dtype)
+
+
+class _FileStream:
+    """Stream base do backend de arquivo (mesma API do pyaudio.Stream)."""
+
+    def __init__(self, backend, format, channels, rate, frames_per_buffer, stream_callback, start):
+        self.backend = backend
+        self.format = format
+        self.channels = channels
+        self.rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.callback = stream_callback
+        self._running = False
+        self._closed = False
+        self._thread = None
+        self._pacer = None
+        if start:
+            self.start_stream()
+
+    def start_stream(self):
+        if self._running or self._closed:
+            return
+        self._running = True
+        self._pacer = _Pacer(self.rate, self.backend.speed)
+        if self.callback:
+            self._thread = threading.Thread(target=self._callback_loop, daemon=True)
+            self._thread.start()
+
+    def stop_stream(self):
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def close(self):
+        self.stop_stream()
+        self._closed = True
+
+    def is_active(self):
+        if self.callback:
+            return self._running and self._thread is not None and self._thread.is_alive()
+        return self._running
+
+    def is_stopped(self):
+        return not self._running
+
+    def _callback_loop(self):
+        raise NotImplementedError
+
+
+class FileInputStream(_FileStream):
+    """Stream de captura que lê o áudio das fontes do backend no ritmo configurado."""
+
+    def read(self, num_frames, exception_on_overflow=True):
+        """Lê o próximo bloco (bloqueante, respeitando o ritmo do backend)."""
+        block = self.backend._next_input_block(num_frames * self.channels)
+        self._pacer.advance(num_frames)
+        return _to_format(block, self.format)
+
+    def _callback_loop(self):
+        while self._running:
+            block = self.backend._next_input_block(self.frames_per_buffer * self.channels)
+            self._pacer.advance(self.frames_per_buffer)
+            if not self._running:
+                break
+            _, flag = self.callback(_to_format(block, self.format), self.frames_per_buffer, {}, 0)
+            if flag != CONTINUE:
+                break
+        self._running = False
+
+
+class BufferOutputStream(_FileStream):
+    """Stream de reprodução que grava em memória tudo o que seria tocado."""
+
+    def __init__(self, backend, format, channels, rate, frames_per_buffer, stream_callback, start):
+        self.recording = PlaybackRecording(format, channels, rate)
+        super().__init__(backend, format, channels, rate, frames_per_buffer, stream_callback, start)
+
+    def write(self, frames, num_frames=None, exception_on_underflow=False):
+        """Registra o bloco e espera o tempo que ele levaria para tocar."""
+        self.recording.append(bytes(frames))
+        bytes_per_frame = self.backend.get_sample_size(self.format) * self.channels
+        self._pacer.advance(num_frames or len(frames) // bytes_per_frame)
+
+    def _callback_loop(self):
+        while self._running:
+            data, flag = self.callback(None, self.frames_per_buffer, {}, 0)
+            self.recording.append(data)
+            self._pacer.advance(self.frames_per_buffer)
+            if flag != CONTINUE:
+                break
+        self._running = False
+
+
+class FileAudioBackend(AudioBackend):
+    """
+    Implementação do backend sem placa de som.
+
+    A entrada lê fixtures WAV (ou áudio sintético) em tempo real ou acelerado; a
+    saída grava em buffers tudo o que seria reproduzido, com marcação de tempo.
+    Permite rodar e medir captura -> STT -> TTS -> reprodução em uma máquina sem
+    dispositivo de áudio.
+    """
+
+    name = "file"
+
+    def __init__(self, sources=None, speed=1.0, loop=False, rate=24000):
+        """
+        Args:
+            sources: Lista de caminhos WAV ou arrays int16 (já na taxa `rate`)
+            speed: 1.0 = tempo real, >1 = acelerado, 0 = sem espera
+            loop: Recomeça as fontes ao terminar (caso contrário, entrega silêncio)
+            rate: Taxa de amostragem usada pelos streams
+        """
+        self.speed = speed
+        self.loop = loop
+        self.rate = rate
+        self.recordings = []
+        self.input_exhausted = threading.Event()
+        self._lock = threading.Lock()
+        self._input = self._load_sources(sources or [], rate)
+        self._input_pos = 0
+
+    @staticmethod
+    def _load_sources(sources, rate):
+        """Carrega as fontes, convertendo para int16 mono na taxa pedida."""
+        parts = []
+        for source in sources:
+            if isinstance(source, str):
+                samples, source_rate = load_wav_fixture(source)
+                if source_rate != rate:
+                    positions = np.arange(int(len(samples) * rate / source_rate)) * (source_rate / rate)
+                    samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+                parts.append(samples)
+            else:
+                parts.append(np.asarray(source, dtype=np.int16))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+
+    @property
+    def input_position(self):
+        """Posição atual da leitura de entrada em segundos."""
+        return self._input_pos / float(self.rate)
+
+    def _next_input_block(self, size):
+        """Retorna o próximo bloco de entrada (silêncio após o fim das fontes, se não houver loop)."""
+        with self._lock:
+            block = np.zeros(size, dtype=np.int16)
+            filled = 0
+            while filled < size and len(self._input):
+                if self._input_pos >= len(self._input):
+                    if not self.loop:
+                        self.input_exhausted.set()
+                        break
+                    self._input_pos = 0
+                take = min(size - filled, len(self._input) - self._input_pos)
+                block[filled:filled + take] = self._input[self._input_pos:self._input_pos + take]
+                filled += take
+                self._input_pos += take
+            if not self.loop and self._input_pos >= len(self._input):
+                self.input_exhausted.set()
+            return block
+
+    def _device(self, index):
+        return {
+            'index': index,
+            'name': "Arquivo de áudio (entrada)" if index == INPUT_DEVICE_INDEX else "Buffer de reprodução (saída)",
+            'maxInputChannels': 1 if index == INPUT_DEVICE_INDEX else 0,
+            'maxOutputChannels': 2 if index == OUTPUT_DEVICE_INDEX else 0,
+            'defaultSampleRate': float(self.rate),
+            'hostApi': 0
+        }
+
+    def open(self, format, channels, rate, input=False, output=False, input_device_index=None,
+             output_device_index=None, frames_per_buffer=1024, start=True, stream_callback=None):
+        if format not in (FORMAT_INT16, FORMAT_FLOAT32):
+            raise ValueError(f"Formato não suportado pelo backend de arquivo: {format}")
+        if input:
+            return FileInputStream(self, format, channels, rate, frames_per_buffer, stream_callback, start)
+        if output:
+            stream = BufferOutputStream(self, format, channels, rate, frames_per_buffer, stream_callback, start)
+            self.recordings.append(stream.recording)
+            return stream
+        raise ValueError("O stream precisa ser de entrada ou de saída")
+
+    def get_device_count(self):
+        return 2
+
+    def get_device_info_by_index(self, index):
+        if index not in (INPUT_DEVICE_INDEX, OUTPUT_DEVICE_INDEX):
+            raise IOError(f"Dispositivo inválido: {index}")
+        return self._device(index)
+
+    def get_default_input_device_info(self):
+        return self._device(INPUT_DEVICE_INDEX)
+
+    def get_default_output_device_info(self):
+        return self._device(OUTPUT_DEVICE_INDEX)
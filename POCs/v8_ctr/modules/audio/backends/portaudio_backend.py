@@ -0,0 +1,36 @@
+from .base_backend import AudioBackend
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+class PortAudioBackend(AudioBackend):
+    """Implementação do backend usando a placa de som via PyAudio/PortAudio"""
+
+    name = "portaudio"
+
+    def __init__(self):
+        import pyaudio
+        self._pa = pyaudio.PyAudio()
+
+    def open(self, *args, **kwargs):
+        return self._pa.open(*args, **kwargs)
+
+    def get_device_count(self):
+        return self._pa.get_device_count()
+
+    def get_device_info_by_index(self, index):
+        return self._pa.get_device_info_by_index(index)
+
+    def get_default_input_device_info(self):
+        return self._pa.get_default_input_device_info()
+
+    def get_default_output_device_info(self):
+        return self._pa.get_default_output_device_info()
+
+    def get_sample_size(self, format):
+        return self._pa.get_sample_size(format)
+
+    def terminate(self):
+        self._pa.terminate()
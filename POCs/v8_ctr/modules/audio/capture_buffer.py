@@ -0,0 +1,283 @@
+import io
+import struct
+import threading
+import weakref
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+WAV_HEADER_SIZE = 44
+SAMPLE_WIDTH = 2  # int16
+
+
+def build_wav_header(num_samples, rate, channels=1, sample_width=SAMPLE_WIDTH):
+    """
+    Monta o cabeçalho RIFF/WAVE PCM de 44 bytes.
+
+    Args:
+        num_samples: Número total de amostras (quadros * canais)
+        rate: Taxa de amostragem em Hz
+        channels: Número de canais
+        sample_width: Largura da amostra em bytes
+
+    Returns:
+        bytes: Cabeçalho WAV
+    """
+    data_size = num_samples * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, rate,
+        rate * channels * sample_width, channels * sample_width, sample_width * 8,
+        b'data', data_size
+    )
+
+
+class WavView(io.RawIOBase):
+    """
+    Arquivo WAV somente leitura sobre um memoryview.
+
+    Compatível com o uso que o restante do app faz de io.BytesIO (read, seek,
+    getvalue, name), mas não copia os dados da gravação. dropped_seconds informa
+    quanto do início pedido já tinha sido sobrescrito no anel de captura.
+    """
+
+    def __init__(self, view, sample_rate, channels=1, name="output.wav", dropped_seconds=0.0):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dropped_seconds = dropped_seconds
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        """Copia os próximos bytes para o buffer fornecido."""
+        remaining = len(self._view) - self._pos
+        size = min(len(buffer), remaining)
+        if size <= 0:
+            return 0
+        buffer[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+        self._pos = max(0, position)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def getbuffer(self):
+        """Retorna o memoryview do arquivo WAV completo (sem cópia)."""
+        return self._view
+
+    def getvalue(self):
+        """Retorna o conteúdo do arquivo WAV como bytes (gera uma cópia)."""
+        return bytes(self._view)
+
+    def pcm(self):
+        """Retorna as amostras int16 como array NumPy (sem cópia)."""
+        return np.frombuffer(self._view, dtype=np.int16, offset=WAV_HEADER_SIZE)
+
+    @property
+    def duration(self):
+        """Duração do áudio em segundos."""
+        samples = (len(self._view) - WAV_HEADER_SIZE) // SAMPLE_WIDTH
+        return samples / float(self.sample_rate * self.channels)
+
+
+class CaptureRingBuffer:
+    """
+    Buffer circular pré-alocado para captura de áudio int16.
+
+    O callback do PortAudio escreve direto no anel, sem alocar objetos por chunk.
+    Os 44 bytes anteriores ao anel são reservados para o cabeçalho WAV, de forma
+    que uma gravação que começa no início do anel pode ser entregue como WAV
+    sem nenhuma cópia. A capacidade é fixa: uma gravação mais longa perde o
+    início, o que é registrado no log e em WavView.dropped_seconds.
+    """
+
+    def __init__(self, capacity_seconds, rate, channels=1):
+        """
+        Inicializa o buffer de captura.
+
+        Args:
+            capacity_seconds: Duração máxima mantida no anel, em segundos
+            rate: Taxa de amostragem em Hz
+            channels: Número de canais
+        """
+        self.rate = rate
+        self.channels = channels
+        self.capacity = int(capacity_seconds * rate) * channels
+        self._cond = threading.Condition()
+        self._exported = None
+        self._allocate()
+        self._total = 0
+
+    def _allocate(self):
+        """Aloca o armazenamento do anel (np.empty não toca nas páginas de memória)."""
+        self._backing = np.empty(WAV_HEADER_SIZE + self.capacity * SAMPLE_WIDTH, dtype=np.uint8)
+        self._samples = self._backing[WAV_HEADER_SIZE:].view(np.int16)
+
+    def reset(self):
+        """Descarta o conteúdo atual e prepara o anel para uma nova gravação."""
+        with self._cond:
+            # Se o último WAV entregue ainda está em uso, ele continua apontando
+            # para o armazenamento antigo; a nova gravação usa um anel novo.
+            if self._exported is not None and self._exported() is not None:
+                self._allocate()
+            self._exported = None
+            self._total = 0
+
+    @property
+    def total_written(self):
+        """Número absoluto de amostras escritas desde o último reset."""
+        return self._total
+
+    @property
+    def oldest_available(self):
+        """Índice absoluto da amostra mais antiga ainda presente no anel."""
+        return max(0, self._total - self.capacity)
+
+    @property
+    def overflowed(self):
+        """Indica se amostras antigas já foram sobrescritas."""
+        return self._total > self.capacity
+
+    @property
+    def capacity_seconds(self):
+        """Duração máxima mantida no anel, em segundos."""
+        return self.capacity / float(self.rate * self.channels)
+
+    def write(self, data):
+        """
+        Escreve um bloco de áudio int16 no anel.
+
+        Args:
+            data: bytes ou array int16 recebido do stream de entrada
+        """
+        chunk = np.frombuffer(data, dtype=np.int16) if not isinstance(data, np.ndarray) else data
+        size = len(chunk)
+        if size == 0:
+            return
+
+        with self._cond:
+            total = self._total
+            if size > self.capacity:
+                total += size - self.capacity
+                chunk = chunk[-self.capacity:]
+                size = self.capacity
+
+            start = total % self.capacity
+            first = min(size, self.capacity - start)
+            self._samples[start:start + first] = chunk[:first]
+            if first < size:
+                self._samples[:size - first] = chunk[first:]
+
+            self._total = total + size
+            self._cond.notify_all()
+
+    def wait_for(self, min_total, timeout=None):
+        """
+        Aguarda até que o anel tenha recebido pelo menos min_total amostras.
+
+        Returns:
+            bool: True se a condição foi atingida antes do timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._total >= min_total, timeout=timeout)
+
+    def _clamp(self, start, end):
+        """Limita um intervalo absoluto ao conteúdo ainda presente no anel."""
+        end = self._total if end is None else min(end, self._total)
+        start = max(start, self._total - self.capacity, 0)
+        return start, max(start, end)
+
+    def read_range(self, start, end=None, out=None):
+        """
+        Copia um intervalo absoluto de amostras.
+
+        Args:
+            start: Índice absoluto inicial
+            end: Índice absoluto final (exclusivo); padrão é o fim atual
+            out: Array int16 de destino opcional (evita uma alocação extra)
+
+        Returns:
+            np.ndarray: Amostras int16 do intervalo disponível
+        """
+        with self._cond:
+            start, end = self._clamp(start, end)
+            size = end - start
+            if out is None:
+                out = np.empty(size, dtype=np.int16)
+            if size == 0:
+                return out[:0]
+
+            first_pos = start % self.capacity
+            first = min(size, self.capacity - first_pos)
+            out[:first] = self._samples[first_pos:first_pos + first]
+            if first < size:
+                out[first:size] = self._samples[:size - first]
+            return out[:size]
+
+    def wav_view(self, start=0, end=None, name="output.wav", copy=False):
+        """
+        Entrega um intervalo da gravação como arquivo WAV.
+
+        Quando o intervalo começa no início do anel e não houve sobrescrita, o
+        cabeçalho é escrito no espaço reservado e o WAV é um memoryview do próprio
+        anel (zero cópia). Caso contrário, ou com copy=True (anel que continua
+        sendo escrito), o intervalo é copiado uma única vez.
+
+        Returns:
+            WavView: Arquivo WAV pronto para envio (dropped_seconds > 0 se o início foi sobrescrito)
+        """
+        with self._cond:
+            requested_start = start
+            start, end = self._clamp(start, end)
+            if not copy and start == 0 and not self.overflowed:
+                self._backing[:WAV_HEADER_SIZE] = np.frombuffer(
+                    build_wav_header(end, self.rate, self.channels), dtype=np.uint8
+                )
+                view = memoryview(self._backing)[:WAV_HEADER_SIZE + end * SAMPLE_WIDTH]
+                wav = WavView(view, self.rate, self.channels, name=name)
+                self._exported = weakref.ref(wav)
+                return wav
+
+            dropped_seconds = (start - requested_start) / float(self.rate * self.channels)
+            if dropped_seconds > 0:
+                log.warning("Gravação excedeu a capacidade do buffer de captura (%.0f s): os primeiros %.1f s "
+                            "foram descartados", self.capacity_seconds, dropped_seconds)
+
+            size = end - start
+            backing = np.empty(WAV_HEADER_SIZE + size * SAMPLE_WIDTH, dtype=np.uint8)
+            backing[:WAV_HEADER_SIZE] = np.frombuffer(build_wav_header(size, self.rate, self.channels), dtype=np.uint8)
+            self.read_range(start, end, out=backing[WAV_HEADER_SIZE:].view(np.int16))
+            return WavView(memoryview(backing), self.rate, self.channels, name=name, dropped_seconds=dropped_seconds)
+
+    @staticmethod
+    def samples_to_wav(samples, rate, channels=1, name="output.wav"):
+        """Monta um WavView a partir de amostras int16 com uma única cópia."""
+        samples = np.asarray(samples, dtype=np.int16)
+        backing = np.empty(WAV_HEADER_SIZE + samples.size * SAMPLE_WIDTH, dtype=np.uint8)
+        backing[:WAV_HEADER_SIZE] = np.frombuffer(build_wav_header(samples.size, rate, channels), dtype=np.uint8)
+        backing[WAV_HEADER_SIZE:].view(np.int16)[:] = samples
+        return WavView(memoryview(backing), rate, channels, name=name)
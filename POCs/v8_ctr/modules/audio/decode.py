@@ -0,0 +1,141 @@
+import io
+import struct
+import numpy as np
+from .pcm import resample
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Formatos decodificados no próprio processo (PCM/WAV direto, os demais pelo libsndfile)
+IN_PROCESS_FORMATS = ('pcm', 'pcm16', 'wav', 'flac', 'mp3', 'opus', 'ogg')
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _scale_int16(samples, normalize):
+    """Converte int16 para float32 em uma única passada (escala e normalização de pico juntas)."""
+    out = np.empty(len(samples), dtype=np.float32)
+    if not len(samples):
+        return out
+    scale = 1.0 / 32768.0
+    if normalize:
+        peak = max(int(samples.max()), -int(samples.min()))
+        if peak:
+            scale = 1.0 / peak
+    np.multiply(samples, np.float32(scale), out=out, casting='unsafe')
+    return out
+
+
+def _mono(samples, channels):
+    """Mistura canais intercalados em mono."""
+    if channels <= 1:
+        return samples
+    frames = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    return frames.mean(axis=1, dtype=np.float32) if samples.dtype == np.float32 else frames.mean(axis=1).astype(samples.dtype)
+
+
+def parse_wav(data):
+    """
+    Lê o cabeçalho de um WAV em memória sem copiar as amostras.
+
+    Aceita o tamanho de dados "infinito" (0 ou 0xFFFFFFFF) usado por WAVs
+    gerados em streaming, considerando os dados até o fim do buffer.
+
+    Args:
+        data: Bytes do arquivo WAV
+
+    Returns:
+        tuple: (amostras int16 ou float32 intercaladas, taxa, canais)
+
+    Raises:
+        ValueError: Se o WAV não for PCM 16 bits nem float 32 bits
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("Arquivo WAV inválido")
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(data):
+        chunk_id, size = struct.unpack_from('<4sI', data, offset)
+        offset += 8
+        if chunk_id == b'fmt ':
+            audio_format, channels, rate, _, _, bits = struct.unpack_from('<HHIIHH', data, offset)
+            if audio_format == _WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                audio_format = struct.unpack_from('<H', data, offset + 24)[0]
+            fmt = (audio_format, channels, rate, bits)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV sem bloco fmt antes dos dados")
+            audio_format, channels, rate, bits = fmt
+            end = len(data) if size in (0, 0xFFFFFFFF) else min(len(data), offset + size)
+            if audio_format == _WAVE_FORMAT_PCM and bits == 16:
+                dtype = np.dtype('<i2')
+            elif audio_format == _WAVE_FORMAT_FLOAT and bits == 32:
+                dtype = np.dtype('<f4')
+            else:
+                raise ValueError(f"WAV não suportado: formato {audio_format}, {bits} bits")
+            count = (end - offset) // dtype.itemsize
+            return np.frombuffer(data, dtype=dtype, count=count, offset=offset), rate, channels
+        offset += size + (size & 1)
+    raise ValueError("WAV sem bloco de dados")
+
+
+def _decode_libsndfile(data):
+    """Decodifica MP3/FLAC/OGG/Opus no processo com o libsndfile (soundfile)."""
+    import soundfile as sf
+    samples, rate = sf.read(io.BytesIO(data), dtype='int16', always_2d=True)
+    if samples.shape[1] > 1:
+        return samples.mean(axis=1).astype(np.int16), rate
+    return samples[:, 0], rate
+
+
+def _decode_ffmpeg(data, format):
+    """Último recurso para formatos sem decodificador no processo (AAC): pydub + subprocesso ffmpeg."""
+    from pydub import AudioSegment
+    segment = AudioSegment.from_file(io.BytesIO(data), format=format).set_channels(1).set_sample_width(2)
+    return np.frombuffer(segment.raw_data, dtype=np.int16), segment.frame_rate
+
+
+def decode_audio(data, format, rate=24000, normalize=False):
+    """
+    Decodifica um áudio em memória para float32 mono na taxa pedida.
+
+    PCM e WAV são lidos direto do buffer; MP3, FLAC e Opus são decodificados no
+    processo pelo libsndfile. Só formatos sem decodificador local (AAC) passam
+    pelo ffmpeg. A conversão para float32 e a normalização de pico são feitas
+    em uma única passada sobre as amostras.
+
+    Args:
+        data: Bytes do áudio
+        format: Formato ("pcm", "wav", "mp3", "flac", "opus", "aac", ...)
+        rate: Taxa de saída (PCM bruto é considerado nesta taxa)
+        normalize: Normaliza pelo pico (máximo absoluto = 1.0)
+
+    Returns:
+        np.ndarray: Amostras float32
+    """
+    format = format.lower()
+    if format in ('pcm', 'pcm16'):
+        usable = len(data) & ~1
+        samples, source_rate = np.frombuffer(data, dtype='<i2', count=usable // 2), rate
+    elif format == 'wav':
+        samples, source_rate, channels = parse_wav(data)
+        samples = _mono(samples, channels)
+        if samples.dtype == np.float32:
+            samples = samples.astype(np.float32, copy=True)
+            if normalize and len(samples):
+                peak = float(np.max(np.abs(samples)))
+                if peak > 0:
+                    samples *= 1.0 / peak
+            return resample(samples, source_rate, rate)
+    elif format in IN_PROCESS_FORMATS:
+        samples, source_rate = _decode_libsndfile(data)
+    else:
+        samples, source_rate = _decode_ffmpeg(data, format)
+
+    if source_rate != rate:
+        samples = resample(samples, source_rate, rate)
+    return _scale_int16(samples, normalize)
@@ -0,0 +1,306 @@
+import ctypes
+import os
+import sys
+import threading
+import time
+import logging
+from .audio_context import get_audio_context
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Locais do sistema cujo conteúdo muda quando uma placa de som é conectada/removida (Linux/ALSA)
+HOTPLUG_PATHS = ('/proc/asound/cards', '/dev/snd')
+COREAUDIO_PATH = '/System/Library/Frameworks/CoreAudio.framework/CoreAudio'
+
+
+class _WaveInCaps(ctypes.Structure):
+    """WAVEINCAPSW do winmm."""
+    _fields_ = [('wMid', ctypes.c_ushort), ('wPid', ctypes.c_ushort), ('vDriverVersion', ctypes.c_uint),
+                ('szPname', ctypes.c_wchar * 32), ('dwFormats', ctypes.c_ulong), ('wChannels', ctypes.c_ushort),
+                ('wReserved1', ctypes.c_ushort)]
+
+
+class _WaveOutCaps(ctypes.Structure):
+    """WAVEOUTCAPSW do winmm."""
+    _fields_ = _WaveInCaps._fields_ + [('dwSupport', ctypes.c_ulong)]
+
+
+class _PropertyAddress(ctypes.Structure):
+    """AudioObjectPropertyAddress do CoreAudio."""
+    _fields_ = [('mSelector', ctypes.c_uint32), ('mScope', ctypes.c_uint32), ('mElement', ctypes.c_uint32)]
+
+
+def _windows_fingerprint():
+    """Nomes dos dispositivos de entrada e saída do winmm (mudam com o hot-plug, sem passar pelo PortAudio)."""
+    winmm = ctypes.windll.winmm
+    parts = []
+    for count, get_caps, caps_type in ((winmm.waveInGetNumDevs, winmm.waveInGetDevCapsW, _WaveInCaps),
+                                       (winmm.waveOutGetNumDevs, winmm.waveOutGetDevCapsW, _WaveOutCaps)):
+        names = []
+        for index in range(count()):
+            caps = caps_type()
+            if get_caps(ctypes.c_size_t(index), ctypes.byref(caps), ctypes.sizeof(caps)) == 0:
+                names.append(caps.szPname)
+        parts.append(tuple(names))
+    return tuple(parts)
+
+
+def _macos_fingerprint():
+    """IDs dos dispositivos do CoreAudio (kAudioHardwarePropertyDevices); um dispositivo conectado recebe um ID novo."""
+    coreaudio = ctypes.cdll.LoadLibrary(COREAUDIO_PATH)
+    # kAudioObjectSystemObject, 'dev#', kAudioObjectPropertyScopeGlobal ('glob'), elemento principal
+    address = _PropertyAddress(0x64657623, 0x676c6f62, 0)
+    size = ctypes.c_uint32(0)
+    if coreaudio.AudioObjectGetPropertyDataSize(1, ctypes.byref(address), 0, None, ctypes.byref(size)) != 0:
+        return None
+    ids = (ctypes.c_uint32 * (size.value // 4))()
+    if coreaudio.AudioObjectGetPropertyData(1, ctypes.byref(address), 0, None, ctypes.byref(size), ids) != 0:
+        return None
+    return tuple(ids)
+
+
+def _alsa_fingerprint():
+    """Placas listadas pelo ALSA e nós de /dev/snd."""
+    parts = []
+    for path in HOTPLUG_PATHS:
+        try:
+            if os.path.isdir(path):
+                parts.append(tuple(sorted(os.listdir(path))))
+            elif os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    parts.append(f.read())
+        except OSError:
+            continue
+    return tuple(parts) if parts else None
+
+
+def _hotplug_fingerprint():
+    """
+    Retorna uma assinatura barata dos dispositivos de áudio do sistema, sem inicializar o PortAudio.
+
+    Usa o winmm no Windows, o CoreAudio no macOS e o ALSA no Linux.
+
+    Returns:
+        tuple | None: Assinatura comparável, ou None quando o sistema não oferece uma
+    """
+    try:
+        if sys.platform == 'win32':
+            return _windows_fingerprint()
+        if sys.platform == 'darwin':
+            return _macos_fingerprint()
+    except (OSError, AttributeError) as e:
+        log.debug("Assinatura de hot-plug indisponível: %s", e)
+        return None
+    return _alsa_fingerprint()
+
+
+class AudioDeviceRegistry:
+    """
+    Registro dos dispositivos de áudio, enumerados uma única vez.
+
+    Mantém os mapas nome -> índice e índice -> capacidades e só enumera de novo
+    em um rescan explícito, após invalidate() (ex.: falha ao abrir um stream) ou
+    quando a assinatura de hot-plug do sistema muda. Troca de dispositivo e
+    reabertura de stream passam a ser consultas em memória, sem reinicializar
+    o PortAudio.
+
+    A enumeração usa o backend do AudioContext compartilhado. O PortAudio só
+    enumera os dispositivos ao ser inicializado (e a inicialização é contada por
+    referência), então um backend separado veria a mesma lista antiga enquanto o
+    do contexto estiver vivo: quando os dispositivos mudam, o backend do contexto
+    é reinicializado antes da enumeração. Com uma captura aberta a
+    reinicialização fica pendente no contexto até o stream de entrada ser
+    fechado (a captura contínua do VAD o reabre entre falas).
+    """
+
+    def __init__(self, context=None, hotplug_interval=2.0, reinitialize_timeout=1.0):
+        """
+        Args:
+            context: AudioContext usado na enumeração (padrão: o contexto compartilhado)
+            hotplug_interval: Intervalo mínimo em segundos entre verificações de hot-plug
+            reinitialize_timeout: Espera máxima em segundos pela reinicialização pendente
+                antes de devolver a lista atual
+        """
+        self._context = context
+        self.hotplug_interval = hotplug_interval
+        self.reinitialize_timeout = reinitialize_timeout
+        self.lock = threading.RLock()
+        self.scan_count = 0
+        self.last_scan_ms = 0.0
+        self._devices = None
+        self._info_by_index = {}
+        self._index_by_name = {'input': {}, 'output': {}}
+        self._default_index = {'input': None, 'output': None}
+        self._stale = True
+        self._fingerprint = None
+        self._last_hotplug_check = 0.0
+        self._scanned_reset_count = None
+
+    @property
+    def context(self):
+        """Contexto de áudio cujo backend é usado na enumeração."""
+        if self._context is None:
+            self._context = get_audio_context()
+        return self._context
+
+    def rescan(self, reinitialize=True):
+        """
+        Enumera os dispositivos novamente.
+
+        Args:
+            reinitialize: Reinicializa o backend do contexto antes (necessário para o
+                PortAudio enxergar dispositivos conectados ou removidos), a menos que ele
+                já tenha sido reinicializado desde a última enumeração. Com um stream de
+                entrada aberto, espera até reinitialize_timeout a reinicialização pendente
+
+        Returns:
+            dict: Dispositivos no formato {'input': [...], 'output': [...]}
+        """
+        with self.lock:
+            context = self.context
+            if reinitialize and self._devices is not None and context.reset_count == self._scanned_reset_count:
+                if not context.reinitialize() and not context.wait_reinitialized(self.reinitialize_timeout):
+                    # A captura ainda não liberou o dispositivo (ex.: fala em andamento): a lista
+                    # atual continua valendo e a próxima consulta tenta de novo
+                    self._stale = True
+                    return self._devices
+            started = time.perf_counter()
+            fingerprint = _hotplug_fingerprint()
+            p = context.backend
+            devices = {'input': [], 'output': []}
+            info_by_index = {}
+            index_by_name = {'input': {}, 'output': {}}
+            default_index = {'input': None, 'output': None}
+            try:
+                for i in range(p.get_device_count()):
+                    try:
+                        device_info = p.get_device_info_by_index(i)
+                    except Exception as e:
+                        log.error(f"Erro ao processar o dispositivo {i}: {e}")
+                        continue
+                    info_by_index[device_info['index']] = dict(device_info)
+
+                    # Cria uma entrada de dispositivo com nome limpo e índice original
+                    device_entry = {
+                        'index': device_info['index'],
+                        'name': device_info['name'],
+                        'channels': {
+                            'input': device_info['maxInputChannels'],
+                            'output': device_info['maxOutputChannels']
+                        }
+                    }
+
+                    # Mantém apenas a primeira ocorrência de cada nome (filtra duplicatas)
+                    for kind, channels_key in (('input', 'maxInputChannels'), ('output', 'maxOutputChannels')):
+                        if device_info[channels_key] > 0 and device_info['name'] not in index_by_name[kind]:
+                            devices[kind].append(device_entry)
+                            index_by_name[kind][device_info['name']] = device_info['index']
+
+                for kind, label, getter in (('input', 'entrada', p.get_default_input_device_info),
+                                            ('output', 'saída', p.get_default_output_device_info)):
+                    try:
+                        default_index[kind] = getter()['index']
+                    except Exception as e:
+                        log.warning(f"Não foi possível obter o dispositivo de {label} padrão: {e}")
+            except Exception as e:
+                log.error(f"Erro ao enumerar os dispositivos de áudio: {e}")
+
+            self._devices = devices
+            self._info_by_index = info_by_index
+            self._index_by_name = index_by_name
+            self._default_index = default_index
+            self._fingerprint = fingerprint
+            self._last_hotplug_check = time.monotonic()
+            self._scanned_reset_count = context.reset_count
+            self._stale = False
+            self.scan_count += 1
+            self.last_scan_ms = (time.perf_counter() - started) * 1000
+            log.info("Dispositivos de áudio enumerados em %.1f ms: %d entrada(s), %d saída(s)",
+                     self.last_scan_ms, len(devices['input']), len(devices['output']))
+            return devices
+
+    def invalidate(self):
+        """Marca o registro como desatualizado; a próxima consulta reinicializa o backend e enumera de novo."""
+        with self.lock:
+            self._stale = True
+
+    def check_hotplug(self):
+        """
+        Verifica (no máximo a cada hotplug_interval) se os dispositivos do sistema mudaram.
+
+        Returns:
+            bool: True se um hot-plug foi detectado e o registro foi invalidado
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self._stale or now - self._last_hotplug_check < self.hotplug_interval:
+                return False
+            self._last_hotplug_check = now
+            fingerprint = _hotplug_fingerprint()
+            if fingerprint is None or fingerprint == self._fingerprint:
+                return False
+            log.info("Mudança nos dispositivos de áudio detectada; o registro será atualizado")
+            self._stale = True
+            return True
+
+    def _ensure_fresh(self):
+        self.check_hotplug()
+        if self._stale or self._devices is None:
+            self.rescan()
+
+    def devices(self):
+        """
+        Returns:
+            dict: Dispositivos no formato {'input': [...], 'output': [...]}
+        """
+        with self.lock:
+            self._ensure_fresh()
+            return self._devices
+
+    def index_for_name(self, name, kind='output'):
+        """
+        Obtém o índice de um dispositivo pelo nome.
+
+        Args:
+            name: Nome do dispositivo
+            kind: 'input' ou 'output'
+
+        Returns:
+            int | None: Índice do dispositivo ou None se não existir
+        """
+        with self.lock:
+            self._ensure_fresh()
+            return self._index_by_name[kind].get(name)
+
+    def device_info(self, index):
+        """
+        Retorna as capacidades do dispositivo (mesmo formato de get_device_info_by_index).
+
+        Raises:
+            IOError: Se o índice não existir
+        """
+        with self.lock:
+            self._ensure_fresh()
+            if index not in self._info_by_index:
+                raise IOError(f"Dispositivo inválido: {index}")
+            return self._info_by_index[index]
+
+    def default_index(self, kind='output'):
+        """Retorna o índice do dispositivo padrão de entrada ou saída (ou None)."""
+        with self.lock:
+            self._ensure_fresh()
+            return self._default_index[kind]
+
+
+_registry_instance = None
+_registry_lock = threading.Lock()
+
+def get_device_registry():
+    """Retorna o registro de dispositivos compartilhado pelo processo."""
+    global _registry_instance
+    with _registry_lock:
+        if _registry_instance is None:
+            _registry_instance = AudioDeviceRegistry()
+        return _registry_instance
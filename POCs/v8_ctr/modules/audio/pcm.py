@@ -0,0 +1,126 @@
+import io
+import os
+import wave
+from math import gcd
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+def read_wav_pcm(audio_file):
+    """
+    Lê o PCM 16 bits de um WAV em memória (WavView, BytesIO ou bytes), já em mono.
+
+    Usa o cabeçalho do WAV em vez de interpretar o arquivo inteiro como amostras,
+    e evita cópias quando o arquivo é um WavView do buffer de captura.
+
+    Args:
+        audio_file: WavView, objeto binário com um WAV ou bytes
+
+    Returns:
+        tuple: (amostras int16, taxa de amostragem)
+    """
+    if hasattr(audio_file, 'pcm') and hasattr(audio_file, 'sample_rate'):
+        samples, rate, channels = audio_file.pcm(), audio_file.sample_rate, audio_file.channels
+    else:
+        if isinstance(audio_file, (bytes, bytearray, memoryview)):
+            audio_file = io.BytesIO(audio_file)
+        audio_file.seek(0)
+        with wave.open(audio_file, 'rb') as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("Apenas WAV de 16 bits é suportado")
+            rate = wf.getframerate()
+            channels = wf.getnchannels()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        audio_file.seek(0)
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+
+def load_audio_file(path):
+    """
+    Carrega um arquivo de áudio do disco como PCM 16 bits mono.
+
+    WAV é lido com o módulo wave; os demais formatos (FLAC, OGG) usam o
+    soundfile, dependência opcional.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        tuple: (amostras int16, taxa de amostragem)
+    """
+    if path.lower().endswith('.wav'):
+        with open(path, 'rb') as f:
+            return read_wav_pcm(io.BytesIO(f.read()))
+    try:
+        import soundfile as sf
+    except ImportError:
+        raise ImportError(f"O pacote soundfile é necessário para ler {os.path.basename(path)}")
+    samples, rate = sf.read(path, dtype='int16', always_2d=True)
+    if samples.shape[1] > 1:
+        return samples.mean(axis=1).astype(np.int16), rate
+    return np.ascontiguousarray(samples[:, 0]), rate
+
+
+def resample(samples, source_rate, target_rate):
+    """
+    Reamostra áudio com filtro polifásico (scipy), mantendo o tipo int16 ou float32 da entrada.
+
+    Args:
+        samples: Amostras int16 ou float32
+        source_rate: Taxa de origem em Hz
+        target_rate: Taxa de destino em Hz
+
+    Returns:
+        np.ndarray: Amostras na taxa de destino
+    """
+    if source_rate == target_rate or not len(samples):
+        return samples
+    from scipy.signal import resample_poly
+
+    divisor = gcd(int(source_rate), int(target_rate))
+    resampled = resample_poly(samples.astype(np.float32), target_rate // divisor, source_rate // divisor)
+    if samples.dtype == np.int16:
+        return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+    return resampled.astype(samples.dtype)
+
+
+class PCMStreamDecoder:
+    """
+    Converte PCM 16 bits little-endian recebido em pedaços (streaming) para float32.
+
+    Pedaços da rede não respeitam a fronteira das amostras: o byte ímpar que
+    sobra de um pedaço é guardado e completado pelo seguinte.
+    """
+
+    def __init__(self):
+        self._pending = b''
+        self.samples_decoded = 0
+
+    def feed(self, data):
+        """
+        Decodifica um pedaço de bytes.
+
+        Args:
+            data: Bytes PCM 16 bits (tamanho qualquer)
+
+        Returns:
+            np.ndarray: Amostras float32 em [-1, 1)
+        """
+        if self._pending:
+            data = self._pending + data
+        usable = len(data) & ~1
+        self._pending = data[usable:]
+        samples = np.frombuffer(data, dtype='<i2', count=usable // 2).astype(np.float32)
+        samples *= 1.0 / 32768.0
+        self.samples_decoded += len(samples)
+        return samples
+
+    def reset(self):
+        """Descarta o byte pendente (início de um novo stream)."""
+        self._pending = b''
+        self.samples_decoded = 0
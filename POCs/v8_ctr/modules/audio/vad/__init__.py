@@ -0,0 +1,50 @@
+"""
+Módulo VAD (Voice Activity Detection) com detectores plugáveis que processam quadros em lote.
+
+Classes principais:
+- BaseVAD: Classe base que agrupa o áudio em quadros e delega a decisão
+- EnergyVAD: Detector original baseado apenas em energia
+- MultiFeatureVAD: Detector com energia, cruzamentos por zero e planicidade espectral
+- SpeechStateMachine: Histerese por contagem de quadros (independente do relógio)
+- AdaptiveEndpointer: Fim de turno com limite de silêncio adaptativo
+- NoiseFloorTracker: Estimativa contínua do ruído de fundo e do limite de detecção
+"""
+
+from .base_vad import BaseVAD, SpeechStateMachine, detect_segments
+from .energy_vad import EnergyVAD
+from .multi_feature_vad import MultiFeatureVAD
+from .endpointing import AdaptiveEndpointer
+from .noise_floor import NoiseFloorTracker
+
+VAD_ENGINES = {
+    'energy': EnergyVAD,
+    'multi': MultiFeatureVAD
+}
+
+def create_vad(engine, rate, **kwargs):
+    """
+    Cria o detector de voz pelo nome.
+
+    Args:
+        engine: 'energy' ou 'multi'
+        rate: Taxa de amostragem em Hz
+        **kwargs: Parâmetros repassados ao detector
+
+    Returns:
+        BaseVAD: Instância do detector
+    """
+    if engine not in VAD_ENGINES:
+        raise ValueError(f"Engine de VAD desconhecido: {engine}")
+    return VAD_ENGINES[engine](rate, **kwargs)
+
+__all__ = [
+    'AdaptiveEndpointer',
+    'BaseVAD',
+    'EnergyVAD',
+    'MultiFeatureVAD',
+    'NoiseFloorTracker',
+    'SpeechStateMachine',
+    'VAD_ENGINES',
+    'create_vad',
+    'detect_segments'
+]
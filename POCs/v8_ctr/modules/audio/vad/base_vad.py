@@ -0,0 +1,196 @@
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+
+class BaseVAD:
+    """
+    Classe base para detectores de atividade de voz.
+
+    Recebe blocos de áudio int16 de qualquer tamanho, agrupa em quadros fixos e
+    decide fala/silêncio para todos os quadros completos de uma vez.
+    """
+
+    def __init__(self, rate, frame_size=480, threshold=0.0):
+        """
+        Inicializa o detector.
+
+        Args:
+            rate: Taxa de amostragem em Hz
+            frame_size: Tamanho do quadro de análise em amostras (480 = 20 ms a 24 kHz)
+            threshold: Limite de energia RMS (em unidades int16)
+        """
+        self.rate = rate
+        self.frame_size = frame_size
+        self.threshold = threshold
+        self.last_energy = np.zeros(0, dtype=np.float32)
+        self._pending = np.empty(0, dtype=np.int16)
+
+    @property
+    def frame_duration(self):
+        """Duração de um quadro em segundos."""
+        return self.frame_size / float(self.rate)
+
+    def frames_for(self, seconds):
+        """Converte uma duração em segundos para número de quadros (mínimo 1)."""
+        return max(1, int(round(seconds / self.frame_duration)))
+
+    def reset(self):
+        """Descarta as amostras pendentes de um quadro incompleto."""
+        self._pending = np.empty(0, dtype=np.int16)
+
+    def _frame(self, samples):
+        """Agrupa as amostras em uma matriz (quadros x frame_size), guardando o resto."""
+        samples = np.asarray(samples, dtype=np.int16)
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        num_frames = samples.size // self.frame_size
+        used = num_frames * self.frame_size
+        self._pending = samples[used:].copy()
+        return samples[:used].reshape(num_frames, self.frame_size).astype(np.float32)
+
+    def process(self, samples):
+        """
+        Classifica os quadros completos contidos nas amostras recebidas.
+
+        Args:
+            samples: Array int16 (ou bytes convertidos) com o áudio recebido
+
+        Returns:
+            np.ndarray: Vetor booleano com uma decisão por quadro
+        """
+        frames = self._frame(samples)
+        if not len(frames):
+            self.last_energy = np.zeros(0, dtype=np.float32)
+            return np.zeros(0, dtype=bool)
+        self.last_energy = self.frame_energy(frames)
+        return self.classify(frames)
+
+    def classify(self, frames):
+        """
+        Método abstrato que decide fala/silêncio para uma matriz de quadros.
+
+        Args:
+            frames: Matriz float32 (quadros x frame_size)
+
+        Returns:
+            np.ndarray: Vetor booleano com uma decisão por quadro
+        """
+        raise NotImplementedError("Método classify deve ser implementado pela classe filha")
+
+    @staticmethod
+    def frame_energy(frames):
+        """Energia RMS de cada quadro."""
+        return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+class SpeechStateMachine:
+    """
+    Máquina de estados com histerese para transformar decisões por quadro em
+    início/fim de fala. Conta quadros em vez de usar o relógio, então o mesmo
+    áudio produz sempre os mesmos eventos (ao vivo ou offline).
+    """
+
+    def __init__(self, onset_frames, hangover_frames):
+        """
+        Args:
+            onset_frames: Quadros de fala consecutivos necessários para iniciar
+            hangover_frames: Quadros de silêncio consecutivos para encerrar
+        """
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.reset()
+
+    def reset(self):
+        """Volta ao estado de silêncio."""
+        self.in_speech = False
+        self.frame_index = 0
+        self._speech_run = 0
+        self._silence_run = 0
+        self.speech_start = None
+
+    def current_hangover(self):
+        """Quadros de silêncio necessários para encerrar a fala atual."""
+        return self.hangover_frames
+
+    def _on_frame(self, is_speech, energy, previous_silence_run):
+        """Gancho chamado a cada quadro, antes das transições de estado."""
+        pass
+
+    def _on_end(self, silence_frames):
+        """Gancho chamado quando a fala é encerrada."""
+        pass
+
+    def update(self, decisions, energy=None):
+        """
+        Atualiza o estado com um lote de decisões.
+
+        Args:
+            decisions: Vetor booleano com uma decisão por quadro
+            energy: Energia RMS de cada quadro (opcional)
+
+        Returns:
+            list: Eventos ('start', quadro) e ('end', quadro); o quadro de início
+                  aponta para o primeiro quadro de fala e o de fim para o
+                  primeiro quadro após a fala
+        """
+        events = []
+        for i, is_speech in enumerate(decisions):
+            previous_silence_run = self._silence_run
+            if is_speech:
+                self._speech_run += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+                self._speech_run = 0
+
+            self._on_frame(is_speech, energy[i] if energy is not None else None, previous_silence_run)
+
+            if not self.in_speech and self._speech_run >= self.onset_frames:
+                self.in_speech = True
+                self.speech_start = self.frame_index - self.onset_frames + 1
+                events.append(('start', self.speech_start))
+            elif self.in_speech and not is_speech and self._silence_run >= self.current_hangover():
+                self.in_speech = False
+                events.append(('end', self.frame_index - self._silence_run + 1))
+                self._on_end(self._silence_run)
+                self.speech_start = None
+
+            self.frame_index += 1
+        return events
+
+
+def detect_segments(samples, vad, onset_frames=None, hangover_frames=None):
+    """
+    Executa o VAD offline sobre um áudio completo.
+
+    Args:
+        samples: Array int16 com o áudio
+        vad: Instância de BaseVAD
+        onset_frames: Quadros para confirmar o início (padrão: 0,2 s)
+        hangover_frames: Quadros de silêncio para encerrar (padrão: 0,3 s)
+
+    Returns:
+        tuple: (decisões por quadro, lista de segmentos (início_s, fim_s))
+    """
+    vad.reset()
+    decisions = vad.process(samples)
+    machine = SpeechStateMachine(
+        onset_frames or vad.frames_for(0.2),
+        hangover_frames or vad.frames_for(0.3)
+    )
+
+    segments = []
+    start = None
+    for event, frame in machine.update(decisions):
+        if event == 'start':
+            start = frame
+        else:
+            segments.append((start * vad.frame_duration, frame * vad.frame_duration))
+            start = None
+    if start is not None:
+        segments.append((start * vad.frame_duration, len(decisions) * vad.frame_duration))
+    return decisions, segments
@@ -0,0 +1,144 @@
+import re
+from collections import deque
+import numpy as np
+from .base_vad import SpeechStateMachine
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Finais de frase que indicam turno completo / incompleto na transcrição parcial
+_COMPLETE_ENDING = re.compile(r'[.!?…]["\')\]]*\s*$')
+_INCOMPLETE_ENDING = re.compile(
+    r'(,|;|:|\b(e|ou|mas|que|porque|então|de|do|da|para|com|and|or|but|because|so|the|to|of|with))\s*$',
+    re.IGNORECASE
+)
+
+
+class AdaptiveEndpointer(SpeechStateMachine):
+    """
+    Máquina de estados que encerra o turno assim que a fala provavelmente terminou.
+
+    Em vez de esperar um silêncio fixo, o tempo limite de silêncio é ajustado a cada
+    pausa com base em:
+    - Estatística das pausas recentes do próprio falante dentro das falas
+    - Queda de energia no final da fala (entonação descendente de fim de frase)
+    - Pontuação da transcrição parcial, quando disponível
+    """
+
+    def __init__(self, frame_duration, onset_frames, min_silence=0.3, max_silence=2.0,
+                 default_silence=0.8, pause_percentile=90, margin=1.3, history=50):
+        """
+        Args:
+            frame_duration: Duração de um quadro do VAD em segundos
+            onset_frames: Quadros de fala consecutivos necessários para iniciar
+            min_silence: Menor tempo limite de silêncio permitido (segundos)
+            max_silence: Maior tempo limite de silêncio permitido (segundos)
+            default_silence: Tempo limite usado enquanto não há pausas suficientes
+            pause_percentile: Percentil das pausas recentes usado como base
+            margin: Multiplicador aplicado sobre o percentil das pausas
+            history: Quantidade de pausas e latências mantidas no histórico
+        """
+        self.frame_duration = frame_duration
+        self.min_silence = min_silence
+        self.max_silence = max_silence
+        self.default_silence = default_silence
+        self.pause_percentile = pause_percentile
+        self.margin = margin
+        self.pauses = deque(maxlen=history)
+        self.endpoint_latencies = deque(maxlen=history)
+        self.last_endpoint_latency = None
+        super().__init__(onset_frames, self._to_frames(max_silence))
+
+    def _to_frames(self, seconds):
+        return max(1, int(round(seconds / self.frame_duration)))
+
+    def reset(self):
+        """Volta ao estado de silêncio mantendo o histórico de pausas do falante."""
+        super().reset()
+        self._voiced_energy = deque(maxlen=self._to_frames(2.0))
+        self._decay_factor = 1.0
+        self._partial_text = ""
+        self._hangover = self.hangover_frames
+
+    def set_partial_transcript(self, text):
+        """Informa a transcrição parcial da fala atual (usada para ajustar o fim de turno)."""
+        self._partial_text = text or ""
+        self._hangover = self._to_frames(self.silence_timeout())
+
+    def _punctuation_factor(self):
+        """Encurta o limite após pontuação final e alonga após vírgula ou conjunção."""
+        text = self._partial_text.strip()
+        if not text:
+            return 1.0
+        if _COMPLETE_ENDING.search(text):
+            return 0.6
+        if _INCOMPLETE_ENDING.search(text):
+            return 1.5
+        return 1.0
+
+    def _energy_decay_factor(self):
+        """Encurta o limite quando a energia caiu no final da fala (fim de frase)."""
+        if len(self._voiced_energy) < 10:
+            return 1.0
+        energies = np.fromiter(self._voiced_energy, dtype=np.float32)
+        tail = energies[-5:].mean()
+        reference = np.median(energies)
+        return 0.75 if reference > 0 and tail < 0.5 * reference else 1.0
+
+    def silence_timeout(self):
+        """
+        Calcula o tempo limite de silêncio atual.
+
+        Returns:
+            float: Segundos de silêncio para encerrar o turno
+        """
+        if len(self.pauses) >= 5:
+            base = float(np.percentile(np.fromiter(self.pauses, dtype=np.float32), self.pause_percentile)) * self.margin
+        else:
+            base = self.default_silence
+        timeout = base * self._decay_factor * self._punctuation_factor()
+        return float(min(self.max_silence, max(self.min_silence, timeout)))
+
+    def current_hangover(self):
+        return self._hangover
+
+    def _on_frame(self, is_speech, energy, previous_silence_run):
+        if not self.in_speech:
+            return
+        if is_speech:
+            # Pausa dentro da fala terminou: entra na estatística do falante
+            if previous_silence_run >= 2:
+                self.pauses.append(previous_silence_run * self.frame_duration)
+            if energy is not None:
+                self._voiced_energy.append(energy)
+        elif previous_silence_run == 0:
+            # Início de uma pausa: recalcula o limite uma única vez
+            self._decay_factor = self._energy_decay_factor()
+            self._hangover = self._to_frames(self.silence_timeout())
+
+    def _on_end(self, silence_frames):
+        self.last_endpoint_latency = silence_frames * self.frame_duration
+        self.endpoint_latencies.append(self.last_endpoint_latency)
+        self._voiced_energy.clear()
+        self._decay_factor = 1.0
+        self._partial_text = ""
+
+    def get_metrics(self):
+        """
+        Retorna as métricas de latência de fim de turno.
+
+        Returns:
+            dict: Última latência, média, p50 e p90 (segundos) e quantidade de turnos
+        """
+        if not self.endpoint_latencies:
+            return {'last': None, 'mean': None, 'p50': None, 'p90': None, 'count': 0}
+        latencies = np.fromiter(self.endpoint_latencies, dtype=np.float32)
+        return {
+            'last': self.last_endpoint_latency,
+            'mean': float(latencies.mean()),
+            'p50': float(np.percentile(latencies, 50)),
+            'p90': float(np.percentile(latencies, 90)),
+            'count': len(latencies)
+        }
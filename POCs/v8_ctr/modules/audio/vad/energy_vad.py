@@ -0,0 +1,28 @@
+import numpy as np
+from .base_vad import BaseVAD
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+class EnergyVAD(BaseVAD):
+    """Implementação do VAD original: apenas energia comparada a um limite fixo"""
+
+    def __init__(self, rate, frame_size=480, threshold=0.0, noise_floor=0.0):
+        """
+        Inicializa o VAD de energia.
+
+        Args:
+            rate: Taxa de amostragem em Hz
+            frame_size: Tamanho do quadro em amostras
+            threshold: Limite de energia RMS
+            noise_floor: Energia RMS abaixo da qual o quadro é considerado silêncio absoluto
+        """
+        super().__init__(rate, frame_size, threshold)
+        self.noise_floor = noise_floor
+
+    def classify(self, frames):
+        """Marca como fala os quadros com energia acima do limite."""
+        energy = np.where(self.last_energy < self.noise_floor, 0, self.last_energy)
+        return energy > self.threshold
@@ -0,0 +1,63 @@
+import numpy as np
+from .base_vad import BaseVAD
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+class MultiFeatureVAD(BaseVAD):
+    """
+    Implementação do VAD combinando energia, taxa de cruzamentos por zero e
+    planicidade espectral, calculadas para todos os quadros de uma vez.
+
+    A energia separa o sinal do silêncio; a planicidade espectral e a taxa de
+    cruzamentos por zero rejeitam ruídos de banda larga (ventilador, chiado,
+    teclado) que têm energia alta mas não têm estrutura harmônica de voz.
+    """
+
+    def __init__(self, rate, frame_size=480, threshold=0.0, max_flatness=0.4, zcr_range=(0.005, 0.5)):
+        """
+        Inicializa o VAD de múltiplas características.
+
+        Args:
+            rate: Taxa de amostragem em Hz
+            frame_size: Tamanho do quadro em amostras
+            threshold: Limite de energia RMS
+            max_flatness: Planicidade espectral máxima aceita como voz (0 = tonal, ~0,56 = ruído branco)
+            zcr_range: Faixa (mín, máx) da taxa de cruzamentos por zero aceita como voz
+        """
+        super().__init__(rate, frame_size, threshold)
+        self.max_flatness = max_flatness
+        self.zcr_range = zcr_range
+        self._window = np.hanning(frame_size).astype(np.float32)
+        self.last_features = None
+
+    def compute_features(self, frames):
+        """
+        Calcula as características de cada quadro.
+
+        Returns:
+            dict: Vetores 'energy', 'zcr' e 'flatness' (um valor por quadro)
+        """
+        energy = self.last_energy if len(self.last_energy) == len(frames) else self.frame_energy(frames)
+
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(self.frame_size - 1)
+
+        spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + 1e-10
+        flatness = np.exp(np.mean(np.log(spectrum), axis=1)) / np.mean(spectrum, axis=1)
+
+        return {'energy': energy, 'zcr': zcr, 'flatness': flatness}
+
+    def classify(self, frames):
+        """Marca como fala os quadros com energia suficiente e estrutura espectral de voz."""
+        features = self.compute_features(frames)
+        self.last_features = features
+        zcr_min, zcr_max = self.zcr_range
+        return (
+            (features['energy'] > self.threshold)
+            & (features['flatness'] < self.max_flatness)
+            & (features['zcr'] >= zcr_min)
+            & (features['zcr'] <= zcr_max)
+        )
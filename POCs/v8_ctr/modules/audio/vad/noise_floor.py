@@ -0,0 +1,143 @@
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+class NoiseFloorTracker:
+    """
+    Estimador contínuo do ruído de fundo.
+
+    Mantém a energia dos quadros de silêncio mais recentes em um anel e usa um
+    percentil baixo dessa janela, suavizado por média móvel exponencial, como
+    nível de ruído. Roda dentro do caminho de captura, então o limite de detecção
+    acompanha mudanças no ambiente sem precisar de uma calibração bloqueante.
+
+    Só entram na janela quadros de silêncio sustentado (depois de alguns quadros de
+    não-fala seguidos e bem abaixo do limite), e a estimativa sobe bem mais devagar
+    do que desce: uma fala longa não arrasta o limite para o nível da própria fala.
+    """
+
+    def __init__(self, frame_duration, window_seconds=3.0, percentile=20, smoothing=0.3,
+                 multiplier=3.0, min_threshold=0.0, initial_floor=None, quiet_ratio=0.8,
+                 min_quiet_seconds=0.3, rise_factor=0.1, recovery_seconds=30.0):
+        """
+        Args:
+            frame_duration: Duração de um quadro do VAD em segundos
+            window_seconds: Janela de quadros de silêncio considerada
+            percentile: Percentil da janela usado como estimativa do ruído
+            smoothing: Peso da nova estimativa na média móvel exponencial quando o ruído cai (0 a 1)
+            multiplier: Fator aplicado ao ruído para obter o limite de detecção
+            min_threshold: Limite mínimo de detecção (energia RMS)
+            initial_floor: Estimativa inicial do ruído, se conhecida
+            quiet_ratio: Só entram na estimativa quadros abaixo de quiet_ratio * limite
+            min_quiet_seconds: Silêncio contínuo exigido antes de um quadro entrar na estimativa
+            rise_factor: Fração de smoothing usada quando o ruído sobe (subida mais lenta que a descida)
+            recovery_seconds: Sem nenhum quadro de silêncio por esse tempo, a menor energia do
+                período passa a ser o ruído (recupera um limite que ficou abaixo do ruído real)
+        """
+        self.capacity = max(1, int(round(window_seconds / frame_duration)))
+        self.percentile = percentile
+        self.smoothing = smoothing
+        self.rise_smoothing = smoothing * rise_factor
+        self.multiplier = multiplier
+        self.min_threshold = min_threshold
+        self.noise_floor = initial_floor
+        self.quiet_ratio = quiet_ratio
+        self.min_quiet_frames = max(1, int(round(min_quiet_seconds / frame_duration)))
+        self.recovery_frames = max(1, int(round(recovery_seconds / frame_duration)))
+        self._ring = np.zeros(self.capacity, dtype=np.float32)
+        self._count = 0
+        self._pos = 0
+        self._quiet_run = 0  # Quadros de não-fala consecutivos até o fim do último lote
+        self._since_noise = 0  # Quadros desde o último quadro aceito como ruído
+        self._recovery_min = np.inf  # Menor energia vista desde o último quadro aceito
+
+    @property
+    def threshold(self):
+        """Limite de energia RMS atual para considerar um quadro como fala."""
+        return max(self.min_threshold, (self.noise_floor or 0.0) * self.multiplier)
+
+    def _push(self, values):
+        """Insere energias no anel, sobrescrevendo as mais antigas."""
+        values = values[-self.capacity:]
+        size = len(values)
+        first = min(size, self.capacity - self._pos)
+        self._ring[self._pos:self._pos + first] = values[:first]
+        if first < size:
+            self._ring[:size - first] = values[first:]
+        self._pos = (self._pos + size) % self.capacity
+        self._count = min(self.capacity, self._count + size)
+
+    def _quiet_frames(self, energy, speech):
+        """
+        Seleciona os quadros que podem entrar na estimativa do ruído.
+
+        Um quadro só conta como ruído se não for fala, estiver bem abaixo do limite
+        atual e vier depois de min_quiet_frames quadros de não-fala seguidos. Assim,
+        sílabas fracas e as bordas da fala (logo abaixo do limite) não puxam o ruído
+        para cima durante uma fala longa.
+        """
+        positions = np.arange(len(speech))
+        last_speech = np.maximum.accumulate(np.where(speech, positions, -1))
+        run = np.where(last_speech < 0, positions + 1 + self._quiet_run, positions - last_speech)
+        self._quiet_run = int(run[-1])
+        return (run >= self.min_quiet_frames) & (energy < self.threshold * self.quiet_ratio)
+
+    def _recover(self):
+        """
+        Nenhum quadro de silêncio por recovery_seconds: o limite provavelmente ficou
+        abaixo do ruído real (todo quadro vira fala). A menor energia do período é uma
+        estimativa conservadora do ruído (estatística de mínimo) e reinicia a janela.
+        """
+        if self._recovery_min > (self.noise_floor or 0.0):
+            log.info("Ruído de fundo reestimado: %.4f -> %.4f", self.noise_floor or 0.0, self._recovery_min)
+            self.noise_floor = self._recovery_min
+            self._count = 0
+            self._pos = 0
+        self._since_noise = 0
+        self._recovery_min = np.inf
+
+    def update(self, energy, decisions=None):
+        """
+        Atualiza a estimativa com um lote de quadros.
+
+        Args:
+            energy: Energia RMS de cada quadro
+            decisions: Decisões do VAD (True = fala); quadros de fala são ignorados
+
+        Returns:
+            float: Limite de detecção atualizado
+        """
+        if energy is None or not len(energy):
+            return self.threshold
+
+        energy = np.asarray(energy, dtype=np.float32)
+        speech = energy > self.threshold if decisions is None else np.asarray(decisions, dtype=bool)
+
+        if self.noise_floor is None:
+            # Sem estimativa ainda: o primeiro lote inicializa o ruído (uma única vez)
+            noise = energy[~speech] if (~speech).any() else energy[[int(np.argmin(energy))]]
+            self._quiet_run = 0
+        else:
+            noise = energy[self._quiet_frames(energy, speech)]
+
+        if len(noise):
+            self._since_noise = 0
+            self._recovery_min = np.inf
+        else:
+            self._since_noise += len(energy)
+            self._recovery_min = min(self._recovery_min, float(energy.min()))
+            if self._since_noise >= self.recovery_frames:
+                self._recover()
+            return self.threshold
+        self._push(noise)
+
+        estimate = float(np.percentile(self._ring[:self._count], self.percentile))
+        if self.noise_floor is None:
+            self.noise_floor = estimate
+        else:
+            rate = self.smoothing if estimate < self.noise_floor else self.rise_smoothing
+            self.noise_floor += rate * (estimate - self.noise_floor)
+        return self.threshold
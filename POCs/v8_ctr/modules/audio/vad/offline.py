@@ -0,0 +1,75 @@
+import json
+import os
+import wave
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+def load_wav_fixture(path):
+    """
+    Carrega um WAV PCM 16 bits mono para uso offline com o VAD.
+
+    Args:
+        path: Caminho do arquivo WAV
+
+    Returns:
+        tuple: (amostras int16, taxa de amostragem)
+    """
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Apenas WAV de 16 bits é suportado: {path}")
+        rate = wf.getframerate()
+        channels = wf.getnchannels()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+
+def load_labels(path):
+    """
+    Carrega os rótulos de fala de um fixture (arquivo .json ao lado do .wav).
+
+    Formato esperado: {"speech": [[inicio_s, fim_s], ...]}
+
+    Returns:
+        list: Segmentos de fala em segundos, ou None se não houver rótulos
+    """
+    label_path = os.path.splitext(path)[0] + '.json'
+    if not os.path.exists(label_path):
+        return None
+    with open(label_path, 'r', encoding='utf-8') as f:
+        return [tuple(segment) for segment in json.load(f).get('speech', [])]
+
+
+def segments_to_frames(segments, num_frames, frame_duration):
+    """Converte segmentos em segundos para um vetor booleano por quadro."""
+    labels = np.zeros(num_frames, dtype=bool)
+    for start, end in segments:
+        labels[int(start / frame_duration):int(np.ceil(end / frame_duration))] = True
+    return labels
+
+
+def estimate_threshold(samples, vad, percentile=20, multiplier=3.0, min_threshold=0.0):
+    """
+    Estima o limite de detecção de um áudio completo a partir do seu próprio ruído de fundo.
+
+    Args:
+        samples: Array int16 com o áudio
+        vad: Instância de BaseVAD (define o tamanho do quadro)
+        percentile: Percentil da energia dos quadros usado como ruído de fundo
+        multiplier: Fator aplicado ao ruído para obter o limite
+        min_threshold: Limite mínimo (energia RMS)
+
+    Returns:
+        float: Limite de energia RMS
+    """
+    num_frames = len(samples) // vad.frame_size
+    if num_frames == 0:
+        return min_threshold
+    frames = samples[:num_frames * vad.frame_size].reshape(num_frames, vad.frame_size).astype(np.float32)
+    energy = vad.frame_energy(frames)
+    return max(min_threshold, float(np.percentile(energy, percentile)) * multiplier)
@@ -3,21 +3,54 @@ Módulo STT (Speech-to-Text) que fornece diferentes implementações de transcri
 
 Classes principais:
 - SpeechToText: Classe principal que gerencia diferentes implementações de transcrição
+- STTPipeline: Transcritor e pós-processadores montados uma vez por modo de transcrição
 - OpenAITranscriber: Implementação usando a API OpenAI
 - LocalTranscriber: Implementação usando Whisper localmente
 - SpellcheckTranscriber: Implementação com correção ortográfica usando GPT
+- TermCorrector: Corretor local de termos (chaves fonéticas e trigramas) antes do GPT
+- ChunkedTranscriber: Transcrição em paralelo de gravações longas, dividida nas pausas do VAD
+- IncrementalTranscriber: Transcrição em janelas durante a fala, com hipóteses parciais e finalização rápida
+- WhisperModelPool: Pool residente de modelos Whisper locais, carregado em segundo plano
+- STTWorkerPool: Processos dedicados ao Whisper local (PCM por memória compartilhada, cancelamento)
+- BatchTranscriber: Transcrição em lote de pastas de gravações (JSONL com tempos e vazão)
+- TranscriptionCache: Cache de transcrições (LRU em memória + disco) indexado pelo conteúdo do áudio
+- UploadEncoder: Recorte de silêncio, reamostragem e compressão do áudio antes do envio
 """
 
 from .stt import SpeechToText
+from .pipeline import STTPipeline
 from .openai_transcriber import OpenAITranscriber
 from .local_transcriber import LocalTranscriber
 from .spellcheck_transcriber import SpellcheckTranscriber
+from .term_corrector import TermCorrector
 from .base_transcriber import BaseTranscriber
+from .upload_encoder import UploadEncoder
+from .transcription_cache import TranscriptionCache, get_transcription_cache
+from .whisper_pool import WhisperModelPool, get_whisper_pool
+from .stt_worker import STTWorkerPool, get_stt_worker_pool
+from .chunked_transcriber import ChunkedTranscriber, plan_segments, stitch_transcripts
+from .incremental_transcriber import IncrementalTranscriber
+from .batch_transcriber import BatchTranscriber, find_recordings
 
 __all__ = [
     'SpeechToText',
+    'STTPipeline',
     'OpenAITranscriber',
     'LocalTranscriber',
     'SpellcheckTranscriber',
-    'BaseTranscriber'
+    'TermCorrector',
+    'BaseTranscriber',
+    'UploadEncoder',
+    'TranscriptionCache',
+    'get_transcription_cache',
+    'ChunkedTranscriber',
+    'plan_segments',
+    'stitch_transcripts',
+    'IncrementalTranscriber',
+    'BatchTranscriber',
+    'find_recordings',
+    'WhisperModelPool',
+    'get_whisper_pool',
+    'STTWorkerPool',
+    'get_stt_worker_pool'
 ]
@@ -42,7 +42,7 @@ class BaseTranscriber:
         """
         log.info("Detalhes da Solicitação de Transcrição:")
         log.info("Modelo: %s", model)
-        log.info("Tamanho do Arquivo: %d bytes", len(audio_file.getvalue()))
+        log.info("Tamanho do Arquivo: %d bytes", len(audio_file.getbuffer()))
 
     def _log_correction_details(self, text, model=""):
         """
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import os
+import time
+import numpy as np
+from modules.audio.capture_buffer import CaptureRingBuffer
+from modules.audio.pcm import load_audio_file
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Formatos aceitos na transcrição em lote
+AUDIO_EXTENSIONS = ('.wav', '.flac')
+
+
+def find_recordings(directory, recursive=True, extensions=AUDIO_EXTENSIONS):
+    """
+    Lista as gravações de uma pasta, em ordem alfabética.
+
+    Args:
+        directory: Pasta com as gravações
+        recursive: Inclui as subpastas
+        extensions: Extensões aceitas
+
+    Returns:
+        list: Caminhos dos arquivos
+    """
+    found = []
+    for root, dirs, files in os.walk(directory):
+        found.extend(os.path.join(root, name) for name in files if name.lower().endswith(extensions))
+        if not recursive:
+            break
+    return sorted(found)
+
+
+class BatchTranscriber:
+    """
+    Transcrição em lote de gravações do disco pelo mesmo STTPipeline do aplicativo.
+
+    Os arquivos são lidos e transcritos com no máximo `concurrency` em andamento
+    (e em memória) ao mesmo tempo: no modo online as requisições usam o cliente
+    assíncrono; no modo local o limite mantém a fila dos processos de STT
+    alimentada. Cada resultado é gravado no JSONL assim que fica pronto, seguido
+    de uma linha de resumo com a vazão.
+    """
+
+    def __init__(self, pipeline, concurrency=4, async_client=None):
+        """
+        Args:
+            pipeline: STTPipeline do modo de transcrição desejado
+            concurrency: Número máximo de arquivos em processamento ao mesmo tempo
+            async_client: Cliente AsyncOpenAI usado no modo online (opcional)
+        """
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.async_client = async_client
+
+    async def _transcribe_file(self, path, root, semaphore):
+        """Lê e transcreve um arquivo, devolvendo o registro do JSONL."""
+        async with semaphore:
+            started = time.perf_counter()
+            record = {'type': 'file', 'file': os.path.relpath(path, root) if root else path,
+                      'duration_s': None, 'text': None, 'error': None, 'cached': False}
+            try:
+                samples, rate = await asyncio.to_thread(load_audio_file, path)
+                record['duration_s'] = round(len(samples) / float(rate), 3)
+                audio_file = CaptureRingBuffer.samples_to_wav(samples, rate, name=os.path.splitext(os.path.basename(path))[0] + ".wav")
+                record['load_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+                transcribe_started = time.perf_counter()
+                record['text'], record['cached'] = await self.pipeline.transcribe_async(audio_file, self.async_client)
+                record['transcribe_ms'] = round((time.perf_counter() - transcribe_started) * 1000, 1)
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                log.error("Erro ao transcrever %s: %s", path, e)
+            record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            return record
+
+    async def run_async(self, paths, output_path, root=None):
+        """
+        Transcreve os arquivos e grava os resultados em JSONL.
+
+        Args:
+            paths: Caminhos das gravações
+            output_path: Arquivo JSONL de saída
+            root: Pasta base para os caminhos relativos gravados no JSONL
+
+        Returns:
+            dict: Resumo de vazão do lote
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+        records = []
+        log.info("Transcrição em lote: %d arquivos, modo %s, %d em paralelo",
+                 len(paths), self.pipeline.mode, self.concurrency)
+
+        with open(output_path, 'w', encoding='utf-8') as output:
+            tasks = [asyncio.create_task(self._transcribe_file(path, root, semaphore)) for path in paths]
+            for finished in asyncio.as_completed(tasks):
+                record = await finished
+                records.append(record)
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                log.info("[%d/%d] %s (%.0f ms)%s", len(records), len(paths), record['file'], record['elapsed_ms'],
+                         " - ERRO" if record['error'] else "")
+
+            summary = self._summarize(records, time.perf_counter() - started)
+            output.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        return summary
+
+    def run(self, paths, output_path, root=None):
+        """Versão síncrona de run_async (cria o próprio loop de eventos)."""
+        return asyncio.run(self.run_async(paths, output_path, root))
+
+    def _summarize(self, records, wall_seconds):
+        """Monta a linha de resumo: contagens, duração de áudio e vazão."""
+        ok = [record for record in records if record['error'] is None]
+        audio_seconds = sum(record['duration_s'] for record in ok)
+        latencies = [record['transcribe_ms'] for record in ok if not record['cached']]
+        return {
+            'type': 'summary',
+            'mode': self.pipeline.mode,
+            'files': len(records),
+            'succeeded': len(ok),
+            'failed': len(records) - len(ok),
+            'cached': sum(1 for record in ok if record['cached']),
+            'concurrency': self.concurrency,
+            'audio_seconds': round(audio_seconds, 1),
+            'wall_seconds': round(wall_seconds, 2),
+            'realtime_factor': round(audio_seconds / wall_seconds, 2) if wall_seconds else None,
+            'files_per_minute': round(len(ok) / wall_seconds * 60, 1) if wall_seconds else None,
+            'mean_transcribe_ms': round(float(np.mean(latencies)), 1) if latencies else None,
+            'p95_transcribe_ms': round(float(np.percentile(latencies, 95)), 1) if latencies else None
+        }
@@ -0,0 +1,224 @@
+import re
+import threading
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from modules.audio.capture_buffer import CaptureRingBuffer
+from modules.audio.pcm import read_wav_pcm, resample
+from modules.audio.vad import create_vad, detect_segments
+from modules.audio.vad.offline import estimate_threshold
+from .base_transcriber import BaseTranscriber
+from .stt_worker import get_stt_worker_pool
+from .whisper_pool import WHISPER_RATE
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Pools de threads compartilhados (por número de workers), reaproveitados entre gravações
+_executors = {}
+_executors_lock = threading.Lock()
+
+def plan_segments(samples, rate, target_seconds=20.0, tolerance=0.4, overlap=0.3, vad_engine='multi'):
+    """
+    Divide um áudio longo em segmentos cortados nas pausas detectadas pelo VAD.
+
+    Cada corte é feito no meio da pausa mais próxima de target_seconds, dentro
+    de uma janela de ±tolerance; sem pausa na janela, corta no limite superior.
+    Os segmentos são estendidos por `overlap` segundos de cada lado, para que
+    nenhuma palavra cortada se perca (as repetições são removidas na costura).
+
+    Args:
+        samples: Array int16 com o áudio
+        rate: Taxa de amostragem em Hz
+        target_seconds: Duração alvo de cada segmento
+        tolerance: Fração de target_seconds aceita em volta do alvo para procurar uma pausa
+        overlap: Segundos de sobreposição entre segmentos vizinhos
+        vad_engine: Engine de VAD usado para achar as pausas
+
+    Returns:
+        list: Pares (início, fim) em amostras
+    """
+    total = len(samples)
+    target = int(target_seconds * rate)
+    if total <= target * (1 + tolerance):
+        return [(0, total)]
+
+    vad = create_vad(vad_engine, rate, frame_size=max(1, int(rate * 0.02)))
+    vad.threshold = estimate_threshold(samples, vad)
+    _, speech = detect_segments(samples, vad)
+    pauses = np.array([(speech[i][1] + speech[i + 1][0]) / 2.0 for i in range(len(speech) - 1)]) * rate
+
+    cuts = [0]
+    while total - cuts[-1] > target * (1 + tolerance):
+        low = cuts[-1] + target * (1 - tolerance)
+        high = cuts[-1] + target * (1 + tolerance)
+        candidates = pauses[(pauses >= low) & (pauses <= high)] if len(pauses) else pauses
+        if len(candidates):
+            cut = int(candidates[np.argmin(np.abs(candidates - (cuts[-1] + target)))])
+        else:
+            cut = int(high)
+        cuts.append(cut)
+    cuts.append(total)
+
+    margin = int(overlap * rate)
+    return [(max(0, start - margin), min(total, end + margin)) for start, end in zip(cuts[:-1], cuts[1:])]
+
+
+def _normalize_word(word):
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def stitch_transcripts(texts, overlaps=0.0, min_overlap_words=2, max_overlap_words=8, words_per_second=4.0):
+    """
+    Junta as transcrições dos segmentos removendo as palavras repetidas na sobreposição.
+
+    Só procura repetições nas emendas em que os segmentos se sobrepõem no áudio:
+    o maior trecho (de min_overlap_words até o número de palavras que cabe na
+    sobreposição) em que o fim do texto acumulado coincide com o começo do próximo
+    segmento, ignorando caixa e pontuação. Emendas sem sobreposição (cortes que
+    não repetem áudio) são apenas concatenadas, então uma palavra que de fato se
+    repete na fala ("eu acho que" + "que bom") não é perdida.
+
+    Args:
+        texts: Transcrições na ordem dos segmentos
+        overlaps: Segundos de áudio repetidos em cada emenda (lista com len(texts) - 1 valores, ou um valor para todas)
+        min_overlap_words: Número mínimo de palavras coincidentes para considerar repetição
+        max_overlap_words: Número máximo de palavras repetidas procuradas
+        words_per_second: Ritmo máximo de fala usado para limitar as palavras procuradas pela duração da sobreposição
+
+    Returns:
+        str: Transcrição completa
+    """
+    if np.isscalar(overlaps):
+        overlaps = [overlaps] * max(0, len(texts) - 1)
+    words = []
+    for index, text in enumerate(texts):
+        next_words = (text or "").split()
+        if not next_words:
+            continue
+        repeated = 0
+        overlap = overlaps[index - 1] if index > 0 else 0.0
+        limit = min(max_overlap_words, int(np.ceil(overlap * words_per_second)))
+        if words and overlap > 0 and limit >= min_overlap_words:
+            tail = [_normalize_word(w) for w in words[-limit:]]
+            head = [_normalize_word(w) for w in next_words[:limit]]
+            for size in range(min(len(tail), len(head)), min_overlap_words - 1, -1):
+                if tail[-size:] == head[:size] and any(tail[-size:]):
+                    repeated = size
+                    break
+        words.extend(next_words[repeated:])
+    return " ".join(words)
+
+
+class ChunkedTranscriber(BaseTranscriber):
+    """
+    Transcrição em paralelo de gravações longas.
+
+    Corta o áudio em segmentos sobrepostos nas pausas do VAD, transcreve os
+    segmentos ao mesmo tempo (threads para a API, processos de STT para o
+    Whisper local) e costura o resultado removendo as palavras repetidas.
+    """
+
+    def __init__(self, client, logger, vars=None, transcriber=None, use_local=False, max_workers=4,
+                 min_duration=45.0, target_seconds=20.0, overlap=0.3):
+        """
+        Args:
+            client: Cliente OpenAI inicializado
+            logger: Logger configurado
+            vars: Variáveis da UI (opcional)
+            transcriber: Transcritor online com request_transcription (usado quando use_local=False)
+            use_local: Usa o Whisper local no pool de processos de STT
+            max_workers: Número de requisições simultâneas à API (no modo local vale o num_workers do pool de STT)
+            min_duration: Duração mínima (s) para dividir; abaixo disso envia o áudio inteiro
+            target_seconds: Duração mínima alvo de cada segmento
+            overlap: Segundos de sobreposição entre segmentos
+        """
+        super().__init__(client, logger, vars)
+        self.transcriber = transcriber
+        self.use_local = use_local
+        self.max_workers = max_workers
+        self.min_duration = min_duration
+        self.target_seconds = target_seconds
+        self.overlap = overlap
+        self.last_metrics = None
+
+    def should_split(self, audio_file):
+        """Indica se a gravação é longa o bastante para ser dividida."""
+        duration = getattr(audio_file, 'duration', None)
+        if duration is None:
+            samples, rate = read_wav_pcm(audio_file)
+            duration = len(samples) / float(rate)
+        return duration >= self.min_duration
+
+    @property
+    def workers(self):
+        """Segmentos transcritos ao mesmo tempo: processos de STT (local) ou requisições simultâneas (API)."""
+        if self.use_local:
+            return get_stt_worker_pool().num_workers
+        return self.max_workers
+
+    def _segment_seconds(self, duration):
+        """Duração dos segmentos: uma parte por worker, sem ficar abaixo de target_seconds."""
+        return max(self.target_seconds, duration / self.workers)
+
+    def _get_executor(self):
+        """Retorna o executor do modo atual: o pool de processos de STT (local) ou um pool de threads compartilhado (API)."""
+        if self.use_local:
+            return get_stt_worker_pool()
+        with _executors_lock:
+            if self.max_workers not in _executors:
+                _executors[self.max_workers] = ThreadPoolExecutor(max_workers=self.max_workers)
+            return _executors[self.max_workers]
+
+    def _submit(self, executor, samples, rate, index):
+        if self.use_local:
+            # PCM enviado ao worker de STT por memória compartilhada
+            audio = resample(samples, rate, WHISPER_RATE).astype(np.float32) / 32768.0
+            return executor.submit(audio)
+        segment_file = CaptureRingBuffer.samples_to_wav(samples, rate, name=f"segment_{index}.wav")
+        return executor.submit(self.transcriber.request_transcription, segment_file)
+
+    def transcribe(self, audio_file):
+        """
+        Transcreve a gravação em segmentos paralelos.
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+
+        Returns:
+            str: Texto transcrito
+        """
+        try:
+            started = time.perf_counter()
+            samples, rate = read_wav_pcm(audio_file)
+            segments = plan_segments(samples, rate, self._segment_seconds(len(samples) / float(rate)), overlap=self.overlap)
+            log.info("Transcrição em partes: %.1f s divididos em %d segmentos (%d workers)",
+                     len(samples) / float(rate), len(segments), self.workers)
+
+            executor = self._get_executor()
+            futures = [self._submit(executor, samples[start:end], rate, i) for i, (start, end) in enumerate(segments)]
+            texts = [future.result() for future in futures]
+            overlaps = [(previous_end - start) / float(rate) for (_, previous_end), (start, _) in zip(segments, segments[1:])]
+            transcribed_text = stitch_transcripts(texts, overlaps)
+
+            self.last_metrics = {
+                'segments': len(segments),
+                'audio_seconds': len(samples) / float(rate),
+                'total_ms': (time.perf_counter() - started) * 1000
+            }
+            log.info("Transcrição em partes concluída em %.0f ms", self.last_metrics['total_ms'])
+            return transcribed_text
+
+        except Exception as e:
+            log.error("Erro na Transcrição em partes: %s", e)
+            return f"Erro na Transcrição: {e}"
+
+
+def shutdown_executors():
+    """Encerra os pools de threads da transcrição em partes (no encerramento do aplicativo)."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
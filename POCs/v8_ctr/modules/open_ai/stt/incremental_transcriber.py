@@ -0,0 +1,214 @@
+import threading
+import time
+from modules.audio.capture_buffer import CaptureRingBuffer
+from modules.audio.vad import create_vad, detect_segments
+from modules.audio.vad.offline import estimate_threshold
+from .chunked_transcriber import stitch_transcripts
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+
+class IncrementalTranscriber:
+    """
+    Transcrição incremental enquanto o usuário ainda fala.
+
+    Uma thread lê periodicamente a parte ainda não confirmada do anel de captura.
+    Quando essa parte passa de commit_seconds, o trecho até a última pausa do VAD
+    é transcrito e confirmado (não é mais enviado); o restante é transcrito como
+    hipótese parcial, publicada em on_partial. No fim do turno só falta transcrever
+    a cauda curta após a última pausa confirmada — ou nada, se a última hipótese
+    parcial já cobre toda a fala.
+    """
+
+    # Segundos de áudio usados para estimar o ruído de fundo do VAD
+    NOISE_WINDOW = 30.0
+
+    def __init__(self, transcriber, step=1.0, commit_seconds=4.0, min_pause=0.25, min_window=0.5,
+                 on_partial=None, vad_engine='multi'):
+        """
+        Args:
+            transcriber: Transcritor com request_transcription(audio_file), que propaga exceções
+            step: Intervalo em segundos entre as atualizações parciais
+            commit_seconds: Duração não confirmada a partir da qual se procura uma pausa para confirmar
+            min_pause: Duração mínima (s) de uma pausa usada como ponto de corte
+            min_window: Duração mínima (s) de áudio novo para pedir uma hipótese parcial
+            on_partial: Callback chamado com o texto parcial (confirmado + hipótese)
+            vad_engine: Engine de VAD usado para achar as pausas
+        """
+        self.transcriber = transcriber
+        self.step = step
+        self.commit_seconds = commit_seconds
+        self.min_pause = min_pause
+        self.min_window = min_window
+        self.on_partial = on_partial
+        self.vad_engine = vad_engine
+        self.buffer = None
+        self.vad = None
+        self.partial_text = ""
+        self.final_text = None
+        self.last_metrics = None
+        self._committed = []
+        self._start = 0
+        self._commit_index = 0
+        self._partial_range = None
+        self._end_index = None
+        self._stop = threading.Event()
+        self._commit_lock = threading.Lock()
+        self._thread = None
+        self._stats = {'partials': 0, 'commits': 0, 'errors': 0, 'partial_ms': []}
+
+    def start(self, buffer, start=0):
+        """
+        Começa a acompanhar o anel de captura a partir de um índice absoluto.
+
+        Args:
+            buffer: CaptureRingBuffer sendo preenchido pela captura
+            start: Índice absoluto da primeira amostra da fala
+        """
+        self.buffer = buffer
+        self.vad = create_vad(self.vad_engine, buffer.rate, frame_size=max(1, int(buffer.rate * 0.02)))
+        self._start = start
+        self._commit_index = start
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        log.info("Transcrição incremental iniciada (atualização a cada %.1f s)", self.step)
+
+    def stop(self, end=None):
+        """
+        Marca o fim da fala e encerra as atualizações parciais (não bloqueia).
+
+        Args:
+            end: Índice absoluto do fim da fala; padrão é o fim atual do anel
+        """
+        if self._end_index is None:
+            self._end_index = self.buffer.total_written if end is None else end
+        self._stop.set()
+
+    def _request(self, start, end):
+        """Transcreve um intervalo absoluto do anel."""
+        samples = self.buffer.read_range(start, end)
+        audio_file = CaptureRingBuffer.samples_to_wav(samples, self.buffer.rate, self.buffer.channels,
+                                                      name=f"incremental_{start}.wav")
+        return self.transcriber.request_transcription(audio_file)
+
+    def _speech(self, start, end):
+        """
+        Segmentos de fala (início_s, fim_s) de um intervalo absoluto, relativos a start.
+
+        O limite do VAD é estimado sobre os últimos NOISE_WINDOW segundos da fala
+        inteira (que incluem o pré-roll e as pausas), e não só sobre o intervalo,
+        que pode ser curto demais para conter ruído de fundo.
+        """
+        reference = self.buffer.read_range(max(self._start, end - int(self.NOISE_WINDOW * self.buffer.rate)), end)
+        self.vad.threshold = estimate_threshold(reference, self.vad)
+        return detect_segments(self.buffer.read_range(start, end), self.vad)[1]
+
+    def _find_commit_point(self, start, end):
+        """
+        Procura a última pausa entre falas no intervalo, deixando pelo menos
+        min_window segundos de áudio depois dela (o fim ainda pode mudar).
+
+        Returns:
+            int | None: Índice absoluto do meio da pausa
+        """
+        rate = self.buffer.rate
+        speech = self._speech(start, end)
+        if not speech:
+            # Só silêncio: avança sem transcrever, mantendo a janela mínima
+            return max(start, end - int(self.min_window * rate))
+        latest = (end - start) / float(rate) - self.min_window
+        for (_, previous_end), (next_start, _) in reversed(list(zip(speech[:-1], speech[1:]))):
+            middle = (previous_end + next_start) / 2.0
+            if next_start - previous_end >= self.min_pause and middle <= latest:
+                return start + int(middle * rate)
+        return None
+
+    def _run(self):
+        """Loop da thread: confirma trechos nas pausas e publica hipóteses parciais."""
+        rate = self.buffer.rate
+        while not self._stop.wait(self.step):
+            try:
+                end = self.buffer.total_written
+                with self._commit_lock:
+                    if self._stop.is_set():
+                        break
+                    if end - self._commit_index >= self.commit_seconds * rate:
+                        cut = self._find_commit_point(self._commit_index, end)
+                        if cut is not None and cut > self._commit_index:
+                            text = self._request(self._commit_index, cut) if cut - self._commit_index >= self.min_window * rate else ""
+                            if text.strip():
+                                self._committed.append(text)
+                            self._commit_index = cut
+                            self._stats['commits'] += 1
+                    start = self._commit_index
+                    committed = list(self._committed)
+
+                if end - start < self.min_window * rate:
+                    continue
+                started = time.perf_counter()
+                text = self._request(start, end)
+                if self._stop.is_set():
+                    # A fala terminou durante o pedido: a finalização já decidiu sem esta hipótese
+                    break
+                self._stats['partials'] += 1
+                self._stats['partial_ms'].append((time.perf_counter() - started) * 1000)
+                self._partial_range = (start, end, text)
+                self.partial_text = stitch_transcripts(committed + [text])
+                if self.on_partial:
+                    self.on_partial(self.partial_text)
+            except Exception as e:
+                self._stats['errors'] += 1
+                log.warning("Falha na atualização da transcrição incremental: %s", e)
+
+    def finalize(self, end=None):
+        """
+        Conclui a transcrição no fim do turno.
+
+        Reaproveita a última hipótese parcial quando o áudio após ela não tem
+        fala; caso contrário transcreve apenas a cauda não confirmada.
+
+        Args:
+            end: Índice absoluto do fim da fala (padrão: o marcado em stop ou o fim atual)
+
+        Returns:
+            str: Texto transcrito completo
+        """
+        if self.final_text is not None:
+            return self.final_text
+        started = time.perf_counter()
+        self.stop(end)
+        with self._commit_lock:
+            start = self._commit_index
+            committed = list(self._committed)
+        end = self._end_index
+        rate = self.buffer.rate
+
+        reused = False
+        partial = self._partial_range
+        if partial is not None and partial[0] == start and partial[1] <= end and not self._speech(partial[1], end):
+            tail_text = partial[2]
+            reused = True
+        elif end - start >= self.min_window * rate or not committed:
+            tail_text = self._request(start, end)
+        else:
+            tail_text = ""
+
+        text = stitch_transcripts(committed + [tail_text])
+        self.final_text = text
+        self.last_metrics = {
+            'finalize_ms': (time.perf_counter() - started) * 1000,
+            'tail_seconds': (end - start) / float(rate),
+            'reused_partial': reused,
+            'commits': self._stats['commits'],
+            'partials': self._stats['partials'],
+            'errors': self._stats['errors'],
+            'mean_partial_ms': sum(self._stats['partial_ms']) / len(self._stats['partial_ms'])
+                               if self._stats['partial_ms'] else None
+        }
+        log.info("Transcrição incremental finalizada em %.0f ms (cauda de %.2f s%s, %d trechos confirmados, %d parciais)",
+                 self.last_metrics['finalize_ms'], self.last_metrics['tail_seconds'],
+                 ", parcial reaproveitada" if reused else "", self._stats['commits'], self._stats['partials'])
+        return text
@@ -1,5 +1,8 @@
 import numpy as np
+from modules.audio.pcm import read_wav_pcm, resample
 from .base_transcriber import BaseTranscriber
+from .whisper_pool import WHISPER_RATE
+from .stt_worker import get_stt_worker_pool
 import logging
 
 # Configuração do logger
@@ -8,27 +11,62 @@ log = logging.getLogger(__name__)
 
 class LocalTranscriber(BaseTranscriber):
     """Implementação do transcritor usando Whisper localmente"""
-    
+
+    def __init__(self, client, logger, vars=None, pool=None):
+        """
+        Inicializa o transcritor local.
+
+        Args:
+            client: Cliente OpenAI inicializado
+            logger: Logger configurado
+            vars: Variáveis da UI (opcional)
+            pool: STTWorkerPool (processos isolados) ou WhisperModelPool (no próprio processo);
+                  padrão: pool de processos de STT do aplicativo
+        """
+        super().__init__(client, logger, vars)
+        self.pool = pool or get_stt_worker_pool()
+
+    @property
+    def model(self):
+        """Nome do modelo usado (identifica as transcrições no cache)."""
+        return f"whisper-{self.pool.model_name}-local"
+
     def transcribe(self, audio_file):
         """
         Transcreve áudio usando o modelo Whisper local.
-        
+
         Args:
-            audio_file: Objeto BytesIO contendo os dados de áudio
-            
+            audio_file: WavView ou objeto binário com o WAV gravado
+
         Returns:
             str: Texto transcrito
         """
         try:
-            import whisper
-            self._log_transcription_details(audio_file, "whisper-base-local")
-            
-            local_model = whisper.load_model("base")
-            audio_file.seek(0)
-            audio_data = np.frombuffer(audio_file.read(), np.int16).astype(np.float32) / 32768.0
-            result = local_model.transcribe(audio_data)
-            return result.get("text", "")
-            
+            return self.request_transcription(audio_file)
         except Exception as e:
             log.error("Erro na Transcrição Local: %s", e)
             return f"Erro na Transcrição Local: {e}"
+
+    def request_transcription(self, audio_file):
+        """
+        Transcreve no pool local propagando exceções (usado pela transcrição incremental).
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+
+        Returns:
+            str: Texto transcrito
+
+        Raises:
+            RuntimeError: Se o modelo Whisper não pôde ser carregado
+        """
+        # Falha antes de decodificar o áudio quando o modelo já se mostrou indisponível
+        if self.pool.load_error is not None:
+            raise RuntimeError(f"Modelo Whisper indisponível: {self.pool.load_error}")
+        self._log_transcription_details(audio_file, self.model)
+
+        # Lê o PCM pelo cabeçalho do WAV e converte para float32 a 16 kHz, como o Whisper espera
+        samples, rate = read_wav_pcm(audio_file)
+        audio_data = resample(samples, rate, WHISPER_RATE).astype(np.float32) / 32768.0
+        return self.pool.transcribe(audio_data)
+
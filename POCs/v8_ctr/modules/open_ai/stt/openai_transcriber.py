@@ -1,4 +1,7 @@
+import asyncio
+import time
 from .base_transcriber import BaseTranscriber
+from .upload_encoder import UploadEncoder
 import logging
 
 # Configuração do logger
@@ -7,6 +10,21 @@ log = logging.getLogger(__name__)
 
 class OpenAITranscriber(BaseTranscriber):
     """Implementação do transcritor usando a API OpenAI"""
+
+    def __init__(self, client, logger, vars=None, encoder=None):
+        """
+        Inicializa o transcritor online.
+
+        Args:
+            client: Cliente OpenAI inicializado
+            logger: Logger configurado
+            vars: Variáveis da UI (opcional)
+            encoder: UploadEncoder usado antes do envio (padrão: FLAC 16 kHz sem silêncio nas bordas)
+        """
+        super().__init__(client, logger, vars)
+        self.encoder = encoder or UploadEncoder()
+        self.model = "whisper-1"
+        self.last_metrics = None
     
     def transcribe(self, audio_file):
         """
@@ -19,22 +37,73 @@ class OpenAITranscriber(BaseTranscriber):
             str: Texto transcrito
         """
         try:
-            if not self.client:
-                raise ValueError("Cliente OpenAI não inicializado")
-            
-            audio_file.seek(0)
-            self._log_transcription_details(audio_file, "whisper-1")
-            
-            response = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file
-            )
-            
-            transcribed_text = response.text
-            log.info("Texto transcrito: %s", transcribed_text)
-            
-            return transcribed_text
-            
+            return self.request_transcription(audio_file)
         except Exception as e:
             log.error("Erro na Transcrição: %s", e)
             return f"Erro na Transcrição: {e}"
+
+    def request_transcription(self, audio_file):
+        """
+        Codifica e envia o áudio à API, propagando exceções (usado pela transcrição em partes).
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+
+        Returns:
+            str: Texto transcrito
+        """
+        if not self.client:
+            raise ValueError("Cliente OpenAI não inicializado")
+        
+        started = time.perf_counter()
+        audio_file.seek(0)
+        self._log_transcription_details(audio_file, self.model)
+
+        # Recorta o silêncio, reamostra para 16 kHz e comprime antes do envio
+        upload_file, metrics = self.encoder.encode(audio_file)
+        request_started = time.perf_counter()
+        
+        response = self.client.audio.transcriptions.create(
+            model=self.model,
+            file=upload_file
+        )
+        
+        transcribed_text = response.text
+        self._record_metrics(metrics, started, request_started)
+        log.info("Texto transcrito: %s", transcribed_text)
+        
+        return transcribed_text
+
+    async def request_transcription_async(self, audio_file, async_client):
+        """
+        Versão assíncrona de request_transcription, para transcrever muitos arquivos ao mesmo tempo.
+
+        A codificação (CPU) roda em uma thread; a requisição usa o cliente assíncrono.
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+            async_client: Cliente AsyncOpenAI
+
+        Returns:
+            str: Texto transcrito
+        """
+        started = time.perf_counter()
+        upload_file, metrics = await asyncio.to_thread(self.encoder.encode, audio_file)
+        request_started = time.perf_counter()
+        response = await async_client.audio.transcriptions.create(
+            model=self.model,
+            file=upload_file
+        )
+        self._record_metrics(metrics, started, request_started)
+        return response.text
+
+    def _record_metrics(self, metrics, started, request_started):
+        """Completa e registra as métricas de codificação e latência de uma requisição."""
+        metrics['request_ms'] = (time.perf_counter() - request_started) * 1000
+        metrics['total_ms'] = (time.perf_counter() - started) * 1000
+        self.last_metrics = metrics
+        log.info("Envio: %d -> %d bytes (%s, %.0f%% menor), %.2f s -> %.2f s de áudio",
+                 metrics['original_bytes'], metrics['encoded_bytes'], metrics['codec'],
+                 metrics['saved_ratio'] * 100, metrics['original_duration'], metrics['trimmed_duration'])
+        log.info("Latência da transcrição: %.0f ms (codificação %.0f ms, requisição %.0f ms)",
+                 metrics['total_ms'], metrics['encode_ms'], metrics['request_ms'])
@@ -0,0 +1,152 @@
+import asyncio
+from .openai_transcriber import OpenAITranscriber
+from .local_transcriber import LocalTranscriber
+from .spellcheck_transcriber import SpellcheckTranscriber
+from .chunked_transcriber import ChunkedTranscriber
+from .incremental_transcriber import IncrementalTranscriber
+from .transcription_cache import TranscriptionCache, audio_fingerprint, get_transcription_cache
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Modos de transcrição da UI (valores da variável 'whisper')
+MODE_ONLINE = "Online"
+MODE_LOCAL = "Local"
+MODE_SPELLCHECK = "Com Correção Ortográfica"
+
+
+def mode_for(use_local=False, use_spellcheck=False):
+    """Converte as opções de transcrição no modo correspondente da UI."""
+    if use_spellcheck:
+        return MODE_SPELLCHECK
+    return MODE_LOCAL if use_local else MODE_ONLINE
+
+
+class STTPipeline:
+    """
+    Pipeline de transcrição montado uma vez para um modo: transcritor, divisão
+    em partes para gravações longas e pós-processadores (correção ortográfica).
+
+    Os objetos (codificador de envio, lista de termos da correção) são
+    reaproveitados entre as gravações; o pipeline só é refeito quando o modo
+    de transcrição muda. A transcrição bruta (antes dos pós-processadores) passa
+    pelo cache de transcrições, indexado pelo conteúdo do áudio.
+    """
+
+    def __init__(self, client, logger, task_manager, vars=None, mode=MODE_ONLINE, cache=None):
+        """
+        Args:
+            client: Cliente OpenAI inicializado
+            logger: Logger configurado
+            task_manager: Instância do TaskManager para acessar prompts
+            vars: Variáveis da UI (opcional)
+            mode: Modo de transcrição ("Online", "Local" ou "Com Correção Ortográfica")
+            cache: TranscriptionCache usado (padrão: cache compartilhado do aplicativo)
+        """
+        self.mode = mode
+        self.use_local = mode == MODE_LOCAL
+        self.use_spellcheck = mode == MODE_SPELLCHECK
+
+        if self.use_local:
+            self.transcriber = LocalTranscriber(client, logger, vars)
+        else:
+            self.transcriber = OpenAITranscriber(client, logger, vars)
+        # Gravações longas são divididas nas pausas e transcritas em paralelo
+        self.chunked = ChunkedTranscriber(client, logger, vars, transcriber=self.transcriber, use_local=self.use_local)
+        self.post_processors = [SpellcheckTranscriber(client, logger, task_manager, vars)] if self.use_spellcheck else []
+        self._can_request = self.use_local or client is not None
+        self.cache = cache or get_transcription_cache()
+        # Online e correção ortográfica usam o mesmo transcritor: compartilham as entradas do cache
+        self._cache_mode = "local" if self.use_local else "online"
+
+    def transcribe(self, audio_file):
+        """
+        Transcreve a gravação e aplica os pós-processadores.
+
+        Se a gravação chegou com uma transcrição incremental (feita durante a fala),
+        apenas a finaliza em vez de transcrever o áudio inteiro.
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+
+        Returns:
+            str: Texto transcrito (e corrigido, se for o caso)
+        """
+        try:
+            key = TranscriptionCache.make_key(audio_fingerprint(audio_file), self._cache_mode, self.transcriber.model)
+            text = self.cache.get(key)
+            if text is not None:
+                log.info("Transcrição encontrada no cache (taxa de acerto %.0f%%)",
+                         self.cache.get_metrics()['hit_rate'] * 100)
+            else:
+                text = self._transcribe_audio(audio_file)
+                if not text.startswith("Erro na Transcrição"):
+                    self.cache.put(key, text)
+
+            for processor in self.post_processors:
+                text = processor.transcribe(text)
+            return text
+
+        except Exception as e:
+            log.error("Erro na Transcrição: %s", e)
+            return f"Erro na Transcrição: {e}"
+
+    async def transcribe_async(self, audio_file, async_client=None):
+        """
+        Versão assíncrona de transcribe para processamento em lote, propagando erros.
+
+        No modo online com async_client, a requisição usa o cliente assíncrono;
+        no modo local (ou sem cliente assíncrono) o pipeline síncrono roda em uma
+        thread, e o Whisper local continua nos processos de STT.
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+            async_client: Cliente AsyncOpenAI (opcional)
+
+        Returns:
+            tuple: (texto transcrito, True se veio do cache)
+
+        Raises:
+            RuntimeError: Se a transcrição falhar
+        """
+        key = TranscriptionCache.make_key(audio_fingerprint(audio_file), self._cache_mode, self.transcriber.model)
+        text = self.cache.get(key)
+        cached = text is not None
+        if not cached:
+            if async_client is not None and not self.use_local:
+                text = await self.transcriber.request_transcription_async(audio_file, async_client)
+            else:
+                text = await asyncio.to_thread(self._transcribe_audio, audio_file)
+                if text.startswith("Erro na Transcrição"):
+                    raise RuntimeError(text)
+            self.cache.put(key, text)
+
+        for processor in self.post_processors:
+            text = await asyncio.to_thread(processor.transcribe, text)
+        return text, cached
+
+    def _transcribe_audio(self, audio_file):
+        """Transcrição bruta: finaliza a incremental, divide gravações longas ou envia o áudio inteiro."""
+        incremental = getattr(audio_file, 'incremental', None)
+        if incremental is not None:
+            return incremental.finalize()
+        if self.chunked.should_split(audio_file):
+            return self.chunked.transcribe(audio_file)
+        return self.transcriber.transcribe(audio_file)
+
+    def create_incremental(self, on_partial=None, **options):
+        """
+        Cria uma transcrição incremental que usa o transcritor deste pipeline.
+
+        Args:
+            on_partial: Callback chamado com cada hipótese parcial
+            **options: Parâmetros do IncrementalTranscriber (step, commit_seconds, vad_engine, ...)
+
+        Returns:
+            IncrementalTranscriber | None: None se o modo online não tiver cliente
+        """
+        if not self._can_request:
+            return None
+        return IncrementalTranscriber(self.transcriber, on_partial=on_partial, **options)
@@ -1,4 +1,5 @@
 from .base_transcriber import BaseTranscriber
+from .term_corrector import TermCorrector, parse_terms
 import logging
 
 # Configuração do logger
@@ -8,9 +9,12 @@ log = logging.getLogger(__name__)
 class SpellcheckTranscriber(BaseTranscriber):
     """
     Implementação do transcritor com correção ortográfica usando GPT-4.
+
+    Os termos conhecidos são corrigidos primeiro por um corretor local; o texto
+    só vai ao modelo quando o corretor encontra trechos de baixa confiança.
     """
     
-    def __init__(self, client, logger, task_manager, vars=None):
+    def __init__(self, client, logger, task_manager, vars=None, escalate=True):
         """
         Inicializa o SpellcheckTranscriber.
         
@@ -19,13 +23,22 @@ class SpellcheckTranscriber(BaseTranscriber):
             logger: Logger para registrar informações
             task_manager: Instância do TaskManager para acessar o prompt de correção
             vars: Variáveis de configuração (opcional)
+            escalate: Envia ao modelo os textos com trechos duvidosos (False: só o corretor local)
         """
         super().__init__(client, logger, vars)
         log.info("Inicializando SpellcheckTranscriber")
         self.task_manager = task_manager
-        self.correct_terms = self.task_manager.get_spelling_correction_prompt().strip().split('\n')
         # Remove espaços em branco e vírgulas extras
-        self.correct_terms = [term.strip().strip(',') for term in self.correct_terms if term.strip()]
+        self.correct_terms = parse_terms(self.task_manager.get_spelling_correction_prompt())
+        self.corrector = TermCorrector(self.correct_terms)
+        self.escalate = escalate
+        self.stats = {'local': 0, 'escalated': 0}
+        # O prompt do sistema é montado uma vez; o transcritor é reaproveitado entre gravações
+        self.system_message = (
+            "Corrija o texto usando a lista de termos fornecida como referência. "
+            "Retorne apenas o texto corrigido, sem explicações.\n\n"
+            f"Termos corretos: {', '.join(self.correct_terms)}"
+        )
 
     def transcribe(self, text):
         """
@@ -41,12 +54,16 @@ class SpellcheckTranscriber(BaseTranscriber):
             log.info("Iniciando correção ortográfica")
             log.info("Texto original: %s", text)
 
-            # Prepara o prompt do sistema
-            system_message = (
-                "Corrija o texto usando a lista de termos fornecida como referência. "
-                "Retorne apenas o texto corrigido, sem explicações.\n\n"
-                f"Termos corretos: {', '.join(self.correct_terms)}"
-            )
+            # Correção local dos termos conhecidos; o modelo só é chamado se houver dúvida
+            text, report = self.corrector.correct(text)
+            log.info("Correção local em %.0f us: %d termo(s) corrigido(s), %d trecho(s) duvidoso(s)",
+                     report['elapsed_us'], len(report['corrections']), len(report['uncertain']))
+            if not report['needs_review'] or not self.escalate or not self.client:
+                self.stats['local'] += 1
+                log.info("Texto corrigido: %s", text)
+                return text
+            self.stats['escalated'] += 1
+            log.info("Trechos duvidosos enviados ao modelo: %s", [item['text'] for item in report['uncertain']])
 
             # Aplica correção com GPT-4
             selected_model = self.vars['chatgpt_model'].get() if self.vars else "gpt-4"
@@ -56,7 +73,7 @@ class SpellcheckTranscriber(BaseTranscriber):
                 model=selected_model,
                 temperature=0,
                 messages=[
-                    {"role": "system", "content": system_message},
+                    {"role": "system", "content": self.system_message},
                     {"role": "user", "content": text}
                 ]
             )
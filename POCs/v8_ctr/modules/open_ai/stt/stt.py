@@ -1,6 +1,5 @@
-from .openai_transcriber import OpenAITranscriber
-from .local_transcriber import LocalTranscriber
-from .spellcheck_transcriber import SpellcheckTranscriber
+import threading
+from .pipeline import STTPipeline, MODE_ONLINE, mode_for
 import logging
 
 # Configuração do logger
@@ -10,12 +9,14 @@ log = logging.getLogger(__name__)
 class SpeechToText:
     """
     Classe principal que gerencia diferentes implementações de transcrição.
-    Atua como uma fábrica para criar a implementação apropriada com base nas opções.
+    Mantém um pipeline por modo de transcrição, montado no primeiro uso do modo e
+    reaproveitado depois (alternar entre a transcrição normal e a com correção
+    ortográfica não remonta o pipeline nem o índice de termos).
     """
     def __init__(self, client, logger, task_manager, vars=None):
         """
         Inicializa o gerenciador de transcrição.
-        
+
         Args:
             client: Cliente OpenAI inicializado
             logger: Logger configurado
@@ -26,41 +27,60 @@ class SpeechToText:
         self.logger = logger
         self.task_manager = task_manager
         self.vars = vars
+        self._pipelines = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def current_mode(self):
+        """Retorna o modo de transcrição selecionado na UI."""
+        return self.vars['whisper'].get() if self.vars else MODE_ONLINE
+
+    def get_pipeline(self, mode=None):
+        """
+        Retorna o pipeline do modo pedido, montando-o apenas no primeiro uso do modo.
+
+        Args:
+            mode: Modo de transcrição (padrão: o selecionado na UI)
+
+        Returns:
+            STTPipeline: Pipeline pronto para uso
+        """
+        mode = mode or self.current_mode()
+        with self._lock:
+            pipeline = self._pipelines.get(mode)
+            if pipeline is None:
+                pipeline = STTPipeline(self.client, self.logger, self.task_manager, self.vars, mode=mode)
+                self._pipelines[mode] = pipeline
+                self.builds += 1
+                log.info("Pipeline de transcrição montado para o modo %s", mode)
+            return pipeline
 
     def transcribe_audio(self, audio_file, use_local=False, use_spellcheck=False):
         """
         Transcreve áudio para texto usando a implementação apropriada.
-        
+
         Args:
             audio_file: Objeto BytesIO contendo os dados de áudio
             use_local: Booleano indicando se deve usar o modelo Whisper local
             use_spellcheck: Booleano indicando se deve usar correção ortográfica
-            
+
         Returns:
             str: Texto transcrito
         """
         log.info("=== Iniciando transcribe_audio ===")
         log.info("Parâmetros: use_local=%s, use_spellcheck=%s", use_local, use_spellcheck)
-        
-        try:
-            # Primeiro faz a transcrição normal
-            if use_local:
-                transcriber = LocalTranscriber(self.client, self.logger, self.vars)
-            else:
-                transcriber = OpenAITranscriber(self.client, self.logger, self.vars)
-            
-            # Executa a transcrição inicial
-            transcribed_text = transcriber.transcribe(audio_file)
-            
-            # Se necessário, aplica a correção ortográfica
-            if use_spellcheck:
-                log.info("Aplicando correção ortográfica ao texto transcrito")
-                spellchecker = SpellcheckTranscriber(self.client, self.logger, self.task_manager, self.vars)
-                corrected_text = spellchecker.transcribe(transcribed_text)
-                return corrected_text
-            
-            return transcribed_text
-            
-        except Exception as e:
-            log.error("Erro na Transcrição: %s", e)
-            return f"Erro na Transcrição: {e}"
+        return self.get_pipeline(mode_for(use_local, use_spellcheck)).transcribe(audio_file)
+
+    def create_incremental(self, on_partial=None, mode=None, **options):
+        """
+        Cria uma transcrição incremental com o transcritor do pipeline atual.
+
+        Args:
+            on_partial: Callback chamado com cada hipótese parcial
+            mode: Modo de transcrição (padrão: o selecionado na UI)
+            **options: Parâmetros do IncrementalTranscriber (step, commit_seconds, vad_engine, ...)
+
+        Returns:
+            IncrementalTranscriber | None: None se o modo online não tiver cliente
+        """
+        return self.get_pipeline(mode).create_incremental(on_partial=on_partial, **options)
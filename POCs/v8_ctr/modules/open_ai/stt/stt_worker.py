@@ -0,0 +1,474 @@
+import collections
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, CancelledError
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait as wait_connections
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+def _attach_shared_memory(name):
+    """Abre um bloco de memória compartilhada criado pelo processo principal, sem assumir sua posse."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: o worker (spawn) usa o mesmo resource_tracker do processo principal,
+        # que continua responsável por remover o bloco
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(index, model_name, conn):
+    """
+    Loop do processo de STT: carrega o modelo uma vez e transcreve os pedidos recebidos.
+
+    Args:
+        index: Índice do worker no pool
+        model_name: Modelo Whisper carregado pelo worker
+        conn: Ponta do worker no pipe exclusivo com o processo principal; recebe
+            (job_id, nome da memória compartilhada, número de amostras) e envia as mensagens
+    """
+    from .whisper_pool import WhisperModelPool, WHISPER_RATE
+
+    pool = WhisperModelPool(model_name)
+    pool.warm_up()
+    pool.ready.wait()
+    conn.send(('ready', index, multiprocessing.current_process().pid, pool.load_seconds,
+               None if pool.load_error is None else str(pool.load_error)))
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        job_id, shm_name, num_samples = task
+
+        conn.send(('started', job_id, index))
+        started = time.perf_counter()
+        shm = None
+        try:
+            shm = _attach_shared_memory(shm_name)
+            samples = np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)
+            text = pool.transcribe(samples)
+            del samples
+            elapsed = time.perf_counter() - started
+            duration = num_samples / float(WHISPER_RATE)
+            conn.send(('done', job_id, index, text, None, elapsed, elapsed / duration if duration else 0.0))
+        except Exception as e:
+            conn.send(('done', job_id, index, None, str(e), time.perf_counter() - started, None))
+        finally:
+            if shm is not None:
+                shm.close()
+
+
+class STTWorkerPool:
+    """
+    Pool de processos dedicados ao Whisper local.
+
+    A inferência roda fora do processo do aplicativo, então não disputa o GIL
+    com o loop do Tk, o callback de reprodução e o loop do VAD. O PCM vai para
+    o worker por memória compartilhada (sem serialização) e o texto volta pelo
+    pipe exclusivo de cada worker. A fila de pedidos fica no processo principal
+    e cada worker recebe um pedido por vez, então reiniciar um worker à força
+    (cancelamento de um pedido em execução) só descarta o pipe dele, sem deixar
+    lock ou fila compartilhada em estado inconsistente para os outros. Expõe
+    métricas de profundidade de fila.
+
+    Pedidos só são entregues a workers que carregaram o modelo. Um worker cujo
+    modelo não carregou sai do pool; um worker que morre é reiniciado com
+    espera crescente, até max_restarts vezes seguidas. Sem nenhum worker
+    restante, o pool fica falho: load_error guarda o motivo, os pedidos na
+    fila falham e os novos são recusados de imediato.
+    """
+
+    def __init__(self, model_name="base", num_workers=1, max_restarts=3, restart_backoff=0.5):
+        """
+        Args:
+            model_name: Modelo Whisper carregado em cada worker
+            num_workers: Número de processos de STT
+            max_restarts: Reinícios seguidos de um worker que morre antes de ele sair do pool
+            restart_backoff: Espera antes do primeiro reinício (s); dobra a cada reinício seguido
+        """
+        self.model_name = model_name
+        self.num_workers = num_workers
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self._ctx = multiprocessing.get_context('spawn')
+        self._workers = {}
+        self._conns = {}
+        self._busy = {}
+        self._pending = collections.deque()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._collector = None
+        self._running = False
+        self.ready = threading.Event()
+        self.load_error = None
+        self._ready_workers = set()
+        self._failed_workers = {}
+        self._crashes = collections.Counter()
+        self._restart_at = {}
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'restarts': 0}
+        self._wait_ms = []
+        self._processing_ms = []
+        self._rtfs = []
+
+    def start(self):
+        """Inicia os processos (o modelo é carregado em segundo plano em cada um)."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for index in range(self.num_workers):
+                self._spawn(index)
+            self._collector = threading.Thread(target=self._collect, daemon=True)
+            self._collector.start()
+        log.info("Pool de STT iniciado com %d processo(s) (modelo %s)", self.num_workers, self.model_name)
+
+    def _spawn(self, index):
+        """Cria o processo do worker com um pipe novo (chamado com o lock)."""
+        conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self.model_name, child_conn),
+            daemon=True,
+            name=f"stt-worker-{index}"
+        )
+        process.start()
+        child_conn.close()
+        self._workers[index] = process
+        self._conns[index] = conn
+        self._busy[index] = None
+
+    def _discard(self, index):
+        """Encerra o worker e descarta o pipe dele (chamado com o lock)."""
+        process = self._workers.pop(index, None)
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(timeout=1.0)
+        conn = self._conns.pop(index, None)
+        if conn is not None:
+            conn.close()
+        self._busy.pop(index, None)
+        self._ready_workers.discard(index)
+
+    def _restart(self, index):
+        """Substitui um worker (morto ou interrompido) por um processo e um pipe novos (chamado com o lock)."""
+        self._discard(index)
+        self._spawn(index)
+        self._stats['restarts'] += 1
+        self._dispatch()
+
+    def _remove_worker(self, index, error):
+        """
+        Tira o worker do pool (chamado com o lock).
+
+        Sem nenhum worker restante, marca o pool como falho e falha os pedidos na fila.
+        """
+        self._discard(index)
+        self._restart_at.pop(index, None)
+        self._failed_workers[index] = error
+        if len(self._failed_workers) < self.num_workers:
+            if len(self._ready_workers) + len(self._failed_workers) >= self.num_workers:
+                self.ready.set()
+            return
+        self.load_error = error
+        log.error("Pool de STT indisponível: %s", error)
+        while self._pending:
+            job_id = self._pending.popleft()
+            if job_id in self._jobs:
+                self._stats['failed'] += 1
+                self._finish(job_id, error=f"Modelo Whisper indisponível: {error}")
+        self.ready.set()
+
+    def _dispatch(self):
+        """Entrega os pedidos pendentes aos workers prontos e livres, um por worker (chamado com o lock)."""
+        for index, job_id in list(self._busy.items()):
+            if job_id is not None or index not in self._ready_workers:
+                continue
+            while self._pending:
+                job_id = self._pending.popleft()
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                try:
+                    self._conns[index].send((job_id, job['shm'].name, job['samples']))
+                except (OSError, ValueError):
+                    # Worker morreu: o pedido volta para a fila e _check_workers reinicia o worker
+                    self._pending.appendleft(job_id)
+                    break
+                job['worker'] = index
+                self._busy[index] = job_id
+                break
+
+    def submit(self, samples):
+        """
+        Envia amostras float32 a 16 kHz para transcrição.
+
+        Args:
+            samples: Amostras float32 normalizadas em [-1, 1] a 16 kHz
+
+        Returns:
+            Future: Resolve com o texto; job_id fica disponível em future.job_id
+
+        Raises:
+            RuntimeError: Se nenhum worker conseguiu carregar o modelo
+        """
+        self.start()
+        if self.load_error is not None:
+            raise RuntimeError(f"Modelo Whisper indisponível: {self.load_error}")
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, samples.nbytes))
+        np.ndarray(samples.shape, dtype=np.float32, buffer=shm.buf)[:] = samples
+
+        future = Future()
+        with self._lock:
+            job_id = next(self._ids)
+            future.job_id = job_id
+            self._jobs[job_id] = {'future': future, 'shm': shm, 'samples': len(samples),
+                                  'submitted': time.perf_counter(), 'started': None, 'worker': None}
+            self._stats['submitted'] += 1
+            self._pending.append(job_id)
+            self._dispatch()
+        return future
+
+    def transcribe(self, samples, timeout=None):
+        """Transcreve e espera o resultado (mesma interface do WhisperModelPool)."""
+        return self.submit(samples).result(timeout)
+
+    def cancel(self, future, force=False):
+        """
+        Cancela um pedido.
+
+        Pedidos ainda na fila são descartados. Um pedido já entregue a um
+        worker só é interrompido com force=True, reiniciando o worker com um
+        pipe novo (o modelo é recarregado em segundo plano).
+
+        Returns:
+            bool: True se o pedido foi cancelado
+        """
+        with self._lock:
+            job = self._jobs.get(future.job_id)
+            if job is None:
+                return False
+            if job['worker'] is not None:
+                if not force:
+                    return False
+                self._finish(future.job_id, error=CancelledError())
+                self._restart(job['worker'])
+            else:
+                self._pending.remove(future.job_id)
+                self._finish(future.job_id, error=CancelledError())
+            self._stats['cancelled'] += 1
+            return True
+
+    def _finish(self, job_id, text=None, error=None):
+        """Resolve o Future do pedido e libera a memória compartilhada (chamado com o lock)."""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        if job['worker'] is not None and self._busy.get(job['worker']) == job_id:
+            self._busy[job['worker']] = None
+        try:
+            job['shm'].close()
+            job['shm'].unlink()
+        except FileNotFoundError:
+            pass
+        future = job['future']
+        if future.done():
+            return
+        if isinstance(error, CancelledError):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result(text)
+
+    def _collect(self):
+        """Thread que recebe as mensagens dos workers e resolve os pedidos."""
+        while self._running:
+            with self._lock:
+                conns = {conn: index for index, conn in self._conns.items()}
+            if not conns:
+                # Todos os workers aguardam reinício ou saíram do pool
+                time.sleep(0.5)
+                self._check_workers()
+                continue
+            try:
+                readable = wait_connections(list(conns), timeout=0.5)
+            except (OSError, ValueError):
+                # Um pipe foi fechado por um reinício durante a espera
+                continue
+            if not readable:
+                self._check_workers()
+                continue
+
+            for conn in readable:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    self._check_workers()
+                    continue
+                with self._lock:
+                    if self._conns.get(conns[conn]) is not conn:
+                        continue  # Mensagem de um worker que já foi substituído
+                    self._handle(message)
+
+    def _handle(self, message):
+        """Processa uma mensagem de um worker (chamado com o lock)."""
+        kind = message[0]
+        if kind == 'ready':
+            _, index, pid, load_seconds, error = message
+            if error:
+                log.error("Worker de STT %d não carregou o modelo: %s", index, error)
+                self._remove_worker(index, error)
+                return
+            log.info("Worker de STT %d (pid %d) pronto em %.2f s", index, pid, load_seconds or 0.0)
+            self._ready_workers.add(index)
+            if len(self._ready_workers) + len(self._failed_workers) >= self.num_workers:
+                self.ready.set()
+            self._dispatch()
+        elif kind == 'started':
+            _, job_id, index = message
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['started'] = time.perf_counter()
+                self._wait_ms.append((job['started'] - job['submitted']) * 1000)
+        elif kind == 'done':
+            _, job_id, index, text, error, elapsed, rtf = message
+            if self._busy.get(index) == job_id:
+                self._busy[index] = None
+            if job_id in self._jobs:
+                self._processing_ms.append(elapsed * 1000)
+                if error:
+                    self._stats['failed'] += 1
+                else:
+                    self._stats['completed'] += 1
+                    self._crashes[index] = 0
+                    if rtf is not None:
+                        self._rtfs.append(rtf)
+                self._finish(job_id, text=text, error=error)
+            self._dispatch()
+
+    def _check_workers(self):
+        """
+        Falha o pedido de workers que morreram e agenda o reinício deles.
+
+        O reinício espera restart_backoff segundos, dobrando a cada morte seguida
+        (a contagem zera quando o worker conclui uma transcrição). Depois de
+        max_restarts reinícios seguidos, o worker sai do pool.
+        """
+        with self._lock:
+            if not self._running:
+                return
+            for index, process in list(self._workers.items()):
+                if process.is_alive():
+                    continue
+                job_id = self._busy.get(index)
+                if job_id is not None:
+                    self._stats['failed'] += 1
+                    self._finish(job_id, error="Worker de STT encerrado durante a transcrição")
+                self._crashes[index] += 1
+                if self._crashes[index] > self.max_restarts:
+                    log.error("Worker de STT %d encerrou %d vezes seguidas (código %s); removido do pool",
+                              index, self._crashes[index], process.exitcode)
+                    self._remove_worker(index, f"worker de STT encerrado {self._crashes[index]} vezes seguidas "
+                                               f"(código {process.exitcode})")
+                    continue
+                delay = self.restart_backoff * 2 ** (self._crashes[index] - 1)
+                log.error("Worker de STT %d encerrou inesperadamente (código %s); reiniciando em %.1f s",
+                          index, process.exitcode, delay)
+                self._discard(index)
+                self._restart_at[index] = time.monotonic() + delay
+
+            now = time.monotonic()
+            for index, restart_at in list(self._restart_at.items()):
+                if restart_at <= now:
+                    del self._restart_at[index]
+                    self._spawn(index)
+                    self._stats['restarts'] += 1
+
+    def get_metrics(self):
+        """Retorna a profundidade da fila, os contadores e os tempos médios de espera e processamento."""
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job['started'] is None)
+            mean = lambda values: sum(values) / len(values) if values else None
+            return dict(self._stats, **{
+                'queued': queued,
+                'running': len(self._jobs) - queued,
+                'workers_ready': len(self._ready_workers),
+                'workers_failed': len(self._failed_workers),
+                'load_error': self.load_error,
+                'mean_wait_ms': mean(self._wait_ms),
+                'mean_processing_ms': mean(self._processing_ms),
+                'mean_rtf': mean(self._rtfs)
+            })
+
+    def shutdown(self):
+        """Cancela os pedidos pendentes e encerra os processos."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._pending.clear()
+            self._restart_at.clear()
+            for job_id in list(self._jobs):
+                self._finish(job_id, error=CancelledError())
+            for conn in self._conns.values():
+                try:
+                    conn.send(None)
+                except (OSError, ValueError):
+                    pass
+            workers = dict(self._workers)
+        for process in workers.values():
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        with self._lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._workers.clear()
+            self._conns.clear()
+            self._busy.clear()
+        log.info("Pool de STT encerrado")
+
+
+_worker_pool_instance = None
+_worker_pool_lock = threading.Lock()
+
+def get_stt_worker_pool(model_name=None, num_workers=None):
+    """
+    Retorna o pool de processos de STT compartilhado pelo aplicativo.
+
+    Args:
+        model_name: Modelo desejado; se diferente do atual, o pool é recriado
+        num_workers: Número de processos usado na criação do pool
+
+    Returns:
+        STTWorkerPool: Pool compartilhado
+    """
+    global _worker_pool_instance
+    with _worker_pool_lock:
+        if _worker_pool_instance is not None and model_name and model_name != _worker_pool_instance.model_name:
+            _worker_pool_instance.shutdown()
+            _worker_pool_instance = None
+        if _worker_pool_instance is None:
+            _worker_pool_instance = STTWorkerPool(model_name or "base", num_workers or 1)
+        return _worker_pool_instance
+
+
+def shutdown_stt_worker_pool():
+    """Encerra o pool de processos de STT, se existir."""
+    global _worker_pool_instance
+    with _worker_pool_lock:
+        if _worker_pool_instance is not None:
+            _worker_pool_instance.shutdown()
+            _worker_pool_instance = None
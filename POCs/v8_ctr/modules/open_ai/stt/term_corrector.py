@@ -0,0 +1,272 @@
+import re
+import time
+import unicodedata
+from collections import defaultdict
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Palavras comuns ("cloud", "B.R.I.C.K.") com os pontos internos das siglas preservados
+_TOKEN_RE = re.compile(r"\w+(?:\.\w+)+\.?|\w+")
+# Sigla entre parênteses no fim do termo: "Amazon Web Services (AWS)"
+_ALIAS_RE = re.compile(r"^(.*?)\s*\(([^)]+)\)\s*$")
+
+# Regras fonéticas aplicadas em ordem sobre a chave normalizada (português e inglês)
+_PHONETIC_RULES = [
+    ("sch", "sk"), ("ph", "f"), ("ck", "k"), ("ch", "x"), ("sh", "x"), ("lh", "li"), ("nh", "ni"),
+    ("qu", "k"), ("q", "k"), ("ce", "se"), ("ci", "si"), ("c", "k"), ("z", "s"), ("w", "u"),
+    ("y", "i"), ("h", ""),
+]
+
+
+def normalize_key(text):
+    """Chave de comparação: minúsculas, sem acentos e só com letras e dígitos."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return "".join(ch for ch in text if ch.isascii() and ch.isalnum())
+
+
+def phonetic_key(key):
+    """
+    Chave fonética simplificada de uma chave normalizada.
+
+    Aplica as regras de _PHONETIC_RULES e junta letras repetidas ("clowd" e
+    "cloud" viram "kloud"). As vogais são mantidas: em português elas distinguem
+    palavras comuns ("pulso") de termos parecidos ("pulse").
+    """
+    for source, target in _PHONETIC_RULES:
+        key = key.replace(source, target)
+    collapsed = []
+    for ch in key:
+        if not collapsed or collapsed[-1] != ch:
+            collapsed.append(ch)
+    return "".join(collapsed)
+
+
+def bounded_distance(a, b, max_distance):
+    """
+    Distância de Levenshtein entre a e b, interrompida assim que passar de max_distance.
+
+    Returns:
+        int: Distância, ou max_distance + 1 se for maior que o limite
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(value)
+            best = min(best, value)
+        if best > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _trigrams(key):
+    padded = "$$" + key + "$$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def parse_terms(text):
+    """
+    Lê a lista de termos do prompt de correção (um por linha, vírgulas opcionais).
+
+    Returns:
+        list: Termos na ordem do arquivo
+    """
+    terms = [term.strip().strip(',').strip() for term in text.strip().split('\n')]
+    return [term for term in terms if term]
+
+
+class TermCorrector:
+    """
+    Corretor local de termos de domínio.
+
+    Indexa os termos por chave normalizada (exata), por chave fonética e por
+    trigramas separados por comprimento, o que limita a verificação de distância
+    de edição a poucos candidatos mesmo com dezenas de milhares de termos.
+    Cada trecho do texto (de uma até o maior número de palavras de um termo)
+    recebe uma nota de confiança: acima de accept_score a correção é aplicada;
+    entre review_score e accept_score, ou com candidatos empatados, o texto é
+    marcado para revisão (a correção pelo LLM).
+    """
+
+    def __init__(self, terms, accept_score=0.85, review_score=0.6, min_fuzzy_length=4, cache_size=4096):
+        """
+        Args:
+            terms: Lista de termos corretos ("Termo" ou "Nome Longo (SIGLA)")
+            accept_score: Confiança mínima para aplicar uma correção
+            review_score: Confiança a partir da qual um trecho duvidoso pede revisão
+            min_fuzzy_length: Comprimento mínimo da chave para busca aproximada
+            cache_size: Número de consultas aproximadas mantidas em cache
+        """
+        self.accept_score = accept_score
+        self.review_score = review_score
+        self.min_fuzzy_length = min_fuzzy_length
+        self.cache_size = cache_size
+        self._canonical = {}
+        self._phonetic = defaultdict(set)
+        self._postings = defaultdict(list)
+        self._keys = []
+        self._words = {}
+        self._word_counts = set()
+        self._cache = {}
+        self.max_words = 1
+
+        started = time.perf_counter()
+        for term in terms:
+            match = _ALIAS_RE.match(term)
+            for variant in ([match.group(1), match.group(2)] if match else [term]):
+                self._add(variant)
+        # Listas de índices em arrays numpy: a contagem de trigramas de uma consulta vira um bincount
+        self._postings = {gram: np.array(indexes, dtype=np.int32) for gram, indexes in self._postings.items()}
+        self.build_ms = (time.perf_counter() - started) * 1000
+        log.info("Corretor de termos: %d termos indexados em %.1f ms", len(self._keys), self.build_ms)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _add(self, term):
+        """Indexa um termo pela chave exata, fonética e pelos trigramas."""
+        key = normalize_key(term)
+        if not key or key in self._canonical:
+            return
+        self._canonical[key] = term
+        self._words[key] = len(_TOKEN_RE.findall(term))
+        self._phonetic[phonetic_key(key)].add(key)
+        index = len(self._keys)
+        self._keys.append(key)
+        for gram in _trigrams(key):
+            self._postings[(gram, len(key))].append(index)
+        self._word_counts.add(self._words[key])
+        self.max_words = max(self.max_words, self._words[key])
+
+    def max_distance(self, length):
+        """Distância de edição tolerada para uma chave do comprimento dado."""
+        return 1 if length <= 8 else 2
+
+    def _fuzzy_candidates(self, key, max_distance):
+        """Chaves indexadas a no máximo max_distance edições de key (filtro de contagem de trigramas)."""
+        grams = _trigrams(key)
+        # Cada edição destrói no máximo 3 trigramas: uma chave a d edições compartilha len(grams) - 3d
+        needed = len(grams) - 3 * max_distance
+        if needed <= 0:
+            return []
+        postings = []
+        for gram in grams:
+            for length in range(len(key) - max_distance, len(key) + max_distance + 1):
+                posting = self._postings.get((gram, length))
+                if posting is not None:
+                    postings.append(posting)
+        if not postings:
+            return []
+
+        # Só as chaves com trigramas suficientes chegam à distância de edição (em Python)
+        counts = np.bincount(np.concatenate(postings))
+        found = []
+        for index in np.flatnonzero(counts >= needed):
+            distance = bounded_distance(key, self._keys[index], max_distance)
+            if distance <= max_distance:
+                found.append((distance, self._keys[index]))
+        return found
+
+    def lookup(self, key, words=1):
+        """
+        Procura o termo correspondente a uma chave normalizada.
+
+        Args:
+            key: Chave normalizada do trecho
+            words: Número de palavras do trecho; só termos com o mesmo número são aceitos
+
+        Returns:
+            list: Pares (confiança, termo) do melhor para o pior
+        """
+        if self._words.get(key) == words:
+            return [(1.0, self._canonical[key])]
+        if len(key) < self.min_fuzzy_length or words not in self._word_counts:
+            return []
+        if (key, words) in self._cache:
+            return self._cache[(key, words)]
+
+        phonetic = self._phonetic.get(phonetic_key(key), ())
+        scores = {}
+        for distance, candidate in self._fuzzy_candidates(key, self.max_distance(len(key))):
+            if self._words[candidate] == words:
+                scores[candidate] = 1.0 - distance / float(max(len(key), len(candidate)))
+        for candidate in phonetic:
+            if self._words[candidate] != words:
+                continue
+            # Mesmo som: a distância conta menos, mas a nota nunca chega à de uma chave exata
+            distance = bounded_distance(key, candidate, len(key))
+            score = 1.0 - distance / float(max(len(key), len(candidate)))
+            scores[candidate] = min(0.95, max(scores.get(candidate, 0.0), score + 0.15))
+
+        result = sorted(((score, self._canonical[candidate]) for candidate, score in scores.items()), reverse=True)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[(key, words)] = result
+        return result
+
+    def correct(self, text):
+        """
+        Corrige os termos do texto.
+
+        Args:
+            text: Texto transcrito
+
+        Returns:
+            tuple: (texto corrigido, relatório com 'corrections', 'uncertain',
+                    'needs_review' e 'elapsed_us')
+        """
+        started = time.perf_counter()
+        tokens = list(_TOKEN_RE.finditer(text))
+        keys = [normalize_key(token.group()) for token in tokens]
+        corrections = []
+        uncertain = []
+        pieces = []
+        cursor = 0
+        i = 0
+        while i < len(tokens):
+            accepted = None
+            for size in range(min(self.max_words, len(tokens) - i), 0, -1):
+                key = "".join(keys[i:i + size])
+                matches = self.lookup(key, size)
+                if not matches:
+                    continue
+                best_score, best_term = matches[0]
+                tied = len(matches) > 1 and matches[1][0] == best_score and matches[1][1] != best_term
+                if best_score >= self.accept_score and not tied:
+                    accepted = (size, best_term, best_score)
+                    break
+                if best_score >= self.review_score:
+                    original = text[tokens[i].start():tokens[i + size - 1].end()]
+                    uncertain.append({'text': original, 'candidates': [term for _, term in matches[:3]]})
+
+            if accepted is None:
+                i += 1
+                continue
+            size, term, score = accepted
+            start, end = tokens[i].start(), tokens[i + size - 1].end()
+            original = text[start:end]
+            if original != term:
+                pieces.append(text[cursor:start])
+                pieces.append(term)
+                # Sigla terminada em ponto no fim da frase: não duplica o ponto
+                cursor = end + 1 if term.endswith('.') and text[end:end + 1] == '.' else end
+                corrections.append({'text': original, 'term': term, 'score': score})
+            i += size
+        pieces.append(text[cursor:])
+
+        report = {
+            'corrections': corrections,
+            'uncertain': uncertain,
+            'needs_review': bool(uncertain),
+            'elapsed_us': (time.perf_counter() - started) * 1e6
+        }
+        return "".join(pieces), report
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from modules.audio.pcm import read_wav_pcm
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+
+def audio_fingerprint(audio_file):
+    """
+    Hash do conteúdo PCM de uma gravação (ignora o cabeçalho e o nome do arquivo).
+
+    Args:
+        audio_file: WavView ou objeto binário com o WAV gravado
+
+    Returns:
+        str: Hash hexadecimal do áudio e da taxa de amostragem
+    """
+    samples, rate = read_wav_pcm(audio_file)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(rate).encode('ascii'))
+    digest.update(np.ascontiguousarray(samples).view(np.uint8))
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """
+    Cache de transcrições indexado pelo conteúdo do áudio, pelo modo e pelo modelo.
+
+    Mantém as entradas mais recentes em memória (LRU limitado) e, opcionalmente,
+    uma cópia em disco (um arquivo de texto por entrada) que sobrevive ao
+    reinício do aplicativo. Reenvios e correções da mesma gravação voltam na hora.
+    """
+
+    def __init__(self, max_entries=128, disk_dir=None):
+        """
+        Args:
+            max_entries: Número máximo de transcrições mantidas em memória
+            disk_dir: Pasta do cache em disco (None desativa o disco)
+        """
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(fingerprint, mode, model):
+        """Chave do cache: hash do PCM + modo de transcrição + modelo."""
+        return f"{fingerprint}-{mode}-{model}"
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.txt")
+
+    def get(self, key):
+        """
+        Procura uma transcrição (memória primeiro, depois disco).
+
+        Returns:
+            str | None: Texto transcrito, ou None se não estiver no cache
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+
+        text = None
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except OSError:
+                text = None
+
+        with self._lock:
+            if text is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            self._remember(key, text)
+            return text
+
+    def put(self, key, text):
+        """Guarda uma transcrição em memória e, se configurado, no disco."""
+        with self._lock:
+            self._remember(key, text)
+            self._stats['stores'] += 1
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(temp_path, path)
+            except OSError as e:
+                log.warning("Não foi possível gravar a transcrição no cache em disco: %s", e)
+
+    def _remember(self, key, text):
+        """Insere no LRU em memória, descartando a entrada menos usada (chamado com o lock)."""
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        """Esvazia o cache em memória (o disco é mantido)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self):
+        """Retorna os contadores e as taxas de acerto do cache."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['disk_hits'] + self._stats['misses']
+            return dict(self._stats, **{
+                'entries': len(self._entries),
+                'lookups': lookups,
+                'hit_rate': (self._stats['hits'] + self._stats['disk_hits']) / lookups if lookups else None,
+                'memory_hit_rate': self._stats['hits'] / lookups if lookups else None
+            })
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_transcription_cache(max_entries=None, disk_dir=None):
+    """
+    Retorna o cache de transcrições compartilhado pelo aplicativo.
+
+    Args:
+        max_entries: Tamanho do LRU usado na criação do cache
+        disk_dir: Pasta do cache em disco usada na criação do cache
+
+    Returns:
+        TranscriptionCache: Cache compartilhado
+    """
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = TranscriptionCache(max_entries or 128, disk_dir)
+        return _cache_instance
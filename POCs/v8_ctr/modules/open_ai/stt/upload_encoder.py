@@ -0,0 +1,121 @@
+import io
+import time
+from modules.audio.capture_buffer import CaptureRingBuffer
+from modules.audio.pcm import read_wav_pcm, resample
+from modules.audio.vad import create_vad, detect_segments
+from modules.audio.vad.offline import estimate_threshold
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Codecs aceitos pela API de transcrição e o formato/subtipo usado pelo libsndfile
+CODECS = {
+    'flac': ('FLAC', 'PCM_16', 'audio.flac'),
+    'opus': ('OGG', 'OPUS', 'audio.ogg'),
+    'wav': (None, None, 'audio.wav')
+}
+
+
+class UploadEncoder:
+    """
+    Prepara o áudio gravado para o envio à API de transcrição.
+
+    Remove o silêncio do início e do fim com o VAD, reamostra para 16 kHz e
+    codifica em FLAC ou Opus no próprio processo (via soundfile/libsndfile). Sem
+    o soundfile instalado, envia WAV 16 kHz, que já é 1/3 menor que o original.
+    """
+
+    def __init__(self, codec='flac', target_rate=16000, trim_silence=True, padding=0.2,
+                 vad_engine='multi', frame_duration=0.02, noise_percentile=20, multiplier=3.0,
+                 min_threshold=0.0):
+        """
+        Args:
+            codec: 'flac', 'opus' ou 'wav'
+            target_rate: Taxa de amostragem enviada (16 kHz é a taxa usada pelo Whisper)
+            trim_silence: Remove o silêncio antes da primeira e depois da última fala
+            padding: Segundos de margem mantidos em volta da fala
+            vad_engine: Engine de VAD usado no recorte ('energy' ou 'multi')
+            frame_duration: Duração do quadro do VAD em segundos
+            noise_percentile: Percentil da energia dos quadros usado como ruído de fundo
+            multiplier: Fator aplicado ao ruído para obter o limite de detecção
+            min_threshold: Limite mínimo de detecção (energia RMS)
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Codec de envio desconhecido: {codec}")
+        self.codec = codec
+        self.target_rate = target_rate
+        self.trim_silence = trim_silence
+        self.padding = padding
+        self.vad_engine = vad_engine
+        self.frame_duration = frame_duration
+        self.noise_percentile = noise_percentile
+        self.multiplier = multiplier
+        self.min_threshold = min_threshold
+        self.last_metrics = None
+
+    def _speech_bounds(self, samples, rate):
+        """Retorna (início, fim) em amostras entre a primeira e a última fala, com margem."""
+        vad = create_vad(self.vad_engine, rate, frame_size=max(1, int(rate * self.frame_duration)))
+        vad.threshold = estimate_threshold(samples, vad, self.noise_percentile, self.multiplier, self.min_threshold)
+
+        _, segments = detect_segments(samples, vad)
+        if not segments:
+            # Nenhuma fala detectada: envia o áudio inteiro e deixa a decisão para a API
+            return 0, len(samples)
+        start = max(0, int((segments[0][0] - self.padding) * rate))
+        end = min(len(samples), int((segments[-1][1] + self.padding) * rate))
+        return start, end
+
+    def _encode(self, samples, rate):
+        """Codifica as amostras no codec configurado (WAV se o soundfile não estiver disponível)."""
+        format, subtype, name = CODECS[self.codec]
+        if format is not None:
+            try:
+                import soundfile as sf
+                output = io.BytesIO()
+                sf.write(output, samples, rate, format=format, subtype=subtype)
+                output.seek(0)
+                output.name = name
+                return output, self.codec
+            except ImportError:
+                log.warning("soundfile não instalado; enviando WAV %d Hz sem compressão", rate)
+            except Exception as e:
+                log.error("Erro ao codificar áudio em %s: %s. Enviando WAV", self.codec, e)
+        return CaptureRingBuffer.samples_to_wav(samples, rate, name='audio.wav'), 'wav'
+
+    def encode(self, audio_file):
+        """
+        Recorta, reamostra e codifica o áudio gravado.
+
+        Args:
+            audio_file: WavView ou objeto binário com o WAV gravado
+
+        Returns:
+            tuple: (arquivo pronto para envio com atributo name, métricas)
+        """
+        started = time.perf_counter()
+        original_bytes = len(audio_file.getbuffer())
+        samples, rate = read_wav_pcm(audio_file)
+        original_duration = len(samples) / float(rate) if rate else 0.0
+
+        if self.trim_silence:
+            start, end = self._speech_bounds(samples, rate)
+            samples = samples[start:end]
+
+        samples = resample(samples, rate, self.target_rate)
+        encoded, codec = self._encode(samples, self.target_rate)
+        encoded_bytes = len(encoded.getbuffer())
+
+        self.last_metrics = {
+            'codec': codec,
+            'original_bytes': original_bytes,
+            'encoded_bytes': encoded_bytes,
+            'saved_bytes': original_bytes - encoded_bytes,
+            'saved_ratio': 1.0 - encoded_bytes / float(original_bytes) if original_bytes else 0.0,
+            'original_duration': original_duration,
+            'trimmed_duration': len(samples) / float(self.target_rate),
+            'encode_ms': (time.perf_counter() - started) * 1000
+        }
+        return encoded, self.last_metrics
@@ -0,0 +1,177 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Taxa de amostragem esperada pelo Whisper
+WHISPER_RATE = 16000
+
+
+def resident_memory_mb():
+    """
+    Memória residente (RSS) atual do processo em MB.
+
+    Usa o psutil quando instalado; no Linux lê /proc/self/statm; nos demais
+    sistemas cai para o pico informado por resource.getrusage.
+
+    Returns:
+        float | None: RSS em MB, ou None se não for possível medir
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return None
+
+
+class WhisperModelPool:
+    """
+    Pool residente de modelos Whisper locais.
+
+    Carrega o modelo configurado uma única vez (em segundo plano, a partir do
+    warm_up) e atende as transcrições a partir da memória. Cada instância do
+    modelo é usada por uma transcrição por vez; size > 1 permite transcrições
+    simultâneas ao custo de memória.
+    """
+
+    def __init__(self, model_name="base", size=1):
+        """
+        Args:
+            model_name: Tamanho do modelo Whisper ("tiny", "base", "small", ...)
+            size: Número de instâncias do modelo mantidas em memória
+        """
+        self.model_name = model_name
+        self.size = size
+        self.ready = threading.Event()
+        self.load_seconds = None
+        self.load_error = None
+        self.rss_before_mb = None
+        self.rss_after_mb = None
+        self._models = queue.Queue()
+        self._loading = False
+        self._lock = threading.Lock()
+        self._rtfs = []
+
+    def warm_up(self):
+        """Inicia o carregamento em segundo plano (sem efeito se já carregado ou carregando)."""
+        with self._lock:
+            if self._loading or self.ready.is_set():
+                return
+            self._loading = True
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _load(self):
+        """Carrega as instâncias do modelo e registra o tempo e a memória usados."""
+        try:
+            import whisper
+
+            self.rss_before_mb = resident_memory_mb()
+            started = time.perf_counter()
+            for _ in range(self.size):
+                self._models.put(whisper.load_model(self.model_name))
+            self.load_seconds = time.perf_counter() - started
+            self.rss_after_mb = resident_memory_mb()
+            log.info("Modelo Whisper '%s' carregado em %.2f s (%d instância(s), RSS %s MB)",
+                     self.model_name, self.load_seconds, self.size,
+                     f"{self.rss_after_mb:.0f}" if self.rss_after_mb is not None else "?")
+        except Exception as e:
+            self.load_error = e
+            log.error("Erro ao carregar o modelo Whisper '%s': %s", self.model_name, e)
+        finally:
+            self.ready.set()
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """
+        Empresta uma instância do modelo, esperando o warm-up se necessário.
+
+        Raises:
+            RuntimeError: Se o modelo não pôde ser carregado
+        """
+        self.warm_up()
+        if not self.ready.wait(timeout):
+            raise TimeoutError(f"Modelo Whisper '{self.model_name}' ainda carregando")
+        if self.load_error is not None:
+            raise RuntimeError(f"Modelo Whisper indisponível: {self.load_error}")
+        model = self._models.get(timeout=timeout)
+        try:
+            yield model
+        finally:
+            self._models.put(model)
+
+    def transcribe(self, samples, **options):
+        """
+        Transcreve amostras float32 a 16 kHz com um modelo residente.
+
+        Args:
+            samples: Amostras float32 normalizadas em [-1, 1] a 16 kHz
+            **options: Opções repassadas a model.transcribe (ex.: language)
+
+        Returns:
+            str: Texto transcrito
+        """
+        with self.acquire() as model:
+            started = time.perf_counter()
+            device = getattr(model, 'device', None)
+            options.setdefault('fp16', device is not None and device.type == 'cuda')
+            result = model.transcribe(samples, **options)
+            elapsed = time.perf_counter() - started
+
+        duration = len(samples) / float(WHISPER_RATE)
+        rtf = elapsed / duration if duration else 0.0
+        with self._lock:
+            self._rtfs.append(rtf)
+        log.info("Whisper local: %.2f s de áudio em %.2f s (RTF %.2f)", duration, elapsed, rtf)
+        return result.get("text", "")
+
+    def get_metrics(self):
+        """Retorna o tempo de carga, o fator de tempo real (último e médio) e a memória residente."""
+        with self._lock:
+            rtfs = list(self._rtfs)
+        return {
+            'model': self.model_name,
+            'ready': self.ready.is_set() and self.load_error is None,
+            'load_seconds': self.load_seconds,
+            'last_rtf': rtfs[-1] if rtfs else None,
+            'mean_rtf': sum(rtfs) / len(rtfs) if rtfs else None,
+            'transcriptions': len(rtfs),
+            'model_rss_mb': (self.rss_after_mb - self.rss_before_mb)
+                            if self.rss_after_mb is not None and self.rss_before_mb is not None else None,
+            'rss_mb': resident_memory_mb()
+        }
+
+
+_pool_instance = None
+_pool_lock = threading.Lock()
+
+def get_whisper_pool(model_name=None):
+    """
+    Retorna o pool residente do processo.
+
+    Args:
+        model_name: Modelo desejado; se diferente do atual, um novo pool é criado
+
+    Returns:
+        WhisperModelPool: Pool compartilhado
+    """
+    global _pool_instance
+    with _pool_lock:
+        if _pool_instance is None or (model_name and model_name != _pool_instance.model_name):
+            _pool_instance = WhisperModelPool(model_name or "base")
+        return _pool_instance
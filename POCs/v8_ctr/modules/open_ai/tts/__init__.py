@@ -5,19 +5,36 @@ Classes principais:
 - OpenAITTS: Classe principal que gerencia diferentes implementações TTS
 - StandardTTS: Implementação do TTS padrão usando o modelo tts-1
 - ChatCompletionsTTS: Implementação TTS usando Chat Completions com suporte a áudio
+- TTSPrefetchScheduler: Síntese antecipada com look-ahead limitado, reprodução em ordem e cancelamento
+- SentenceSegmenter: Divisão do texto em trechos para o TTS (primeiro trecho curto, seguintes maiores)
+- SpeechController: Ciclo de vida das falas com tokens de cancelamento (parada sem busy-wait, com prazo)
+- LoudnessNormalizer: Normalização de volume em streaming (RMS corrente com gate + limitador) na reprodução
+- TTSAudioCache: Cache do áudio sintetizado (LRU em memória + disco) por engine, modelo, voz, velocidade e texto
 """
 
 from .tts import OpenAITTS
 from .tts_standard import StandardTTS
 from .tts_chat_completions import ChatCompletionsTTS
 from .tts_base import BaseTTS
-from .audio_processor import AudioChunkProcessor, AudioStreamManager
+from .prefetch_scheduler import TTSPrefetchScheduler
+from .sentence_segmenter import SentenceSegmenter, split_sentences
+from .cancellation import CancellationToken, SpeechController
+from .tts_cache import TTSAudioCache, get_tts_cache
+from .audio_processor import AudioChunkProcessor, AudioStreamManager, LoudnessNormalizer
 
 __all__ = [
     'OpenAITTS',
     'StandardTTS',
     'ChatCompletionsTTS',
     'BaseTTS',
+    'TTSPrefetchScheduler',
+    'SentenceSegmenter',
+    'split_sentences',
+    'CancellationToken',
+    'SpeechController',
+    'TTSAudioCache',
+    'get_tts_cache',
     'AudioChunkProcessor',
-    'AudioStreamManager'
+    'AudioStreamManager',
+    'LoudnessNormalizer'
 ]
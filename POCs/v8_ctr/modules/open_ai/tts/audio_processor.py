@@ -1,53 +1,162 @@
-import pyaudio
 import numpy as np
-import io
 import base64
-from pydub import AudioSegment
 import asyncio
 import threading
+import time
 import queue
 import logging
 from config.audio_config import AudioDeviceConfig
+from modules.audio.backends import CONTINUE, FORMAT_FLOAT32
+from modules.audio.audio_context import get_audio_context
+from modules.audio.decode import decode_audio
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
 # Configurações de áudio otimizadas para baixa latência e compatibilidade com GPT-4
-CHUNK = 2048  # Aumentado para melhor buffer
+CHUNK = 1024  # 42,7 ms: ao parar, no máximo um bloco já entregue ao dispositivo ainda toca
 CHANNELS = 1
 RATE = 24000  # Ajustado para 24000Hz para compatibilidade com GPT-4
-FORMAT = pyaudio.paFloat32
-BUFFER_SIZE = 10  # Número de chunks no buffer
+FORMAT = FORMAT_FLOAT32
+BUFFER_SIZE = 20  # Número de chunks no buffer (~0,85 s)
+
+# Normalização de volume na reprodução (todas as falas, de qualquer engine)
+LOUDNESS_TARGET_DBFS = -20.0  # RMS alvo da fala
+LOUDNESS_MAX_GAIN_DB = 12.0  # Ganho máximo (falas muito baixas)
+LOUDNESS_MIN_GAIN_DB = -12.0  # Atenuação máxima (falas muito altas)
+LOUDNESS_WINDOW = 1.0  # Constante de tempo do RMS corrente em segundos
+LOUDNESS_GATE_DBFS = -50.0  # Quadros abaixo disso (pausas) não entram no RMS
+LIMITER_CEILING = 0.89  # Pico máximo após o ganho (-1 dBFS)
+
+
+class LoudnessNormalizer:
+    """
+    Normalizador de volume em streaming: RMS corrente com gate + limitador.
+
+    Processa os blocos à medida que chegam, sem precisar do áudio inteiro.
+    O RMS de cada quadro de 10 ms (em dB) entra numa média exponencial que
+    ignora as pausas (gate) e continua de um bloco para o outro, então o
+    ganho não salta entre sentenças, respostas ou engines; a média em dB
+    reage igual a trechos mais altos e mais baixos. O ganho por
+    amostra é interpolado entre os quadros e limitado para que nenhum
+    pico passe de `ceiling`. Todo o cálculo é vetorizado com NumPy/SciPy.
+    """
+
+    def __init__(self, target_dbfs=LOUDNESS_TARGET_DBFS, max_gain_db=LOUDNESS_MAX_GAIN_DB,
+                 min_gain_db=LOUDNESS_MIN_GAIN_DB, window=LOUDNESS_WINDOW, gate_dbfs=LOUDNESS_GATE_DBFS,
+                 ceiling=LIMITER_CEILING, frame=240, rate=RATE):
+        """
+        Args:
+            target_dbfs: RMS alvo em dBFS
+            max_gain_db: Ganho máximo em dB
+            min_gain_db: Ganho mínimo (atenuação máxima) em dB
+            window: Constante de tempo do RMS corrente em segundos
+            gate_dbfs: Potência abaixo da qual o quadro é pausa e não atualiza o RMS
+            ceiling: Pico máximo da saída (limitador)
+            frame: Tamanho do quadro de análise em amostras
+            rate: Taxa de amostragem em Hz
+        """
+        from scipy.signal import lfilter
+
+        self._lfilter = lfilter
+        self.target_dbfs = target_dbfs
+        self.max_gain_db = max_gain_db
+        self.min_gain_db = min_gain_db
+        self.gate_power = 10 ** (gate_dbfs / 10)
+        self.ceiling = ceiling
+        self.frame = frame
+        self.alpha = float(np.exp(-frame / (window * rate)))
+        self.metrics = {'chunks': 0, 'samples': 0, 'limited_samples': 0}
+        self.reset()
+
+    def reset(self):
+        """Volta ao estado inicial: RMS no alvo com o peso de poucos quadros e ganho unitário."""
+        # Média ponderada pela voz: numerador (nível em dB dos quadros com voz) / denominador (peso da voz)
+        self._den = 1.0 - self.alpha ** 10
+        self._num = self.target_dbfs * self._den
+        self._gain = 1.0
+
+    def process(self, samples):
+        """
+        Aplica o ganho a um bloco de áudio.
+
+        Args:
+            samples: Amostras float32 (qualquer tamanho)
+
+        Returns:
+            np.ndarray: Novo array float32 com o volume normalizado
+        """
+        x = np.asarray(samples, dtype=np.float32)
+        n = len(x)
+        if not n:
+            return x.copy()
+
+        starts = np.arange(0, n, self.frame)
+        lengths = np.diff(np.append(starts, n))
+        power = np.add.reduceat(np.square(x, dtype=np.float64), starts) / lengths
+        peaks = np.maximum.reduceat(np.abs(x), starts)
+
+        # RMS corrente só sobre os quadros com voz: as pausas não puxam o ganho para cima
+        voiced = (power > self.gate_power).astype(np.float64)
+        b, a = [1.0 - self.alpha], [1.0, -self.alpha]
+        level_db = 10 * np.log10(np.maximum(power, 1e-12))
+        num, _ = self._lfilter(b, a, voiced * level_db, zi=[self.alpha * self._num])
+        den, _ = self._lfilter(b, a, voiced, zi=[self.alpha * self._den])
+        self._num, self._den = float(num[-1]), float(den[-1])
+        level = np.where(den > 1e-12, num / np.maximum(den, 1e-12), self.target_dbfs)
+        gain = 10 ** (np.clip(self.target_dbfs - level, self.min_gain_db, self.max_gain_db) / 20)
+
+        # Ganho por amostra: rampa a partir do ganho do bloco anterior até o centro de cada quadro
+        centers = starts + lengths / 2.0
+        sample_gain = np.interp(np.arange(n), np.concatenate(([0.0], centers)), np.concatenate(([self._gain], gain)))
+        self._gain = float(gain[-1])
+
+        # Limitador: nenhum quadro passa do teto
+        limit = np.repeat(self.ceiling / np.maximum(peaks, 1e-9), lengths)
+        limited = sample_gain > limit
+        self.metrics['limited_samples'] += int(np.count_nonzero(limited))
+        self.metrics['chunks'] += 1
+        self.metrics['samples'] += n
+        return (x * np.minimum(sample_gain, limit)).astype(np.float32)
+
+    def get_metrics(self):
+        """Retorna os contadores e o estado atual (nível e ganho em dB)."""
+        return dict(self.metrics, **{
+            'level_dbfs': self._num / self._den if self._den > 1e-12 else self.target_dbfs,
+            'gain_db': 20 * np.log10(self._gain)
+        })
 
 class AudioChunkProcessor:
     """Classe para processar chunks de áudio base64 de forma assíncrona"""
     def __init__(self, chunk_size=8192):  # Reduzido para 8KB chunks
         self.chunk_size = chunk_size
         
-    def process_base64_chunks(self, base64_data):
+    def decode_base64(self, base64_data, format="wav"):
+        """
+        Decodifica o áudio base64 inteiro para float32, em um único buffer.
+
+        O volume não é normalizado aqui: o LoudnessNormalizer da reprodução
+        cuida disso de forma contínua entre as falas.
+
+        Args:
+            base64_data: Áudio codificado em base64
+            format: Formato do áudio ("wav", "pcm16", "mp3", ...)
+
+        Returns:
+            np.ndarray: Amostras float32 em RATE Hz
+        """
+        decoded_data = base64.b64decode(base64_data + "=" * (-len(base64_data) % 4))
+        return decode_audio(decoded_data, format, rate=RATE)
+
+    def process_base64_chunks(self, base64_data, format="wav"):
         """Processa o áudio base64 em chunks, retornando um gerador"""
         try:
-            # Decodifica todo o base64 primeiro
-            decoded_data = base64.b64decode(base64_data + "=" * (-len(base64_data) % 4))
-            
-            # Converte para AudioSegment uma única vez
-            audio = AudioSegment.from_mp3(io.BytesIO(decoded_data))
-            audio = audio.set_channels(CHANNELS)
-            
-            # Obtém todos os samples de uma vez
-            samples = np.array(audio.get_array_of_samples(), dtype=np.int16)
-            float_samples = samples.astype(np.float32)
-            
-            # Normaliza todo o áudio de uma vez
-            max_value = np.max(np.abs(float_samples))
-            if max_value > 0:
-                float_samples = float_samples / max_value
-            
-            # Divide em chunks menores para processamento
+            float_samples = self.decode_base64(base64_data, format)
+
+            # Divide em chunks menores (fatias do mesmo buffer, sem cópia)
             for i in range(0, len(float_samples), self.chunk_size):
-                chunk = float_samples[i:i + self.chunk_size]
-                yield chunk
+                yield float_samples[i:i + self.chunk_size]
                 
         except Exception as e:
             log.error("Erro ao processar áudio: %s", e)
@@ -64,7 +173,8 @@ class AudioChunkProcessor:
 class AudioStreamManager:
     """Gerencia o stream de áudio para reprodução"""
     def __init__(self):
-        self.p = pyaudio.PyAudio()
+        # Contexto de áudio compartilhado: o backend é inicializado uma vez por processo
+        self.audio_context = get_audio_context()
         self.stream = None
         self.lock = threading.Lock()
         self.buffer = queue.Queue(maxsize=BUFFER_SIZE)
@@ -72,27 +182,30 @@ class AudioStreamManager:
         self.play_thread = None
         self.audio_config = AudioDeviceConfig()
         self.current_device = None
+        self.audio_context.subscribe('output_device', self.set_output_device_index)
+        self.audio_context.subscribe('interrupt', self.flush)
+        # Volume contínuo entre sentenças, respostas e engines (o estado persiste entre as falas)
+        self.normalizer = LoudnessNormalizer()
 
     def _get_output_device_index(self, device_name):
         """Obtém o índice do dispositivo de saída pelo nome"""
-        devices = AudioDeviceConfig.list_audio_devices()
-        for device in devices['output']:
-            if device['name'] == device_name:
-                return device['index']
-        return None
+        return self.audio_config.registry.index_for_name(device_name, 'output')
 
     def update_output_device(self, device_name):
         """Atualiza o dispositivo de saída em tempo real"""
         log.info(f"AudioStreamManager: Atualizando dispositivo de saída para: {device_name}")
-        with self.lock:
-            # Obtém o índice do novo dispositivo
-            new_device_index = self._get_output_device_index(device_name)
-            if new_device_index is None:
-                log.error(f"AudioStreamManager: Dispositivo não encontrado: {device_name}")
-                return False
+        # Obtém o índice do novo dispositivo
+        new_device_index = self._get_output_device_index(device_name)
+        if new_device_index is None:
+            log.error(f"AudioStreamManager: Dispositivo não encontrado: {device_name}")
+            return False
+        return self.set_output_device_index(new_device_index)
 
-            # Se o dispositivo for o mesmo, não faz nada
-            if new_device_index == self.current_device:
+    def set_output_device_index(self, new_device_index):
+        """Reabre o stream de saída no dispositivo informado (inscrito no evento 'output_device' do contexto)."""
+        with self.lock:
+            # Se o dispositivo for o mesmo (e o stream não foi fechado pelo contexto), não faz nada
+            if new_device_index == self.current_device and self.stream is not None and not self.stream.closed:
                 return True
 
             # Fecha o stream atual se existir
@@ -113,7 +226,8 @@ class AudioStreamManager:
 
             # Tenta abrir o novo stream
             try:
-                self.stream = self.p.open(
+                self.stream = self.audio_context.open_stream(
+                    owner=self,
                     format=FORMAT,
                     channels=CHANNELS,
                     rate=RATE,
@@ -124,13 +238,15 @@ class AudioStreamManager:
                     stream_callback=self._callback
                 )
                 self.current_device = new_device_index
-                log.info(f"AudioStreamManager: Stream de áudio atualizado com sucesso para o dispositivo: {device_name}")
+                log.info(f"AudioStreamManager: Stream de áudio atualizado com sucesso para o dispositivo: {new_device_index}")
                 return True
             except Exception as e:
                 log.error(f"AudioStreamManager: Erro ao abrir stream com novo dispositivo: {e}")
+                self.audio_config.registry.invalidate()
                 # Tenta reabrir com o dispositivo padrão
                 try:
-                    self.stream = self.p.open(
+                    self.stream = self.audio_context.open_stream(
+                        owner=self,
                         format=FORMAT,
                         channels=CHANNELS,
                         rate=RATE,
@@ -151,7 +267,8 @@ class AudioStreamManager:
         with self.lock:
             try:
                 stream_valid = False
-                if self.stream is not None:
+                # Fechado pelo contexto (reinicialização do backend após hot-plug): reabre
+                if self.stream is not None and not self.stream.closed:
                     try:
                         stream_valid = self.stream.is_active()
                     except:
@@ -180,7 +297,8 @@ class AudioStreamManager:
                         log.error(f"AudioStreamManager: Erro ao ler configurações de dispositivo: {e}")
 
                     try:
-                        self.stream = self.p.open(
+                        self.stream = self.audio_context.open_stream(
+                            owner=self,
                             format=FORMAT,
                             channels=CHANNELS,
                             rate=RATE,
@@ -193,8 +311,10 @@ class AudioStreamManager:
                         log.info(f"AudioStreamManager: Stream de áudio iniciado com dispositivo de saída: {output_device}")
                     except Exception as e:
                         log.error(f"AudioStreamManager: Erro ao abrir stream com dispositivo específico: {e}")
+                        self.audio_config.registry.invalidate()
                         # Tenta novamente com o dispositivo padrão
-                        self.stream = self.p.open(
+                        self.stream = self.audio_context.open_stream(
+                            owner=self,
                             format=FORMAT,
                             channels=CHANNELS,
                             rate=RATE,
@@ -216,11 +336,11 @@ class AudioStreamManager:
         try:
             if not self.buffer.empty():
                 data = self.buffer.get_nowait()
-                return (data, pyaudio.paContinue)
+                return (data, CONTINUE)
             else:
-                return (np.zeros(frame_count, dtype=np.float32).tobytes(), pyaudio.paContinue)
+                return (np.zeros(frame_count, dtype=np.float32).tobytes(), CONTINUE)
         except:
-            return (np.zeros(frame_count, dtype=np.float32).tobytes(), pyaudio.paContinue)
+            return (np.zeros(frame_count, dtype=np.float32).tobytes(), CONTINUE)
 
     def play_audio_chunks(self, float_samples, stop_flag=None, on_first_chunk=None):
         """Reproduz chunks de áudio."""
@@ -231,11 +351,8 @@ class AudioStreamManager:
             return
 
         # Limpa o buffer antes de começar
-        while not self.buffer.empty():
-            try:
-                self.buffer.get_nowait()
-            except:
-                pass
+        self.flush()
+        float_samples = self.normalizer.process(float_samples)
 
         first_chunk = True
         for i in range(0, len(float_samples), CHUNK):
@@ -255,25 +372,120 @@ class AudioStreamManager:
                 chunk = np.pad(chunk, (0, CHUNK - len(chunk)), 'constant')
             
             try:
-                # Espera até que haja espaço no buffer
-                self.buffer.put(chunk.tobytes(), timeout=1.0)
-            except queue.Full:
-                log.warning("AudioStreamManager: Buffer de áudio cheio, pulando chunk")
-                continue
+                # Espera até que haja espaço no buffer (desiste na hora ao parar)
+                if not self._put_chunk(chunk.tobytes(), stop_flag):
+                    break
             except Exception as e:
                 log.error("AudioStreamManager: Erro ao reproduzir chunk de áudio: %s", e)
                 if not self.ensure_stream():
                     break
 
         # Adiciona um chunk silencioso no final para suavizar a transição
-        silence = np.zeros(CHUNK, dtype=np.float32)
-        try:
-            self.buffer.put(silence.tobytes(), timeout=1.0)
-        except:
-            pass
+        if not (stop_flag and stop_flag.is_set()):
+            silence = np.zeros(CHUNK, dtype=np.float32)
+            try:
+                self.buffer.put(silence.tobytes(), timeout=1.0)
+            except:
+                pass
+
+    def play_stream(self, sample_blocks, stop_flag=None, on_first_chunk=None, flush=False):
+        """
+        Reproduz áudio que chega em blocos de tamanho qualquer (streaming da API).
+
+        Os blocos são reagrupados em CHUNK amostras e enfileirados assim que
+        completam um bloco de saída, sem esperar o fim do áudio, já com o volume
+        normalizado pelo LoudnessNormalizer. Por padrão não
+        descarta o buffer, para que sentenças consecutivas toquem sem cortar o
+        final da anterior.
+
+        Args:
+            sample_blocks: Iterável de arrays float32
+            stop_flag: threading.Event que interrompe a reprodução (opcional)
+            on_first_chunk: Callback chamado ao enfileirar o primeiro bloco com áudio
+            flush: Descarta o áudio pendente antes de começar
+
+        Returns:
+            int: Número de amostras enfileiradas
+        """
+        if not self.ensure_stream():
+            return 0
+        if flush:
+            self.flush()
+
+        pending = np.zeros(CHUNK, dtype=np.float32)
+        filled = 0
+        queued = 0
+        for block in sample_blocks:
+            block = self.normalizer.process(block)
+            offset = 0
+            while offset < len(block):
+                if stop_flag and stop_flag.is_set():
+                    return queued
+                take = min(CHUNK - filled, len(block) - offset)
+                pending[filled:filled + take] = block[offset:offset + take]
+                filled += take
+                offset += take
+                if filled == CHUNK:
+                    if on_first_chunk and not queued:
+                        on_first_chunk()
+                    if not self._put_chunk(pending.tobytes(), stop_flag):
+                        return queued
+                    queued += CHUNK
+                    filled = 0
+
+        if filled and not (stop_flag and stop_flag.is_set()):
+            if on_first_chunk and not queued:
+                on_first_chunk()
+            pending[filled:] = 0
+            if self._put_chunk(pending.tobytes(), stop_flag):
+                queued += filled
+        return queued
+
+    def _put_chunk(self, data, stop_flag=None, check_interval=1.0):
+        """
+        Enfileira um bloco de saída esperando por vaga até haver espaço ou a parada ser pedida.
+
+        Nunca descarta áudio (o agendador de pré-busca produz mais rápido que a
+        reprodução). Se o buffer continua cheio por check_interval segundos, verifica
+        se o stream ainda consome o buffer e o reabre se necessário; sem stream
+        (cleanup) ou sem conseguir reabrir, desiste da reprodução.
+
+        Returns:
+            bool: True se o bloco foi enfileirado
+        """
+        last_check = time.monotonic()
+        while True:
+            if stop_flag and stop_flag.is_set():
+                return False
+            try:
+                self.buffer.put(data, timeout=0.05)
+                if stop_flag and stop_flag.is_set():
+                    # A parada esvaziou o buffer enquanto este bloco esperava vaga: não deixa ele tocar
+                    self.flush()
+                    return False
+                return True
+            except queue.Full:
+                if time.monotonic() - last_check < check_interval:
+                    continue
+                last_check = time.monotonic()
+                if self.stream is None or not self.ensure_stream():
+                    log.error("AudioStreamManager: Stream de saída indisponível com o buffer cheio; reprodução interrompida")
+                    return False
+
+    def buffered_seconds(self):
+        """Segundos de áudio enfileirados e ainda não entregues ao dispositivo."""
+        return self.buffer.qsize() * CHUNK / float(RATE)
+
+    def flush(self):
+        """Descarta o áudio ainda não reproduzido, mantendo o stream aberto (barge-in)."""
+        while not self.buffer.empty():
+            try:
+                self.buffer.get_nowait()
+            except:
+                pass
 
     def cleanup(self):
-        """Limpa os recursos de áudio."""
+        """Fecha o stream de saída e limpa o buffer (o backend pertence ao contexto compartilhado)."""
         with self.lock:
             if self.stream is not None:
                 try:
@@ -284,11 +496,4 @@ class AudioStreamManager:
                 self.stream = None
         
         # Limpa o buffer
-        while not self.buffer.empty():
-            try:
-                self.buffer.get_nowait()
-            except:
-                pass
-
-        if self.p:
-            self.p.terminate()
+        self.flush()
@@ -0,0 +1,162 @@
+import threading
+import time
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Tempo máximo que stop_speaking espera a fala encerrar (a saída já foi silenciada antes da espera)
+STOP_TIMEOUT = 0.5
+
+
+class CancellationToken:
+    """
+    Token de cancelamento de uma fala.
+
+    Tem a mesma interface de threading.Event (set, is_set, wait), então pode
+    ser passado onde o código espera um stop_event, e aceita callbacks
+    chamados no cancelamento, para acordar na hora quem está bloqueado
+    (filas do agendador, streams HTTP, engine de voz do PC) sem polling.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.cancelled_at = None
+
+    def cancel(self):
+        """
+        Cancela o token e chama os callbacks registrados (uma única vez).
+
+        Returns:
+            bool: True se este chamado cancelou o token (False se já estava cancelado)
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.cancelled_at = time.perf_counter()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                log.debug("Erro em callback de cancelamento: %s", e)
+        return True
+
+    set = cancel
+
+    def is_set(self):
+        """Indica se o token foi cancelado."""
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Bloqueia (sem consumir CPU) até o cancelamento ou o fim do prazo."""
+        return self._event.wait(timeout)
+
+    def add_callback(self, callback):
+        """
+        Registra uma função chamada no cancelamento (na hora, se o token já foi cancelado).
+
+        Args:
+            callback: Função sem argumentos
+
+        Returns:
+            callable: Função que remove o callback (chamar quando o recurso for liberado)
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+class SpeechController:
+    """
+    Controla o ciclo de vida das falas de um engine de TTS.
+
+    Cada fala recebe um CancellationToken em begin() e é encerrada com end().
+    cancel() cancela o token, silencia a saída e espera a fala terminar numa
+    threading.Condition (sem busy-wait), com prazo máximo; chamado pela própria
+    thread que está falando (por exemplo de dentro de um callback), não espera.
+    """
+
+    def __init__(self, silence=None):
+        """
+        Args:
+            silence: Função que descarta o áudio pendente da saída, chamada logo após o cancelamento
+        """
+        self.silence = silence
+        self._condition = threading.Condition()
+        self._token = CancellationToken()
+        self._speaking = False
+        self._owner = None
+        self.last_stop = {}
+
+    @property
+    def token(self):
+        """Token da fala atual (ou da última)."""
+        return self._token
+
+    @property
+    def is_speaking(self):
+        """Indica se há uma fala em andamento."""
+        return self._speaking
+
+    def begin(self):
+        """
+        Inicia uma nova fala na thread atual.
+
+        Returns:
+            CancellationToken: Token da nova fala
+        """
+        with self._condition:
+            self._token = CancellationToken()
+            self._speaking = True
+            self._owner = threading.get_ident()
+            return self._token
+
+    def end(self, token):
+        """Encerra a fala do token e acorda quem espera em cancel()."""
+        with self._condition:
+            if token is self._token:
+                self._speaking = False
+                self._owner = None
+                self._condition.notify_all()
+
+    def cancel(self, timeout=STOP_TIMEOUT):
+        """
+        Cancela a fala atual, silencia a saída e espera a fala encerrar.
+
+        Args:
+            timeout: Prazo máximo da espera em segundos
+
+        Returns:
+            bool: True se a fala encerrou dentro do prazo (ou não havia fala)
+        """
+        started = time.perf_counter()
+        with self._condition:
+            token = self._token
+            speaking = self._speaking
+            owner = self._owner
+        token.cancel()
+        if self.silence:
+            self.silence()
+
+        stopped = True
+        if speaking and owner != threading.get_ident():
+            with self._condition:
+                stopped = self._condition.wait_for(
+                    lambda: not self._speaking or self._token is not token, timeout)
+            if not stopped:
+                log.warning("A fala não encerrou em %.0f ms; seguindo (a saída já foi silenciada)", timeout * 1000)
+        self.last_stop = {'wait': time.perf_counter() - started, 'stopped': stopped, 'was_speaking': speaking}
+        return stopped
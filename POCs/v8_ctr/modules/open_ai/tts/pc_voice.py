@@ -1,5 +1,6 @@
 import pyttsx3
 import logging
+from .cancellation import SpeechController, STOP_TIMEOUT
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
@@ -10,7 +11,18 @@ class PCVoiceTTS:
         self.pc_engine = None
         self.voice_speed_var = voice_speed_var  # Variável tkinter para velocidade da voz
         self.voice = None
-        self.is_speaking = False
+        # Mesmo controle de fala dos engines da OpenAI: parar interrompe o pyttsx3 e espera sem busy-wait
+        self.speech = SpeechController(silence=self._stop_engine)
+
+    @property
+    def is_speaking(self):
+        """Indica se há uma fala em andamento."""
+        return self.speech.is_speaking
+
+    def _stop_engine(self):
+        """Interrompe a fala do pyttsx3, se o engine já foi criado."""
+        if self.pc_engine:
+            self.pc_engine.stop()
 
     def _ensure_pc_engine(self):
         """Garante que o engine pyttsx3 está inicializado."""
@@ -35,27 +47,31 @@ class PCVoiceTTS:
 
     def speak_response(self, response_text, on_speech_start=None):
         """Reproduz o texto usando a voz do PC."""
+        token = self.speech.begin()
         try:
-            self.is_speaking = True
             if on_speech_start:
                 on_speech_start()
             
             engine = self._ensure_pc_engine()
             engine.setProperty('rate', int(175 * self._get_current_speed()))
+            if token.is_set():
+                return
             engine.say(response_text)
             engine.runAndWait()
             
         except Exception as e:
             log.error("Erro ao reproduzir texto com voz do PC: %s", e)
         finally:
-            self.is_speaking = False
+            self.speech.end(token)
 
-    def stop_speaking(self):
-        """Para a reprodução atual."""
-        if self.pc_engine:
-            self.pc_engine.stop()
-        while self.is_speaking:
-            pass
+    def stop_speaking(self, timeout=STOP_TIMEOUT):
+        """
+        Para a reprodução atual e espera a fala encerrar, sem consumir CPU e por no máximo `timeout`.
+
+        Returns:
+            bool: True se a fala encerrou dentro do prazo
+        """
+        return self.speech.cancel(timeout)
 
     def enqueue_speak(self, response_text, on_speech_start=None):
         """Adiciona texto à fila de fala."""
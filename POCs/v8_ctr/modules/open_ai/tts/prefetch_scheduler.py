@@ -0,0 +1,120 @@
+import queue
+import time
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+
+class TTSPrefetchScheduler:
+    """
+    Agenda a síntese dos trechos de uma resposta com look-ahead limitado.
+
+    Mantém até `lookahead` trechos sendo sintetizados à frente do que está
+    tocando e entrega o áudio estritamente na ordem do texto, como um único
+    gerador de blocos para AudioStreamManager.play_stream. Um trecho lento
+    atrasa os seguintes, mas nunca é descartado por tempo; ao parar, as
+    requisições ainda não iniciadas são canceladas, as em andamento
+    encerram no próximo bloco e a espera pelo trecho atual é acordada na
+    hora pelo token de cancelamento (sem polling).
+    """
+
+    def __init__(self, synthesize, executor, lookahead=2, buffered_seconds=None):
+        """
+        Args:
+            synthesize: Função (texto, índice, fila, stop_event) que coloca na fila os blocos float32 do trecho
+            executor: ThreadPoolExecutor usado nas sínteses
+            lookahead: Trechos sintetizados à frente do que está tocando
+            buffered_seconds: Função que retorna os segundos de áudio já no buffer de saída (para medir pausas)
+        """
+        self.synthesize = synthesize
+        self.executor = executor
+        self.lookahead = lookahead
+        self.buffered_seconds = buffered_seconds
+        self._futures = []
+        self.metrics = {}
+
+    def _produce(self, text, index, output, stop_event):
+        """Roda a síntese de um trecho e sempre marca o fim da fila (None), mesmo com erro."""
+        try:
+            if not stop_event.is_set():
+                self.synthesize(text, index, output, stop_event)
+        except Exception as e:
+            log.error("Erro na síntese do trecho %d: %s", index + 1, e)
+        finally:
+            output.put(None)
+
+    def blocks(self, chunks, stop_event):
+        """
+        Gera os blocos de áudio de todos os trechos, em ordem.
+
+        Args:
+            chunks: Trechos de texto na ordem de leitura
+            stop_event: CancellationToken que interrompe a síntese e a entrega
+
+        Yields:
+            np.ndarray: Blocos float32
+        """
+        outputs = {}
+        current = {}
+        submitted = 0
+        started = time.perf_counter()
+        self.metrics = {'chunks': len(chunks), 'lookahead': self.lookahead, 'requests': 0, 'first_audio_wait': None,
+                        'gaps': [], 'waits': [], 'empty_chunks': 0, 'cancelled': 0}
+        # No cancelamento, um None na fila do trecho atual acorda a espera bloqueante
+        unregister = stop_event.add_callback(lambda: current['output'].put(None) if current else None)
+        try:
+            for index in range(len(chunks)):
+                # Janela de síntese: o trecho atual e até `lookahead` à frente
+                while submitted < min(len(chunks), index + 1 + self.lookahead):
+                    outputs[submitted] = queue.Queue()
+                    self._futures.append(self.executor.submit(
+                        self._produce, chunks[submitted], submitted, outputs[submitted], stop_event))
+                    submitted += 1
+                    self.metrics['requests'] += 1
+
+                output = outputs.pop(index)
+                current['output'] = output
+                buffered = self.buffered_seconds() if self.buffered_seconds and index else 0.0
+                wait_started = time.perf_counter()
+                has_audio = False
+                while not stop_event.is_set():
+                    block = output.get()
+                    if block is None:
+                        break
+                    if not has_audio:
+                        has_audio = True
+                        waited = time.perf_counter() - wait_started
+                        if index == 0:
+                            self.metrics['first_audio_wait'] = time.perf_counter() - started
+                        else:
+                            # Pausa audível: espera pelo trecho além do áudio que ainda havia no buffer
+                            self.metrics['waits'].append(waited)
+                            self.metrics['gaps'].append(max(0.0, waited - buffered))
+                    yield block
+                if stop_event.is_set():
+                    return
+                if not has_audio:
+                    self.metrics['empty_chunks'] += 1
+                    log.warning("Trecho %d terminou sem áudio", index + 1)
+        finally:
+            unregister()
+            self.cancel()
+
+    def cancel(self):
+        """Cancela as sínteses que ainda não começaram."""
+        for future in self._futures:
+            if future.cancel():
+                self.metrics['cancelled'] = self.metrics.get('cancelled', 0) + 1
+        self._futures = []
+
+    def get_metrics(self):
+        """Retorna as métricas da última resposta, com o resumo das pausas entre trechos."""
+        metrics = dict(self.metrics)
+        gaps = metrics.get('gaps') or []
+        metrics['mean_gap'] = float(np.mean(gaps)) if gaps else 0.0
+        metrics['max_gap'] = max(gaps) if gaps else 0.0
+        metrics['stalls'] = sum(1 for gap in gaps if gap > 0)
+        return metrics
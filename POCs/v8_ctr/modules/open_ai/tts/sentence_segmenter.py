@@ -0,0 +1,228 @@
+import re
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Abreviações (sem o ponto, em minúsculas) que não encerram a frase
+ABBREVIATIONS = {
+    # Português
+    'sr', 'sra', 'srta', 'dr', 'dra', 'prof', 'profa', 'eng', 'exmo', 'exma', 'av', 'obs', 'aprox',
+    'ex', 'ltda', 'cia', 'séc', 'p.ex', 'a.c', 'd.c',
+    # Inglês
+    'mr', 'mrs', 'ms', 'jr', 'st', 'vs', 'inc', 'corp', 'approx', 'dept', 'e.g', 'i.e', 'u.s'
+}
+# Abreviações que só valem antes de um número ("nº 5", "p. 12", "art. 5º")
+NUMBER_ABBREVIATIONS = {'n', 'nº', 'no', 'núm', 'p', 'pp', 'pág', 'pag', 'art', 'cap', 'fig', 'vol', 'tel'}
+# Palavras comuns no início de frase: depois de uma letra maiúscula com ponto indicam
+# fim de frase ("item A. Depois", "so do I. Then"), não um sobrenome após uma inicial
+SENTENCE_STARTERS = {
+    # Português
+    'a', 'o', 'as', 'os', 'um', 'uma', 'e', 'mas', 'então', 'depois', 'agora', 'hoje', 'ontem', 'amanhã',
+    'também', 'isso', 'isto', 'este', 'esta', 'esse', 'essa', 'aquele', 'aquela', 'ele', 'ela', 'eles',
+    'elas', 'eu', 'nós', 'você', 'vocês', 'não', 'sim', 'se', 'quando', 'por', 'para', 'com', 'no', 'na',
+    'em', 'de', 'do', 'da', 'já', 'ainda', 'só', 'aqui', 'lá', 'assim', 'porém', 'contudo', 'além',
+    # Inglês
+    'the', 'an', 'and', 'but', 'so', 'then', 'now', 'it', 'he', 'she', 'we', 'they', 'you', 'i', 'this',
+    'that', 'these', 'those', 'there', 'here', 'if', 'when', 'in', 'on', 'at', 'for', 'with', 'also', 'yes'
+}
+
+# Fim de frase: pontuação terminal (com aspas/parênteses de fechamento) seguida de espaço ou fim do texto
+_SENTENCE_END = re.compile(r'[.!?…]+["\'”’)\]]*(?=\s|$)')
+# Fronteiras de oração dentro de uma frase longa
+_CLAUSE_END = re.compile(r'(?:[,;:]|\s[—–-])(?=\s)')
+_ORDINAL_ITEM = re.compile(r'^\d+[.)]$')
+
+
+def _is_abbreviation(token, next_text, previous=''):
+    """
+    Indica se o token terminado em ponto é abreviação, inicial ou sigla com pontos.
+
+    Uma letra sozinha só é inicial se for maiúscula e vier antes de outra
+    inicial ("J. R. Tolkien") ou de um nome, entre uma palavra maiúscula (ou o
+    início da frase) e uma palavra maiúscula que não costuma abrir frases
+    ("John F. Kennedy"). Assim "item A. Depois" e "Vitamina C. Ela" são quebrados.
+
+    Args:
+        token: Palavra terminada no ponto
+        next_text: Texto depois do ponto, sem espaços iniciais
+        previous: Palavra anterior ao token na mesma frase ('' no início da frase)
+
+    Returns:
+        bool: True se o ponto não encerra a frase
+    """
+    letters = token.rstrip('.').lstrip('(["\'“‘')
+    word = letters.lower()
+    if word in ABBREVIATIONS:
+        return True
+    if word in NUMBER_ABBREVIATIONS:
+        return next_text[:1].isdigit()
+    # Siglas com pontos ("B.R.I.C.K.", "E.U.A.")
+    if re.fullmatch(r'(?:[^\W\d_]\.)+[^\W\d_]', word):
+        return True
+    if not re.fullmatch(r'[^\W\d_]', letters) or not letters.isupper():
+        return False
+    next_word = next_text.split(None, 1)[0].lstrip('(["\'“‘') if next_text else ''
+    if re.fullmatch(r'[^\W\d_]\.', next_word) and next_word[0].isupper():
+        return True
+    previous = previous.lstrip('(["\'“‘')
+    return (next_word[:1].isupper() and next_word.rstrip('.,;:!?').lower() not in SENTENCE_STARTERS
+            and (not previous or previous[0].isupper()))
+
+
+def split_sentences(text):
+    """
+    Divide o texto em frases completas, mantendo a pontuação original.
+
+    Não quebra números decimais ("3.14", "1.000,50"), URLs, e-mails,
+    abreviações ("Sr.", "Dr.", "e.g.") nem siglas com pontos; quebras de linha
+    (parágrafos e itens de lista) também encerram a frase.
+
+    Args:
+        text: Texto da resposta
+
+    Returns:
+        list: Frases sem espaços nas pontas
+    """
+    sentences = []
+    for line in text.splitlines():
+        start = 0
+        for match in _SENTENCE_END.finditer(line):
+            end = match.end()
+            token = line[:match.start() + 1].rsplit(None, 1)[-1] if line[:match.start() + 1].strip() else ''
+            next_text = line[end:].lstrip()
+            if match.group().startswith('.') and not match.group().startswith('..'):
+                words = line[start:match.start() + 1].split()
+                if _is_abbreviation(token, next_text, words[-2] if len(words) > 1 else ''):
+                    continue
+                # Itens numerados ("1. Abrir o arquivo") no início da linha
+                if _ORDINAL_ITEM.match(token) and not line[:match.start()].strip(' \t0123456789'):
+                    continue
+            # Reticências ou ponto seguidos de minúscula continuam a frase
+            if next_text and next_text[0].islower() and match.group()[0] in '.…':
+                continue
+            sentence = line[start:end].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = end
+        rest = line[start:].strip()
+        if rest:
+            sentences.append(rest)
+    return sentences
+
+
+def split_clauses(sentence, max_chars):
+    """
+    Divide uma frase longa em orações (vírgula, ponto e vírgula, dois pontos, travessão),
+    agrupando as orações vizinhas até `max_chars`. Orações ainda maiores são
+    cortadas no último espaço antes do limite.
+
+    Args:
+        sentence: Frase a dividir
+        max_chars: Tamanho máximo de cada parte
+
+    Returns:
+        list: Partes da frase
+    """
+    pieces = []
+    start = 0
+    for match in _CLAUSE_END.finditer(sentence):
+        pieces.append(sentence[start:match.end()].strip())
+        start = match.end()
+    pieces.append(sentence[start:].strip())
+
+    parts = []
+    for piece in filter(None, pieces):
+        while len(piece) > max_chars:
+            cut = piece.rfind(' ', 0, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            parts.append(piece[:cut].strip())
+            piece = piece[cut:].strip()
+        if parts and len(parts[-1]) + 1 + len(piece) <= max_chars and parts[-1][-1] not in '.!?…':
+            parts[-1] = f"{parts[-1]} {piece}"
+        elif piece:
+            parts.append(piece)
+    return parts
+
+
+class SentenceSegmenter:
+    """
+    Divide a resposta em trechos para o TTS pensando na latência.
+
+    O primeiro trecho é curto (uma frase ou oração de até `first_max_chars`),
+    para o primeiro áudio sair rápido; os seguintes crescem por `growth` até
+    `max_chars`, agrupando frases inteiras para reduzir o número de
+    requisições enquanto o início já está tocando.
+    """
+
+    def __init__(self, first_max_chars=80, first_min_chars=20, growth=2.0, max_chars=400):
+        """
+        Args:
+            first_max_chars: Tamanho máximo do primeiro trecho
+            first_min_chars: Frases iniciais menores que isso são agrupadas com a seguinte
+            growth: Fator de crescimento do orçamento de caracteres a cada trecho
+            max_chars: Tamanho máximo de qualquer trecho
+        """
+        self.first_max_chars = first_max_chars
+        self.first_min_chars = first_min_chars
+        self.growth = growth
+        self.max_chars = max_chars
+
+    def split(self, text):
+        """
+        Divide o texto em trechos para síntese.
+
+        Args:
+            text: Texto da resposta
+
+        Returns:
+            list: Trechos na ordem de leitura, com a pontuação original
+        """
+        units = []
+        for sentence in split_sentences(text):
+            units.extend(split_clauses(sentence, self.max_chars) if len(sentence) > self.max_chars else [sentence])
+        if not units:
+            return []
+
+        first, units = self._first_chunk(units)
+        chunks = [first]
+        budget = min(self.max_chars, self.first_max_chars * self.growth)
+        current = ""
+        for unit in units:
+            if current and len(current) + 1 + len(unit) > budget:
+                chunks.append(current)
+                current = ""
+                budget = min(self.max_chars, budget * self.growth)
+            current = f"{current} {unit}" if current else unit
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _first_chunk(self, units):
+        """Monta o primeiro trecho: curto, terminando em frase ou oração."""
+        first = units[0]
+        rest = list(units[1:])
+
+        # Frases iniciais muito curtas ("Claro.") vão junto com a seguinte, se couber
+        while len(first) < self.first_min_chars and rest and len(first) + 1 + len(rest[0]) <= self.first_max_chars:
+            first = f"{first} {rest.pop(0)}"
+        # Se a frase seguinte não couber inteira, leva junto só a primeira oração dela
+        if len(first) < self.first_min_chars and rest:
+            clauses = split_clauses(rest[0], self.first_max_chars - len(first) - 1)
+            if len(clauses) > 1 and clauses[0][-1] in ',;:—–-':
+                tail = " ".join(clauses[1:])
+                first = f"{first} {clauses[0]}"
+                rest = ([tail] if tail else []) + rest[1:]
+
+        if len(first) <= self.first_max_chars:
+            return first, rest
+
+        # Frase inicial longa: corta na primeira oração que caiba no limite; sem oração
+        # que caiba, só corta entre palavras se a frase passar do dobro do limite
+        clauses = split_clauses(first, self.first_max_chars)
+        head = clauses[0]
+        if head[-1] not in ',;:—–-' and len(first) <= 2 * self.first_max_chars:
+            return first, rest
+        tail = " ".join(clauses[1:])
+        return head, ([tail] if tail else []) + rest
@@ -1,3 +1,4 @@
+import threading
 from .tts_standard import StandardTTS
 from .tts_chat_completions import ChatCompletionsTTS
 
@@ -42,10 +43,10 @@ class OpenAITTS:
         if isinstance(self._tts_instance, ChatCompletionsTTS):
             self._tts_instance.set_input_audio(audio_data_base64, skip_transcription)
 
-    def set_transcript_callback(self, callback):
-        """Define o callback para atualizar o texto do chat com a transcrição."""
+    def set_transcript_callback(self, callback, on_partial=None):
+        """Define os callbacks para atualizar o texto do chat com a transcrição (completa e parcial)."""
         if isinstance(self._tts_instance, ChatCompletionsTTS):
-            self._tts_instance.set_transcript_callback(callback)
+            self._tts_instance.set_transcript_callback(callback, on_partial)
 
     def set_voice(self, voice):
         """Define a voz a ser usada."""
@@ -58,6 +59,16 @@ class OpenAITTS:
         if self._tts_instance:
             self._tts_instance.set_model(model)
 
+    def prewarm(self, phrases):
+        """
+        Deixa as frases comuns no cache de áudio, em segundo plano (apenas TTS padrão).
+
+        Args:
+            phrases: Frases a sintetizar com a voz e o modelo atuais
+        """
+        if isinstance(self._tts_instance, StandardTTS) and phrases:
+            threading.Thread(target=self._tts_instance.prewarm_cache, args=(list(phrases),), daemon=True).start()
+
     def speak_response(self, response_text, on_speech_start=None):
         """Processa e reproduz o texto como áudio."""
         if self._tts_instance:
@@ -4,6 +4,8 @@ from concurrent.futures import ThreadPoolExecutor
 import time
 from openai import OpenAI
 from .audio_processor import AudioChunkProcessor, AudioStreamManager
+from .cancellation import SpeechController, STOP_TIMEOUT
+from modules.audio.audio_context import get_audio_context
 import logging
 
 # Configuração do logger
@@ -29,8 +31,9 @@ class BaseTTS:
         self.audio_buffer = queue.Queue()
         self.executor = ThreadPoolExecutor(max_workers=5)
         
-        self.is_speaking = False
-        self.stop_current = False
+        # Ciclo de vida das falas: cada fala recebe um token de cancelamento (stop_event)
+        self.speech = SpeechController(silence=lambda: get_audio_context().interrupt())
+        self.stop_event = self.speech.token
         self.speech_started_callback = None
         self.first_chunk_played = False
         
@@ -110,11 +113,25 @@ class BaseTTS:
         except AttributeError:
             return "Default (Sem entonação)"
 
-    def stop_speaking(self):
-        """Para a reprodução atual."""
-        self.stop_current = True
-        while self.is_speaking:
-            pass
+    @property
+    def is_speaking(self):
+        """Indica se há uma fala em andamento."""
+        return self.speech.is_speaking
+
+    def _begin_speech(self):
+        """Inicia uma fala e retorna o token que a interrompe (também exposto em self.stop_event)."""
+        self.stop_event = self.speech.begin()
+        return self.stop_event
+
+    def stop_speaking(self, timeout=STOP_TIMEOUT):
+        """
+        Para a reprodução atual: cancela a fala, descarta o áudio pendente e
+        espera a fala encerrar, sem consumir CPU e por no máximo `timeout`.
+
+        Returns:
+            bool: True se a fala encerrou dentro do prazo
+        """
+        return self.speech.cancel(timeout)
 
     def enqueue_speak(self, response_text, on_speech_start=None):
         """Adiciona texto à fila de fala."""
@@ -0,0 +1,267 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+
+def normalize_tts_text(text):
+    """
+    Normaliza o texto usado na chave do cache (espaços repetidos e pontas).
+
+    Maiúsculas e pontuação são mantidas: mudam a entonação do áudio gerado.
+
+    Args:
+        text: Texto enviado ao TTS
+
+    Returns:
+        str: Texto normalizado
+    """
+    return " ".join(text.split())
+
+
+class TTSAudioCache:
+    """
+    Cache do áudio sintetizado indexado por engine, modelo, voz, velocidade e texto.
+
+    Mantém o PCM já decodificado (float32, pronto para tocar) num LRU limitado
+    em bytes e, opcionalmente, uma cópia em disco (PCM 16 bits bruto, um
+    arquivo por entrada) que sobrevive ao reinício do aplicativo. Frases
+    repetidas (confirmações, saudações, mensagens de erro) tocam sem
+    nenhuma requisição ao TTS.
+
+    O disco também é um LRU limitado em bytes: a data de modificação de cada
+    arquivo marca o último uso e os mais antigos são apagados quando o limite
+    é ultrapassado. Entradas guardadas com persist=False (sentenças de
+    respostas, que raramente se repetem) ficam só em memória até o primeiro
+    acerto, quando passam a ser gravadas no disco.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, disk_max_bytes=128 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Tamanho máximo do áudio mantido em memória
+            disk_dir: Pasta do cache em disco (None desativa o disco)
+            disk_max_bytes: Tamanho máximo dos arquivos do cache em disco
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._unsaved = set()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'disk_evictions': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            if self._disk_bytes > self.disk_max_bytes:
+                self._trim_disk()
+
+    @staticmethod
+    def make_key(engine, model, voice, speed, text):
+        """Chave do cache: hash de engine + modelo + voz + velocidade (2 casas) + texto normalizado."""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update("\x00".join([engine, model, voice, f"{float(speed):.2f}",
+                                   normalize_tts_text(text)]).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pcm")
+
+    def get(self, key):
+        """
+        Procura o áudio de um texto (memória primeiro, depois disco).
+
+        Returns:
+            np.ndarray | None: Amostras float32 (somente leitura), ou None se não estiver no cache
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                samples = self._entries[key]
+                save = key in self._unsaved
+                self._unsaved.discard(key)
+            else:
+                samples = None
+
+        if samples is not None:
+            # Primeira repetição de uma entrada só em memória: passa a valer a pena guardá-la no disco
+            if save and self.disk_dir:
+                self._write_disk(key, samples)
+            return samples
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    samples = np.frombuffer(f.read(), dtype='<i2').astype(np.float32) / 32768.0
+                os.utime(path)  # Marca o uso para o LRU do disco
+            except (OSError, ValueError):
+                samples = None
+
+        with self._lock:
+            if samples is None or not len(samples):
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            return self._remember(key, samples)
+
+    def put(self, key, samples, persist=True):
+        """
+        Guarda o áudio em memória e, se configurado, no disco.
+
+        Args:
+            key: Chave gerada por make_key
+            samples: Amostras float32 do áudio
+            persist: Se False, grava no disco só quando a entrada tiver um acerto em memória
+
+        Returns:
+            np.ndarray: Cópia somente leitura guardada no cache
+        """
+        with self._lock:
+            samples = self._remember(key, samples)
+            self._stats['stores'] += 1
+            if persist or not self.disk_dir:
+                self._unsaved.discard(key)
+            elif key in self._entries:
+                self._unsaved.add(key)
+
+        if self.disk_dir and persist:
+            self._write_disk(key, samples)
+        return samples
+
+    def _write_disk(self, key, samples):
+        """Grava uma entrada no disco (arquivo temporário + rename) e apaga as mais antigas se passar do limite."""
+        path = self._disk_path(key)
+        data = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        if len(data) > self.disk_max_bytes:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            log.warning("Não foi possível gravar o áudio no cache em disco: %s", e)
+            return
+        with self._disk_lock:
+            self._disk_bytes += len(data) - previous
+            over_limit = self._disk_bytes > self.disk_max_bytes
+        if over_limit:
+            self._trim_disk()
+
+    def _disk_files(self):
+        """Lista (mtime, tamanho, caminho) dos arquivos do cache em disco."""
+        files = []
+        for folder, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith('.pcm'):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                files.append((info.st_mtime, info.st_size, path))
+        return files
+
+    def _trim_disk(self):
+        """
+        Apaga os arquivos usados há mais tempo até o disco ficar em 90% do limite.
+
+        A folga evita percorrer a pasta a cada gravação quando o cache está cheio.
+        """
+        with self._disk_lock:
+            files = sorted(self._disk_files())
+            total = sum(size for _, size, _ in files)
+            target = self.disk_max_bytes * 0.9
+            removed = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._disk_bytes = total
+        if removed:
+            with self._lock:
+                self._stats['disk_evictions'] += removed
+            log.info("Cache de áudio em disco: %d arquivos antigos removidos (%.1f MB em uso)", removed, total / 1e6)
+
+    def _remember(self, key, samples):
+        """Insere no LRU em memória, descartando as entradas menos usadas até caber (chamado com o lock)."""
+        samples = np.array(samples, dtype=np.float32)
+        samples.flags.writeable = False
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).nbytes
+        if samples.nbytes > self.max_bytes:
+            return samples
+        self._entries[key] = samples
+        self._bytes += samples.nbytes
+        while self._bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._unsaved.discard(evicted_key)
+            self._bytes -= evicted.nbytes
+            self._stats['evictions'] += 1
+        return samples
+
+    def clear(self):
+        """Esvazia o cache em memória (o disco é mantido)."""
+        with self._lock:
+            self._entries.clear()
+            self._unsaved.clear()
+            self._bytes = 0
+
+    def get_metrics(self):
+        """Retorna os contadores, a ocupação e as taxas de acerto do cache."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['disk_hits'] + self._stats['misses']
+            return dict(self._stats, **{
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'audio_seconds': self._bytes / 4 / 24000.0,
+                'disk_bytes': self._disk_bytes,
+                'lookups': lookups,
+                'hit_rate': (self._stats['hits'] + self._stats['disk_hits']) / lookups if lookups else None,
+                'memory_hit_rate': self._stats['hits'] / lookups if lookups else None
+            })
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_tts_cache(max_bytes=None, disk_dir=None, disk_max_bytes=None):
+    """
+    Retorna o cache de áudio do TTS compartilhado pelo aplicativo.
+
+    Args:
+        max_bytes: Tamanho do LRU em memória usado na criação do cache
+        disk_dir: Pasta do cache em disco usada na criação do cache
+        disk_max_bytes: Tamanho máximo do cache em disco usado na criação do cache
+
+    Returns:
+        TTSAudioCache: Cache compartilhado
+    """
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = TTSAudioCache(max_bytes or 64 * 1024 * 1024, disk_dir,
+                                            disk_max_bytes or 128 * 1024 * 1024)
+        return _cache_instance
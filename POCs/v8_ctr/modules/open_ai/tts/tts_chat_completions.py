@@ -1,27 +1,54 @@
 import asyncio
+import base64
 import time
 import numpy as np
 from .tts_base import BaseTTS
 from .audio_processor import AudioChunkProcessor
+from modules.audio.pcm import PCMStreamDecoder
 import logging
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+# Único formato de áudio aceito pela API com stream=True: PCM 16 bits, 24 kHz, mono
+STREAM_FORMAT = "pcm16"
+
+
+def _delta_audio(delta):
+    """
+    Extrai o áudio e a transcrição de um delta do streaming.
+
+    Versões antigas do SDK entregam `delta.audio` como dicionário, as novas como objeto.
+
+    Returns:
+        tuple: (dados base64 ou None, trecho da transcrição ou None)
+    """
+    audio = getattr(delta, 'audio', None)
+    if audio is None:
+        return None, None
+    if isinstance(audio, dict):
+        return audio.get('data'), audio.get('transcript')
+    return getattr(audio, 'data', None), getattr(audio, 'transcript', None)
+
+
 class ChatCompletionsTTS(BaseTTS):
     """Implementação TTS usando Chat Completions com suporte a áudio"""
-    def __init__(self, voice_speed_var=None, accent_var=None, emotion_var=None, intonation_var=None):
+    def __init__(self, voice_speed_var=None, accent_var=None, emotion_var=None, intonation_var=None, streaming=True):
         super().__init__(voice_speed_var)
+        self.streaming = streaming  # Reproduz o áudio à medida que chega (False: espera a resposta inteira)
         self.last_transcript = None
         self.input_audio_data = None
         self.skip_transcription = False
         self.transcript_callback = None
+        self.partial_transcript_callback = None
+        self.first_audio_latency = None
         self.chunk_processor = AudioChunkProcessor()
         self.accent_var = accent_var
         self.emotion_var = emotion_var
         self.intonation_var = intonation_var
         self.current_audio_data = None
+        self.audio_format = "wav"  # Decodificado direto no processo (mp3 também funciona, via libsndfile)
 
     def set_input_audio(self, audio_data_base64, skip_transcription=False):
         """Define o áudio de entrada em base64 para uso com TTS-GPT4."""
@@ -33,9 +60,16 @@ class ChatCompletionsTTS(BaseTTS):
         self.skip_transcription = skip_transcription
         log.info("Áudio de entrada definido com sucesso")
 
-    def set_transcript_callback(self, callback):
-        """Define o callback para atualizar o texto do chat com a transcrição."""
+    def set_transcript_callback(self, callback, on_partial=None):
+        """
+        Define os callbacks para atualizar o texto do chat com a transcrição.
+
+        Args:
+            callback: Chamado com a transcrição completa ao fim da resposta
+            on_partial: Chamado com cada trecho novo da transcrição durante o streaming
+        """
         self.transcript_callback = callback
+        self.partial_transcript_callback = on_partial
         log.info("Callback de transcrição definido")
 
     def speak_response(self, response_text, on_speech_start=None):
@@ -43,6 +77,7 @@ class ChatCompletionsTTS(BaseTTS):
         if self._shutdown or not response_text.strip():
             return
             
+        token = None
         try:
             log.info("=== Iniciando speak_response (TTS-GPT4) ===")
             log.info("Texto recebido: %s", response_text)
@@ -50,8 +85,7 @@ class ChatCompletionsTTS(BaseTTS):
             # Para qualquer reprodução em andamento
             self.stop_speaking()
             
-            self.is_speaking = True
-            self.stop_current = False
+            token = self._begin_speech()
             self.first_chunk_played = False
             self.speech_started_callback = on_speech_start
 
@@ -68,13 +102,16 @@ class ChatCompletionsTTS(BaseTTS):
             import traceback
             traceback.print_exc()
         finally:
-            self.is_speaking = False
-            self.stop_current = False
+            if token is not None:
+                self.speech.end(token)
             self.first_chunk_played = False
             self.speech_started_callback = None
 
     def _generate_and_play_audio(self, text):
         """Gera e reproduz áudio usando Chat Completions."""
+        if self.streaming:
+            self._stream_and_play_audio(text)
+            return
         try:
             log.info("=== Iniciando nova geração de áudio (TTS-GPT4) ===")
             log.info("Texto de entrada: %s", text)
@@ -91,19 +128,10 @@ class ChatCompletionsTTS(BaseTTS):
             
             self._handle_transcript(transcript)
             
-            # Processa todo o áudio antes de começar a reprodução
-            all_samples = []
-            for chunk in self.chunk_processor.process_base64_chunks(audio_data):
-                if self.stop_current or self._shutdown:
-                    break
-                    
-                if len(chunk) > 0:
-                    all_samples.append(chunk)
-
-            if all_samples and not self.stop_current and not self._shutdown:
-                # Concatena todos os chunks em um único array
-                final_samples = np.concatenate(all_samples)
-                
+            # Decodifica todo o áudio no processo, direto para um único buffer float32
+            final_samples = self.chunk_processor.decode_base64(audio_data, self.audio_format)
+
+            if len(final_samples) and not self.stop_event.is_set() and not self._shutdown:
                 # Aplica fade in/out para suavizar o áudio
                 fade_length = min(len(final_samples), 1024)
                 fade_in = np.linspace(0.0, 1.0, fade_length)
@@ -115,7 +143,7 @@ class ChatCompletionsTTS(BaseTTS):
                 # Reproduz o áudio processado
                 if self.speech_started_callback:
                     self.speech_started_callback()
-                self.audio_stream.play_audio_chunks(final_samples)
+                self.audio_stream.play_audio_chunks(final_samples, stop_flag=self.stop_event)
             
             if self.skip_transcription:
                 self.input_audio_data = None
@@ -124,6 +152,74 @@ class ChatCompletionsTTS(BaseTTS):
         except Exception as e:
             log.error("Erro ao gerar áudio com Chat Completions TTS: %s", e)
 
+    def _stream_and_play_audio(self, text):
+        """
+        Gera o áudio em streaming e reproduz cada trecho assim que chega.
+
+        Os deltas de áudio (PCM 16 bits em base64) são decodificados um a um
+        e vão direto para a reprodução; a transcrição parcial é repassada ao
+        callback à medida que chega. Ao parar, a conexão é fechada na hora.
+        """
+        log.info("=== Iniciando geração de áudio em streaming (TTS-GPT4) ===")
+        log.info("Texto de entrada: %s", text)
+        log.info("Voz atual: %s", self.voice)
+
+        token = self.stop_event
+        decoder = PCMStreamDecoder()
+        transcript = []
+        metrics = {'first_delta': None, 'deltas': 0}
+        self.api_start_time = time.time()
+        self.first_audio_latency = None
+
+        def audio_blocks():
+            stream = self._make_api_call(self._prepare_messages(text), stream=True)
+            unregister = token.add_callback(stream.close)
+            try:
+                for chunk in stream:
+                    if token.is_set() or self._shutdown:
+                        break
+                    if not chunk.choices:
+                        continue
+                    data, transcript_delta = _delta_audio(chunk.choices[0].delta)
+                    if transcript_delta:
+                        transcript.append(transcript_delta)
+                        self._handle_transcript_delta(transcript_delta)
+                    if data:
+                        if metrics['first_delta'] is None:
+                            metrics['first_delta'] = time.time() - self.api_start_time
+                        metrics['deltas'] += 1
+                        samples = decoder.feed(base64.b64decode(data))
+                        if len(samples):
+                            yield samples
+            finally:
+                unregister()
+
+        def on_first_chunk():
+            self.first_audio_latency = time.time() - self.api_start_time
+            self.first_chunk_played = True
+            if self.speech_started_callback:
+                self.speech_started_callback()
+
+        blocks = audio_blocks()
+        try:
+            self.audio_stream.play_stream(blocks, stop_flag=token, on_first_chunk=on_first_chunk, flush=True)
+            if not token.is_set():
+                self._handle_transcript("".join(transcript))
+        except Exception as e:
+            if not token.is_set():  # Fechar a conexão ao parar interrompe a leitura com erro
+                log.error("Erro no streaming de áudio do Chat Completions TTS: %s", e)
+        finally:
+            blocks.close()
+
+        if self.skip_transcription:
+            self.input_audio_data = None
+            self.skip_transcription = False
+
+        log.info("Primeiro delta de áudio: %s | primeiro áudio tocando: %s | %d deltas, %.2f s de áudio",
+                 f"{metrics['first_delta']:.2f} s" if metrics['first_delta'] is not None else "-",
+                 f"{self.first_audio_latency:.2f} s" if self.first_audio_latency is not None else "-",
+                 metrics['deltas'], decoder.samples_decoded / 24000.0)
+
     def _prepare_messages(self, text):
         """Prepara as mensagens para a API incluindo system prompt e user message."""
         log.info("=== Debug: _prepare_messages ===")
@@ -199,12 +295,20 @@ class ChatCompletionsTTS(BaseTTS):
             }
         ]
 
-    def _make_api_call(self, messages):
-        """Faz a chamada à API do Chat Completions."""
+    def _make_api_call(self, messages, stream=False):
+        """Faz a chamada à API do Chat Completions (com stream=True, retorna o iterador de deltas)."""
+        if stream:
+            return self.client_openai.chat.completions.create(
+                model="gpt-4o-audio-preview",
+                modalities=["text", "audio"],
+                audio={"voice": self.voice, "format": STREAM_FORMAT},
+                messages=messages,
+                stream=True
+            )
         return self.client_openai.chat.completions.create(
             model="gpt-4o-audio-preview",
             modalities=["text", "audio"],
-            audio={"voice": self.voice, "format": "mp3"},
+            audio={"voice": self.voice, "format": self.audio_format},
             messages=messages
         )
 
@@ -218,10 +322,7 @@ class ChatCompletionsTTS(BaseTTS):
         
         self.last_transcript = transcript
 
-    def stop_speaking(self):
-        """Para a reprodução atual e limpa os recursos."""
-        self.stop_current = True
-        if self.audio_stream and self.audio_stream.stream:
-            self.audio_stream.cleanup()
-            self.audio_stream.ensure_stream()  # Reinicializa o stream
-        self.is_speaking = False
+    def _handle_transcript_delta(self, transcript_delta):
+        """Repassa um trecho novo da transcrição (streaming) ao callback parcial."""
+        if self.skip_transcription and self.partial_transcript_callback:
+            self.partial_transcript_callback(transcript_delta)
@@ -1,32 +1,83 @@
 import time
-import io
-from pydub import AudioSegment
 import numpy as np
 from .tts_base import BaseTTS
+from .audio_processor import CHUNK
+from .sentence_segmenter import SentenceSegmenter
+from .prefetch_scheduler import TTSPrefetchScheduler
+from .tts_cache import get_tts_cache
+from .cancellation import CancellationToken
+from modules.audio.pcm import PCMStreamDecoder
+from modules.audio.decode import decode_audio
 import logging
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+# Bytes lidos por vez do streaming PCM (um bloco de saída: CHUNK amostras de 16 bits)
+STREAM_READ_BYTES = CHUNK * 2
+# Formato das sentenças baixadas inteiras (sem streaming): WAV é lido direto, sem ffmpeg
+BATCH_FORMAT = "wav"
+# Engine usado na chave do cache de áudio
+CACHE_ENGINE = "audio.speech"
+
+
+class _DiscardQueue:
+    """Fila que descarta os blocos (síntese só para o cache, sem reprodução)."""
+
+    def put(self, block):
+        pass
+
+
+class _RecordingQueue:
+    """Repassa os blocos para a fila de reprodução e guarda uma cópia para o cache."""
+
+    def __init__(self, output):
+        self.output = output
+        self.blocks = []
+
+    def put(self, block):
+        self.blocks.append(block)
+        self.output.put(block)
+
+
 class StandardTTS(BaseTTS):
     """Implementação do TTS padrão usando o modelo tts-1"""
-    
+
+    def __init__(self, voice_speed_var=None, streaming=True, lookahead=2, cache=None):
+        """
+        Args:
+            voice_speed_var: Variável da UI com a velocidade da voz
+            streaming: Reproduz o PCM à medida que chega da API (False: baixa cada sentença inteira)
+            lookahead: Sentenças sintetizadas à frente da que está tocando
+            cache: TTSAudioCache usado (None: cache compartilhado do aplicativo)
+        """
+        super().__init__(voice_speed_var)
+        self.streaming = streaming
+        self.lookahead = lookahead
+        self.cache = cache if cache is not None else get_tts_cache()
+        self._prewarmed = set()
+        self._prewarming = set()
+        self.scheduler = None
+        self.segmenter = SentenceSegmenter()
+        self.first_audio_latency = None
+
     def speak_response(self, response_text, on_speech_start=None):
         """Processa e reproduz o texto como áudio usando TTS padrão."""
         if self._shutdown:
             return
             
+        token = None
         try:
             log.info("\n=== Iniciando speak_response (TTS-1) ===")
             log.info("Texto recebido: %s", response_text)
             log.info("Modelo atual: %s", self.model)
             
-            self.is_speaking = True
-            self.stop_current = False
+            token = self._begin_speech()
             self.first_chunk_played = False
             self.speech_started_callback = on_speech_start
             self.sentence_metrics = []  # Limpa métricas anteriores
+            self.first_audio_latency = None
 
             if not self.audio_stream.ensure_stream():
                 return
@@ -41,44 +92,191 @@ class StandardTTS(BaseTTS):
             import traceback
             traceback.print_exc()
         finally:
-            self.is_speaking = False
-            self.stop_current = False
+            if token is not None:
+                self.speech.end(token)
             self.first_chunk_played = False
             self.speech_started_callback = None
 
     def _process_sentences(self, response_text):
-        """Processa o texto dividindo em sentenças e gerando áudio para cada uma."""
+        """Divide o texto em trechos e reproduz o áudio de cada um, em ordem, com síntese antecipada."""
         process_start_time = time.time()
-        sentences = [s.strip() for s in response_text.split('.') if s.strip()]
+        sentences = self.segmenter.split(response_text)
         if not sentences:
             return
 
         log.info("Número de sentenças: %d", len(sentences))
-        
-        # Processa primeira sentença
-        first_audio = self._generate_audio_for_sentence(sentences[0], 0)
-        
-        # Submete sentenças restantes para processamento paralelo
-        futures = []
-        for i, sentence in enumerate(sentences[1:], 1):
-            if not self._shutdown:
-                future = self.executor.submit(self._generate_audio_for_sentence, sentence, i)
-                futures.append((future, i))
-        
-        # Reproduz primeira sentença
+
+        def on_first_chunk():
+            self.first_audio_latency = time.time() - process_start_time
+            self.first_chunk_played = True
+            if self.speech_started_callback:
+                self.speech_started_callback()
+
+        self.scheduler = TTSPrefetchScheduler(self._synthesize_cached, self.executor, lookahead=self.lookahead,
+                                              buffered_seconds=self.audio_stream.buffered_seconds)
         if not self._shutdown:
-            self.audio_stream.play_audio_chunks(
-                first_audio,
-                stop_flag=self.stop_current,
-                on_first_chunk=self.speech_started_callback
+            self.audio_stream.play_stream(
+                self.scheduler.blocks(sentences, self.stop_event),
+                stop_flag=self.stop_event,
+                on_first_chunk=on_first_chunk,
+                flush=True
             )
-        
-        # Processa sentenças restantes
-        self._process_remaining_sentences(futures)
-        
+
         self._print_statistics(len(sentences), process_start_time)
 
-    def _generate_audio_for_sentence(self, sentence, sentence_index=0):
+    def _synthesize_cached(self, sentence, sentence_index, output, stop_event):
+        """
+        Coloca na fila o áudio de uma sentença, vindo do cache ou da API.
+
+        Em caso de acerto o áudio inteiro vai para a fila de uma vez, sem
+        requisição; senão a sentença é sintetizada normalmente e o áudio só
+        é guardado se a síntese terminou sem ser interrompida.
+
+        Returns:
+            bool: True se o áudio da sentença foi entregue por completo
+        """
+        key = self.cache.make_key(CACHE_ENGINE, self.model, self.voice, self._get_current_speed(), sentence)
+        cached = self.cache.get(key)
+        if cached is not None:
+            log.info("Sentença %d tocada do cache de áudio", sentence_index + 1)
+            output.put(cached)
+            return True
+
+        recorder = _RecordingQueue(output)
+        synthesize = self._stream_sentence_audio if self.streaming else self._download_sentence_audio
+        completed = synthesize(sentence, sentence_index, recorder, stop_event)
+        if completed and recorder.blocks and not stop_event.is_set():
+            # Sentenças de respostas raramente se repetem: só vão ao disco a partir da primeira repetição
+            self.cache.put(key, np.concatenate(recorder.blocks), persist=False)
+        return completed
+
+    def prewarm_cache(self, phrases):
+        """
+        Sintetiza e guarda no cache as frases comuns com a voz, o modelo e a velocidade atuais.
+
+        As frases passam pelo mesmo segmentador da fala, para que as chaves
+        coincidam com as de speak_response. Frases já no cache (memória ou
+        disco) não geram requisição; cada combinação de voz é aquecida uma vez,
+        e só conta como aquecida se todos os trechos foram sintetizados (sem
+        rede na inicialização, a próxima chamada tenta de novo). As métricas da
+        síntese ficam fora de sentence_metrics, que é o relatório da fala atual.
+
+        Args:
+            phrases: Frases a deixar prontas
+
+        Returns:
+            int: Número de trechos sintetizados (ausentes do cache)
+        """
+        signature = (self.model, self.voice, round(self._get_current_speed(), 2))
+        if signature in self._prewarmed or signature in self._prewarming:
+            return 0
+        self._prewarming.add(signature)
+
+        stop_event = CancellationToken()
+        metrics = []
+        synthesized = 0
+        failed = 0
+        try:
+            for phrase in phrases:
+                for chunk in self.segmenter.split(phrase):
+                    if self._shutdown:
+                        return synthesized
+                    key = self.cache.make_key(CACHE_ENGINE, self.model, self.voice, self._get_current_speed(), chunk)
+                    if self.cache.get(key) is not None:
+                        continue
+                    sink = _RecordingQueue(_DiscardQueue())
+                    synthesize = self._stream_sentence_audio if self.streaming else self._download_sentence_audio
+                    if synthesize(chunk, 0, sink, stop_event, metrics) and sink.blocks:
+                        self.cache.put(key, np.concatenate(sink.blocks))
+                        synthesized += 1
+                    else:
+                        failed += 1
+        finally:
+            self._prewarming.discard(signature)
+
+        if failed:
+            log.warning("Aquecimento do cache de áudio incompleto: %d trechos falharam (nova tentativa na próxima troca de voz)",
+                        failed)
+        else:
+            self._prewarmed.add(signature)
+        log.info("Cache de áudio aquecido: %d trechos sintetizados para a voz %s (%.2f s de API)",
+                 synthesized, self.voice, sum(m['total_time'] for m in metrics))
+        return synthesized
+
+    def _stream_sentence_audio(self, sentence, sentence_index, output, stop_event, metrics=None):
+        """
+        Pede o áudio de uma sentença em PCM bruto e coloca os blocos na fila à medida que chegam.
+
+        Args:
+            metrics: Lista que recebe as métricas da sentença (padrão: sentence_metrics da fala atual)
+
+        Returns:
+            bool: True se o áudio chegou até o fim (sem parada nem erro)
+        """
+        try:
+            if self._shutdown or stop_event.is_set():
+                return False
+            sentence_start_time = time.time()
+            first_byte_time = None
+            processing_time = 0.0
+            decoder = PCMStreamDecoder()
+
+            completed = True
+            with self.client_openai.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=sentence,
+                response_format="pcm",  # PCM 16 bits, 24 kHz, mono: sem decodificação
+                speed=self._get_current_speed()
+            ) as response:
+                # Ao parar, fecha a conexão na hora em vez de esperar o próximo pedaço da rede
+                unregister = stop_event.add_callback(response.close)
+                for data in response.iter_bytes(STREAM_READ_BYTES):
+                    if self._shutdown or stop_event.is_set():
+                        completed = False
+                        break
+                    if first_byte_time is None:
+                        first_byte_time = time.time() - sentence_start_time
+                    processing_start = time.time()
+                    samples = decoder.feed(data)
+                    processing_time += time.time() - processing_start
+                    if len(samples):
+                        output.put(samples)
+                unregister()
+
+            total_time = time.time() - sentence_start_time
+            (self.sentence_metrics if metrics is None else metrics).append({
+                'index': sentence_index + 1,
+                'text_length': len(sentence),
+                'api_time': first_byte_time if first_byte_time is not None else total_time,
+                'processing_time': processing_time,
+                'total_time': total_time,
+                'audio_seconds': decoder.samples_decoded / 24000.0
+            })
+            return completed
+
+        except Exception as e:
+            if not stop_event.is_set():  # Fechar a conexão ao parar interrompe a leitura com erro
+                log.error("Erro no streaming de áudio da sentença %d: %s", sentence_index + 1, e)
+            return False
+
+    def _download_sentence_audio(self, sentence, sentence_index, output, stop_event, metrics=None):
+        """
+        Baixa o áudio inteiro de uma sentença e o coloca na fila como um único bloco.
+
+        Args:
+            metrics: Lista que recebe as métricas da sentença (padrão: sentence_metrics da fala atual)
+
+        Returns:
+            bool: True se o áudio foi entregue
+        """
+        audio_data = self._generate_audio_for_sentence(sentence, sentence_index, metrics)
+        if len(audio_data) and not stop_event.is_set():
+            output.put(audio_data)
+            return True
+        return False
+
+    def _generate_audio_for_sentence(self, sentence, sentence_index=0, metrics=None):
         """Gera áudio para uma única sentença."""
         if self._shutdown:
             return np.array([], dtype=np.float32)
@@ -92,27 +290,21 @@ class StandardTTS(BaseTTS):
             response = self.client_openai.audio.speech.create(
                 model=self.model,
                 voice=self.voice,
-                input=sentence.strip() + ".",
-                response_format="aac",  # Alterado de mp3 para aac
+                input=sentence,
+                response_format=BATCH_FORMAT,
                 speed=self._get_current_speed()
             )
             api_call_time = time.time() - api_call_start
             
             processing_start = time.time()
-            audio_segment = AudioSegment.from_file(io.BytesIO(response.content), format="aac")  # Alterado para ler formato aac
-            audio_segment = audio_segment.set_frame_rate(24000).set_channels(1)
-            
-            samples = np.array(audio_segment.get_array_of_samples(), dtype=np.int16)
-            float_samples = samples.astype(np.float32)
-            max_value = np.max(np.abs(float_samples))
-            if max_value > 0:
-                float_samples = float_samples / max_value
+            # O volume é normalizado na reprodução (contínuo entre as sentenças), não por sentença
+            float_samples = decode_audio(response.content, BATCH_FORMAT, rate=24000)
             
             processing_time = time.time() - processing_start
             total_time = time.time() - sentence_start_time
             
             # Armazena métricas da sentença
-            self.sentence_metrics.append({
+            (self.sentence_metrics if metrics is None else metrics).append({
                 'index': sentence_index + 1,
                 'text_length': len(sentence),
                 'api_time': api_call_time,
@@ -130,22 +322,6 @@ class StandardTTS(BaseTTS):
             log.error("Erro ao gerar áudio para a sentença: %s", e)
             return np.array([], dtype=np.float32)
 
-    def _process_remaining_sentences(self, futures):
-        """Processa as sentenças restantes após a primeira."""
-        for future, idx in futures:
-            if self._shutdown:
-                break
-            try:
-                audio_data = future.result(timeout=10)
-                if len(audio_data) > 0 and not self.stop_current and not self._shutdown:
-                    self.audio_stream.play_audio_chunks(
-                        audio_data,
-                        stop_flag=self.stop_current,
-                        on_first_chunk=None
-                    )
-            except Exception as e:
-                log.error("Erro ao processar a sentença %d: %s", idx, e)
-
     def _print_statistics(self, num_sentences, process_start_time):
         """Imprime estatísticas do processamento."""
         total_process_time = time.time() - process_start_time
@@ -153,8 +329,19 @@ class StandardTTS(BaseTTS):
         log.info("\n=== Estatísticas Finais (TTS-1) ===")
         log.info("Total de sentenças processadas: %d", num_sentences)
         log.info("Tempo total de processamento: %.2f segundos", total_process_time)
-        
+        if self.first_audio_latency is not None:
+            log.info("Tempo até o primeiro áudio: %.2f segundos", self.first_audio_latency)
+        if self.scheduler is not None:
+            metrics = self.scheduler.get_metrics()
+            log.info("Pausas entre sentenças: média %.0f ms, máxima %.0f ms (%d de %d com espera)",
+                     metrics['mean_gap'] * 1000, metrics['max_gap'] * 1000, metrics['stalls'], len(metrics['gaps']))
+        cache_metrics = self.cache.get_metrics()
+        if cache_metrics['lookups']:
+            log.info("Cache de áudio: %.0f%% de acertos, %d entradas (%.1f MB)",
+                     cache_metrics['hit_rate'] * 100, cache_metrics['entries'], cache_metrics['bytes'] / 1e6)
+
         if self.sentence_metrics:
+            self.sentence_metrics.sort(key=lambda m: m['index'])
             # Calcula e exibe médias
             avg_api_time = sum(m['api_time'] for m in self.sentence_metrics) / len(self.sentence_metrics)
             avg_processing_time = sum(m['processing_time'] for m in self.sentence_metrics) / len(self.sentence_metrics)
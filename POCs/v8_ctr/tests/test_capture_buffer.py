@@ -0,0 +1,56 @@
+import numpy as np
+
+from modules.audio.capture_buffer import CaptureRingBuffer, WAV_HEADER_SIZE
+from modules.audio.pcm import read_wav_pcm
+
+
+def ramp(start, count):
+    """Amostras int16 crescentes, fáceis de conferir depois da volta do anel."""
+    return np.arange(start, start + count, dtype=np.int16)
+
+
+def test_write_within_capacity_is_zero_copy():
+    buffer = CaptureRingBuffer(1, 1000)
+    buffer.write(ramp(0, 400).tobytes())
+    wav = buffer.wav_view()
+
+    samples, rate = read_wav_pcm(wav)
+    assert rate == 1000
+    np.testing.assert_array_equal(samples, ramp(0, 400))
+    assert wav.dropped_seconds == 0
+    # O WAV aponta para o próprio anel (cabeçalho no espaço reservado)
+    assert np.shares_memory(np.frombuffer(wav.getbuffer(), dtype=np.uint8), buffer._backing)
+
+
+def test_wraparound_keeps_latest_samples_in_order():
+    buffer = CaptureRingBuffer(1, 1000)
+    for start in range(0, 2500, 300):
+        buffer.write(ramp(start, min(300, 2500 - start)).tobytes())
+
+    assert buffer.total_written == 2500
+    assert buffer.overflowed
+    assert buffer.oldest_available == 1500
+    np.testing.assert_array_equal(buffer.read_range(1500, 2500), ramp(1500, 1000))
+    # Intervalo que atravessa a emenda do anel (posição 2000 = índice 0)
+    np.testing.assert_array_equal(buffer.read_range(1900, 2100), ramp(1900, 200))
+
+
+def test_overflow_is_reported_on_export():
+    buffer = CaptureRingBuffer(1, 1000)
+    buffer.write(ramp(0, 2500).tobytes())
+    wav = buffer.wav_view()
+
+    samples, _ = read_wav_pcm(wav)
+    np.testing.assert_array_equal(samples, ramp(1500, 1000))
+    assert wav.dropped_seconds == 1.5
+    assert len(wav.getbuffer()) == WAV_HEADER_SIZE + 1000 * 2
+
+
+def test_copy_view_is_independent_of_later_writes():
+    buffer = CaptureRingBuffer(1, 1000)
+    buffer.write(ramp(0, 500).tobytes())
+    wav = buffer.wav_view(100, 300, copy=True)
+    buffer.write(ramp(500, 1000).tobytes())
+
+    samples, _ = read_wav_pcm(wav)
+    np.testing.assert_array_equal(samples, ramp(100, 200))
@@ -0,0 +1,69 @@
+import numpy as np
+
+from modules.audio.backends import synthetic_utterances
+from modules.open_ai.stt.chunked_transcriber import plan_segments, stitch_transcripts
+
+RATE = 16000
+
+
+def dictation(count):
+    """Falas sintéticas separadas por pausas, com `count` blocos de três falas."""
+    return np.concatenate([synthetic_utterances(RATE, count=3, seed=seed) for seed in range(count)])
+
+
+def test_short_audio_is_a_single_segment():
+    samples = synthetic_utterances(RATE, count=2)
+    assert plan_segments(samples, RATE, target_seconds=20.0) == [(0, len(samples))]
+
+
+def test_segments_cover_audio_and_cut_in_pauses():
+    samples = dictation(6)
+    overlap = 0.3
+    segments = plan_segments(samples, RATE, target_seconds=8.0, overlap=overlap)
+
+    assert len(segments) > 1
+    assert segments[0][0] == 0 and segments[-1][1] == len(samples)
+    margin = int(overlap * RATE)
+    for (_, end), (start, _) in zip(segments[:-1], segments[1:]):
+        # Vizinhos se sobrepõem exatamente 2 * overlap em volta do corte
+        assert end - start == 2 * margin
+        cut = start + margin
+        # O corte cai numa pausa: o trecho em volta dele é só ruído de fundo
+        window = samples[cut - RATE // 20:cut + RATE // 20].astype(np.float32)
+        assert np.sqrt(np.mean(window ** 2)) < 200
+    for start, end in segments:
+        assert (end - start) / RATE <= 8.0 * 1.4 + 2 * overlap
+
+
+def test_stitch_removes_words_repeated_in_overlap():
+    texts = ["eu fui ao mercado ontem", "mercado ontem e comprei pão"]
+    assert stitch_transcripts(texts, overlaps=0.6) == "eu fui ao mercado ontem e comprei pão"
+
+
+def test_stitch_ignores_case_and_punctuation():
+    texts = ["Vamos revisar o relatório.", "O relatório, depois a agenda."]
+    assert stitch_transcripts(texts, overlaps=0.6) == "Vamos revisar o relatório. depois a agenda."
+
+
+def test_stitch_keeps_single_repeated_word():
+    # Uma palavra só não basta como prova de repetição ("que" + "que bom")
+    assert stitch_transcripts(["eu acho que", "que bom"], overlaps=0.6) == "eu acho que que bom"
+
+
+def test_stitch_without_audio_overlap_only_concatenates():
+    texts = ["fechamos o contrato", "fechamos o contrato de novo"]
+    assert stitch_transcripts(texts, overlaps=0.0) == "fechamos o contrato fechamos o contrato de novo"
+    # Sobreposição por emenda: só a segunda emenda repete áudio
+    texts = ["a b c", "b c d", "c d e"]
+    assert stitch_transcripts(texts, overlaps=[0.0, 0.6]) == "a b c b c d e"
+
+
+def test_stitch_limits_search_to_overlap_duration():
+    # 0.3 s de sobreposição comportam no máximo 2 palavras a 4 palavras/s
+    texts = ["um dois três quatro", "dois três quatro cinco"]
+    assert stitch_transcripts(texts, overlaps=0.3) == "um dois três quatro dois três quatro cinco"
+    assert stitch_transcripts(texts, overlaps=1.0) == "um dois três quatro cinco"
+
+
+def test_stitch_skips_empty_segments():
+    assert stitch_transcripts(["olá mundo", "", None, "mundo novo"], overlaps=0.6) == "olá mundo mundo novo"
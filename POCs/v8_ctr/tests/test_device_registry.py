@@ -0,0 +1,66 @@
+import threading
+import time
+
+from modules.audio.audio_context import AudioContext
+from modules.audio.backends.base_backend import FORMAT_INT16
+from modules.audio.backends.file_backend import FileAudioBackend
+from modules.audio.device_registry import AudioDeviceRegistry
+
+
+def make_registry():
+    context = AudioContext(backend_factory=lambda: FileAudioBackend(speed=0))
+    return context, AudioDeviceRegistry(context, reinitialize_timeout=0.05)
+
+
+def open_capture(context):
+    return context.open_stream(format=FORMAT_INT16, channels=1, rate=24000, input=True, start=False)
+
+
+def test_rescan_reinitializes_backend():
+    context, registry = make_registry()
+    registry.devices()
+    registry.rescan()
+    assert context.reset_count == 1
+    assert registry.scan_count == 2
+
+
+def test_rescan_during_capture_runs_once_capture_closes():
+    context, registry = make_registry()
+    registry.devices()
+    capture = open_capture(context)
+
+    registry.invalidate()
+    registry.devices()
+    assert context.reinitialize_pending
+    assert context.reset_count == 0
+
+    # Fechar a captura executa a reinicialização pendente; a próxima consulta só enumera
+    capture.close()
+    assert not context.reinitialize_pending
+    assert context.reset_count == 1
+    registry.devices()
+    assert context.reset_count == 1
+    assert registry.scan_count == 2
+
+
+def test_rescan_waits_for_capture_to_reopen():
+    context, registry = make_registry()
+    registry.reinitialize_timeout = 2.0
+    registry.devices()
+    capture = open_capture(context)
+
+    # Como a captura do VAD: ao ver a pendência, fecha e reabre o stream
+    def reopen():
+        while not context.reinitialize_pending:
+            time.sleep(0.005)
+        capture.close()
+        open_capture(context)
+
+    thread = threading.Thread(target=reopen)
+    thread.start()
+    registry.rescan()
+    thread.join()
+
+    assert context.reset_count == 1
+    assert registry.scan_count == 2
+    assert context.get_metrics()['input_streams'] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+
+from modules.audio.vad.noise_floor import NoiseFloorTracker
+
+FRAME = 0.02  # Quadros de 20 ms, como o VAD do app
+BATCH = 5  # Quadros por lote (100 ms), como um bloco de captura
+
+
+def feed(tracker, energy):
+    """Entrega as energias em lotes, como o caminho de captura, e devolve o limite a cada lote."""
+    return [tracker.update(energy[i:i + BATCH]) for i in range(0, len(energy), BATCH)]
+
+
+def ambient(seconds, level, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.abs(level * (1 + 0.1 * rng.standard_normal(int(seconds / FRAME))))
+
+
+def test_first_batch_initializes_floor():
+    tracker = NoiseFloorTracker(FRAME)
+    assert tracker.noise_floor is None
+    tracker.update(np.full(BATCH, 0.01))
+    assert np.isclose(tracker.noise_floor, 0.01)
+    assert np.isclose(tracker.threshold, 0.03)
+
+
+def test_long_speech_does_not_raise_threshold():
+    tracker = NoiseFloorTracker(FRAME)
+    feed(tracker, ambient(2.0, 0.008))
+    before = tracker.threshold
+
+    # 20 s de fala: sílabas fortes e trechos fracos logo abaixo do limite, sem pausas longas
+    rng = np.random.default_rng(1)
+    speech = np.where(rng.random(int(20 / FRAME)) < 0.7, 0.2, before * 0.9)
+    thresholds = feed(tracker, speech)
+
+    assert max(thresholds) < before * 1.1
+
+
+def test_threshold_follows_louder_ambient():
+    tracker = NoiseFloorTracker(FRAME)
+    feed(tracker, ambient(2.0, 0.01))
+    feed(tracker, ambient(25.0, 0.02, seed=1))
+    assert 0.015 < tracker.noise_floor <= 0.021
+
+
+def test_threshold_drops_quickly_when_ambient_quiets():
+    tracker = NoiseFloorTracker(FRAME)
+    feed(tracker, ambient(5.0, 0.02))
+    feed(tracker, ambient(5.0, 0.005, seed=1))
+    assert tracker.noise_floor < 0.007
+
+
+def test_recovers_when_ambient_jumps_above_threshold():
+    tracker = NoiseFloorTracker(FRAME, recovery_seconds=10.0)
+    feed(tracker, ambient(2.0, 0.01))
+    # O ruído novo fica acima do limite antigo: todo quadro parece fala
+    feed(tracker, ambient(12.0, 0.05, seed=1))
+    assert tracker.noise_floor > 0.03
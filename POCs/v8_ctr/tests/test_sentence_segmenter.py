@@ -0,0 +1,62 @@
+import pytest
+
+from modules.open_ai.tts.sentence_segmenter import SentenceSegmenter, split_clauses, split_sentences
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("O valor é 3.14 e o total R$ 1.000,50. Depois falamos.", ["O valor é 3.14 e o total R$ 1.000,50.", "Depois falamos."]),
+    ("O Sr. Silva chegou. Ele usa o B.R.I.C.K. para isso!", ["O Sr. Silva chegou.", "Ele usa o B.R.I.C.K. para isso!"]),
+    ("Veja https://exemplo.com/a.b. Fim.", ["Veja https://exemplo.com/a.b.", "Fim."]),
+    ("I said no. See No. 5 on p. 12.", ["I said no.", "See No. 5 on p. 12."]),
+    ("Vamos ao mar. Depois voltamos.", ["Vamos ao mar.", "Depois voltamos."]),
+    ("Pronto... e depois saímos. Fim?", ["Pronto... e depois saímos.", "Fim?"]),
+    ("Passos:\n1. Abrir.\n2. Salvar.", ["Passos:", "1. Abrir.", "2. Salvar."]),
+    ("Comprei o item A. Depois o item B.", ["Comprei o item A.", "Depois o item B."]),
+    ("Vitamina C. Ela é boa.", ["Vitamina C.", "Ela é boa."]),
+    ("Yes, so do I. Then we left.", ["Yes, so do I.", "Then we left."]),
+    ("J. R. R. Tolkien escreveu o livro. Fim.", ["J. R. R. Tolkien escreveu o livro.", "Fim."]),
+    ("O discurso de John F. Kennedy foi curto.", ["O discurso de John F. Kennedy foi curto."]),
+    ("Sem pontuação final", ["Sem pontuação final"]),
+    ("", []),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_split_clauses_respects_limit():
+    sentence = ("Encontrei três arquivos, o mais recente foi alterado hoje de manhã; "
+                "o segundo é da semana passada e o terceiro está vazio")
+    parts = split_clauses(sentence, 40)
+    assert all(len(part) <= 40 for part in parts)
+    assert " ".join(parts) == sentence
+
+
+def test_first_chunk_is_short_and_later_chunks_grow():
+    text = ("Certo, já estou verificando. Encontrei três arquivos com esse nome na pasta de documentos. "
+            "O mais recente foi alterado hoje de manhã. O segundo é da semana passada. O terceiro está vazio. "
+            "Quer que eu abra o mais recente? Também posso enviar uma cópia por e-mail.")
+    segmenter = SentenceSegmenter(first_max_chars=40, max_chars=120)
+    chunks = segmenter.split(text)
+
+    assert chunks[0] == "Certo, já estou verificando."
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert len(chunks[1]) > len(chunks[0])
+    assert " ".join(chunks) == text
+
+
+def test_short_opening_sentence_is_grouped():
+    chunks = SentenceSegmenter().split("Claro. A reunião foi remarcada para amanhã às dez.")
+    assert chunks == ["Claro. A reunião foi remarcada para amanhã às dez."]
+
+
+def test_long_opening_sentence_is_cut_at_a_clause():
+    text = ("Hmm, não encontrei nenhum evento com esse nome na sua agenda; talvez ele tenha sido criado em outra "
+            "conta, ou quem sabe o convite ainda não foi aceito.")
+    chunks = SentenceSegmenter(first_max_chars=80).split(text)
+    assert len(chunks[0]) <= 80
+    assert chunks[0].endswith((",", ";"))
+    assert " ".join(chunks) == text
+
+
+def test_empty_text_has_no_chunks():
+    assert SentenceSegmenter().split("   ") == []
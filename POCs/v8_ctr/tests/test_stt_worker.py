@@ -0,0 +1,59 @@
+import logging
+import time
+
+import numpy as np
+import pytest
+
+from modules.open_ai.stt.local_transcriber import LocalTranscriber
+from modules.open_ai.stt.stt_worker import STTWorkerPool
+
+# Modelo que nenhum worker consegue carregar (com ou sem o Whisper instalado)
+MISSING_MODEL = "modelo-inexistente"
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_pool_fails_when_no_worker_loads_the_model():
+    pool = STTWorkerPool(MISSING_MODEL, num_workers=2)
+    pool.start()
+    try:
+        queued = pool.submit(np.zeros(1600, dtype=np.float32))
+        with pytest.raises(RuntimeError, match="Modelo Whisper indisponível"):
+            queued.result(timeout=30)
+
+        assert pool.ready.is_set() and pool.load_error is not None
+        metrics = pool.get_metrics()
+        assert metrics['workers_ready'] == 0 and metrics['workers_failed'] == 2 and metrics['failed'] == 1
+        with pytest.raises(RuntimeError, match="Modelo Whisper indisponível"):
+            pool.submit(np.zeros(1600, dtype=np.float32))
+
+        # O transcritor falha antes de ler o áudio
+        text = LocalTranscriber(None, logging.getLogger(__name__), pool=pool).transcribe(None)
+        assert text.startswith("Erro na Transcrição Local: Modelo Whisper indisponível")
+    finally:
+        pool.shutdown()
+
+
+def test_pool_stops_restarting_a_crashing_worker():
+    pool = STTWorkerPool(MISSING_MODEL, max_restarts=1, restart_backoff=0.2)
+    pool.start()
+    try:
+        first = pool._workers[0]
+        first.kill()
+        killed_at = time.monotonic()
+        wait_for(lambda: pool.get_metrics()['restarts'] == 1)
+        assert time.monotonic() - killed_at >= 0.2  # Reinício só depois da espera
+        pool._workers[0].kill()  # Mata o substituto antes de ele carregar o modelo
+
+        wait_for(lambda: pool.load_error is not None)
+        assert "encerrado 2 vezes seguidas" in pool.load_error
+        assert pool.get_metrics()['restarts'] == 1
+        with pytest.raises(RuntimeError):
+            pool.submit(np.zeros(1600, dtype=np.float32))
+    finally:
+        pool.shutdown()
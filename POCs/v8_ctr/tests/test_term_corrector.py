@@ -0,0 +1,59 @@
+from modules.open_ai.stt.term_corrector import TermCorrector, parse_terms
+
+TERMS = """Cloud,
+PULSE,
+RAPT,
+B.R.I.C.K.,
+Q.U.A.R.T.Z.,
+Azure,
+Google Cloud,
+Amazon Web Services (AWS)"""
+
+
+def make_corrector():
+    return TermCorrector(parse_terms(TERMS))
+
+
+def test_parse_terms_splits_list():
+    terms = parse_terms(TERMS)
+    assert "B.R.I.C.K." in terms and "Amazon Web Services (AWS)" in terms
+    assert len(terms) == 8
+
+
+def test_exact_terms_get_canonical_spelling():
+    text, report = make_corrector().correct("O projeto pulse usa o brick e o quartz.")
+    assert text == "O projeto PULSE usa o B.R.I.C.K. e o Q.U.A.R.T.Z."
+    assert not report['needs_review']
+    assert [c['term'] for c in report['corrections']] == ["PULSE", "B.R.I.C.K.", "Q.U.A.R.T.Z."]
+
+
+def test_multi_word_terms_and_aliases():
+    text, _ = make_corrector().correct("A migração para a amazon web services e a aws termina hoje.")
+    assert text == "A migração para a Amazon Web Services e a AWS termina hoje."
+    text, _ = make_corrector().correct("Vamos subir no clowd da azure e no google cloud amanhã.")
+    assert text == "Vamos subir no Cloud da Azure e no Google Cloud amanhã."
+
+
+def test_phonetic_misspelling_is_corrected():
+    text, report = make_corrector().correct("O Kloud caiu de novo durante a reunião.")
+    assert text == "O Cloud caiu de novo durante a reunião."
+    assert report['corrections'][0]['score'] < 1.0
+
+
+def test_acronym_at_end_of_sentence_keeps_single_period():
+    text, _ = make_corrector().correct("Ele trabalha no brick.")
+    assert text == "Ele trabalha no B.R.I.C.K."
+
+
+def test_unrelated_text_is_untouched():
+    sentence = "Hoje vamos conversar sobre o tempo e a reunião de amanhã."
+    text, report = make_corrector().correct(sentence)
+    assert text == sentence
+    assert report['corrections'] == [] and not report['needs_review']
+
+
+def test_doubtful_match_asks_for_review():
+    text, report = make_corrector().correct("Meu pulso está alto depois da corrida.")
+    assert text == "Meu pulso está alto depois da corrida."
+    assert report['needs_review']
+    assert report['uncertain'][0]['candidates'][0] == "PULSE"
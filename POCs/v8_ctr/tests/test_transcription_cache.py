@@ -0,0 +1,33 @@
+import numpy as np
+
+from modules.open_ai.stt.transcription_cache import TranscriptionCache, audio_fingerprint
+from modules.audio.capture_buffer import CaptureRingBuffer
+
+
+def test_transcription_cache_evicts_least_recently_used():
+    cache = TranscriptionCache(max_entries=2)
+    cache.put("a", "primeira")
+    cache.put("b", "segunda")
+    assert cache.get("a") == "primeira"
+    cache.put("c", "terceira")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "primeira" and cache.get("c") == "terceira"
+    metrics = cache.get_metrics()
+    assert metrics['evictions'] == 1 and metrics['hits'] == 3 and metrics['misses'] == 1
+
+
+def test_transcription_cache_reads_back_from_disk(tmp_path):
+    TranscriptionCache(disk_dir=str(tmp_path)).put("chave", "texto salvo")
+    cache = TranscriptionCache(disk_dir=str(tmp_path))
+    assert cache.get("chave") == "texto salvo"
+    assert cache.get_metrics()['disk_hits'] == 1
+
+
+def test_fingerprint_depends_on_audio_content():
+    samples = np.arange(1000, dtype=np.int16)
+    first = CaptureRingBuffer.samples_to_wav(samples, 16000, name="a.wav")
+    same = CaptureRingBuffer.samples_to_wav(samples.copy(), 16000, name="b.wav")
+    other = CaptureRingBuffer.samples_to_wav(samples[::-1].copy(), 16000)
+    assert audio_fingerprint(first) == audio_fingerprint(same)
+    assert audio_fingerprint(first) != audio_fingerprint(other)
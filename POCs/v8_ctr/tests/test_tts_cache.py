@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+
+from modules.open_ai.tts.tts_cache import TTSAudioCache
+
+
+def test_tts_cache_evicts_least_recently_used_by_bytes():
+    # Cada entrada tem 100 amostras float32 (400 bytes); cabem duas
+    cache = TTSAudioCache(max_bytes=800)
+    cache.put("a", np.zeros(100))
+    cache.put("b", np.ones(100))
+    assert cache.get("a") is not None  # "a" passa a ser a mais recente
+    cache.put("c", np.full(100, 0.5))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    metrics = cache.get_metrics()
+    assert metrics['entries'] == 2 and metrics['bytes'] == 800 and metrics['evictions'] == 1
+
+
+def test_tts_cache_entries_are_read_only_copies():
+    cache = TTSAudioCache()
+    samples = np.zeros(10, dtype=np.float32)
+    cache.put("a", samples)
+    samples[0] = 1.0
+
+    cached = cache.get("a")
+    assert cached[0] == 0.0
+    assert not cached.flags.writeable
+
+
+def test_tts_cache_skips_entries_larger_than_memory():
+    cache = TTSAudioCache(max_bytes=100)
+    cache.put("a", np.zeros(100))
+    assert cache.get("a") is None
+    assert cache.get_metrics()['entries'] == 0
+
+
+def test_tts_cache_reads_back_from_disk(tmp_path):
+    samples = np.linspace(-0.5, 0.5, 240, dtype=np.float32)
+    TTSAudioCache(disk_dir=str(tmp_path)).put("abc", samples)
+
+    cache = TTSAudioCache(disk_dir=str(tmp_path))
+    restored = cache.get("abc")
+    np.testing.assert_allclose(restored, samples, atol=1 / 16384)
+    assert cache.get_metrics()['disk_hits'] == 1
+
+
+def test_tts_cache_key_ignores_extra_whitespace_only():
+    key = TTSAudioCache.make_key("tts-1", "tts-1", "alloy", 1.0, "Olá,  tudo bem? ")
+    assert key == TTSAudioCache.make_key("tts-1", "tts-1", "alloy", 1.0, "Olá, tudo bem?")
+    assert key != TTSAudioCache.make_key("tts-1", "tts-1", "alloy", 1.0, "olá, tudo bem?")
+    assert key != TTSAudioCache.make_key("tts-1", "tts-1", "alloy", 1.25, "Olá, tudo bem?")
+
+
+def test_tts_cache_disk_evicts_least_recently_used_files(tmp_path):
+    # Cada entrada tem 100 amostras (200 bytes em disco); a terceira passa do limite
+    cache = TTSAudioCache(disk_dir=str(tmp_path), disk_max_bytes=500)
+    cache.put("aa1", np.zeros(100))
+    cache.put("bb2", np.zeros(100))
+    os.utime(cache._disk_path("aa1"), (1, 1))
+    os.utime(cache._disk_path("bb2"), (2, 2))
+    cache.clear()
+    assert cache.get("aa1") is not None  # Acerto no disco renova o arquivo
+    cache.put("cc3", np.zeros(100))
+
+    assert not os.path.exists(cache._disk_path("bb2"))
+    assert os.path.exists(cache._disk_path("aa1")) and os.path.exists(cache._disk_path("cc3"))
+    metrics = cache.get_metrics()
+    assert metrics['disk_evictions'] == 1 and metrics['disk_bytes'] == 400
+
+
+def test_tts_cache_unpersisted_entries_reach_disk_on_first_hit(tmp_path):
+    cache = TTSAudioCache(disk_dir=str(tmp_path))
+    cache.put("abc", np.zeros(100), persist=False)
+    assert not os.path.exists(cache._disk_path("abc"))
+
+    assert cache.get("abc") is not None
+    assert os.path.exists(cache._disk_path("abc"))
+    assert cache.get_metrics()['disk_bytes'] == 200
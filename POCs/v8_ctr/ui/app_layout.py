@@ -32,6 +32,7 @@ class AppLayout:
             'update_voice_dropdown': self._default_update_voice_dropdown,
             'vad_checkbox': self._default_vad_checkbox,
             'toggle_logs': self._toggle_logs,
+            'refresh_devices': self._default_refresh_devices,
         }
         
         self.callbacks = {**self.default_callbacks, **self.callbacks}
@@ -60,6 +61,9 @@ class AppLayout:
     def _default_vad_checkbox(self):
         log.info("vad_checkbox padrão chamado")
 
+    def _default_refresh_devices(self):
+        log.info("refresh_devices padrão chamado")
+
     def _toggle_logs(self):
         show_logs = self.vars['show_logs'].get()
         self.log_config.set_log_visibility(show_logs)
@@ -418,6 +422,13 @@ class AppLayout:
             command=self.callbacks['vad_checkbox']
         ).pack(pady=2, fill='x')
 
+        # Transcrição durante a fala (apenas no modo VAD; no modo online faz uma requisição por segundo de fala)
+        ModernCheckbutton(
+            self.sidebar_col2,
+            text="Transcrição durante a fala (VAD)",
+            variable=self.vars['incremental_transcription']
+        ).pack(pady=2, fill='x')
+
         # === COLUNA 3: Dispositivos de Áudio e Opções ===
         # Dispositivos de Áudio
         tk.Label(
@@ -439,11 +450,12 @@ class AppLayout:
             fg=DarkTheme.TEXT_PRIMARY
         ).pack(pady=(5,2), fill='x')
         
-        ModernOptionMenu(
+        self.input_device_menu = ModernOptionMenu(
             self.sidebar_col3,
             self.vars['input_device'],
             *input_device_names
-        ).pack(pady=(0,5), fill='x')
+        )
+        self.input_device_menu.pack(pady=(0,5), fill='x')
 
         # Dispositivo de Saída
         output_devices = AudioDeviceConfig.list_audio_devices()['output']
@@ -456,10 +468,18 @@ class AppLayout:
             fg=DarkTheme.TEXT_PRIMARY
         ).pack(pady=(5,2), fill='x')
         
-        ModernOptionMenu(
+        self.output_device_menu = ModernOptionMenu(
             self.sidebar_col3,
             self.vars['output_device'],
             *output_device_names
+        )
+        self.output_device_menu.pack(pady=(0,5), fill='x')
+
+        # Enumera os dispositivos de novo (ex.: fone conectado com o aplicativo aberto)
+        ModernButton(
+            self.sidebar_col3,
+            text="Atualizar dispositivos",
+            command=self.callbacks['refresh_devices']
         ).pack(pady=(0,5), fill='x')
 
         # Opções
@@ -123,6 +123,18 @@ class ChatDisplay(ModernTextArea):
         self.insert(tk.END, f"{sender}: {message}", sender)
         self.see(tk.END)
 
+    def start_message(self, sender):
+        """Abre uma mensagem vazia que recebe o texto aos poucos (append_to_message)."""
+        if self.get("1.0", tk.END).strip():
+            self.insert(tk.END, "\n")
+        self.insert(tk.END, f"{sender}: ", sender)
+        self.see(tk.END)
+
+    def append_to_message(self, text, sender):
+        """Acrescenta texto ao fim da última mensagem (transcrição em streaming)."""
+        self.insert(tk.END, text, sender)
+        self.see(tk.END)
+
 # Novo Seletor de Combo para o Modelo ChatGPT
 class ChatGPTModelSelector(ModernOptionMenu):
     def __init__(self, master, variable):